@@ -22,6 +22,10 @@ setup(
         'pyinstaller==6.4.0',
 
     ],
+    extras_require={
+        'simulation': ['numpy'],
+        'effects': ['numpy'],
+    },
     author='Lucas Veit',
     description='Library used for development of Visual Novels',
 )
\ No newline at end of file
@@ -0,0 +1,58 @@
+import unittest
+from vnengine.analysis import analyze
+from vnengine.story import Story
+
+class TestAnalysis(unittest.TestCase):
+    def setUp(self):
+        self.story = Story()
+
+    def add(self, name, *choices):
+        self.story.add_scene(name, name, f"/path/to/{name}.jpg")
+        for go_to_scene in choices:
+            self.story.scenes[name].add_choice(go_to_scene, go_to_scene)
+
+    def test_diamond(self):
+        self.add('start', 'a', 'b')
+        self.add('a', 'c', 'end')
+        self.add('b', 'c')
+        self.add('c', 'end')
+        self.add('end')
+        result = analyze(self.story)
+        self.assertEqual(result['endings'], {'end': {'shortest': 2, 'longest': 3, 'paths': 3}})
+        self.assertEqual(result['paths'], 3)
+        self.assertEqual(result['cycles'], 0)
+        self.assertEqual(result['dead_ends'], [])
+
+    def test_cycles_dead_ends_and_unreachable(self):
+        self.add('start', 'loop1', 'end')
+        self.add('loop1', 'loop2')
+        self.add('loop2', 'loop1', 'trap')
+        self.add('trap', 'trap')
+        self.add('end')
+        self.add('lost', 'end')
+        result = analyze(self.story)
+        self.assertEqual(result['cycles'], 2)
+        self.assertEqual(result['largest_cycle'], 2)
+        self.assertEqual(result['dead_ends'], ['loop1', 'loop2', 'trap'])
+        self.assertEqual(result['unreachable'], ['lost'])
+        self.assertEqual(result['endings']['end']['paths'], 1)
+
+    def test_big_path_counts(self):
+        # a ladder of 200 steps with two choices per step has 2 ** 200 paths
+        for step in range(200):
+            self.add(f'{step}a', f'{step + 1}a', f'{step + 1}b')
+            self.add(f'{step}b', f'{step + 1}a', f'{step + 1}b')
+        self.add('200a', 'end')
+        self.add('200b', 'end')
+        self.add('end')
+        result = analyze(self.story)
+        self.assertEqual(result['endings']['end']['paths'], 2 ** 200)
+        self.assertEqual(result['endings']['end']['longest'], 201)
+
+    def test_undefined_scene(self):
+        self.add('start', 'missing')
+        with self.assertRaises(ValueError):
+            analyze(self.story)
+
+if __name__ == '__main__':
+    unittest.main()
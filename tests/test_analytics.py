@@ -0,0 +1,81 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from vnengine.analytics import _CHOICES_QUERY, _SCENES_QUERY, AnalyticsLog, report
+
+class TestAnalytics(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.folder.name, 'analytics.db')
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def play(self, session, choices):
+        log = AnalyticsLog(self.path, session, interval=60)
+        log.scene('Start')
+        for scene, choice, target in choices:
+            log.choice(scene, choice, target)
+            log.scene(target)
+        log.close()
+        return log
+
+    def test_report(self):
+        self.play('a', [('Start', 0, 'Left'), ('Left', 0, 'End')])
+        self.play('b', [('Start', 1, 'Right'), ('Right', 0, 'End')])
+        self.play('c', [('Start', 1, 'Right'), ('Right', 1, 'Start'), ('Start', 1, 'Right')])
+        result = report(self.path)
+        self.assertEqual(result['sessions'], 3)
+        scenes = {scene['scene']: (scene['visits'], scene['sessions']) for scene in result['scenes']}
+        self.assertEqual(scenes, {'Start': (4, 3), 'Right': (3, 2), 'Left': (1, 1), 'End': (2, 2)})
+        self.assertEqual(result['scenes'][0]['scene'], 'Start')
+        choices = {(choice['scene'], choice['choice']): (choice['target'], choice['taken'], choice['share']) for choice in result['choices']}
+        self.assertEqual(choices[('Start', 0)], ('Left', 1, 0.25))
+        self.assertEqual(choices[('Start', 1)], ('Right', 3, 0.75))
+        self.assertEqual(choices[('Right', 0)], ('End', 1, 0.5))
+        self.assertEqual(choices[('Right', 1)], ('Start', 1, 0.5))
+
+    def test_batches(self):
+        log = AnalyticsLog(self.path, 'a', batch_size=10, interval=60)
+        try:
+            for _ in range(25):
+                log.scene('Start')
+            # a full batch wakes the writer without waiting for its interval
+            log.flush()
+            self.assertEqual(log.written, 25)
+            self.assertEqual(len(log.buffer), 0)
+        finally:
+            log.close()
+        self.assertEqual(report(self.path)['scenes'][0]['visits'], 25)
+
+    def test_queries_use_the_indexes(self):
+        self.play('a', [('Start', 0, 'End')])
+        connection = sqlite3.connect(self.path)
+        try:
+            for query in (_SCENES_QUERY, _CHOICES_QUERY):
+                plan = ' '.join(row[-1] for row in connection.execute(f'EXPLAIN QUERY PLAN {query}'))
+                self.assertIn('COVERING INDEX', plan)
+        finally:
+            connection.close()
+
+    def test_missing_database(self):
+        with self.assertRaises(FileNotFoundError):
+            report(os.path.join(self.folder.name, 'missing.db'))
+
+    def test_write_errors_are_warned_once(self):
+        log = AnalyticsLog(self.path, 'a', interval=60)
+        connection = sqlite3.connect(self.path)
+        connection.execute('DROP TABLE events')
+        connection.close()
+        log.scene('Start')
+        with self.assertWarns(UserWarning):
+            log.flush()
+            log.thread.join()
+        self.assertTrue(log.failed)
+        log.scene('Start')
+        self.assertEqual(len(log.buffer), 0)
+        log.close()
+
+if __name__ == '__main__':
+    unittest.main()
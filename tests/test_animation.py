@@ -0,0 +1,145 @@
+import threading
+import time
+import unittest
+import pygame
+from vnengine.base.animation import _Animation
+from vnengine.utils.animation import _FramePlayer
+
+def frame_image(path):
+    # each frame is filled with its number as the red channel
+    surface = pygame.Surface((4, 2))
+    surface.fill((int(path[1:-4]), 0, 0))
+    return surface
+
+def sheet_image(path):
+    # a 3x2 sheet of 2x2 cells, each filled with its index
+    surface = pygame.Surface((6, 4))
+    for index in range(6):
+        surface.fill((index, 0, 0), pygame.Rect(index % 3 * 2, index // 3 * 2, 2, 2))
+    return surface
+
+class TestAnimation(unittest.TestCase):
+    def test_sequence(self):
+        animation = _Animation(['a.png', 'b.png', 'c.png'], fps=10)
+        self.assertEqual(animation.count, 3)
+        self.assertEqual([animation.sequence(elapsed) for elapsed in (0, 99, 100, 450)], [0, 0, 1, 4])
+        self.assertEqual(animation.source(4), ('b.png', None))
+        once = _Animation(['a.png', 'b.png', 'c.png'], fps=10, loop=False)
+        self.assertEqual(once.sequence(10000), 2)
+
+    def test_sprite_sheet(self):
+        animation = _Animation('sheet.png', columns=3, rows=2, count=5)
+        self.assertTrue(animation.is_sheet)
+        self.assertEqual(animation.source(4), ('sheet.png', (1, 1, 3, 2)))
+        self.assertEqual(animation.source(5), ('sheet.png', (0, 0, 3, 2)))
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            _Animation([])
+        with self.assertRaises(ValueError):
+            _Animation(['a.png'], fps=0)
+        with self.assertRaises(ValueError):
+            _Animation('sheet.png', columns=2, rows=2, count=5)
+
+class TestFramePlayer(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        self.players = []
+
+    def tearDown(self):
+        for player in self.players:
+            player.close()
+        pygame.quit()
+
+    def player(self, animation, loader, capacity=4):
+        player = _FramePlayer(animation, (8, 4), capacity, loader)
+        self.players.append(player)
+        return player
+
+    def wait_for(self, predicate):
+        deadline = time.monotonic() + 5
+        while not predicate():
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.001)
+
+    def test_decodes_ahead_into_a_bounded_ring(self):
+        player = self.player(_Animation([f'f{idx}.png' for idx in range(20)], fps=10), frame_image)
+        self.wait_for(lambda: player.decoded == 4)
+        time.sleep(0.05)
+        # the worker waits for the game to move on instead of decoding the whole animation
+        self.assertEqual(player.decoded, 4)
+        frame = player.frame(0)
+        self.assertEqual(frame.get_size(), (8, 4))
+        self.assertEqual(frame.get_at((0, 0))[0], 0)
+        # moving on by a frame lets the worker decode one more
+        self.assertEqual(player.frame(100).get_at((0, 0))[0], 1)
+        self.wait_for(lambda: player.decoded == 5)
+        self.assertEqual(player.dropped, 0)
+
+    def test_dropped_frames(self):
+        gate = threading.Event()
+        def slow(path):
+            gate.wait()
+            return frame_image(path)
+        player = self.player(_Animation([f'f{idx}.png' for idx in range(20)], fps=10), slow)
+        # nothing is decoded yet: nothing to show
+        self.assertIsNone(player.frame(0))
+        gate.set()
+        self.wait_for(lambda: player.frame(0) is not None)
+        # the game moved three frames on before the next frames were shown
+        self.wait_for(lambda: player.frame(300) is not None and player.shown == 3)
+        self.assertEqual(player.dropped, 2)
+        self.assertEqual(player.frame(300).get_at((0, 0))[0], 3)
+
+    def test_late_frame_keeps_the_last_one(self):
+        gate = threading.Event()
+        gate.set()
+        def gated(path):
+            gate.wait()
+            return frame_image(path)
+        player = self.player(_Animation([f'f{idx}.png' for idx in range(20)], fps=10), gated, capacity=1)
+        self.wait_for(lambda: player.frame(0) is not None)
+        first = player.frame(0)
+        gate.clear()
+        # frame 1 is not decoded in time, frame 0 stays on the screen
+        self.assertIs(player.frame(100), first)
+        gate.set()
+        self.wait_for(lambda: player.frame(100) is not first)
+        self.assertEqual(player.frame(100).get_at((0, 0))[0], 1)
+
+    def test_sprite_sheet_and_loop(self):
+        loads = []
+        def loader(path):
+            loads.append(path)
+            return sheet_image(path)
+        player = self.player(_Animation('sheet.png', fps=10, columns=3, rows=2), loader)
+        for sequence in range(8):
+            self.wait_for(lambda: player.frame(sequence * 100) is not None and player.shown == sequence)
+            self.assertEqual(player.frame_surface.get_at((0, 0))[0], sequence % 6)
+        # the sheet is decoded once and cut into frames
+        self.assertEqual(loads, ['sheet.png'])
+
+    def test_once_stops_on_the_last_frame(self):
+        player = self.player(_Animation(['f0.png', 'f1.png'], fps=10, loop=False), frame_image)
+        self.wait_for(lambda: player.frame(5000) is not None and player.shown == 1)
+        time.sleep(0.05)
+        # nothing is decoded after the last frame
+        self.assertEqual(player.next, 2)
+        self.assertEqual(player.frame(9000).get_at((0, 0))[0], 1)
+
+    def test_restart(self):
+        player = self.player(_Animation([f'f{idx}.png' for idx in range(20)], fps=10), frame_image)
+        self.wait_for(lambda: player.frame(500) is not None and player.shown == 5)
+        self.wait_for(lambda: player.frame(0) is not None and player.shown == 0)
+        self.assertEqual(player.frame_surface.get_at((0, 0))[0], 0)
+        self.assertEqual(player.dropped, 5)
+
+    def test_errors_are_raised_in_the_game(self):
+        def broken(path):
+            raise pygame.error('broken image')
+        player = self.player(_Animation(['f0.png'], fps=10), broken)
+        with self.assertRaises(pygame.error):
+            self.wait_for(lambda: player.frame(0) is not None)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import os
+import tempfile
+import time
+import unittest
+import wave
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+import pygame
+from vnengine.utils.audio import _AudioManager
+
+class TestAudioManager(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.now = 0
+        self.audio = _AudioManager(max_bytes=200000, fade_ms=100, clock=lambda: self.now)
+        if not self.audio.enabled:
+            self.skipTest("No audio device")
+
+    def tearDown(self):
+        self.audio.close()
+        pygame.mixer.quit()
+        self.folder.cleanup()
+
+    def wav(self, name, seconds=0.5):
+        path = os.path.join(self.folder.name, name)
+        with wave.open(path, 'wb') as file:
+            file.setnchannels(1)
+            file.setsampwidth(2)
+            file.setframerate(22050)
+            file.writeframes(b'\x01\x00' * int(22050 * seconds))
+        return path
+
+    def wait(self):
+        for _ in range(200):
+            if not self.audio.pending:
+                return
+            time.sleep(0.01)
+
+    def test_crossfade(self):
+        first, second = self.wav('first.wav'), self.wav('second.wav')
+        self.audio.play_music(first)
+        self.assertEqual(self.audio.music, first)
+        self.audio.play_music(first)
+        self.assertIsNone(self.audio.next_music)
+        self.audio.play_music(second)
+        self.assertEqual(self.audio.music, first)
+        self.assertEqual(self.audio.next_music, second)
+        self.audio.update()
+        self.assertEqual(self.audio.music, first)
+        self.now = 100
+        self.audio.update()
+        self.assertEqual(self.audio.music, second)
+        self.assertIsNone(self.audio.next_music)
+        self.audio.play_music(None)
+        self.now = 200
+        self.audio.update()
+        self.assertIsNone(self.audio.music)
+
+    def test_voices_are_cached_and_bounded(self):
+        voices = [self.wav(f'voice{idx}.wav') for idx in range(3)]
+        self.audio.prefetch(voices)
+        self.wait()
+        # each voice has 88200 bytes once converted to the mixer format, so only two fit in the cache
+        self.assertEqual(len(self.audio.sounds), 2)
+        self.assertLessEqual(self.audio.sounds.bytes, 200000)
+        self.assertNotIn(voices[0], self.audio.sounds)
+
+    def test_voice_waits_for_decoding(self):
+        voice = self.wav('voice.wav')
+        self.audio.play_voice(voice)
+        self.assertTrue(self.audio.voice_playing)
+        self.wait()
+        self.audio.update()
+        self.assertIsNone(self.audio.voice)
+        self.audio.play_voice(os.path.join(self.folder.name, 'missing.wav'))
+        self.wait()
+        self.audio.update()
+        self.assertIsNone(self.audio.voice)
+
+    def test_sound_effects_wait_for_decoding(self):
+        effect = self.wav('effect.wav')
+        self.audio.play_sound(effect)
+        self.audio.play_sound(os.path.join(self.folder.name, 'missing.wav'))
+        self.wait()
+        self.audio.update()
+        # the effect played and the one that failed to decode was dropped
+        self.assertEqual(self.audio.effects, [])
+        self.assertIn(effect, self.audio.sounds)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -25,5 +25,13 @@ class TestButton(unittest.TestCase):
         self.assertTrue(self.button.is_over((101, 101)))
         self.assertFalse(self.button.is_over((90, 90)))
 
+    def test_surface(self):
+        choice = _Button(100, 100, "Test", scenario='choice')
+        width, height = choice.font.size("Test")
+        surface = choice.surface(hovered=True)
+        self.assertEqual(surface.get_size(), (width + 20, height + 10))
+        self.assertEqual(surface.get_at((0, 0))[:3], (0, 0, 0))
+        self.assertEqual(self.button.surface().get_size(), self.button.font.size("Test"))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,122 @@
+import unittest
+import pygame
+from vnengine.utils.cache import _LRUCache, _ImageCache, _MemoryBudget, _TextCache
+
+class TestLRUCache(unittest.TestCase):
+    def test_evicts_least_recently_used(self):
+        cache = _LRUCache(10, size_of=len)
+        cache.put('a', 'xxxx')
+        cache.put('b', 'xxxx')
+        cache.get('a')
+        cache.put('c', 'xxxx')
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertEqual(cache.bytes, 8)
+
+    def test_discard(self):
+        cache = _LRUCache(100, size_of=len)
+        cache.put(('a', 1), 'x')
+        cache.put(('b', 2), 'x')
+        cache.discard(lambda key: key[1] == 1)
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.bytes, 1)
+
+class TestMemoryBudget(unittest.TestCase):
+    def test_evicts_lowest_priority_first(self):
+        texts, images = _LRUCache(4, size_of=len), _LRUCache(4, size_of=len)
+        budget = _MemoryBudget(10)
+        budget.register('texts', texts, 0)
+        budget.register('images', images, 1)
+        # the caches are bounded only by the budget
+        self.assertEqual(texts.max_bytes, 10)
+        images.put('a', 'xxx')
+        images.put('b', 'xxx')
+        texts.put('c', 'xx')
+        texts.put('d', 'xx')
+        self.assertEqual(budget.bytes, 10)
+        images.put('e', 'xxx')
+        # the oldest text goes first, the images only when the most recent text is the only one left
+        self.assertEqual(list(texts.entries), ['d'])
+        self.assertEqual(list(images.entries), ['b', 'e'])
+        self.assertEqual(budget.bytes, 8)
+        stats = budget.stats()
+        self.assertEqual((stats['budget'], stats['bytes']), (10, 8))
+        self.assertEqual(stats['caches']['texts'], {'bytes': 2, 'entries': 1, 'evictions': 1, 'priority': 0})
+        self.assertEqual(stats['caches']['images']['evictions'], 1)
+
+    def test_without_budget(self):
+        cache = _LRUCache(4, size_of=len)
+        budget = _MemoryBudget()
+        budget.register('texts', cache, 0)
+        cache.put('a', 'xxx')
+        cache.put('b', 'xxx')
+        self.assertEqual(cache.max_bytes, 4)
+        self.assertEqual(list(cache.entries), ['b'])
+        self.assertEqual(budget.stats()['bytes'], 3)
+
+class TestImageCache(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        self.loads = []
+        self.cache = _ImageCache(loader=self.loader)
+
+    def tearDown(self):
+        pygame.quit()
+
+    def loader(self, path):
+        self.loads.append(path)
+        return pygame.Surface((64, 32))
+
+    def test_scales_and_decodes_once(self):
+        self.assertEqual(self.cache.get('a.jpg', (128, 64)).get_size(), (128, 64))
+        self.assertEqual(self.cache.get('a.jpg', (32, 16)).get_size(), (32, 16))
+        self.assertEqual(self.loads, ['a.jpg'])
+
+    def test_prefetch_and_resize(self):
+        self.cache.prefetch(['a.jpg', 'b.jpg'], (100, 50))
+        self.assertEqual(self.cache.get('b.jpg', (100, 50)).get_size(), (100, 50))
+        self.cache.get('a.jpg', (100, 50))
+        self.cache.get('a.jpg', (200, 100))
+        self.cache.resize([(200, 100)])
+        self.assertNotIn(('a.jpg', (100, 50)), self.cache.scaled)
+        self.assertIn(('a.jpg', (200, 100)), self.cache.scaled)
+        self.assertIn('b.jpg', self.cache.sources)
+
+    def test_reduced_prefetch(self):
+        self.cache.prefetch(['a.jpg'], (100, 50), reduced=True)
+        surface = self.cache.get('a.jpg', (100, 50))
+        self.assertEqual(surface.get_bitsize(), 16)
+        self.assertEqual(self.cache.scaled.bytes, 100 * 50 * 2)
+        self.assertIn(('a.jpg', (100, 50)), self.cache.reduced)
+        # the image is converted to the display format once it is shown
+        pygame.display.set_mode((10, 10))
+        surface = self.cache.get('a.jpg', (100, 50))
+        self.assertEqual(surface.get_bitsize(), pygame.display.get_surface().get_bitsize())
+        self.assertNotIn(('a.jpg', (100, 50)), self.cache.reduced)
+
+    def test_forget(self):
+        self.cache.get('a.jpg', (100, 50))
+        self.cache.get('b.jpg', (100, 50))
+        self.cache.forget('a.jpg')
+        self.assertNotIn('a.jpg', self.cache.sources)
+        self.assertNotIn(('a.jpg', (100, 50)), self.cache.scaled)
+        self.assertIn(('b.jpg', (100, 50)), self.cache.scaled)
+        self.cache.get('a.jpg', (100, 50))
+        self.assertEqual(self.loads, ['a.jpg', 'b.jpg', 'a.jpg'])
+
+class TestTextCache(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+
+    def tearDown(self):
+        pygame.quit()
+
+    def test_render_once(self):
+        cache = _TextCache()
+        font = pygame.font.Font(None, 24)
+        text = cache.render(font, 'Menu', (255, 255, 255))
+        self.assertIs(cache.render(font, 'Menu', (255, 255, 255)), text)
+        self.assertIsNot(cache.render(font, 'Menu', (0, 0, 0)), text)
+
+if __name__ == '__main__':
+    unittest.main()
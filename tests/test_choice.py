@@ -6,6 +6,26 @@ class TestChoice(unittest.TestCase):
         choice_text = "Choose option A"
         choice = _Choice(choice_text)
         self.assertEqual(choice.choice_text, choice_text)
+        self.assertIsNone(choice.predicate)
+        self.assertIsNone(choice.effect)
+
+    def test_compiled_condition_and_effects(self):
+        slots = {'gold': 0, 'has_key': 1}
+        choice = _Choice("Buy the key", "Shop", "gold >= 10 and not has_key", "gold -= 10; has_key = True", slots)
+        self.assertTrue(choice.predicate([10, 0]))
+        self.assertFalse(choice.predicate([10, 1]))
+        self.assertFalse(choice.predicate([9, 0]))
+        values = [12, 0]
+        choice.effect(values)
+        self.assertEqual(values, [2, 1])
+
+    def test_invalid_expressions(self):
+        for condition in ('gold >', 'open(gold)', 'coins > 1', 'gold.real', '"text"', 'gold if gold else 1'):
+            with self.assertRaises(ValueError):
+                _Choice("Buy", "Shop", condition, None, {'gold': 0})
+        for effects in ('gold', 'gold == 1', 'coins = 1', 'gold = open()'):
+            with self.assertRaises(ValueError):
+                _Choice("Buy", "Shop", None, effects, {'gold': 0})
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
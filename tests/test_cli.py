@@ -0,0 +1,33 @@
+import os
+import tempfile
+import unittest
+from vnengine.cli import launcher_script, modify_script
+
+SCRIPT = """from vnengine import story
+story = story.Story()
+story.set_resolution('hd')
+story.add_scene('Start', 'The cat starts to run.', 'assets/01.jpg')
+story.add_choice('Start', 'Run away', 'Start')
+story.run()
+"""
+
+class TestCli(unittest.TestCase):
+    def test_modify_script_keeps_texts(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.py', delete=False) as file:
+            file.write(SCRIPT)
+        try:
+            script = modify_script(file.name, 'en', 'pt,en', 'fullhd')
+        finally:
+            os.remove(file.name)
+        self.assertIn("story.add_scene('Start', 'The cat starts to run.', 'assets/01.jpg')", script)
+        self.assertIn("story.add_choice('Start', 'Run away', 'Start')", script)
+        self.assertNotIn("story.set_resolution('hd')", script)
+        self.assertIn("story.set_languages(['pt', 'en'])", script)
+        self.assertEqual(script.count('story.run()'), 1)
+
+    def test_launcher_script(self):
+        script = launcher_script('coloring.vn', 'en', 'pt,en', 'hd')
+        self.assertIn("parser.read_story('coloring.vn', language='en', languages=['pt', 'en'], resolution='hd')", script)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+import pygame
+from vnengine.utils.cache import _ImageCache
+from vnengine.utils.compositor import _Compositor
+
+COLORS = {'bg.jpg': (0, 0, 255), 'anna.png': (255, 0, 0), 'bob.png': (0, 255, 0), 'bob_sad.png': (0, 128, 0)}
+
+class TestCompositor(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        self.cache = _ImageCache(loader=self.loader)
+        self.compositor = _Compositor(self.cache)
+        self.scaled = []
+        layer = self.compositor.layer
+        self.compositor.layer = lambda path, size: self.scaled.append(path) or layer(path, size)
+
+    def tearDown(self):
+        pygame.quit()
+
+    def loader(self, path):
+        if path == 'bg.jpg':
+            surface = pygame.Surface((100, 50))
+        elif path == 'rain.png':
+            surface = pygame.Surface((10, 10), pygame.SRCALPHA)
+            surface.fill((255, 255, 255, 0))
+            surface.fill((255, 255, 255, 255), pygame.Rect(0, 0, 1, 1))
+            return surface
+        else:
+            surface = pygame.Surface((10, 20), pygame.SRCALPHA)
+        surface.fill(COLORS[path])
+        return surface
+
+    def test_background_only(self):
+        surface = self.compositor.get((('bg.jpg', None, None),), (200, 100))
+        self.assertIs(surface, self.cache.get('bg.jpg', (200, 100)))
+        self.assertEqual(len(self.compositor.composites), 0)
+
+    def test_layers_are_drawn_in_order(self):
+        layers = (('bg.jpg', None, None), ('anna.png', 0.25, 1.0), ('rain.png', None, None))
+        surface = self.compositor.get(layers, (200, 100))
+        # sprites are scaled like the background, twice their size, with the bottom at y and centered at x
+        self.assertEqual(surface.get_at((50, 99))[:3], (255, 0, 0))
+        self.assertEqual(surface.get_at((50, 60))[:3], (255, 0, 0))
+        self.assertEqual(surface.get_at((50, 55))[:3], (0, 0, 255))
+        self.assertEqual(surface.get_at((150, 50))[:3], (0, 0, 255))
+        self.assertEqual(surface.get_at((0, 0))[:3], (255, 255, 255))
+        self.assertIs(self.compositor.get(layers, (200, 100)), surface)
+
+    def test_partial_recomposition(self):
+        background, anna = ('bg.jpg', None, None), ('anna.png', 0.25, 1.0)
+        self.compositor.get((background, anna, ('bob.png', 0.75, 1.0)), (200, 100))
+        self.scaled.clear()
+        surface = self.compositor.get((background, anna, ('bob_sad.png', 0.75, 1.0)), (200, 100))
+        self.assertEqual(self.scaled, ['bob_sad.png'])
+        self.assertEqual(surface.get_at((150, 99))[:3], (0, 128, 0))
+        self.assertEqual(surface.get_at((50, 99))[:3], (255, 0, 0))
+
+    def test_draw_layers(self):
+        layers = (('bg.jpg', None, None), ('anna.png', 0.25, 1.0))
+        screen = pygame.Surface((300, 100))
+        screen.fill((9, 9, 9))
+        self.compositor.draw_layers(screen, layers, pygame.Rect(100, 0, 200, 100))
+        # only the sprite is drawn, moved with the background and scaled like its image
+        self.assertEqual(screen.get_at((150, 99))[:3], (255, 0, 0))
+        self.assertEqual(screen.get_at((150, 55))[:3], (9, 9, 9))
+        self.assertEqual(screen.get_at((50, 99))[:3], (9, 9, 9))
+        self.assertEqual(len(self.compositor.composites), 0)
+
+    def test_resize(self):
+        layers = (('bg.jpg', None, None), ('anna.png', 0.5, 1.0))
+        self.compositor.get(layers, (200, 100))
+        self.compositor.get(layers, (100, 50))
+        self.compositor.resize([(100, 50)])
+        self.assertEqual([key[0] for key in self.compositor.composites.entries], [(100, 50)])
+
+    def test_forget(self):
+        background = ('bg.jpg', None, None)
+        self.compositor.get((background, ('anna.png', 0.25, 1.0)), (200, 100))
+        self.compositor.get((background, ('bob.png', 0.75, 1.0)), (200, 100))
+        self.compositor.forget('anna.png')
+        self.assertEqual([key[1][1][0] for key in self.compositor.composites.entries], ['bob.png'])
+        self.assertNotIn('anna.png', self.cache.sources)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+import pygame
+from vnengine.dev import StoryReloader, diff_stories
+from vnengine.parser import parse_story
+from vnengine.story import Story
+
+SOURCE = """background assets/menu.jpg
+
+scene Start
+    image assets/01.jpg
+    text Hello!
+    choice Go -> Middle
+
+scene Middle
+    image assets/02.jpg
+    text Middle
+    choice Go -> End
+
+scene End
+    image assets/03.jpg
+    text Bye!
+"""
+
+class TestDiffStories(unittest.TestCase):
+    def test_diff(self):
+        old = parse_story(SOURCE)
+        new = parse_story(SOURCE.replace('text Middle', 'text Changed').replace('choice Go -> End', 'choice Go -> Other')
+                          + "\nscene Other\n    image assets/03.jpg\n")
+        self.assertEqual(diff_stories(old, new), {'added': ['Other'], 'removed': [], 'changed': ['Middle']})
+        self.assertEqual(diff_stories(new, old), {'added': [], 'removed': ['Other'], 'changed': ['Middle']})
+
+    def test_scripts_are_compared_by_code(self):
+        def scripts():
+            # each reload of a source defines its scripts again
+            def intro():
+                yield say('Hello')
+            def other():
+                yield say('Bye')
+            return intro, other
+        say = None
+        old, new = parse_story(SOURCE), parse_story(SOURCE)
+        (old_intro, _), (new_intro, new_other) = scripts(), scripts()
+        old.set_script('Start', old_intro)
+        new.set_script('Start', new_intro)
+        self.assertIsNot(old_intro, new_intro)
+        self.assertEqual(diff_stories(old, new), {'added': [], 'removed': [], 'changed': []})
+        new.set_script('Start', new_other)
+        self.assertEqual(diff_stories(old, new), {'added': [], 'removed': [], 'changed': ['Start']})
+
+class TestStoryReloader(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.folder.name)
+        os.mkdir('assets')
+        for name in ('menu.jpg', '01.jpg', '02.jpg', '03.jpg'):
+            pygame.image.save(pygame.Surface((8, 8)), os.path.join('assets', name))
+        self.write(SOURCE)
+        self.story = parse_story(SOURCE)
+        self.reloader = StoryReloader(self.story, 'story.vn', interval=60)
+
+    def tearDown(self):
+        self.reloader.close()
+        os.chdir(self.cwd)
+        self.folder.cleanup()
+
+    def write(self, source):
+        with open('story.vn', 'w', encoding='utf-8') as file:
+            file.write(source)
+
+    def test_reload_keeps_unchanged_scenes(self):
+        start = self.story.scenes['Start']
+        self.write(SOURCE.replace('text Middle', 'text Changed'))
+        self.assertEqual(self.reloader.reload_story(), {'added': [], 'removed': [], 'changed': ['Middle']})
+        self.assertIs(self.story.scenes['Start'], start)
+        self.assertEqual(self.story.scenes['Middle'].character_text, 'Changed')
+
+    def test_invalid_source_is_not_applied(self):
+        self.write(SOURCE.replace('image assets/02.jpg', 'image assets/missing.jpg'))
+        self.assertIsNone(self.reloader.reload_story())
+        self.assertEqual(self.story.scenes['Middle'].background_display_img, 'assets/02.jpg')
+
+    def test_removed_scene_revalidates_its_predecessors(self):
+        new = Story()
+        new.add_scene('Start', 'Hello!', 'assets/01.jpg')
+        new.add_scene('Middle', 'Middle', 'assets/02.jpg')
+        new.add_choice('Start', 'Go', 'Middle')
+        new.add_choice('Middle', 'Go', 'End')
+        with self.assertRaises(ValueError):
+            self.reloader.validate(new, {'added': [], 'removed': ['End'], 'changed': []})
+
+    def test_reload_on_the_menu(self):
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        with mock.patch('googletrans.Translator') as translator:
+            translator.return_value.translate.side_effect = lambda text, src, dest: mock.Mock(text=text)
+            from vnengine.utils.game import _Game
+            self.story.set_display_mode('windowed')
+            game = _Game(self.story)
+            # the translator is made by a startup worker
+            game.startup.wait('translations')
+        try:
+            self.reloader.game = game
+            game.scene = 'start'
+            game.starting_menu()
+            self.write(SOURCE.replace('text Middle', 'text Changed'))
+            self.assertEqual(self.reloader.reload_story()['changed'], ['Middle'])
+            self.assertEqual(game.scene, 'start')
+            self.assertIsNone(game.current_scene)
+        finally:
+            game.slots.close()
+            game.gallery.close()
+            pygame.quit()
+
+    def test_watcher(self):
+        self.write(SOURCE.replace('text Hello!', 'text Hi!'))
+        os.utime('story.vn', ns=(1, 1))
+        self.reloader.watcher.check()
+        self.reloader.update()
+        self.assertEqual(self.story.scenes['Start'].character_text, 'Hi!')
+        self.assertEqual(self.reloader.watcher.take(), set())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+import pygame
+from vnengine.utils.button import _Button
+from vnengine.utils.dialogue import _Dialogue
+from vnengine.utils.font import _FontRegistry
+
+FONT = os.path.join(os.path.dirname(pygame.__file__), pygame.font.get_default_font())
+
+class TestFontRegistry(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        self.folder = tempfile.TemporaryDirectory()
+        self.font = os.path.join(self.folder.name, 'font.ttf')
+        shutil.copyfile(FONT, self.font)
+
+    def tearDown(self):
+        pygame.quit()
+        self.folder.cleanup()
+
+    def test_fonts_are_loaded_once(self):
+        registry = _FontRegistry({'de': self.font})
+        self.assertIs(registry.get(20, 'de'), registry.get(20, 'de'))
+        self.assertIs(registry.get(20, 'pt'), registry.get(20, 'en'))
+        self.assertIsNot(registry.get(20, 'de'), registry.get(20, 'pt'))
+        self.assertIsNot(registry.get(20, 'de'), registry.get(30, 'de'))
+        self.assertEqual(len(registry), 3)
+        self.assertEqual(list(registry.data), [self.font])
+        # new sizes are parsed from the file read before
+        os.remove(self.font)
+        self.assertEqual(registry.get(40, 'de').get_height(), pygame.font.Font(FONT, 40).get_height())
+
+    def test_face_for_every_language(self):
+        registry = _FontRegistry({None: self.font, 'de': FONT})
+        self.assertEqual(registry.face('pt'), self.font)
+        self.assertEqual(registry.face('de'), FONT)
+        self.assertIsNone(_FontRegistry().face('pt'))
+
+    def test_forget_and_quit(self):
+        registry = _FontRegistry({None: self.font})
+        font = registry.get(20)
+        other = _FontRegistry()
+        other.get(20)
+        registry.forget(self.font)
+        self.assertEqual(len(registry), 0)
+        self.assertIsNot(registry.get(20), font)
+        # fonts can't be used after pygame quits
+        pygame.quit()
+        self.assertEqual(len(registry), 0)
+        self.assertEqual(len(other), 0)
+        pygame.init()
+        # the callback is registered again after pygame starts again, and only once however often the fonts are cleared
+        registry.get(20)
+        self.assertTrue(registry.registered)
+        with mock.patch('pygame.register_quit') as register_quit:
+            for size in (21, 22, 23):
+                registry.clear()
+                registry.get(size)
+        register_quit.assert_not_called()
+        pygame.quit()
+        self.assertEqual(len(registry), 0)
+        pygame.init()
+
+    def test_widgets_share_the_default_font(self):
+        self.assertIs(_Button(100, 100, "A").font, _Button(110, 110, "B").font)
+        self.assertIs(_Dialogue(0, 0, 10, 10, "A").font, _Dialogue(5, 5, 10, 10, "B").font)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import os
+import tempfile
+import unittest
+import pygame
+from vnengine.runtime import SeenScenes
+from vnengine.utils.gallery import _Gallery, _unlocked_backgrounds
+
+class TestGallery(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        self.folder = tempfile.TemporaryDirectory()
+        self.image = os.path.join(self.folder.name, 'background.png')
+        self.write_image((255, 0, 0))
+        self.thumbnails = os.path.join(self.folder.name, 'thumbnails')
+        self.loads = []
+        self.galleries = []
+
+    def tearDown(self):
+        for gallery in self.galleries:
+            gallery.close()
+        pygame.quit()
+        self.folder.cleanup()
+
+    def write_image(self, color):
+        image = pygame.Surface((400, 300))
+        image.fill(color)
+        pygame.image.save(image, self.image)
+
+    def assertColor(self, color, expected):
+        # smoothing may round the color down by a few units
+        for channel, value in zip(color[:3], expected):
+            self.assertAlmostEqual(channel, value, delta=3)
+
+    def loader(self, path):
+        self.loads.append(path)
+        return pygame.image.load(path)
+
+    def gallery(self):
+        gallery = _Gallery(self.thumbnails, (40, 40), loader=self.loader)
+        self.galleries.append(gallery)
+        return gallery
+
+    def test_thumbnails_are_made_once(self):
+        gallery = self.gallery()
+        self.assertIsNone(gallery.get(self.image))
+        gallery.wait()
+        self.assertEqual(gallery.get(self.image).get_size(), (40, 30))
+        self.assertEqual(len(os.listdir(self.thumbnails)), 1)
+        # another game reads the thumbnail without decoding the image
+        other = self.gallery()
+        other.get(self.image)
+        other.wait()
+        self.assertColor(other.get(self.image).get_at((20, 15)), (255, 0, 0))
+        self.assertEqual(self.loads, [self.image])
+
+    def test_changed_image_gets_a_new_thumbnail(self):
+        gallery = self.gallery()
+        gallery.get(self.image)
+        gallery.wait()
+        self.write_image((0, 0, 255))
+        gallery.forget(self.image)
+        gallery.get(self.image)
+        gallery.wait()
+        self.assertColor(gallery.get(self.image).get_at((20, 15)), (0, 0, 255))
+        self.assertEqual(len(os.listdir(self.thumbnails)), 2)
+
+    def test_unlocked_backgrounds(self):
+        seen = SeenScenes(4)
+        seen.add(2)
+        backgrounds = {'a.jpg': [0, 1], 'b.jpg': [2], 'c.jpg': [3]}
+        self.assertEqual(_unlocked_backgrounds(backgrounds, seen), [('a.jpg', False), ('b.jpg', True), ('c.jpg', False)])
+
+if __name__ == '__main__':
+    unittest.main()
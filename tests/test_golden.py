@@ -0,0 +1,123 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pygame
+from vnengine.golden import check_golden, compare_images, render_screens, write_heatmap
+from vnengine.story import Story
+
+GOLDEN = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'golden')
+# set VNENGINE_UPDATE_GOLDEN=1 to write the golden images again after an intended change of the rendering
+UPDATE = os.environ.get('VNENGINE_UPDATE_GOLDEN') == '1'
+
+def background(path, color, accent):
+    surface = pygame.Surface((160, 90))
+    surface.fill(color)
+    pygame.draw.rect(surface, accent, (20, 50, 120, 30))
+    pygame.draw.circle(surface, (240, 220, 120), (130, 20), 10)
+    pygame.image.save(surface, path)
+
+class TestCompareImages(unittest.TestCase):
+    def setUp(self):
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        pygame.init()
+        self.folder = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.folder.cleanup()
+        pygame.quit()
+
+    def frame(self, size=(320, 180)):
+        surface = pygame.Surface(size)
+        surface.fill((30, 60, 90))
+        pygame.draw.rect(surface, (200, 200, 200), (10, 10, 100, 40))
+        return surface
+
+    def test_differences_within_the_tolerance_match(self):
+        expected = self.frame()
+        actual = self.frame()
+        self.assertIsNone(compare_images(actual, expected))
+        actual.fill((38, 60, 90), (0, 100, 320, 80))
+        self.assertIsNone(compare_images(actual, expected, tolerance=8))
+        difference = compare_images(actual, expected, tolerance=4)
+        self.assertEqual(difference.shape, (320, 180))
+        self.assertEqual(np.count_nonzero(difference), 320 * 80)
+        self.assertEqual(difference.max(), 8)
+
+    def test_formats_are_compared_by_color(self):
+        expected = self.frame().convert(24)
+        self.assertIsNone(compare_images(self.frame(), expected, tolerance=0))
+        with self.assertRaises(ValueError):
+            compare_images(self.frame((320, 181)), expected)
+
+    def test_failures_write_the_frame_and_a_heatmap(self):
+        golden = os.path.join(self.folder.name, 'golden')
+        self.assertEqual(check_golden({'menu-hd': self.frame()}, golden, update=True), [])
+        changed = self.frame()
+        pygame.draw.rect(changed, (255, 0, 0), (200, 100, 20, 20))
+        messages = check_golden({'menu-hd': changed, 'scene-hd': changed}, golden)
+        self.assertEqual(len(messages), 2)
+        self.assertIn('400 pixels', messages[0])
+        self.assertIn('no golden image', messages[1])
+        heatmap = pygame.image.load(os.path.join(golden, 'failures', 'menu-hd.diff.png'))
+        self.assertEqual(heatmap.get_at((210, 110))[:3], (225, 0, 0))
+        self.assertEqual(heatmap.get_at((0, 0))[:3], (7, 15, 22))
+        self.assertTrue(os.path.exists(os.path.join(golden, 'failures', 'menu-hd.png')))
+        # a few pixels can be allowed to differ
+        self.assertEqual(check_golden({'menu-hd': changed}, golden, max_ratio=0.01), [])
+
+    def test_heatmap_of_a_difference(self):
+        difference = np.zeros((320, 180), np.uint8)
+        difference[5, 5] = 20
+        path = os.path.join(self.folder.name, 'heat', 'diff.png')
+        write_heatmap(difference, self.frame(), path)
+        self.assertEqual(pygame.image.load(path).get_at((5, 5))[:3], (96, 0, 0))
+
+    def test_hundreds_of_4k_frames(self):
+        expected = self.frame((3840, 2160))
+        same = self.frame((3840, 2160))
+        changed = self.frame((3840, 2160))
+        pygame.draw.rect(changed, (255, 0, 0), (2000, 1000, 300, 200))
+        self.assertEqual(np.count_nonzero(compare_images(changed, expected)), 300 * 200)
+        for index in range(200):
+            difference = compare_images(changed if index % 10 == 0 else same, expected)
+            self.assertEqual(difference is None, index % 10 != 0)
+
+class TestGoldenScreens(unittest.TestCase):
+    def setUp(self):
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        self.folder = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.folder.name)
+        pygame.init()
+        background('menu.png', (40, 40, 70), (90, 60, 120))
+        background('forest.png', (40, 90, 50), (70, 50, 30))
+        background('lake.png', (50, 80, 140), (30, 120, 160))
+        self.story = Story()
+        self.story.add_starting_background('menu.png')
+        self.story.set_display_mode('windowed')
+        self.story.set_languages(['pt', 'en', 'es'])
+        self.story.add_scene('Start', 'Você acorda numa floresta escura. Ao longe, ouve-se água.', 'forest.png')
+        self.story.add_scene('Lake', 'O lago brilha.', 'lake.png')
+        self.story.add_scene('Deeper', 'As árvores fecham-se.', 'forest.png')
+        self.story.add_choice('Start', 'Seguir o som da água', 'Lake')
+        self.story.add_choice('Start', 'Entrar mais na floresta', 'Deeper')
+
+    def tearDown(self):
+        pygame.quit()
+        os.chdir(self.cwd)
+        self.folder.cleanup()
+
+    def test_screens_match_the_golden_images(self):
+        frames = render_screens(self.story)
+        self.assertEqual(len(frames), 12)
+        self.assertEqual(frames['menu-4k'].get_size(), (3840, 2160))
+        messages = check_golden(frames, GOLDEN, update=UPDATE)
+        self.assertEqual(messages, [], '\n'.join(messages))
+
+    def test_invalid_screen(self):
+        with self.assertRaises(ValueError):
+            render_screens(self.story, screens=['credits'])
+
+if __name__ == '__main__':
+    unittest.main()
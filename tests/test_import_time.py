@@ -0,0 +1,31 @@
+import subprocess
+import sys
+import unittest
+
+# authoring tools only need these modules, which must not load the renderer or the translation client
+MODULES = ['vnengine.story', 'vnengine.parser', 'vnengine.loader', 'vnengine.analysis', 'vnengine.cli']
+HEAVY_MODULES = ['pygame', 'googletrans', 'httpx']
+MAX_IMPORT_TIME = 0.1
+
+class TestImportTime(unittest.TestCase):
+    def import_modules(self):
+        code = f"import sys; import {', '.join(MODULES)}; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], capture_output=True, text=True, check=True)
+        return result.stdout.strip(), result.stderr
+
+    def test_heavy_modules_are_lazy(self):
+        loaded, _ = self.import_modules()
+        self.assertEqual(loaded, '')
+
+    def test_import_time(self):
+        _, report = self.import_modules()
+        # each line of the report is "import time: self | cumulative | package"
+        cumulative = 0
+        for line in report.splitlines():
+            fields = line.split('|')
+            if len(fields) == 3 and fields[2].strip() in MODULES:
+                cumulative += int(fields[1])
+        self.assertLess(cumulative / 1e6, MAX_IMPORT_TIME)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+import unittest
+from vnengine.utils.layout import _Element, _Layout, _LayoutCache
+
+class TestLayout(unittest.TestCase):
+    def test_resolve_anchors(self):
+        self.assertEqual(_Element('topright', width=0.8, height=1.0).resolve((1280, 720)).rect, (256, 0, 1024, 720))
+        self.assertEqual(_Element('bottom', x=-0.04, y=-0.045).resolve((1920, 1080)).rect.topleft, (883, 1031))
+        self.assertEqual(_Element('center', width=0.5, height=0.5).resolve((100, 100)).rect, (25, 25, 50, 50))
+
+    def test_rows(self):
+        box = _Element('topleft', x=0.02, y=0.2, spacing=0.1).resolve((1000, 1000))
+        self.assertEqual(box.row(0), (20, 200))
+        self.assertEqual(box.row(3), (20, 500))
+
+    def test_invalid_anchor(self):
+        with self.assertRaises(ValueError):
+            _Element('middle')
+
+    def test_fonts_and_language_overrides(self):
+        layout = _Layout({'sidebar': _Element(width=0.2)}, fonts={'button': 0.05}, languages={'de': {'sidebar': _Element(width=0.3)}})
+        self.assertEqual(layout.resolve((1000, 800), 'pt')['sidebar'].rect.width, 200)
+        self.assertEqual(layout.resolve((1000, 800), 'de')['sidebar'].rect.width, 300)
+        self.assertEqual(layout.resolve((1000, 800), 'pt').fonts['button'], 40)
+
+    def test_cache(self):
+        cache = _LayoutCache()
+        menu = cache.get('menu', (1280, 720), 'pt')
+        self.assertIs(cache.get('menu', (1280, 720), 'pt'), menu)
+        self.assertIsNot(cache.get('menu', (1920, 1080), 'pt'), menu)
+        self.assertIsNot(cache.get('menu', (1280, 720), 'en'), menu)
+        cache.invalidate()
+        self.assertIsNot(cache.get('menu', (1280, 720), 'pt'), menu)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,149 @@
+import json
+import os
+import tempfile
+import unittest
+from vnengine.loader import StreamingStory, load_story
+
+class TestLoader(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def write(self, name, lines):
+        path = os.path.join(self.folder.name, name)
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write('\n'.join(lines) + '\n')
+        return path
+
+    def write_jsonl(self, records):
+        return self.write('story.jsonl', [json.dumps(record) for record in records])
+
+    def test_load_jsonl(self):
+        path = self.write_jsonl([
+            {'type': 'story', 'languages': ['pt', 'en'], 'language': 'en', 'background': 'menu.jpg', 'characters': {'Anna': {'happy': 'anna.png'}}, 'font_en': 'en.ttf'},
+            {'type': 'scene', 'name': 'Start', 'text': 'Hello,\nworld!', 'image': 'a.jpg', 'sprites': [['Anna', 'happy', 0.3]], 'overlays': ['rain.png']},
+            {'type': 'choice', 'name': 'Start', 'text': 'Left', 'to': 'Left'},
+            {'type': 'choice', 'name': 'Start', 'text': 'Right', 'to': 'Right'},
+            {'type': 'scene', 'name': 'Left', 'text': 'Left', 'image': 'b.jpg', 'music': 'theme.ogg', 'voice': 'left.ogg', 'voice_en': 'left_en.ogg'},
+            {'type': 'scene', 'name': 'Right', 'text': 'Right', 'image': 'a.jpg', 'music': 'none', 'animation': {'sheet': 'waves.png', 'columns': 4, 'rows': 2, 'fps': 8}, 'effects': ['snow', ['dust', 500]]},
+        ])
+        story = load_story(path)
+        self.assertIsInstance(story, StreamingStory)
+        self.assertEqual(story.language, 'en')
+        self.assertEqual(story.starting_background, 'menu.jpg')
+        self.assertEqual(story.fonts, {'en': 'en.ttf'})
+        self.assertEqual(story.number_scenes, 3)
+        self.assertEqual(story.images, ['a.jpg', 'b.jpg'])
+        self.assertEqual(story.backgrounds(), {'a.jpg': [0, 2], 'b.jpg': [1]})
+        scene = story.scenes['Start']
+        self.assertEqual(scene.character_text, 'Hello,\nworld!')
+        self.assertEqual([(choice.go_to_scene, choice.choice_text) for choice in scene.choices], [('Left', 'Left'), ('Right', 'Right')])
+        self.assertEqual(story.scenes['Right'].background_display_img, 'a.jpg')
+        self.assertEqual(story.scenes['Right'].music, '')
+        self.assertEqual(story.scenes['Left'].music, 'theme.ogg')
+        self.assertEqual(story.scenes['Left'].voice('en'), 'left_en.ogg')
+        self.assertEqual(story.audio_files(), ['theme.ogg', 'left.ogg', 'left_en.ogg'])
+        self.assertEqual(scene.layers(), (('a.jpg', None, None), ('anna.png', 0.3, 1.0), ('rain.png', None, None)))
+        self.assertIsNone(scene.animation)
+        self.assertEqual(story.scenes['Right'].animation.key(), (('waves.png',), 8.0, 4, 2, 8, True))
+        self.assertEqual(story.frames, {'waves.png': None})
+        self.assertEqual([effect.key() for effect in story.scenes['Right'].effects], [('snow', 1500), ('dust', 500)])
+        self.assertEqual(scene.effects, [])
+        story.validatePathing()
+
+    def test_load_csv(self):
+        path = self.write('story.csv', [
+            'type,name,text,image,to',
+            'scene,Start,"Hello, world!\\nBye",a.jpg,',
+            'choice,Start,Go,,End',
+            'scene,End,Fim?,b.jpg,',
+        ])
+        story = load_story(path)
+        self.assertEqual(story.scenes['Start'].character_text, 'Hello, world!\nBye')
+        self.assertEqual(story.scenes['Start'].choices[0].go_to_scene, 'End')
+        self.assertEqual(list(story.scenes), ['Start', 'End'])
+
+    def test_resident_scenes_and_cache(self):
+        records = []
+        for number in range(20):
+            records.append({'type': 'scene', 'name': str(number), 'text': f'Scene {number}', 'image': 'a.jpg'})
+            if number < 19:
+                records.append({'type': 'choice', 'name': str(number), 'text': 'Next', 'to': str(number + 1)})
+        story = load_story(self.write_jsonl(records), radius=2, cache_size=3)
+        story.focus('5')
+        self.assertEqual(set(story.scenes.resident), {'5', '6', '7'})
+        for number in range(10, 20):
+            story.scenes[str(number)]
+        self.assertEqual(len(story.scenes.cache), 3)
+        self.assertIs(story.scenes['6'], story.scenes.resident['6'])
+
+    def test_undefined_scene(self):
+        path = self.write_jsonl([
+            {'type': 'scene', 'name': 'Start', 'text': '', 'image': 'a.jpg'},
+            {'type': 'choice', 'name': 'Start', 'text': 'Go', 'to': 'Nowhere'},
+        ])
+        with self.assertRaises(ValueError):
+            load_story(path).validatePathing()
+
+    def test_errors_have_line_numbers(self):
+        path = self.write_jsonl([{'type': 'scene', 'name': 'Start', 'text': '', 'image': 'a.jpg'}, {'type': 'choice', 'name': 'Other', 'to': 'Start'}])
+        with self.assertRaisesRegex(ValueError, 'Line 2'):
+            load_story(path)
+        path = self.write_jsonl([{'type': 'scene', 'name': 'Start', 'text': '', 'image': 'a.jpg'}, {'type': 'choice', 'name': 'Start', 'to': 'Start', 'if': 'gold > 1'}])
+        with self.assertRaisesRegex(ValueError, 'Line 2'):
+            load_story(path)
+        path = self.write_jsonl([{'type': 'scene', 'name': 'Start', 'text': '', 'image': 'a.jpg', 'animation': {'frames': [], 'fps': 12}}])
+        with self.assertRaisesRegex(ValueError, 'Line 1'):
+            load_story(path)
+        path = self.write_jsonl([{'type': 'scene', 'name': 'Start', 'text': '', 'image': 'a.jpg', 'effects': [['fog', 100]]}])
+        with self.assertRaisesRegex(ValueError, 'Line 1'):
+            load_story(path)
+
+    def test_variables_and_conditions(self):
+        path = self.write_jsonl([
+            {'type': 'story', 'variables': {'gold': 5}},
+            {'type': 'scene', 'name': 'Start', 'text': '', 'image': 'a.jpg'},
+            {'type': 'scene', 'name': 'Shop', 'text': '', 'image': 'a.jpg'},
+            {'type': 'choice', 'name': 'Shop', 'text': 'Back', 'to': 'Start'},
+            {'type': 'choice', 'name': 'Start', 'text': 'Buy', 'to': 'Shop', 'if': 'gold >= 10', 'set': 'gold -= 10'},
+            {'type': 'choice', 'name': 'Start', 'text': 'Work', 'to': 'Start', 'set': 'gold += 5'},
+        ])
+        story = load_story(path)
+        self.assertEqual(story.variables, {'gold': 5})
+        graph = story.graph()
+        self.assertEqual(list(graph.targets), [1, 0, 0])
+        self.assertEqual(sorted(graph.conditions), [0])
+        self.assertEqual(sorted(graph.effects), [0, 1])
+        self.assertEqual(story.scenes['Start'].choices[0].condition, 'gold >= 10')
+        # the scenes use the conditions and effects compiled by the index
+        self.assertIs(story.scenes['Start'].choices[0].predicate, graph.conditions[0])
+        self.assertIs(story.scenes['Start'].choices[1].effect, graph.effects[1])
+        self.assertIsNone(story.scenes['Start'].choices[1].predicate)
+        self.assertEqual(story.scenes['Start'].choices[1].effects, 'gold += 5')
+        story.close()
+
+        path = self.write('story.csv', ['type,name,text,image,to,if,set,variables', 'story,,,,,,,"gold=5, has_key"',
+                                        'scene,Start,Hi,a.jpg,,,,', 'choice,Start,Buy,,Start,gold >= 5,has_key = 1,'])
+        story = load_story(path)
+        self.assertEqual(story.variables, {'gold': 5, 'has_key': 0})
+        self.assertEqual(story.scenes['Start'].choices[0].effects, 'has_key = 1')
+        story.close()
+
+    def test_close(self):
+        path = self.write_jsonl([{'type': 'scene', 'name': 'Start', 'text': 'Hi', 'image': 'a.jpg'},
+                                 {'type': 'scene', 'name': 'End', 'text': 'Bye', 'image': 'a.jpg'}])
+        with load_story(path, cache_size=0) as story:
+            self.assertEqual(story.scenes['Start'].character_text, 'Hi')
+            file = story.file
+            self.assertFalse(file.closed)
+        self.assertTrue(file.closed)
+        self.assertIsNone(story.file)
+        # a closed story opens its file again to read a scene
+        self.assertEqual(story.scenes['End'].character_text, 'Bye')
+        story.close()
+        story.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import hashlib
+import os
+import tempfile
+import unittest
+import pygame
+from vnengine.pack import AssetPack, asset_digest, asset_exists, build_pack, mount, open_asset, unmount
+
+class TestAssetPack(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.assets = os.path.join(self.folder.name, 'assets')
+        os.makedirs(os.path.join(self.assets, 'sprites'))
+        with open(os.path.join(self.assets, 'story.txt'), 'wb') as file:
+            file.write(b'hello pack')
+        image = pygame.Surface((4, 3))
+        image.fill((255, 0, 0))
+        pygame.image.save(image, os.path.join(self.assets, 'sprites', 'red.png'))
+        self.path = os.path.join(self.folder.name, 'assets.pack')
+        self.assertEqual(build_pack(self.assets, self.path), 2)
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_read_and_open(self):
+        pack = AssetPack(self.path)
+        try:
+            self.assertEqual(pack.names, ['assets/story.txt', 'assets/sprites/red.png'])
+            self.assertIn('./assets/story.txt', pack)
+            self.assertEqual(bytes(pack.read('assets/story.txt')), b'hello pack')
+            with pack.open('assets/story.txt') as file:
+                self.assertEqual(file.read(5), b'hello')
+                file.seek(-4, os.SEEK_END)
+                self.assertEqual(file.read(), b'pack')
+            with pack.open('assets/sprites/red.png') as file:
+                image = pygame.image.load(file, 'red.png')
+            self.assertEqual(image.get_size(), (4, 3))
+            self.assertEqual(image.get_at((0, 0))[:3], (255, 0, 0))
+            self.assertEqual(pack.verify(), [])
+            with self.assertRaises(KeyError):
+                pack.read('assets/missing.txt')
+        finally:
+            pack.close()
+
+    def test_verify_detects_corruption(self):
+        with open(self.path, 'r+b') as file:
+            file.seek(-1, os.SEEK_END)
+            file.write(b'\x00')
+        pack = AssetPack(self.path)
+        try:
+            self.assertEqual(pack.verify(), ['assets/sprites/red.png'])
+        finally:
+            pack.close()
+
+    def test_invalid_pack(self):
+        with self.assertRaises(ValueError):
+            AssetPack(os.path.join(self.assets, 'story.txt'))
+
+    def test_mount(self):
+        cwd = os.getcwd()
+        os.chdir(self.folder.name)
+        pack = mount(self.path)
+        try:
+            os.rename('assets', 'moved')
+            self.assertTrue(asset_exists('assets/story.txt'))
+            self.assertFalse(asset_exists('assets/missing.txt'))
+            with open_asset('assets/story.txt') as file:
+                self.assertEqual(file.read(), b'hello pack')
+            with open_asset('moved/story.txt') as file:
+                self.assertEqual(file.read(), b'hello pack')
+        finally:
+            unmount(pack)
+            pack.close()
+            os.chdir(cwd)
+        self.assertFalse(asset_exists(os.path.join(self.folder.name, 'assets/story.txt')))
+
+    def test_asset_digest(self):
+        expected = hashlib.sha256(b'hello pack').digest()
+        self.assertEqual(asset_digest(os.path.join(self.assets, 'story.txt')), expected)
+        cwd = os.getcwd()
+        os.chdir(self.folder.name)
+        pack = mount(self.path)
+        try:
+            os.rename('assets', 'moved')
+            # read from the index of the pack, the file is gone
+            self.assertEqual(asset_digest('assets/story.txt'), expected)
+        finally:
+            unmount(pack)
+            pack.close()
+            os.chdir(cwd)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+import unittest
+from vnengine.parser import StoryParseError, parse_story, read_story
+from vnengine.story import Story
+
+SOURCE = """# a small story
+background assets/menu.jpg
+music assets/menu.ogg
+character Anna happy assets/anna happy.png
+languages pt, en
+language en
+resolution fullhd
+font assets/font.ttf
+font de assets/font de.ttf
+analytics stats/analytics.db
+memory 1536 low
+
+scene Start
+    image assets/01.jpg
+    text Hello!
+    text The cat starts to run.
+    music assets/theme.ogg
+    voice assets/start.ogg
+    voice en assets/start_en.ogg
+    sprite Anna happy 0.3
+    overlay assets/rain.png
+    choice Go left -> Left
+    choice Go -> right -> Right
+
+scene Left
+    image assets/02.jpg
+    text Left
+    music none
+    animation once 8 assets/waves.png 4x2 6
+    effect rain
+    effect dust 500
+
+scene Right
+    image assets/03.jpg
+    animation 12 assets/f1.png assets/f2.png
+"""
+
+class TestParser(unittest.TestCase):
+    def test_parse(self):
+        story = parse_story(SOURCE)
+        self.assertIsInstance(story, Story)
+        self.assertEqual(story.starting_background, 'assets/menu.jpg')
+        self.assertEqual(story.languages, ['pt', 'en'])
+        self.assertEqual(story.language, 'en')
+        self.assertEqual(story.resolution, 'fullhd')
+        self.assertEqual(story.fonts, {None: 'assets/font.ttf', 'de': 'assets/font de.ttf'})
+        self.assertEqual(story.analytics, 'stats/analytics.db')
+        self.assertEqual((story.memory_budget, story.low_memory), (1536 * 1024 * 1024, True))
+        self.assertEqual(story.scenes_names, ['Start', 'Left', 'Right'])
+        self.assertEqual(story.scenes['Start'].character_text, 'Hello!\nThe cat starts to run.')
+        self.assertEqual([(choice.choice_text, choice.go_to_scene) for choice in story.scenes['Start'].choices], [('Go left', 'Left'), ('Go -> right', 'Right')])
+        self.assertEqual(story.scenes['Right'].character_text, '')
+        self.assertEqual(story.starting_music, 'assets/menu.ogg')
+        self.assertEqual(story.scenes['Start'].music, 'assets/theme.ogg')
+        self.assertEqual(story.scenes['Start'].voices, {None: 'assets/start.ogg', 'en': 'assets/start_en.ogg'})
+        self.assertEqual(story.scenes['Left'].music, '')
+        self.assertIsNone(story.scenes['Right'].music)
+        self.assertEqual(story.characters, {'Anna': {'happy': 'assets/anna happy.png'}})
+        self.assertEqual(story.scenes['Start'].sprites, [('assets/anna happy.png', 0.3, 1.0)])
+        self.assertEqual(story.scenes['Start'].overlays, ['assets/rain.png'])
+        self.assertIsNone(story.scenes['Start'].animation)
+        self.assertEqual(story.scenes['Left'].animation.key(), (('assets/waves.png',), 8.0, 4, 2, 6, False))
+        self.assertEqual(story.scenes['Right'].animation.key(), (('assets/f1.png', 'assets/f2.png'), 12.0, 1, 1, 2, True))
+        self.assertEqual([effect.key() for effect in story.scenes['Left'].effects], [('rain', 4000), ('dust', 500)])
+        self.assertEqual(story.scenes['Start'].effects, [])
+
+    def test_overrides(self):
+        story = parse_story(SOURCE, language='pt', languages=['pt', 'es'], resolution='4k', display_mode='windowed')
+        self.assertEqual(story.language, 'pt')
+        self.assertEqual(story.languages, ['pt', 'es'])
+        self.assertEqual(story.resolution, '4k')
+        self.assertEqual(story.display_mode, 'windowed')
+
+    def assertParseError(self, source, line):
+        with self.assertRaises(StoryParseError) as context:
+            parse_story(source, 'story.vn')
+        self.assertEqual(context.exception.line, line)
+        self.assertIn(f'story.vn, line {line}', str(context.exception))
+
+    def test_errors_with_line_numbers(self):
+        self.assertParseError("scene A\n    image a.jpg\n    choice Go -> B\n", 3)
+        self.assertParseError("scene A\n    text no image\n", 1)
+        self.assertParseError("scene A\n    image a.jpg\n\nscene A\n    image b.jpg\n", 4)
+        self.assertParseError("resolution 8k\n", 1)
+        self.assertParseError("    image a.jpg\n", 1)
+        self.assertParseError("scene A\n    image a.jpg\n    sound a.ogg\n", 3)
+        self.assertParseError("scene A\n    image a.jpg\n    choice Go\n", 3)
+        self.assertParseError("# nothing\n", 1)
+        self.assertParseError("var gold ten\n", 1)
+        self.assertParseError("var gold 1\nscene A\n    image a.jpg\n    choice Buy -> A if silver > 1\n", 4)
+        self.assertParseError("var gold 1\nscene A\n    image a.jpg\n    choice Buy -> A if\n", 4)
+        self.assertParseError("scene A\n    image a.jpg\n    animation fast a.png\n", 3)
+        self.assertParseError("memory 2GB\n", 1)
+        self.assertParseError("scene A\n    image a.jpg\n    effect hail\n", 3)
+        self.assertParseError("scene A\n    image a.jpg\n    effect snow many\n", 3)
+        self.assertParseError("scene A\n    image a.jpg\n    effect snow 0\n", 3)
+        self.assertParseError("scene A\n    animation 12 a.png 2x2 9\n    image a.jpg\n", 2)
+
+    def test_variables_and_conditions(self):
+        story = parse_story("var gold 10\nvar has_key\n\nscene Start\n    image a.jpg\n"
+                            "    choice Buy the key -> Start if gold >= 10 and not has_key set gold -= 10; has_key = 1\n"
+                            "    choice Leave -> Start\n")
+        self.assertEqual(story.variables, {'gold': 10, 'has_key': 0})
+        buy, leave = story.scenes['Start'].choices
+        self.assertEqual((buy.choice_text, buy.go_to_scene), ('Buy the key', 'Start'))
+        self.assertEqual(buy.condition, 'gold >= 10 and not has_key')
+        self.assertEqual(buy.effects, 'gold -= 10; has_key = 1')
+        self.assertIsNone(leave.condition)
+
+    def test_read_missing_file(self):
+        with self.assertRaises(FileNotFoundError):
+            read_story('/path/to/missing.vn')
+
+if __name__ == '__main__':
+    unittest.main()
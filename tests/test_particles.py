@@ -0,0 +1,88 @@
+import os
+import unittest
+import numpy as np
+import pygame
+from vnengine.base.effect import _Effect
+from vnengine.utils.particles import _EffectLayer, _ParticleSystem
+
+class TestEffect(unittest.TestCase):
+    def test_default_count(self):
+        self.assertEqual(_Effect('rain').key(), ('rain', 4000))
+        self.assertEqual(_Effect('dust', 10).key(), ('dust', 10))
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            _Effect('hail')
+        with self.assertRaises(ValueError):
+            _Effect('snow', 0)
+
+class TestParticles(unittest.TestCase):
+    def setUp(self):
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        pygame.init()
+
+    def tearDown(self):
+        pygame.quit()
+
+    def test_same_seed_same_particles(self):
+        first = _ParticleSystem(_Effect('snow', 100), (320, 180), seed=3)
+        second = _ParticleSystem(_Effect('snow', 100), (320, 180), seed=3)
+        for _ in range(20):
+            first.update(0.05)
+            second.update(0.05)
+        np.testing.assert_array_equal(first.x, second.x)
+        np.testing.assert_array_equal(first.y, second.y)
+
+    def test_particles_stay_over_the_background(self):
+        for kind in ('rain', 'snow', 'sparkles', 'dust'):
+            system = _ParticleSystem(_Effect(kind, 500), (320, 180))
+            for _ in range(200):
+                system.update(0.1)
+            self.assertTrue(((system.x >= 0) & (system.x < 320)).all(), kind)
+            self.assertTrue(((system.y >= -system.margin) & (system.y <= 180 + system.margin)).all(), kind)
+
+    def test_draw_writes_the_color_inside_the_background(self):
+        target = pygame.Surface((400, 300))
+        rect = pygame.Rect(40, 30, 320, 180)
+        system = _ParticleSystem(_Effect('snow', 2000), rect.size)
+        system.draw(target, rect)
+        pixels = pygame.surfarray.array3d(target)
+        # nothing is drawn outside the background
+        self.assertEqual(pixels[:40].max(), 0)
+        self.assertEqual(pixels[:, :30].max(), 0)
+        self.assertEqual(pixels[360:].max(), 0)
+        colors = {tuple(color) for color in pixels[40:360, 30:210].reshape(-1, 3)}
+        # the flakes are opaque, and their border is half blended with the black background
+        self.assertIn((250, 250, 255), colors)
+        self.assertIn((125, 125, 127), colors)
+
+    def test_draw_without_32_bits(self):
+        target = pygame.Surface((320, 180), depth=16)
+        system = _ParticleSystem(_Effect('rain', 500), (320, 180))
+        system.draw(target, target.get_rect())
+        self.assertGreater(pygame.surfarray.array3d(target).max(), 0)
+
+    def test_layer_moves_by_the_time_between_frames(self):
+        layer = _EffectLayer([_Effect('rain', 50), _Effect('dust', 50)], (320, 180))
+        target = pygame.Surface((320, 180))
+        self.assertEqual(layer.key(), (('rain', 50), ('dust', 50), (320, 180)))
+        layer.draw(target, target.get_rect(), 1000)
+        self.assertEqual(layer.systems[0].time, 0.0)
+        layer.draw(target, target.get_rect(), 1050)
+        self.assertAlmostEqual(layer.systems[0].time, 0.05)
+        # a long pause counts as a single short frame
+        layer.draw(target, target.get_rect(), 60000)
+        self.assertAlmostEqual(layer.systems[0].time, 0.15)
+
+    def test_tens_of_thousands_of_particles_at_fullhd(self):
+        target = pygame.Surface((1920, 1080))
+        layer = _EffectLayer([_Effect('rain', 20000), _Effect('snow', 10000)], (1920, 1080))
+        for frame in range(31):
+            layer.draw(target, target.get_rect(), frame * 16)
+        self.assertAlmostEqual(layer.systems[0].time, 0.48)
+        colors = {tuple(color) for color in pygame.surfarray.array3d(target)[::7, ::7].reshape(-1, 3)}
+        self.assertIn((175, 195, 235), colors)
+        self.assertIn((250, 250, 255), colors)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,173 @@
+import json
+import os
+import tempfile
+import unittest
+from vnengine.runtime import CompiledStory, SeenScenes, StoryRuntime
+from vnengine.story import Story
+
+class TestStoryRuntime(unittest.TestCase):
+    def setUp(self):
+        self.story = Story()
+        self.story.add_scene('Start', 'Hello!', '/path/to/start.jpg')
+        self.story.add_scene('Left', 'Left', '/path/to/left.jpg')
+        self.story.add_scene('Right', 'Right', '/path/to/right.jpg')
+        self.story.add_choice('Start', 'Go left', 'Left')
+        self.story.add_choice('Start', 'Go right', 'Right')
+        self.story.add_choice('Left', 'Back to start', 'Start')
+        self.runtime = StoryRuntime(self.story)
+
+    def test_initial_state(self):
+        self.assertEqual(self.runtime.current, 0)
+        self.assertEqual(self.runtime.current_scene, 'Start')
+        self.assertEqual(self.runtime.scene.character_text, 'Hello!')
+        self.assertEqual(self.runtime.choices, ['Go left', 'Go right'])
+        self.assertFalse(self.runtime.is_ending)
+
+    def test_choose_and_back(self):
+        self.assertEqual(self.runtime.choose(1), 'Right')
+        self.assertTrue(self.runtime.is_ending)
+        self.assertTrue(self.runtime.back())
+        self.assertEqual(self.runtime.current_scene, 'Start')
+        self.assertFalse(self.runtime.back())
+        with self.assertRaises(IndexError):
+            self.runtime.choose(2)
+
+    def test_snapshot_and_restore(self):
+        self.runtime.choose(0)
+        self.runtime.choose(0)
+        snapshot = self.runtime.snapshot()
+        self.assertEqual(snapshot, (0, 1, 0))
+        other = StoryRuntime(self.runtime.compiled)
+        other.restore(snapshot)
+        self.assertEqual(other.current_scene, 'Start')
+        self.assertEqual(other.snapshot(), snapshot)
+        with self.assertRaises(ValueError):
+            other.restore([0, 7])
+        with self.assertRaises(ValueError):
+            other.restore([])
+
+    def test_shared_compiled_story(self):
+        compiled = CompiledStory(self.story)
+        runtimes = [StoryRuntime(compiled) for _ in range(1000)]
+        for idx, runtime in enumerate(runtimes):
+            runtime.choose(idx % 2)
+        self.assertTrue(all(runtime.compiled is compiled for runtime in runtimes))
+        self.assertEqual(runtimes[0].current_scene, 'Left')
+        self.assertEqual(runtimes[1].current_scene, 'Right')
+        self.assertFalse(hasattr(runtimes[0], '__dict__'))
+
+class TestVariables(unittest.TestCase):
+    def setUp(self):
+        self.story = Story()
+        self.story.add_variable('gold', 5)
+        self.story.add_variable('has_key')
+        self.story.add_scene('Hall', 'A locked door.', '/path/to/hall.jpg')
+        self.story.add_scene('Shop', 'A key for 10 gold.', '/path/to/shop.jpg')
+        self.story.add_scene('Room', 'The door opens.', '/path/to/room.jpg')
+        self.story.add_choice('Hall', 'Work', 'Hall', None, 'gold += 5')
+        self.story.add_choice('Hall', 'Buy the key', 'Shop', 'gold >= 10 and not has_key', 'gold -= 10; has_key = 1')
+        self.story.add_choice('Hall', 'Open the door', 'Room', 'has_key')
+        self.story.add_choice('Hall', 'Force the door', 'Room', 'not has_key and gold < 10')
+        self.story.add_choice('Shop', 'Back', 'Hall')
+        self.runtime = StoryRuntime(self.story)
+
+    def test_guarded_choices(self):
+        self.assertEqual(self.runtime.choices, ['Work', 'Force the door'])
+        self.assertEqual(self.runtime.available(), [0, 3])
+        self.runtime.choose(0)
+        self.assertEqual(self.runtime.values(), {'gold': 10, 'has_key': 0})
+        self.assertEqual(self.runtime.choices, ['Work', 'Buy the key'])
+        self.assertEqual(self.runtime.choose(1), 'Shop')
+        self.assertEqual(self.runtime.values(), {'gold': 0, 'has_key': 1})
+        self.runtime.choose(0)
+        self.assertEqual(self.runtime.choices, ['Work', 'Open the door'])
+        self.assertEqual(self.runtime.choose(1), 'Room')
+        self.assertTrue(self.runtime.is_ending)
+        with self.assertRaises(IndexError):
+            self.runtime.choose(0)
+
+    def test_back_undoes_effects(self):
+        self.runtime.choose(0)
+        self.runtime.choose(1)
+        self.runtime.choose(0)
+        self.assertTrue(self.runtime.back())
+        self.assertEqual(self.runtime.values(), {'gold': 0, 'has_key': 1})
+        self.assertTrue(self.runtime.back())
+        self.assertEqual(self.runtime.values(), {'gold': 10, 'has_key': 0})
+        self.assertTrue(self.runtime.back())
+        self.assertEqual(self.runtime.values(), {'gold': 5, 'has_key': 0})
+        self.runtime.choose(0)
+        self.runtime.start()
+        self.assertEqual(self.runtime.values(), {'gold': 5, 'has_key': 0})
+
+    def test_state(self):
+        self.runtime.choose(0)
+        self.runtime.choose(1)
+        state = json.loads(json.dumps(self.runtime.state()))
+        self.assertEqual(state['history'], [0, 0, 1])
+        self.assertEqual(state['variables'], {'gold': 0, 'has_key': 1})
+        other = StoryRuntime(self.runtime.compiled)
+        other.load_state(state)
+        self.assertEqual(other.values(), self.runtime.values())
+        other.back()
+        self.assertEqual(other.values(), {'gold': 10, 'has_key': 0})
+        # variables missing in the state keep their initial values
+        other.load_state({'history': [0], 'variables': {'gold': 7}})
+        self.assertEqual(other.values(), {'gold': 7, 'has_key': 0})
+        for invalid in ({'history': [0], 'variables': {'gold': 'a'}}, {'history': [0], 'undo': [[5, {}]]}, {'history': [9]},
+                        {'history': [0, 2 ** 40]}):
+            with self.assertRaises(ValueError):
+                other.load_state(invalid)
+            # a state that doesn't load leaves the game as it was
+            self.assertEqual(other.state(), {'history': [0], 'variables': {'gold': 7, 'has_key': 0}, 'undo': []})
+
+    def test_division_by_zero_gives_zero(self):
+        story = Story()
+        story.add_variable('gold', 10)
+        story.add_variable('g')
+        story.add_scene('Start', 'Hello!', '/path/to/start.jpg')
+        story.add_choice('Start', 'Split', 'Start', '10 // g > 2 or gold % g == 0', 'gold //= g; g = gold % g')
+        story.add_choice('Start', 'Wait', 'Start', '10 // g == 0')
+        runtime = StoryRuntime(story)
+        self.assertEqual(runtime.available(), [0, 1])
+        self.assertFalse(runtime.is_ending)
+        runtime.choose(0)
+        self.assertEqual(runtime.values(), {'gold': 0, 'g': 0})
+
+    def test_many_conditional_choices(self):
+        story = Story()
+        story.add_variable('level', 250)
+        story.add_scene('Start', 'Many choices.', '/path/to/start.jpg')
+        for number in range(500):
+            story.add_choice('Start', f'Choice {number}', 'Start', f'level >= {number} and level % 2 == 0')
+        runtime = StoryRuntime(story)
+        self.assertEqual(runtime.available(), list(range(251)))
+
+class TestSeenScenes(unittest.TestCase):
+    def test_add_and_contains(self):
+        seen = SeenScenes(20)
+        self.assertTrue(seen.add(0))
+        self.assertTrue(seen.add(19))
+        self.assertFalse(seen.add(19))
+        self.assertIn(19, seen)
+        self.assertNotIn(18, seen)
+        self.assertNotIn(20, seen)
+        self.assertEqual(len(seen), 2)
+        self.assertEqual(len(seen.to_bytes()), 3)
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'seen.dat')
+            self.assertEqual(len(SeenScenes.load(path, 10)), 0)
+            seen = SeenScenes(10)
+            seen.add(3)
+            seen.add(9)
+            seen.save(path)
+            # scenes removed from the story are dropped
+            self.assertEqual(len(SeenScenes.load(path, 9)), 1)
+            loaded = SeenScenes.load(path, 100)
+            self.assertIn(9, loaded)
+            self.assertEqual(len(loaded), 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import os
+import tempfile
+import unittest
+import pygame
+from vnengine.utils.saves import _SaveSlots, _thumbnail
+
+class TestSaveSlots(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        self.folder = tempfile.TemporaryDirectory()
+        self.saves = os.path.join(self.folder.name, 'saves')
+        self.slots = _SaveSlots(self.saves, count=3, size=(32, 18))
+        self.screen = pygame.Surface((1280, 720))
+        self.screen.fill((255, 0, 0))
+        self.state = {'history': [0, 2], 'variables': {'gold': 5}, 'undo': [[1, {'gold': 0}]]}
+
+    def tearDown(self):
+        self.slots.close()
+        pygame.quit()
+        self.folder.cleanup()
+
+    def assertColor(self, color, expected):
+        for channel, value in zip(color[:3], expected):
+            self.assertAlmostEqual(channel, value, delta=3)
+
+    def test_thumbnail_keeps_proportions(self):
+        self.assertEqual(_thumbnail(pygame.Surface((400, 300)), (32, 18)).get_size(), (24, 18))
+        self.assertEqual(_thumbnail(pygame.Surface((400, 300), depth=8), (40, 40)).get_size(), (40, 30))
+
+    def test_save_and_load(self):
+        self.assertIsNone(self.slots.info(1))
+        with self.assertRaises(ValueError):
+            self.slots.load(1)
+        self.slots.save(1, self.state, self.screen, 'Start')
+        # the slot is shown at once, the screen drawn after the save is not in the thumbnail
+        self.assertEqual(self.slots.info(1)['scene'], 'Start')
+        self.screen.fill((0, 0, 255))
+        self.assertEqual(self.slots.load(1), self.state)
+        self.assertEqual(sorted(os.listdir(self.saves)), ['slot2.json', 'slot2.png'])
+        thumbnail = self.slots.thumbnail(1)
+        self.assertEqual(thumbnail.get_size(), (32, 18))
+        # smoothing may round the color down by a few units
+        self.assertColor(thumbnail.get_at((16, 9)), (255, 0, 0))
+
+    def test_damaged_slots(self):
+        os.makedirs(self.saves, exist_ok=True)
+        for slot, text in ((0, '{"scene": "Start", "ti'), (1, '{"scene": "Start", "state": {}}')):
+            with open(self.slots.path(slot), 'w') as file:
+                file.write(text)
+            self.assertEqual(self.slots.info(slot), {'scene': None, 'time': None, 'status': 'damaged'})
+            with self.assertRaises(ValueError):
+                self.slots.load(slot)
+        self.assertEqual(self.slots.version(0)[1], 'damaged')
+        # a damaged slot can be saved over
+        self.slots.save(0, self.state, self.screen, 'Start')
+        self.assertEqual(self.slots.info(0)['status'], 'ok')
+        self.assertEqual(self.slots.load(0), self.state)
+        self.slots.mark(0, 'incompatible')
+        self.assertEqual(self.slots.info(0)['scene'], 'Start')
+        self.assertEqual(self.slots.info(0)['status'], 'incompatible')
+
+    def test_thumbnails_are_read_when_requested(self):
+        self.slots.save(0, self.state, self.screen, 'Start')
+        self.slots.close()
+        slots = _SaveSlots(self.saves, count=3, size=(32, 18))
+        self.addCleanup(slots.close)
+        version = slots.version(0)
+        self.assertIsNone(version[2])
+        slots.wait()
+        self.assertEqual(slots.thumbnail(0).get_size(), (32, 18))
+        self.assertNotEqual(slots.version(0), version)
+        # empty slots have no thumbnail
+        slots.thumbnail(2)
+        slots.wait()
+        self.assertIsNone(slots.thumbnail(2))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -10,7 +10,7 @@ class TestScene(unittest.TestCase):
         self.assertEqual(scene.character_text, character_text)
         self.assertEqual(scene.background_display_img, image)
         self.assertEqual(scene.scene_number, scene_number)
-        self.assertEqual(scene.choices, {})
+        self.assertEqual(scene.choices, [])
 
     def test_add_choice(self):
         character_text = "Hello, world!"
@@ -23,8 +23,16 @@ class TestScene(unittest.TestCase):
         scene.add_choice(choice_text, go_to_scene)
 
         self.assertEqual(len(scene.choices), 1)
-        self.assertIn(go_to_scene, scene.choices)
-        self.assertEqual(scene.choices[go_to_scene].choice_text, choice_text)
+        self.assertEqual(scene.choices[0].go_to_scene, go_to_scene)
+        self.assertEqual(scene.choices[0].choice_text, choice_text)
+
+    def test_choices_to_the_same_scene(self):
+        scene = _Scene("Hello, world!", "/path/to/test.jpg", 0)
+        scene.add_choice("Pay", "Shop", "gold >= 10", "gold -= 10", {'gold': 0})
+        scene.add_choice("Steal", "Shop")
+        self.assertEqual([(choice.choice_text, choice.go_to_scene) for choice in scene.choices], [("Pay", "Shop"), ("Steal", "Shop")])
+        self.assertEqual(scene.choices[0].condition, "gold >= 10")
+        self.assertIsNone(scene.choices[1].predicate)
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,123 @@
+import unittest
+from vnengine.script import _Scheduler, move, say, shake, sound, spawn, wait
+
+SPRITES = [('alice.png', 0.25, 1.0), ('bob.png', 0.75, 1.0)]
+
+def entrance():
+    yield say('Hello!', 1.0)
+    yield sound('door.ogg')
+    yield move(0, 0.5, 1.0, 2.0)
+    yield say('Bye!')
+    yield shake(0.5)
+
+class TestScheduler(unittest.TestCase):
+    def scheduler(self, script, sounds=None):
+        return _Scheduler(script, SPRITES, sounds.append if sounds is not None else None)
+
+    def test_actions_run_in_time(self):
+        sounds = []
+        scheduler = self.scheduler(entrance, sounds)
+        self.assertEqual(scheduler.text, 'Hello!')
+        scheduler.update(0.5)
+        self.assertEqual(sounds, [])
+        scheduler.update(2.0)
+        self.assertEqual(sounds, ['door.ogg'])
+        self.assertEqual(scheduler.position(0), (0.375, 1.0))
+        self.assertIsNone(scheduler.position(1))
+        scheduler.update(3.2)
+        self.assertEqual(scheduler.text, 'Bye!')
+        self.assertTrue(scheduler.done)
+        # the shake started when the move ended, at 3 seconds, not at the time of the frame
+        self.assertTrue(scheduler.active)
+        self.assertNotEqual(scheduler.offset(1000), (0, 0))
+        scheduler.update(3.5)
+        self.assertFalse(scheduler.active)
+        self.assertEqual(scheduler.offset(1000), (0, 0))
+
+    def test_layers(self):
+        scheduler = self.scheduler(entrance)
+        layers = (('bg.png', None, None), ('alice.png', 0.25, 1.0), ('bob.png', 0.75, 1.0))
+        self.assertIs(scheduler.layers(layers), layers)
+        scheduler.update(3.0)
+        self.assertEqual(scheduler.layers(layers), (('bg.png', None, None), ('alice.png', 0.5, 1.0), ('bob.png', 0.75, 1.0)))
+
+    def test_spawn_runs_scripts_together(self):
+        def walk(sprite, x):
+            yield move(sprite, x, 1.0, 1.0)
+        def both():
+            yield spawn(walk(0, 0.0))
+            yield spawn(walk(1, 1.0))
+            yield wait(1.0)
+            yield say('Done')
+        scheduler = self.scheduler(both)
+        scheduler.update(0.5)
+        self.assertEqual(scheduler.position(0), (0.125, 1.0))
+        self.assertEqual(scheduler.position(1), (0.875, 1.0))
+        scheduler.update(1.0)
+        self.assertEqual(scheduler.text, 'Done')
+
+    def test_skip(self):
+        sounds = []
+        scheduler = self.scheduler(entrance, sounds)
+        scheduler.skip()
+        self.assertTrue(scheduler.done)
+        self.assertFalse(scheduler.active)
+        self.assertEqual(scheduler.text, 'Bye!')
+        self.assertEqual(scheduler.position(0), (0.5, 1.0))
+        self.assertEqual(sounds, [])
+
+    def test_skip_stops_scripts_that_never_end(self):
+        def forever():
+            while True:
+                yield shake(1.0, wait=True)
+        scheduler = self.scheduler(forever)
+        scheduler.skip(limit=100)
+        self.assertTrue(scheduler.done)
+
+    def test_state_restores_the_same_script(self):
+        sounds = []
+        played = self.scheduler(entrance, sounds)
+        played.update(2.0)
+        restored = self.scheduler(entrance, sounds)
+        restored.restore(played.state())
+        # the sound played before the save is not played again
+        self.assertEqual(sounds, ['door.ogg'])
+        self.assertEqual((restored.text, restored.position(0), restored.time), (played.text, played.position(0), played.time))
+        with self.assertRaises(ValueError):
+            restored.restore({})
+
+    def test_invalid_scripts(self):
+        def not_an_action():
+            yield 1
+        with self.assertRaises(ValueError):
+            self.scheduler(not_an_action)
+        def missing_sprite():
+            yield move(2, 0.5, 1.0)
+        with self.assertRaises(ValueError):
+            self.scheduler(missing_sprite)
+        def never_waits():
+            while True:
+                yield say('again')
+        with self.assertRaises(ValueError):
+            self.scheduler(never_waits)
+        with self.assertRaises(ValueError):
+            wait(-1)
+
+    def test_many_waiting_scripts(self):
+        ticks = []
+        def tick(index):
+            yield wait((index + 1) / 1000)
+            ticks.append(index)
+        def crowd():
+            for index in reversed(range(20000)):
+                yield spawn(tick(index))
+        scheduler = self.scheduler(crowd)
+        self.assertEqual(len(scheduler.heap), 20000)
+        for frame in range(1, 61):
+            scheduler.update(frame / 60 * 20)
+        # the scripts resumed in the order of their times, not of their creation
+        self.assertEqual(ticks, list(range(20000)))
+        self.assertTrue(scheduler.done)
+
+if __name__ == '__main__':
+    unittest.main()
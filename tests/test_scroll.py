@@ -0,0 +1,61 @@
+import unittest
+import pygame
+from vnengine.utils.scroll import _ScrollList
+
+class TestScrollList(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        self.screen = pygame.Surface((200, 200))
+        self.rendered = []
+        self.list = _ScrollList(pygame.Rect(0, 50, 200, 100), 20, 10000, self.render)
+
+    def tearDown(self):
+        pygame.quit()
+
+    def render(self, index, hovered):
+        self.rendered.append((index, hovered))
+        surface = pygame.Surface((100, 10))
+        surface.fill((255, 0, 0) if hovered else (0, 255, 0))
+        return surface
+
+    def test_only_visible_rows_are_rendered(self):
+        self.list.draw(self.screen)
+        self.assertEqual(self.list.visible(), range(0, 5))
+        self.assertEqual(self.rendered, [(index, False) for index in range(5)])
+        self.list.scroll_to_end()
+        self.list.draw(self.screen)
+        self.assertEqual(self.list.visible(), range(9995, 10000))
+        self.assertEqual(len(self.rendered), 10)
+        # rows already rendered come from the cache
+        self.list.draw(self.screen)
+        self.assertEqual(len(self.rendered), 10)
+
+    def test_scroll_bounds(self):
+        self.list.scroll(-50)
+        self.assertEqual(self.list.offset, 0)
+        self.list.scroll(10 ** 9)
+        self.assertEqual(self.list.offset, 10000 * 20 - 100)
+        self.list.scroll_to(3)
+        self.assertEqual(self.list.offset, 60)
+        self.list.offset = 25
+        self.assertEqual(self.list.visible(), range(1, 7))
+
+    def test_hover_and_row_at(self):
+        self.list.draw(self.screen)
+        # the second row is centered at y = 50 + 20 + 10
+        self.assertEqual(self.list.row_at((100, 80)), 1)
+        self.assertIsNone(self.list.row_at((10, 80)))
+        self.assertIsNone(self.list.row_at((100, 10)))
+        self.list.draw(self.screen, (100, 80))
+        self.assertIn((1, True), self.rendered)
+        self.assertEqual(self.screen.get_at((100, 80))[:3], (255, 0, 0))
+
+    def test_rows_are_clipped(self):
+        self.list.offset = 10
+        self.list.draw(self.screen)
+        self.assertEqual(self.screen.get_at((100, 45))[:3], (0, 0, 0))
+        with self.assertRaises(ValueError):
+            _ScrollList(pygame.Rect(0, 0, 10, 10), 5, 1, self.render, align='right')
+
+if __name__ == '__main__':
+    unittest.main()
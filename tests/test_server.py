@@ -0,0 +1,108 @@
+import asyncio
+import json
+import threading
+import unittest
+from vnengine.server import StoryServer, load_test
+from vnengine.story import Story
+
+def make_story():
+    story = Story()
+    story.add_scene('Start', 'Hello!', '/path/to/start.jpg')
+    story.add_scene('Left', 'Left', '/path/to/left.jpg')
+    story.add_scene('Right', 'Right', '/path/to/right.jpg')
+    story.add_choice('Start', 'Go left', 'Left')
+    story.add_choice('Start', 'Go right', 'Right')
+    story.add_choice('Left', 'Back to start', 'Start')
+    return story
+
+class TestStoryServer(unittest.TestCase):
+    def setUp(self):
+        self.server = StoryServer(make_story())
+
+    def test_dispatch(self):
+        owned = set()
+        state = self.server.dispatch({'op': 'new'}, owned)
+        session = state['session']
+        self.assertEqual(state['scene'], 'Start')
+        self.assertEqual(state['choices'], ['Go left', 'Go right'])
+        state = self.server.dispatch({'op': 'choose', 'session': session, 'index': 1}, owned)
+        self.assertEqual(state['scene'], 'Right')
+        self.assertTrue(state['ending'])
+        self.assertEqual(state['history'], [0, 2])
+        state = self.server.dispatch({'op': 'back', 'session': session}, owned)
+        self.assertEqual(state['scene'], 'Start')
+        self.assertFalse(self.server.dispatch({'op': 'choose', 'session': session, 'index': 5}, owned)['ok'])
+        self.assertFalse(self.server.dispatch({'op': 'state', 'session': session}, set())['ok'])
+        self.assertFalse(self.server.dispatch({'op': 'jump', 'session': session}, owned)['ok'])
+        for invalid in ([session], {'id': session}, True, None):
+            self.assertFalse(self.server.dispatch({'op': 'state', 'session': invalid}, owned)['ok'])
+        self.assertTrue(self.server.dispatch({'op': 'close', 'session': session}, owned)['ok'])
+        self.assertEqual(self.server.sessions, {})
+
+    def test_restore(self):
+        owned = set()
+        state = self.server.dispatch({'op': 'restore', 'history': [0, 1]}, owned)
+        self.assertEqual(state['scene'], 'Left')
+        self.assertFalse(self.server.dispatch({'op': 'restore', 'history': [0, 9]}, owned)['ok'])
+        self.assertFalse(self.server.dispatch({'op': 'restore', 'history': 'abc'}, owned)['ok'])
+        self.assertNotIn('variables', state)
+
+    def test_variables(self):
+        story = make_story()
+        story.add_variable('visits')
+        story.add_choice('Left', 'Back again', 'Start', 'visits > 0', 'visits += 1')
+        server = StoryServer(story)
+        owned = set()
+        state = server.dispatch({'op': 'restore', 'history': [0, 1], 'variables': {'visits': 1}}, owned)
+        self.assertEqual(state['choices'], ['Back to start', 'Back again'])
+        state = server.dispatch({'op': 'choose', 'session': state['session'], 'index': 1}, owned)
+        self.assertEqual(state['variables'], {'visits': 2})
+        self.assertEqual(state['undo'], [[2, {'visits': 1}]])
+        self.assertFalse(server.dispatch({'op': 'restore', 'history': [0], 'variables': {'visits': 'x'}}, owned)['ok'])
+
+    def test_connection(self):
+        async def main():
+            await self.server.start('127.0.0.1', 0)
+            reader, writer = await asyncio.open_connection('127.0.0.1', self.server.port)
+            writer.write(b'{"op": "new", "id": 7}\nnot json\n')
+            first = json.loads(await reader.readline())
+            second = json.loads(await reader.readline())
+            self.assertEqual(len(self.server.sessions), 1)
+            # a malformed or too long request is answered with an error, the connection and its sessions are kept
+            writer.write(b'{"op": "state", "session": [1]}\n' + b'x' * 200000 + b'\n{"op": "state", "session": %d}\n' % first['session'])
+            errors = [json.loads(await reader.readline()) for _ in range(2)]
+            third = json.loads(await reader.readline())
+            self.assertEqual([error['ok'] for error in errors], [False, False])
+            self.assertEqual(errors[1]['error'], "The request is too long.")
+            self.assertEqual(third['scene'], 'Start')
+            writer.close()
+            await writer.wait_closed()
+            await asyncio.sleep(0.05)
+            self.server.server.close()
+            await self.server.server.wait_closed()
+            return first, second
+
+        first, second = asyncio.run(main())
+        self.assertEqual(first['id'], 7)
+        self.assertEqual(first['scene'], 'Start')
+        self.assertFalse(second['ok'])
+        self.assertEqual(self.server.sessions, {})
+
+    def test_load_test(self):
+        loop = asyncio.new_event_loop()
+        loop.run_until_complete(self.server.start('127.0.0.1', 0))
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+        try:
+            result = load_test('127.0.0.1', self.server.port, sessions=50, connections=3, steps=4)
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            self.server.server.close()
+            loop.run_until_complete(self.server.server.wait_closed())
+            loop.close()
+        self.assertEqual(result['requests'], 50 * 6)
+        self.assertGreater(result['requests_per_second'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+import numpy as np
+from vnengine.simulation import simulate
+from vnengine.story import Story
+
+class TestSimulation(unittest.TestCase):
+    def setUp(self):
+        self.story = Story()
+
+    def add(self, name, *choices):
+        self.story.add_scene(name, name, f"/path/to/{name}.jpg")
+        for go_to_scene in choices:
+            self.story.scenes[name].add_choice(go_to_scene, go_to_scene)
+
+    def diamond(self):
+        self.add('start', 'a', 'b')
+        self.add('a', 'c', 'end')
+        self.add('b', 'c')
+        self.add('c', 'end')
+        self.add('end')
+
+    def test_uniform(self):
+        self.diamond()
+        result = simulate(self.story, players=100000, seed=1)
+        visits = dict(zip(result['names'], result['visits']))
+        self.assertEqual(visits['start'], 100000)
+        self.assertEqual(visits['end'], 100000)
+        self.assertAlmostEqual(visits['a'] / 100000, 0.5, delta=0.01)
+        self.assertAlmostEqual(visits['c'] / 100000, 0.75, delta=0.01)
+        self.assertEqual(result['endings'], {'end': 100000})
+        self.assertEqual(result['path_lengths'][:2].tolist(), [0, 0])
+        self.assertAlmostEqual(result['path_lengths'][2] / 100000, 0.25, delta=0.01)
+        self.assertEqual(result['unfinished'], 0)
+
+    def test_weights(self):
+        self.diamond()
+        result = simulate(self.story, players=1000, weights={'start': [1, 0]}, seed=1)
+        self.assertEqual(result['visits'].tolist()[:3], [1000, 1000, 0])
+        result = simulate(self.story, players=1000, weights=[0, 1, 1, 0, 1, 1], seed=1)
+        self.assertEqual(result['visits'].tolist(), [1000, 0, 1000, 1000, 1000])
+        result = simulate(self.story, players=1000, weights=lambda name, scene: [0] * (len(scene.choices) - 1) + [1], seed=1)
+        self.assertEqual(result['path_lengths'].tolist(), [0, 0, 0, 1000])
+        with self.assertRaises(ValueError):
+            simulate(self.story, weights={'start': [1]})
+        with self.assertRaises(ValueError):
+            simulate(self.story, weights={'start': [0, 0]})
+        with self.assertRaises(ValueError):
+            simulate(self.story, weights={'missing': [1]})
+
+    def test_cycles_and_batches(self):
+        self.add('start', 'loop', 'end')
+        self.add('loop', 'start')
+        self.add('end')
+        result = simulate(self.story, players=10001, max_steps=5, seed=2, batch_size=1000)
+        self.assertEqual(result['endings']['end'] + result['unfinished'], 10001)
+        self.assertAlmostEqual(result['unfinished'] / 10001, 0.125, delta=0.02)
+        self.assertEqual(result['path_lengths'][1::2].sum(), result['endings']['end'])
+        self.assertEqual(int(np.sum(result['visits'])), int(np.arange(result['path_lengths'].size) @ result['path_lengths'])
+                         + result['endings']['end'] + 6 * result['unfinished'])
+
+    def test_conditions_and_effects(self):
+        self.story.add_variable('gold')
+        self.story.add_variable('has_key')
+        self.add('hall')
+        self.add('door')
+        self.add('room')
+        self.story.add_choice('hall', 'Work', 'hall', None, 'gold += 5')
+        self.story.add_choice('hall', 'Buy the key', 'door', 'gold >= 10', 'gold -= 10; has_key = 1')
+        self.story.add_choice('hall', 'Leave', 'door', 'gold >= 10')
+        self.story.add_choice('door', 'Open', 'room', 'has_key')
+        result = simulate(self.story, players=30000, max_steps=100, seed=3, batch_size=7000)
+        # the players work twice, then a third of them leave without the key and end at the door, which they can't open
+        self.assertEqual(result['path_lengths'][:3].tolist(), [0, 0, 0])
+        self.assertAlmostEqual(result['path_lengths'][3] / 30000, 1 / 3, delta=0.015)
+        self.assertAlmostEqual(result['endings']['room'] / 30000, 0.5, delta=0.015)
+        self.assertEqual(result['endings']['room'] + result['endings']['door'], 30000)
+        self.assertEqual(result['unfinished'], 0)
+
+    def test_division_by_zero_gives_zero(self):
+        self.story.add_variable('gold', 10)
+        self.story.add_variable('g')
+        self.add('hall')
+        self.add('room')
+        self.add('cellar')
+        self.story.add_choice('hall', 'Split', 'room', '10 // g == 0', 'gold //= g')
+        self.story.add_choice('room', 'Down', 'cellar', 'gold % g == 0 and gold == 0')
+        result = simulate(self.story, players=100, seed=1)
+        self.assertEqual(result['endings']['cellar'], 100)
+
+if __name__ == '__main__':
+    unittest.main()
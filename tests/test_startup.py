@@ -0,0 +1,118 @@
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+import pygame
+from vnengine.story import Story
+from vnengine.utils.startup import _Startup
+
+class TestStartup(unittest.TestCase):
+    def setUp(self):
+        self.startup = _Startup()
+
+    def tearDown(self):
+        self.startup.close()
+
+    def test_progress_and_ready(self):
+        gate = threading.Event()
+        self.assertEqual(self.startup.progress, 1.0)
+        self.startup.submit('fast', lambda: 1)
+        self.startup.submit('slow', gate.wait)
+        self.startup.wait('fast')
+        self.assertEqual(self.startup.progress, 0.5)
+        self.assertTrue(self.startup.ready('fast', 'missing'))
+        self.assertFalse(self.startup.ready('fast', 'slow'))
+        gate.set()
+        self.startup.wait('slow')
+        self.assertEqual(self.startup.progress, 1.0)
+        with self.assertRaises(ValueError):
+            self.startup.submit('fast', lambda: 1)
+
+    def test_errors_reach_the_main_thread(self):
+        def broken():
+            raise ValueError('invalid story')
+        self.startup.submit('validation', broken)
+        with self.assertRaises(ValueError):
+            self.startup.wait('validation')
+        with self.assertRaises(ValueError):
+            self.startup.check()
+        with self.assertRaises(ValueError):
+            self.startup.ready('validation')
+
+    def test_marks(self):
+        clock = iter([10.0, 10.05, 10.3, 11.0])
+        startup = _Startup(clock=lambda: next(clock))
+        try:
+            self.assertAlmostEqual(startup.mark('first_frame'), 0.05)
+            self.assertAlmostEqual(startup.mark('interactive'), 0.3)
+            # only the first time counts
+            self.assertAlmostEqual(startup.mark('interactive'), 0.3)
+            self.assertEqual(startup.report(), 'Startup: first frame 50 ms, interactive 300 ms')
+            with self.assertRaises(ValueError):
+                startup.mark('menu')
+        finally:
+            startup.close()
+
+class TestProgressiveStartup(unittest.TestCase):
+    def setUp(self):
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        self.folder = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.folder.name)
+        pygame.init()
+        pygame.image.save(pygame.Surface((16, 9)), 'menu.png')
+        self.story = Story()
+        self.story.add_starting_background('menu.png')
+        self.story.set_display_mode('windowed')
+        self.story.set_languages(['pt', 'en'])
+        self.story.add_scene('Start', 'Hello!', 'menu.png')
+        self.gate = threading.Event()
+        self.translator = mock.patch('googletrans.Translator')
+        translator = self.translator.start()
+        def translate(text, src, dest):
+            self.gate.wait()
+            return mock.Mock(text=text.upper())
+        translator.return_value.translate.side_effect = translate
+
+    def tearDown(self):
+        self.gate.set()
+        self.game.startup.close()
+        self.game.slots.close()
+        self.game.gallery.close()
+        self.translator.stop()
+        pygame.quit()
+        os.chdir(self.cwd)
+        self.folder.cleanup()
+
+    def test_menu_waits_only_for_its_assets(self):
+        from vnengine.utils.game import _Game
+        self.story.set_initial_language('en')
+        self.game = _Game(self.story)
+        validation = threading.Event()
+        self.game.startup.submit('validation', validation.wait)
+        # the splash screen is drawn before any startup work is done
+        self.assertEqual(self.game.scene, 'splash')
+        self.assertIsNotNone(self.game.startup.first_frame)
+        self.game.update_startup()
+        self.assertEqual(self.game.scene, 'splash')
+        self.assertIsNone(self.game.startup.interactive)
+        # the menu is shown without waiting for the validation of the story
+        self.gate.set()
+        self.game.startup.wait('translations', 'menu background')
+        self.game.update_startup()
+        self.assertEqual(self.game.scene, 'start')
+        self.assertEqual(self.game.buttons[0].text, 'INICIAR JOGO')
+        self.assertGreaterEqual(self.game.startup.interactive, self.game.startup.first_frame)
+        self.assertFalse(self.game.startup.ready('validation'))
+        validation.set()
+
+    def test_original_language_is_not_translated(self):
+        from vnengine.utils.game import _Game
+        self.game = _Game(self.story)
+        self.game.startup.wait('translations')
+        self.assertEqual(self.game.translate('Iniciar Jogo'), 'Iniciar Jogo')
+        self.assertEqual(self.game.translator.translate.call_count, 0)
+
+if __name__ == '__main__':
+    unittest.main()
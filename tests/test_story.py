@@ -1,5 +1,6 @@
 import unittest
 from vnengine.story import Story
+from vnengine.script import wait
 
 class TestStory(unittest.TestCase):
     def setUp(self):
@@ -20,6 +21,21 @@ class TestStory(unittest.TestCase):
         self.story.set_resolution(resolution)
         self.assertEqual(self.story.resolution, resolution)
 
+    def test_set_font(self):
+        self.story.set_font("/path/to/font.ttf")
+        self.story.set_font("/path/to/font_de.ttf", 'de')
+        self.assertEqual(self.story.fonts, {None: "/path/to/font.ttf", 'de': "/path/to/font_de.ttf"})
+        with self.assertRaises(ValueError):
+            self.story.validateFonts()
+
+    def test_set_memory_budget(self):
+        self.story.set_memory_budget(2048, low_memory=True)
+        self.assertEqual((self.story.memory_budget, self.story.low_memory), (2048 * 1024 * 1024, True))
+        self.story.set_memory_budget(None)
+        self.assertIsNone(self.story.memory_budget)
+        with self.assertRaises(ValueError):
+            self.story.set_memory_budget(0)
+
     def test_add_starting_background(self):
         image = "/path/to/starting_menu.jpg"
         self.story.add_starting_background(image)
@@ -34,6 +50,12 @@ class TestStory(unittest.TestCase):
         self.assertEqual(self.story.scenes[scene_name].character_text, character_text)
         self.assertEqual(self.story.scenes[scene_name].background_display_img, image)
 
+    def test_backgrounds(self):
+        self.story.add_scene("Scene 1", "One", "a.jpg")
+        self.story.add_scene("Scene 2", "Two", "b.jpg")
+        self.story.add_scene("Scene 3", "Three", "a.jpg")
+        self.assertEqual(self.story.backgrounds(), {'a.jpg': [0, 2], 'b.jpg': [1]})
+
     def test_add_choice(self):
         current_scene_name = "Scene 1"
         choice_text = "Choose option A"
@@ -41,8 +63,21 @@ class TestStory(unittest.TestCase):
         self.story.add_scene(current_scene_name, "Hello, world!", "/path/to/scene1.jpg")
         self.story.add_scene(go_to_scene, "Hello, world!", "/path/to/scene2.jpg")
         self.story.add_choice(current_scene_name, choice_text, go_to_scene)
-        self.assertIn(go_to_scene, self.story.scenes[current_scene_name].choices)
-        self.assertEqual(self.story.scenes[current_scene_name].choices[go_to_scene].choice_text, choice_text)
+        self.assertEqual(self.story.scenes[current_scene_name].choices[0].go_to_scene, go_to_scene)
+        self.assertEqual(self.story.scenes[current_scene_name].choices[0].choice_text, choice_text)
+
+    def test_add_variable(self):
+        self.story.add_variable('gold', 10)
+        self.story.add_variable('has_key')
+        self.assertEqual(self.story.variables, {'gold': 10, 'has_key': 0})
+        self.assertEqual(self.story.slots, {'gold': 0, 'has_key': 1})
+        for name in ('2gold', 'if', 'a b'):
+            with self.assertRaises(ValueError):
+                self.story.add_variable(name)
+        self.story.add_scene("Scene 1", "Hello, world!", "/path/to/scene1.jpg")
+        self.story.add_choice("Scene 1", "Buy", "Scene 1", "gold >= 10", "gold -= 10")
+        with self.assertRaises(ValueError):
+            self.story.add_choice("Scene 1", "Steal", "Scene 1", "silver > 0")
         
     def test_validate_path(self):
         scene_name = "Scene 0"
@@ -96,6 +131,72 @@ class TestStory(unittest.TestCase):
         with self.assertRaises(Exception):
             self.story.run()
             
+    def test_add_music_and_voice(self):
+        self.story.add_scene("Scene 0", "Test!", "/path/to/scene0.jpg")
+        self.story.add_scene("Scene 1", "Test!", "/path/to/scene1.jpg")
+        self.story.add_starting_music("menu.ogg")
+        self.story.add_music("Scene 0", "theme.ogg")
+        self.story.add_music("Scene 1", None)
+        self.story.add_voice("Scene 0", "voice.ogg")
+        self.story.add_voice("Scene 0", "voice_en.ogg", "en")
+        
+        self.assertEqual(self.story.scenes["Scene 0"].music, "theme.ogg")
+        self.assertEqual(self.story.scenes["Scene 1"].music, "")
+        self.assertEqual(self.story.scenes["Scene 0"].voice("en"), "voice_en.ogg")
+        self.assertEqual(self.story.scenes["Scene 0"].voice("pt"), "voice.ogg")
+        self.assertIsNone(self.story.scenes["Scene 1"].voice("pt"))
+        self.assertEqual(self.story.audio_files(), ["menu.ogg", "theme.ogg", "voice.ogg", "voice_en.ogg"])
+        
+        with self.assertRaises(ValueError):
+            self.story.validateAudio()
+            
+    def test_add_sprites_and_overlays(self):
+        self.story.add_scene("Scene 0", "Test!", "/path/to/scene0.jpg")
+        self.story.add_character("Anna", {"happy": "anna_happy.png", "sad": "anna_sad.png"})
+        self.story.add_sprite("Scene 0", "Anna", "happy", 0.3)
+        self.story.add_overlay("Scene 0", "rain.png")
+        
+        self.assertEqual(self.story.scenes["Scene 0"].layers(), (("/path/to/scene0.jpg", None, None), ("anna_happy.png", 0.3, 1.0), ("rain.png", None, None)))
+        
+        with self.assertRaises(ValueError):
+            self.story.add_sprite("Scene 0", "Anna", "angry")
+        with self.assertRaises(ValueError):
+            self.story.add_sprite("Scene 0", "Bob", "happy")
+
+    def test_set_script(self):
+        self.story.add_scene("Scene 0", "Test!", "/path/to/scene0.jpg")
+        def script():
+            yield wait(1.0)
+        self.story.set_script("Scene 0", script)
+        self.assertIs(self.story.scenes["Scene 0"].script, script)
+        with self.assertRaises(ValueError):
+            self.story.set_script("Scene 0", script())
+
+    def test_set_animation(self):
+        self.story.add_scene("Scene 0", "Test!", "/path/to/scene0.jpg")
+        self.story.set_animation("Scene 0", "waves.png", 8, columns=4, rows=2)
+        animation = self.story.scenes["Scene 0"].animation
+        self.assertEqual((animation.frames, animation.count, animation.loop), (["waves.png"], 8, True))
+        self.assertEqual(self.story.scenes["Scene 0"].layers(), (("/path/to/scene0.jpg", None, None),))
+
+        with self.assertRaises(ValueError):
+            self.story.set_animation("Scene 0", [])
+        with self.assertRaises(ValueError):
+            self.story.set_animation("Scene 0", ["a.png"], fps=0)
+        with self.assertRaises(ValueError):
+            self.story.validateImages()
+            
+    def test_add_effect(self):
+        self.story.add_scene("Scene 0", "Test!", "/path/to/scene0.jpg")
+        self.story.add_effect("Scene 0", "snow")
+        self.story.add_effect("Scene 0", "sparkles", 20000)
+        self.assertEqual([effect.key() for effect in self.story.scenes["Scene 0"].effects], [("snow", 1500), ("sparkles", 20000)])
+
+        with self.assertRaises(ValueError):
+            self.story.add_effect("Scene 0", "hail")
+        with self.assertRaises(ValueError):
+            self.story.add_effect("Scene 0", "rain", 0)
+
     def test_language_not_defined(self):
         languages = ['de', 'es']
         self.story.set_languages(languages)
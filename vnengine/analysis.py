@@ -0,0 +1,191 @@
+from array import array
+from typing import List, Tuple
+from vnengine.base.graph import _StoryGraph
+
+__all__: List[str] = ['analyze']
+
+def _strongly_connected_components(graph: _StoryGraph) -> Tuple[array, int]:
+    """
+    Finds the strongly connected components of the graph with an iterative version of Tarjan's algorithm.
+
+    Components are numbered in the order in which they are completed, so a choice between two different components always
+    goes from a higher to a lower component number.
+
+    Args:
+        graph (_StoryGraph): The graph of the story.
+
+    Returns:
+        tuple: The component of each scene and the number of components.
+    """
+    scenes = len(graph)
+    starts, targets = graph.starts, graph.targets
+    index = array('i', [-1]) * scenes
+    low = array('i', [0]) * scenes
+    component = array('i', [-1]) * scenes
+    on_stack = bytearray(scenes)
+    stack: List[int] = []
+    counter = 0
+    count = 0
+
+    for root in range(scenes):
+        if index[root] >= 0:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = 1
+        # each entry is a scene and the next of its choices to visit
+        work = [[root, starts[root]]]
+        while work:
+            entry = work[-1]
+            scene = entry[0]
+            if entry[1] < starts[scene + 1]:
+                target = targets[entry[1]]
+                entry[1] += 1
+                if index[target] < 0:
+                    index[target] = low[target] = counter
+                    counter += 1
+                    stack.append(target)
+                    on_stack[target] = 1
+                    work.append([target, starts[target]])
+                elif on_stack[target] and index[target] < low[scene]:
+                    low[scene] = index[target]
+                continue
+
+            work.pop()
+            if work and low[scene] < low[work[-1][0]]:
+                low[work[-1][0]] = low[scene]
+            if low[scene] == index[scene]:
+                while True:
+                    member = stack.pop()
+                    on_stack[member] = 0
+                    component[member] = count
+                    if member == scene:
+                        break
+                count += 1
+
+    return component, count
+
+def analyze(story) -> dict:
+    """
+    Analyses the graph of a story, in time linear on the number of scenes and choices.
+
+    The story starts at its first scene. An ending is a reachable scene without choices and a dead end is a reachable scene
+    from which no ending can be reached. Cycles are found as strongly connected components; the longest route and the number
+    of distinct paths to each ending are computed over the graph where each component is a single step, so every cycle is
+    traversed at most once. Path counts are exact integers of any size.
+
+    Args:
+        story (Story): The story to analyse.
+
+    Returns:
+        dict: The analysis, with the keys:
+            scenes (int): The number of scenes.
+            choices (int): The number of choices.
+            reachable (int): The number of scenes reachable from the first scene.
+            components (int): The number of strongly connected components.
+            cycles (int): The number of reachable components with a cycle.
+            largest_cycle (int): The number of scenes of the largest reachable cycle.
+            unreachable (List[str]): The scenes not reachable from the first scene.
+            dead_ends (List[str]): The reachable scenes from which no ending can be reached.
+            endings (Dict[str, dict]): For each ending, the 'shortest' and 'longest' number of choices to reach it and the
+                number of distinct 'paths' to it.
+            paths (int): The number of distinct paths to any ending.
+
+    Raises:
+        ValueError: If the story has no scenes or a choice goes to a scene that is not defined.
+    """
+    graph = story.graph()
+    scenes = len(graph)
+    if scenes == 0:
+        raise ValueError("There are no scenes defined for the visual novel.")
+    starts, targets, names = graph.starts, graph.targets, graph.names
+
+    component, count = _strongly_connected_components(graph)
+
+    # scenes grouped by component
+    members_start = array('i', [0]) * (count + 1)
+    for scene in range(scenes):
+        members_start[component[scene] + 1] += 1
+    for idx in range(count):
+        members_start[idx + 1] += members_start[idx]
+    members = array('i', [0]) * scenes
+    position = array('i', members_start[:-1])
+    for scene in range(scenes):
+        members[position[component[scene]]] = scene
+        position[component[scene]] += 1
+
+    # shortest number of choices from the first scene, with a breadth first search
+    shortest = array('i', [-1]) * scenes
+    shortest[0] = 0
+    queue = array('i', [0])
+    head = 0
+    while head < len(queue):
+        scene = queue[head]
+        head += 1
+        for idx in range(starts[scene], starts[scene + 1]):
+            target = targets[idx]
+            if shortest[target] < 0:
+                shortest[target] = shortest[scene] + 1
+                queue.append(target)
+
+    # longest route and number of paths over the components, from the first scene to the last components
+    longest = array('i', [-1]) * count
+    paths = [0] * count
+    longest[component[0]] = 0
+    paths[component[0]] = 1
+    for current in range(count - 1, -1, -1):
+        if longest[current] < 0:
+            continue
+        for member in range(members_start[current], members_start[current + 1]):
+            scene = members[member]
+            for idx in range(starts[scene], starts[scene + 1]):
+                target = component[targets[idx]]
+                if target != current:
+                    if longest[current] + 1 > longest[target]:
+                        longest[target] = longest[current] + 1
+                    paths[target] += paths[current]
+
+    # components from which an ending can be reached, from the last components to the first scene
+    can_end = bytearray(count)
+    cyclic = bytearray(count)
+    for current in range(count):
+        size = members_start[current + 1] - members_start[current]
+        if size > 1:
+            cyclic[current] = 1
+        for member in range(members_start[current], members_start[current + 1]):
+            scene = members[member]
+            if starts[scene] == starts[scene + 1]:
+                can_end[current] = 1
+            for idx in range(starts[scene], starts[scene + 1]):
+                target = component[targets[idx]]
+                if target == current:
+                    cyclic[current] = 1
+                elif can_end[target]:
+                    can_end[current] = 1
+
+    endings = {}
+    unreachable = []
+    dead_ends = []
+    for scene in range(scenes):
+        if shortest[scene] < 0:
+            unreachable.append(names[scene])
+        elif not can_end[component[scene]]:
+            dead_ends.append(names[scene])
+        elif starts[scene] == starts[scene + 1]:
+            endings[names[scene]] = {'shortest': shortest[scene], 'longest': longest[component[scene]], 'paths': paths[component[scene]]}
+
+    reachable_cycles = [current for current in range(count) if cyclic[current] and longest[current] >= 0]
+
+    return {
+        'scenes': scenes,
+        'choices': len(targets),
+        'reachable': scenes - len(unreachable),
+        'components': count,
+        'cycles': len(reachable_cycles),
+        'largest_cycle': max((members_start[current + 1] - members_start[current] for current in reachable_cycles), default=0),
+        'unreachable': unreachable,
+        'dead_ends': dead_ends,
+        'endings': endings,
+        'paths': sum(ending['paths'] for ending in endings.values()),
+    }
@@ -0,0 +1,203 @@
+import sqlite3
+import threading
+import time
+import uuid
+import warnings
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+__all__: List[str] = ['AnalyticsLog', 'report']
+
+_SCENE = 0
+_CHOICE = 1
+
+# the indexes hold every column the reports read, so the reports scan only the index of the kind of event they aggregate
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    time REAL NOT NULL,
+    session TEXT NOT NULL,
+    kind INTEGER NOT NULL,
+    scene TEXT NOT NULL,
+    choice INTEGER,
+    target TEXT
+);
+CREATE INDEX IF NOT EXISTS events_scenes ON events (kind, scene, session);
+CREATE INDEX IF NOT EXISTS events_choices ON events (kind, scene, choice, target);
+"""
+
+_SCENES_QUERY = f"SELECT scene, COUNT(*), COUNT(DISTINCT session) FROM events WHERE kind = {_SCENE} GROUP BY scene"
+_CHOICES_QUERY = f"SELECT scene, choice, target, COUNT(*) FROM events WHERE kind = {_CHOICE} GROUP BY scene, choice, target"
+_SESSIONS_QUERY = f"SELECT COUNT(DISTINCT session) FROM events WHERE kind = {_SCENE}"
+
+def _connect(path: str) -> sqlite3.Connection:
+    """
+    Opens an analytics database, creating its table and indexes the first time.
+
+    Args:
+        path (str): The path of the database.
+
+    Returns:
+        sqlite3.Connection: The connection, usable only by the thread that opened it.
+    """
+    connection = sqlite3.connect(path)
+    # the write ahead log lets a report read the database while a game writes to it
+    connection.execute('PRAGMA journal_mode=WAL')
+    connection.execute('PRAGMA synchronous=NORMAL')
+    connection.executescript(_SCHEMA)
+    return connection
+
+class AnalyticsLog:
+    """
+    Records the scenes the player enters and the choices the player takes, in a local SQLite database.
+
+    Recording an event only appends it to a buffer in memory; a background thread writes the buffer to the database in
+    batches, each in a single transaction, so the game loop never waits for the disk. If the database can't be written, a
+    warning is issued and the next events are ignored.
+
+    Attributes:
+        path (str): The path of the database.
+        session (str): The identifier of the game session, written with every event.
+        batch_size (int): The number of buffered events that wakes the writer before its interval.
+        interval (float): The maximum seconds an event stays in the buffer.
+        buffer (Deque[tuple]): The events not written yet.
+        recorded (int): The number of events recorded.
+        written (int): The number of events written to the database.
+    """
+
+    def __init__(self, path: str = 'analytics.db', session: Optional[str] = None, batch_size: int = 1000,
+                 interval: float = 2.0) -> None:
+        """
+        Initializes the log, creating the database if it doesn't exist, and starts the writer.
+
+        Args:
+            path (str, optional): The path of the database. Defaults to 'analytics.db'.
+            session (str, optional): The identifier of the game session. Defaults to a new random identifier.
+            batch_size (int, optional): The number of buffered events that wakes the writer. Defaults to 1000.
+            interval (float, optional): The maximum seconds an event stays in the buffer. Defaults to 2.
+        """
+        self.path = path
+        self.session = session if session else uuid.uuid4().hex
+        self.batch_size = batch_size
+        self.interval = interval
+        self.buffer: Deque[Tuple[Any, ...]] = deque()
+        self.recorded = 0
+        self.written = 0
+        self.failed = False
+        self.closed = False
+        self.wake = threading.Event()
+        self.condition = threading.Condition()
+        # the schema is created here, so a database that can't be opened is reported when the game starts
+        _connect(path).close()
+        self.thread = threading.Thread(target=self._write_batches, name='vnengine-analytics', daemon=True)
+        self.thread.start()
+
+    def _record(self, event: Tuple[Any, ...]) -> None:
+        if self.failed:
+            return
+        self.buffer.append(event)
+        self.recorded += 1
+        if len(self.buffer) >= self.batch_size:
+            self.wake.set()
+
+    def scene(self, scene: str) -> None:
+        """
+        Records that the player entered a scene.
+
+        Args:
+            scene (str): The name of the scene.
+        """
+        self._record((time.time(), self.session, _SCENE, scene, None, None))
+
+    def choice(self, scene: str, choice: int, target: str) -> None:
+        """
+        Records that the player took a choice.
+
+        Args:
+            scene (str): The name of the scene of the choice.
+            choice (int): The index of the choice among the choices of the scene, in the order in which they were created.
+            target (str): The name of the scene the choice goes to.
+        """
+        self._record((time.time(), self.session, _CHOICE, scene, choice, target))
+
+    def _write_batches(self) -> None:
+        connection = None
+        try:
+            connection = _connect(self.path)
+            while True:
+                self.wake.wait(self.interval)
+                self.wake.clear()
+                closed = self.closed
+                batch = [self.buffer.popleft() for _ in range(len(self.buffer))]
+                if batch:
+                    with connection:
+                        connection.executemany('INSERT INTO events VALUES (?, ?, ?, ?, ?, ?)', batch)
+                with self.condition:
+                    self.written += len(batch)
+                    self.condition.notify_all()
+                if closed:
+                    return
+        except sqlite3.Error as error:
+            warnings.warn(f"The analytics database {self.path} can't be written, the next events are ignored: {error}")
+            self.failed = True
+            self.buffer.clear()
+            with self.condition:
+                self.condition.notify_all()
+        finally:
+            if connection is not None:
+                connection.close()
+
+    def flush(self) -> None:
+        """
+        Waits for the events recorded until now to be written.
+        """
+        target = self.recorded
+        self.wake.set()
+        with self.condition:
+            self.condition.wait_for(lambda: self.written >= target or self.failed or not self.thread.is_alive())
+
+    def close(self) -> None:
+        """
+        Writes the events still in the buffer and stops the writer.
+        """
+        self.closed = True
+        self.wake.set()
+        self.thread.join()
+
+def report(path: str) -> Dict[str, Any]:
+    """
+    Aggregates the events of an analytics database into statistics of each scene and each choice.
+
+    The statistics are computed by SQLite from the indexes of the events, so a report of millions of events doesn't load
+    them in memory.
+
+    Args:
+        path (str): The path of the database, written by `AnalyticsLog`.
+
+    Returns:
+        dict: The statistics:
+
+            - 'sessions': the number of game sessions.
+            - 'scenes': for each scene, from the most visited, its 'scene', its 'visits' and the 'sessions' that visited it.
+            - 'choices': for each choice taken, its 'scene', its index 'choice', its 'target' scene, how many times it was
+              'taken', and its 'share' of the choices taken in its scene.
+
+    Raises:
+        FileNotFoundError: If the database doesn't exist.
+    """
+    try:
+        connection = sqlite3.connect(f'file:{path}?mode=ro', uri=True)
+    except sqlite3.OperationalError:
+        raise FileNotFoundError(f"File {path} not found.")
+    try:
+        sessions = connection.execute(_SESSIONS_QUERY).fetchone()[0]
+        scenes = [{'scene': scene, 'visits': visits, 'sessions': count} for scene, visits, count in connection.execute(_SCENES_QUERY)]
+        choices = [{'scene': scene, 'choice': choice, 'target': target, 'taken': taken} for scene, choice, target, taken in connection.execute(_CHOICES_QUERY)]
+    finally:
+        connection.close()
+    totals: Dict[str, int] = {}
+    for choice in choices:
+        totals[choice['scene']] = totals.get(choice['scene'], 0) + choice['taken']
+    for choice in choices:
+        choice['share'] = choice['taken'] / totals[choice['scene']]
+    scenes.sort(key=lambda scene: -scene['visits'])
+    return {'sessions': sessions, 'scenes': scenes, 'choices': choices}
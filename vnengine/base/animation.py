@@ -0,0 +1,100 @@
+from typing import List, Optional, Tuple, Union
+
+__all__: List[str] = []
+
+class _Animation:
+    """
+    Represents an animated background: a sequence of images or the cells of a sprite sheet, shown at a frame rate.
+
+    Attributes:
+        frames (List[str]): The image of each frame, or a single sprite sheet.
+        fps (float): The frames shown per second.
+        columns (int): The number of columns of the sprite sheet.
+        rows (int): The number of rows of the sprite sheet.
+        count (int): The number of frames.
+        loop (bool): Whether the animation starts again after its last frame, or stops on it.
+    """
+
+    def __init__(self, frames: Union[str, List[str]], fps: float = 12.0, columns: int = 1, rows: int = 1,
+                 count: Optional[int] = None, loop: bool = True) -> None:
+        """
+        Initializes an animation.
+
+        Args:
+            frames (str or List[str]): The path of a sprite sheet, or the paths of the images of the frames, in order.
+            fps (float, optional): The frames shown per second. Defaults to 12.
+            columns (int, optional): The number of columns of the sprite sheet. Defaults to 1.
+            rows (int, optional): The number of rows of the sprite sheet. Defaults to 1.
+            count (int, optional): The number of frames of the sprite sheet, when its last row is not full. Defaults to
+                every cell.
+            loop (bool, optional): Whether the animation starts again after its last frame. Defaults to True.
+
+        Raises:
+            ValueError: If there are no frames, or the frame rate or the grid of the sprite sheet are not valid.
+        """
+        if isinstance(frames, str):
+            if columns < 1 or rows < 1:
+                raise ValueError("A sprite sheet must have at least one column and one row.")
+            count = columns * rows if count is None else count
+            if not 1 <= count <= columns * rows:
+                raise ValueError(f"The sprite sheet {frames} has {columns * rows} cells, it can't have {count} frames.")
+            frames = [frames]
+        else:
+            frames = list(frames)
+            if not frames:
+                raise ValueError("An animation must have at least one frame.")
+            columns, rows, count = 1, 1, len(frames)
+        if fps <= 0:
+            raise ValueError("The frame rate of an animation must be greater than 0.")
+        self.frames: List[str] = frames
+        self.fps: float = float(fps)
+        self.columns: int = columns
+        self.rows: int = rows
+        self.count: int = count
+        self.loop: bool = loop
+
+    @property
+    def is_sheet(self) -> bool:
+        """
+        Whether the frames are the cells of a sprite sheet.
+        """
+        return len(self.frames) == 1 and self.count > 1
+
+    def key(self) -> tuple:
+        """
+        Gets everything that defines the animation, e.g. to know whether two scenes show the same animation.
+
+        Returns:
+            tuple: The key of the animation.
+        """
+        return (tuple(self.frames), self.fps, self.columns, self.rows, self.count, self.loop)
+
+    def sequence(self, elapsed: int) -> int:
+        """
+        Gets how many frames were shown since the animation started, i.e. the sequence number of the current frame. It keeps
+        growing while the animation loops, and stops at the last frame otherwise.
+
+        Args:
+            elapsed (int): The time since the animation started, in milliseconds.
+
+        Returns:
+            int: The sequence number of the frame.
+        """
+        sequence = int(max(0, elapsed) * self.fps / 1000)
+        return sequence if self.loop else min(sequence, self.count - 1)
+
+    def source(self, sequence: int) -> Tuple[str, Optional[Tuple[int, int, int, int]]]:
+        """
+        Gets where a frame is read from.
+
+        Args:
+            sequence (int): The sequence number of the frame.
+
+        Returns:
+            tuple: The path of the image, and the (column, row, columns, rows) of the frame in the sprite sheet, or None for
+                frames that are whole images.
+        """
+        index = sequence % self.count
+        if not self.is_sheet:
+            return self.frames[index], None
+        return self.frames[0], (index % self.columns, index // self.columns, self.columns, self.rows)
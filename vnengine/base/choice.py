@@ -1,4 +1,5 @@
-from typing import List
+from typing import Any, Callable, Dict, List, Optional
+from vnengine.base.condition import _compile_condition, _compile_effects
 
 __all__: List[str] = []
 
@@ -8,13 +9,33 @@ class _Choice:
 
     Attributes:
         choice_text (str): The text explaining the choice.
+        go_to_scene (str): The name of the scene to go to when the choice is selected.
+        condition (str): The condition that must hold for the choice to be available, or None if it is always available.
+        effects (str): The assignments of variables done when the choice is selected, or None.
+        predicate (Callable[[List[int]], bool]): The compiled condition, a function of the variable array, or None.
+        effect (Callable[[List[int]], Any]): The compiled effects, which change the variable array in place, or None.
     """
 
-    def __init__(self, choice_text: str) -> None:
+    def __init__(self, choice_text: str, go_to_scene: Optional[str] = None, condition: Optional[str] = None,
+                 effects: Optional[str] = None, slots: Optional[Dict[str, int]] = None) -> None:
         """
         Initializes a new instance of the Choice class.
 
         Args:
             choice_text (str): The text explaining the choice.
+            go_to_scene (str, optional): The name of the scene to go to when the choice is selected. Defaults to None.
+            condition (str, optional): The condition of the choice, e.g. 'gold >= 10 and not has_key'. Defaults to None.
+            effects (str, optional): The assignments done when the choice is selected, e.g. 'gold -= 10; has_key = 1'.
+                Defaults to None.
+            slots (Dict[str, int], optional): The index of each variable of the story in the variable array. Defaults to
+                no variables.
+
+        Raises:
+            ValueError: If the condition or the effects are not valid or use a variable that is not defined.
         """
-        self.choice_text: str = choice_text
\ No newline at end of file
+        self.choice_text: str = choice_text
+        self.go_to_scene: Optional[str] = go_to_scene
+        self.condition: Optional[str] = condition or None
+        self.effects: Optional[str] = effects or None
+        self.predicate: Optional[Callable[[List[int]], bool]] = _compile_condition(condition, slots or {}) if condition else None
+        self.effect: Optional[Callable[[List[int]], Any]] = _compile_effects(effects, slots or {}) if effects else None
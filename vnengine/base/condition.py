@@ -0,0 +1,157 @@
+import ast
+from typing import Any, Callable, Dict, List
+
+__all__: List[str] = []
+
+_ARITHMETIC = {ast.Add: '+', ast.Sub: '-', ast.Mult: '*', ast.FloorDiv: '//', ast.Mod: '%'}
+
+def _floordiv(left: Any, right: Any) -> Any:
+    # a zero divisor is replaced with 1 and the result with 0, for integers and for arrays of the values of many players
+    return (left // (right + (right == 0))) * (right != 0)
+
+def _mod(left: Any, right: Any) -> Any:
+    return (left % (right + (right == 0))) * (right != 0)
+
+# the functions the compiled expressions call, the only names they can use besides the variable array
+_GLOBALS: Dict[str, Any] = {'__builtins__': {}, '_floordiv': _floordiv, '_mod': _mod}
+
+def _error(source: str, message: str) -> ValueError:
+    return ValueError(f"The expression '{source}' is not valid: {message}.")
+
+class _Compiler:
+    """
+    Checks the syntax tree of a condition or of the effects of a choice and rewrites every variable as an item of the
+    variable array, so the compiled function only indexes a list.
+
+    Only integers, the variables and the operators +, -, *, //, %, the comparisons, and, or and not are allowed, so an
+    expression of a story can't call functions or read anything but its variables. A division or a modulo by 0 gives 0,
+    in the game as in the simulation, instead of stopping the story. And, or, not and the chained
+    comparisons are rewritten with the &, | and == operators on booleans, so the same function evaluates a condition for
+    a list of values, or for arrays with the values of many players at once.
+
+    Attributes:
+        source (str): The expression compiled.
+        slots (Dict[str, int]): The index of each variable in the variable array.
+    """
+
+    def __init__(self, source: str, slots: Dict[str, int]) -> None:
+        self.source = source
+        self.slots = slots
+
+    def variable(self, name: str, context: ast.expr_context) -> ast.Subscript:
+        if name not in self.slots:
+            raise _error(self.source, f"the variable {name} is not defined, add it with add_variable")
+        return ast.Subscript(value=ast.Name(id='v', ctx=ast.Load()), slice=ast.Constant(value=self.slots[name]), ctx=context)
+
+    def arithmetic(self, node: ast.AST) -> ast.expr:
+        """
+        Rewrites an integer expression.
+        """
+        if isinstance(node, ast.Name):
+            return self.variable(node.id, ast.Load())
+        if isinstance(node, ast.Constant) and type(node.value) in (int, bool):
+            return ast.Constant(value=int(node.value))
+        if isinstance(node, ast.BinOp) and type(node.op) in _ARITHMETIC:
+            return self.binop(self.arithmetic(node.left), node.op, self.arithmetic(node.right))
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+            return ast.UnaryOp(op=node.op, operand=self.arithmetic(node.operand))
+        raise _error(self.source, f"'{ast.unparse(node)}' is not an integer, a variable or an arithmetic operation")
+
+    def binop(self, left: ast.expr, op: ast.operator, right: ast.expr) -> ast.expr:
+        """
+        Rewrites an arithmetic operation, the divisions and modulos by something that may be 0 as guarded calls.
+        """
+        if isinstance(op, (ast.FloorDiv, ast.Mod)) and not (isinstance(right, ast.Constant) and right.value != 0):
+            function = '_floordiv' if isinstance(op, ast.FloorDiv) else '_mod'
+            return ast.Call(func=ast.Name(id=function, ctx=ast.Load()), args=[left, right], keywords=[])
+        return ast.BinOp(left=left, op=op, right=right)
+
+    def truth(self, node: ast.AST) -> ast.expr:
+        """
+        Rewrites an expression used as a condition into a boolean expression, as & and | of integers are bitwise.
+        """
+        if isinstance(node, ast.BoolOp):
+            return self.chain([self.truth(value) for value in node.values], ast.BitAnd if isinstance(node.op, ast.And) else ast.BitOr)
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+            operand = node.operand
+            boolean = isinstance(operand, (ast.BoolOp, ast.Compare)) or (isinstance(operand, ast.UnaryOp) and isinstance(operand.op, ast.Not))
+            inner = self.truth(operand) if boolean else self.arithmetic(operand)
+            return ast.Compare(left=inner, ops=[ast.Eq()], comparators=[ast.Constant(value=0)])
+        if isinstance(node, ast.Compare):
+            operands = [self.arithmetic(node.left)] + [self.arithmetic(value) for value in node.comparators]
+            return self.chain([ast.Compare(left=operands[idx], ops=[op], comparators=[operands[idx + 1]]) for idx, op in enumerate(node.ops)], ast.BitAnd)
+        return ast.Compare(left=self.arithmetic(node), ops=[ast.NotEq()], comparators=[ast.Constant(value=0)])
+
+    def chain(self, values: List[ast.expr], operator: type) -> ast.expr:
+        result = values[0]
+        for value in values[1:]:
+            result = ast.BinOp(left=result, op=operator(), right=value)
+        return result
+
+    def effect(self, node: ast.AST) -> ast.expr:
+        """
+        Rewrites an assignment as a call that sets an item of the variable array, so the effects are a single expression.
+        """
+        if isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+            name, value = node.targets[0].id, self.arithmetic(node.value)
+        elif isinstance(node, ast.AugAssign) and isinstance(node.target, ast.Name) and type(node.op) in _ARITHMETIC:
+            name = node.target.id
+            value = self.binop(self.variable(name, ast.Load()), node.op, self.arithmetic(node.value))
+        else:
+            raise _error(self.source, f"'{ast.unparse(node)}' is not an assignment of a variable, like 'gold = 10' or 'gold += 1'")
+        self.variable(name, ast.Load())
+        setter = ast.Attribute(value=ast.Name(id='v', ctx=ast.Load()), attr='__setitem__', ctx=ast.Load())
+        return ast.Call(func=setter, args=[ast.Constant(value=self.slots[name]), value], keywords=[])
+
+def _parse(source: str, mode: str) -> ast.AST:
+    try:
+        return ast.parse(source.strip(), mode=mode)
+    except SyntaxError as error:
+        raise _error(source, error.msg) from None
+
+def _function(body: ast.expr) -> Callable[[Any], Any]:
+    arguments = ast.arguments(posonlyargs=[], args=[ast.arg(arg='v')], kwonlyargs=[], kw_defaults=[], defaults=[])
+    expression = ast.fix_missing_locations(ast.Expression(body=ast.Lambda(args=arguments, body=body)))
+    return eval(compile(expression, '<story>', 'eval'), dict(_GLOBALS))
+
+def _compile_condition(source: str, slots: Dict[str, int]) -> Callable[[Any], Any]:
+    """
+    Compiles the condition of a choice, e.g. 'gold >= 10 and not has_key', into a function of the variable array.
+
+    The same function evaluates the condition for many players at once, from an array with a row of values per variable.
+
+    Args:
+        source (str): The condition.
+        slots (Dict[str, int]): The index of each variable in the variable array.
+
+    Returns:
+        Callable: The function, which returns whether the condition holds, or a boolean array for an array of players.
+
+    Raises:
+        ValueError: If the condition is not valid or uses a variable that is not defined.
+    """
+    tree = _parse(source, 'eval')
+    return _function(_Compiler(source, slots).truth(tree.body))
+
+def _compile_effects(source: str, slots: Dict[str, int]) -> Callable[[Any], Any]:
+    """
+    Compiles the effects of a choice, e.g. 'gold -= 10; has_key = 1', into a function that changes the variable array in
+    place. The assignments are done in order.
+
+    The same function changes a list of values, or an array with a row of values per variable for many players at once.
+
+    Args:
+        source (str): The assignments, separated by ';'.
+        slots (Dict[str, int]): The index of each variable in the variable array.
+
+    Returns:
+        Callable: The function.
+
+    Raises:
+        ValueError: If the effects are not valid or use a variable that is not defined.
+    """
+    compiler = _Compiler(source, slots)
+    tree = _parse(source, 'exec')
+    if not tree.body:
+        raise _error(source, "there are no assignments")
+    return _function(ast.Tuple(elts=[compiler.effect(node) for node in tree.body], ctx=ast.Load()))
@@ -0,0 +1,43 @@
+from typing import Dict, List, Optional
+
+__all__: List[str] = []
+
+# the number of particles of each effect when a scene doesn't set it
+_EFFECTS: Dict[str, int] = {'rain': 4000, 'snow': 1500, 'sparkles': 300, 'dust': 800}
+
+class _Effect:
+    """
+    Represents an ambient effect drawn over the background of a scene: particles of rain, snow, sparkles or dust.
+
+    Attributes:
+        kind (str): The kind of the effect.
+        count (int): The number of particles.
+    """
+
+    def __init__(self, kind: str, count: Optional[int] = None) -> None:
+        """
+        Initializes an effect.
+
+        Args:
+            kind (str): The kind of the effect. Availables: 'rain', 'snow', 'sparkles', 'dust'.
+            count (int, optional): The number of particles. Defaults to a number that depends on the kind.
+
+        Raises:
+            ValueError: If the kind is not valid or the number of particles is not positive.
+        """
+        if kind not in _EFFECTS:
+            raise ValueError(f"The effect {kind} is not valid. Availables: {', '.join(_EFFECTS)}.")
+        count = _EFFECTS[kind] if count is None else count
+        if count < 1:
+            raise ValueError("An effect must have at least one particle.")
+        self.kind: str = kind
+        self.count: int = int(count)
+
+    def key(self) -> tuple:
+        """
+        Gets everything that defines the effect, e.g. to know whether two scenes show the same effects.
+
+        Returns:
+            tuple: The key of the effect.
+        """
+        return (self.kind, self.count)
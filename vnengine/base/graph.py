@@ -0,0 +1,87 @@
+from array import array
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+__all__: List[str] = []
+
+class _StoryGraph:
+    """
+    Compact representation of the choices of a story, as integer arrays indexed by scene number.
+
+    The choices of the scene `n` go to the scenes `targets[starts[n]:starts[n + 1]]`, in the order in which they were created.
+
+    Attributes:
+        names (Sequence[str]): The name of each scene, by scene number.
+        starts (array): The index in `targets` of the first choice of each scene, followed by the number of choices.
+        targets (array): The scene number that each choice goes to.
+        conditions (Dict[int, Callable[[List[int]], bool]]): The compiled condition of each choice with a condition, by
+            index in `targets`. Choices without a condition are always available.
+        effects (Dict[int, Callable[[List[int]], Any]]): The compiled effects of each choice with effects, by index in
+            `targets`.
+    """
+
+    def __init__(self, names: Sequence[str], starts: array, targets: array,
+                 conditions: Optional[Dict[int, Callable[[List[int]], bool]]] = None,
+                 effects: Optional[Dict[int, Callable[[List[int]], Any]]] = None) -> None:
+        """
+        Initializes the graph.
+
+        Args:
+            names (Sequence[str]): The name of each scene, by scene number.
+            starts (array): The index in `targets` of the first choice of each scene, followed by the number of choices.
+            targets (array): The scene number that each choice goes to.
+            conditions (Dict[int, Callable], optional): The compiled condition of the choices with a condition, by index
+                in `targets`. Defaults to no conditions.
+            effects (Dict[int, Callable], optional): The compiled effects of the choices with effects, by index in
+                `targets`. Defaults to no effects.
+        """
+        self.names = names
+        self.starts = starts
+        self.targets = targets
+        self.conditions = conditions if conditions is not None else {}
+        self.effects = effects if effects is not None else {}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def choices(self, scene: int) -> array:
+        """
+        Gets the scene numbers that the choices of a scene go to.
+
+        Args:
+            scene (int): The number of the scene.
+
+        Returns:
+            array: The scene numbers.
+        """
+        return self.targets[self.starts[scene]:self.starts[scene + 1]]
+
+    @classmethod
+    def from_story(cls, story) -> '_StoryGraph':
+        """
+        Builds the graph of a story.
+
+        Args:
+            story (Story): The story.
+
+        Returns:
+            _StoryGraph: The graph of the story.
+
+        Raises:
+            ValueError: If a choice goes to a scene that is not defined in the story.
+        """
+        numbers: Dict[str, int] = {name: number for number, name in enumerate(story.scenes_names)}
+        starts = array('i', [0])
+        targets = array('i')
+        conditions: Dict[int, Callable[[List[int]], bool]] = {}
+        effects: Dict[int, Callable[[List[int]], Any]] = {}
+        for name in story.scenes_names:
+            for choice in story.scenes[name].choices:
+                if choice.go_to_scene not in numbers:
+                    raise ValueError(f"Scene {choice.go_to_scene} is not defined in the story. Define this scene so it can be used in a choice.")
+                if choice.predicate is not None:
+                    conditions[len(targets)] = choice.predicate
+                if choice.effect is not None:
+                    effects[len(targets)] = choice.effect
+                targets.append(numbers[choice.go_to_scene])
+            starts.append(len(targets))
+        return cls(story.scenes_names, starts, targets, conditions, effects)
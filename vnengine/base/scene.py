@@ -1,5 +1,7 @@
-from typing import Dict
+from typing import Callable, Dict, Iterator, Optional, Tuple
+from vnengine.base.animation import _Animation
 from vnengine.base.choice import _Choice
+from vnengine.base.effect import _Effect
 from typing import List
 
 __all__: List[str] = []
@@ -10,8 +12,18 @@ class _Scene:
 
     Attributes:
         character_text (str): The text spoken by the character in the scene.
-        background_display_img (str): The image file path for the background display.
-        choices (Dict[str, _Choice]): A dictionary of choices available in the scene.
+        background_display_img (str): The image file path for the background display. Scenes with an animated background
+            show it until the first frame is decoded, and in the gallery.
+        choices (List[_Choice]): The choices of the scene, in the order in which they were created. Several choices can
+            go to the same scene.
+        music (str): The music file played from this scene on, '' to stop the music, or None to keep the music playing.
+        voices (Dict[Optional[str], str]): The voice-over file of the scene by language, None for every language.
+        sprites (List[Tuple[str, float, float]]): The image and the (x, y) position of each character sprite, drawn over the
+            background in order. x is the center and y the bottom of the sprite, as fractions of the background size.
+        overlays (List[str]): The foreground images drawn over the sprites, scaled to the background size.
+        animation (_Animation): The animated background drawn instead of the background image, or None.
+        script (Callable): The generator function of the actions run while the scene is shown, or None.
+        effects (List[_Effect]): The ambient effects drawn over the scene, in the order in which they were added.
     """
 
     def __init__(self, character_text: str, image: str, scene_number: int) -> None:
@@ -26,14 +38,49 @@ class _Scene:
         self.character_text: str = character_text
         self.background_display_img: str = image
         self.scene_number: int = scene_number
-        self.choices: Dict[str, _Choice] = {}
+        self.choices: List[_Choice] = []
+        self.music: Optional[str] = None
+        self.voices: Dict[Optional[str], str] = {}
+        self.sprites: List[Tuple[str, float, float]] = []
+        self.overlays: List[str] = []
+        self.animation: Optional[_Animation] = None
+        self.script: Optional[Callable[[], Iterator]] = None
+        self.effects: List[_Effect] = []
         
-    def add_choice(self, choice_text: str, go_to_scene: str) -> None:
+    def add_choice(self, choice_text: str, go_to_scene: str, condition: Optional[str] = None, effects: Optional[str] = None,
+                   slots: Optional[Dict[str, int]] = None) -> None:
         """
         Adds a choice to a scene. Choices are shown in the order in which they were created.
 
         Args:
             choice_text (str): The text of the choice.
             go_to_scene (str): The name of the scene to go to when the choice is selected.
+            condition (str, optional): The condition that must hold for the choice to be shown. Defaults to None.
+            effects (str, optional): The assignments of variables done when the choice is selected. Defaults to None.
+            slots (Dict[str, int], optional): The index of each variable of the story. Defaults to no variables.
+
+        Raises:
+            ValueError: If the condition or the effects are not valid.
+        """
+        self.choices.append(_Choice(choice_text, go_to_scene, condition, effects, slots))
+
+    def voice(self, language: str) -> Optional[str]:
+        """
+        Gets the voice-over file of the scene for a language.
+
+        Args:
+            language (str): The current language.
+
+        Returns:
+            str: The voice-over of the language, or the one for every language, or None if the scene has no voice-over.
+        """
+        return self.voices.get(language, self.voices.get(None))
+
+    def layers(self) -> Tuple[Tuple[str, Optional[float], Optional[float]], ...]:
+        """
+        Gets the layers of the scene, from the bottom to the top: the background, the sprites and the overlays.
+
+        Returns:
+            tuple: The (image, x, y) of each layer; x and y are None for the layers scaled to the background size.
         """
-        self.choices[go_to_scene] = _Choice(choice_text)
\ No newline at end of file
+        return ((self.background_display_img, None, None),) + tuple(self.sprites) + tuple((overlay, None, None) for overlay in self.overlays)
\ No newline at end of file
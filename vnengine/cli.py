@@ -1,10 +1,11 @@
 import argparse
+import json
 import re
+import runpy
 import warnings
 import os
 import subprocess
 import shutil
-from typing import List
 
 def modify_script(input: str, start_language: str, languages: str, resolution: str) -> str:
     """
@@ -28,21 +29,21 @@ def modify_script(input: str, start_language: str, languages: str, resolution: s
     except IOError:
         raise IOError(f"Error reading file {input}.")
         
-    # remove these commands to be replaced by the ones passed as arguments from the CLI
-    modified_content = re.sub(r'.*?(set_initial_language|set_languages|set_resolution|run).*', '', original_content)
-
     # get the file name
-    story_var_name = re.search(r'\b(\w+)\s*=\s*story\.Story\(\)', modified_content)
+    story_var_name = re.search(r'\b(\w+)\s*=\s*story\.Story\(\)', original_content)
     
     if story_var_name:
         story_var_name = story_var_name.group(1)
     else:
         warnings.warn("Couldn't find assignment of story.Story()")
         
+    # remove only the calls of these methods on the story, to be replaced by the ones passed as arguments from the CLI
+    modified_content = re.sub(rf'^[ \t]*{re.escape(str(story_var_name))}\.(set_initial_language|set_languages|set_resolution|run)\(.*\)[ \t]*$', '', original_content, flags=re.MULTILINE)
+        
     # creates the additional code based on the CLI arguments
     additional_code = f"""
 {story_var_name}.set_initial_language('{start_language}')
-{story_var_name}.set_languages('{languages}')
+{story_var_name}.set_languages({languages.split(',')!r})
 {story_var_name}.set_resolution('{resolution}')
 {story_var_name}.run()
     """    
@@ -51,12 +52,30 @@ def modify_script(input: str, start_language: str, languages: str, resolution: s
     # return the new script code
     return modified_content
 
-def build(resolutions: List[str], languages: str, start_language: str, input: str, output: str) -> None:
+def launcher_script(input: str, start_language: str, languages: str, resolution: str) -> str:
     """
-    Used to build the executable.
+    Used to create the script that runs a story file. The settings passed as arguments override the ones of the story file.
     
     Args:
-        resolutions (List[str]): The resolutions of the project.
+        input (str): The story file, relative to the executable.
+        start_language (str): The default language that the game starts.
+        languages (str): The languages available to be chosen.
+        resolution (str): The resolution of the game.
+        
+    Returns:
+        str: The script that runs the story file.
+    """
+    return f"""from vnengine import parser
+story = parser.read_story({input!r}, language={start_language!r}, languages={languages.split(',')!r}, resolution={resolution!r})
+story.run()
+"""
+
+def build(resolution: str, languages: str, start_language: str, input: str, output: str) -> None:
+    """
+    Used to build the executable. A single executable is built, the resolution can be changed by the player in the options screen.
+    
+    Args:
+        resolution (str): The resolution that the game starts.
         languages (str): The languages available to be chosen.
         start_language (str): The default language that the game starts.
         input (str): The input file to be executed.
@@ -65,37 +84,239 @@ def build(resolutions: List[str], languages: str, start_language: str, input: st
     Returns:
         None
     """
-    for resolution in resolutions:
-        # get extra info 
-        file_name = os.path.splitext(os.path.basename(input))[0]
-        temp_file_path = f"{output}/temp_{resolution}.py"
-        output_folder = f"{output}/{file_name}_{resolution}"
-        
-        # Create script with additional infos
+    # get extra info 
+    file_name = os.path.splitext(os.path.basename(input))[0]
+    temp_file_path = f"{output}/temp_{file_name}.py"
+    output_folder = f"{output}/{file_name}"
+    
+    # Create script with additional infos, story files are read by a launcher instead of being modified
+    is_story_file = os.path.splitext(input)[1] == '.vn'
+    if is_story_file:
+        final_script = launcher_script(os.path.basename(input), start_language, languages, resolution)
+    else:
         final_script = modify_script(input, start_language, languages, resolution)   
+    
+    # Create temp file
+    try:
+        with open(temp_file_path, 'w') as file:
+            file.write(final_script)
+    except IOError:
+        raise IOError(f"Error writing to file {temp_file_path}")
         
-        # Create temp file
-        try:
-            with open(temp_file_path, 'w') as file:
-                file.write(final_script)
-        except IOError:
-            raise IOError(f"Error writing to file {temp_file_path}")
-            
-        # Build executable from temp file
-        os.mkdir(output_folder)
-        command = ["pyinstaller", "--onefile", "--distpath", output_folder,"--name", file_name, temp_file_path]
-        try:
-            subprocess.run(command, check=True)
-            print("Executable created with success!")
-        except subprocess.CalledProcessError as e:
-            print("Error generating executable: ", e)
-            
-        # copy assets folder to destiny folder
-        assets_folder = f"{os.path.dirname(input)}/assets"
-        shutil.copytree(assets_folder, output_folder+"/assets")
-        
-        # remove temp file
-        os.remove(temp_file_path)
+    # Build executable from temp file
+    os.mkdir(output_folder)
+    command = ["pyinstaller", "--onefile", "--distpath", output_folder,"--name", file_name, temp_file_path]
+    try:
+        subprocess.run(command, check=True)
+        print("Executable created with success!")
+    except subprocess.CalledProcessError as e:
+        print("Error generating executable: ", e)
+        
+    # pack the assets folder into a single file next to the executable, read by the game with the same paths
+    from vnengine.pack import build_pack
+    assets_folder = f"{os.path.dirname(input) or '.'}/assets"
+    build_pack(assets_folder, output_folder + "/assets.pack")
+    if is_story_file:
+        shutil.copy(input, output_folder)
+    
+    # remove temp file
+    os.remove(temp_file_path)
+
+def pack(input: str, output: str) -> None:
+    """
+    Used to build an asset pack from a folder.
+    
+    Args:
+        input (str): The folder with the assets.
+        output (str): The path of the pack.
+        
+    Returns:
+        None
+    """
+    from vnengine.pack import build_pack
+    
+    count = build_pack(input, output)
+    print(f"Packed {count} assets into {output}")
+
+def load_input(input: str):
+    """
+    Used to load the story of an input file without running the game.
+    
+    Args:
+        input (str): The input file, a '.vn' story file, a '.jsonl' or '.csv' story file, or a Python script. Python scripts
+            are executed with `Story.run` disabled and the story is the `Story` they create.
+        
+    Returns:
+        Story: The story of the input file.
+    """
+    from vnengine.story import Story
+    
+    extension = os.path.splitext(input)[1].lower()
+    if extension == '.vn':
+        from vnengine.parser import read_story
+        return read_story(input)
+    if extension in ('.jsonl', '.csv'):
+        from vnengine.loader import load_story
+        return load_story(input)
+    
+    if not os.path.exists(input):
+        raise FileNotFoundError(f"File {input} not found.")
+    run = Story.run
+    Story.run = lambda self: None
+    try:
+        namespace = runpy.run_path(input, run_name='__main__')
+    finally:
+        Story.run = run
+    stories = [value for value in namespace.values() if isinstance(value, Story)]
+    if not stories:
+        raise ValueError(f"Couldn't find a Story created by {input}.")
+    return stories[0]
+
+def analyze(input: str, as_json: bool) -> None:
+    """
+    Used to analyse the graph of a story and print the result.
+    
+    Args:
+        input (str): The input file with the story.
+        as_json (bool): Whether the analysis is printed as JSON, for dashboards, instead of as a summary.
+        
+    Returns:
+        None
+    """
+    from vnengine.analysis import analyze as analyze_story
+    
+    result = analyze_story(load_input(input))
+    if as_json:
+        print(json.dumps(result, ensure_ascii=False))
+        return
+    
+    print(f"Scenes: {result['scenes']} ({result['reachable']} reachable), choices: {result['choices']}")
+    print(f"Cycles: {result['cycles']} (largest with {result['largest_cycle']} scenes)")
+    print(f"Distinct paths to an ending: {result['paths']}")
+    for name, ending in result['endings'].items():
+        print(f"Ending {name}: shortest {ending['shortest']}, longest {ending['longest']}, paths {ending['paths']}")
+    for name in result['dead_ends']:
+        print(f"Dead end: {name}")
+    for name in result['unreachable']:
+        print(f"Unreachable: {name}")
+
+def simulate(input: str, players: int, max_steps: int, weights: str, seed: int, top: int) -> None:
+    """
+    Used to simulate many playthroughs of a story and print how often each scene and ending is reached.
+    
+    Args:
+        input (str): The input file with the story.
+        players (int): The number of simulated players.
+        max_steps (int): The maximum number of choices made by a player.
+        weights (str): A JSON file with the weights of the choices of each scene, or None for equally likely choices.
+        seed (int): The seed of the random choices, or None.
+        top (int): The number of most visited scenes printed.
+        
+    Returns:
+        None
+    """
+    import numpy as np
+    from vnengine.simulation import simulate as simulate_story
+    
+    choice_weights = None
+    if weights:
+        with open(weights, 'r', encoding='utf-8') as file:
+            choice_weights = json.load(file)
+    result = simulate_story(load_input(input), players, max_steps, choice_weights, seed)
+    
+    print(f"Players: {players}, unfinished after {max_steps} choices: {result['unfinished']}")
+    for name, count in sorted(result['endings'].items(), key=lambda item: -item[1]):
+        print(f"Ending {name}: {count} ({count / players:.2%})")
+    print("Most visited scenes (visits per player):")
+    for number in np.argsort(-result['visits'], kind='stable')[:top]:
+        print(f"  {result['names'][number]}: {result['visits'][number] / players:.3f}")
+    lengths = result['path_lengths']
+    if lengths.sum():
+        cumulative = np.cumsum(lengths) / lengths.sum()
+        median, p90 = (int(np.searchsorted(cumulative, q)) for q in (0.5, 0.9))
+        mean = float(np.arange(lengths.size) @ lengths) / lengths.sum()
+        print(f"Choices to an ending: mean {mean:.1f}, median {median}, 90th percentile {p90}, max {lengths.size - 1}")
+
+def serve(input: str, host: str, port: int) -> None:
+    """
+    Used to serve a story to many players over TCP, one JSON message per line.
+    
+    Args:
+        input (str): The input file with the story.
+        host (str): The address to listen on.
+        port (int): The port to listen on.
+        
+    Returns:
+        None
+    """
+    from vnengine.server import serve as serve_story
+    
+    story = load_input(input)
+    story.validatePathing()
+    serve_story(story, host, port)
+
+def load_test(host: str, port: int, sessions: int, connections: int, steps: int) -> None:
+    """
+    Used to play many sessions against a running server and print the throughput.
+    
+    Args:
+        host (str): The address of the server.
+        port (int): The port of the server.
+        sessions (int): The number of sessions.
+        connections (int): The number of connections the sessions are split among.
+        steps (int): The number of choices made by each session.
+        
+    Returns:
+        None
+    """
+    from vnengine.server import load_test as run_load_test
+    
+    result = run_load_test(host, port, sessions, connections, steps)
+    print(f"Sessions: {result['sessions']}, requests: {result['requests']} in {result['seconds']:.2f}s")
+    print(f"Requests per second: {result['requests_per_second']:.0f}")
+    print(f"Batch time: median {result['batch_p50'] * 1000:.1f}ms, 99th percentile {result['batch_p99'] * 1000:.1f}ms")
+
+def dev(input: str) -> None:
+    """
+    Used to run a story in development mode: the changes of its source and assets are applied while the game runs.
+    
+    Args:
+        input (str): The input file with the story.
+        
+    Returns:
+        None
+    """
+    from vnengine.dev import develop
+    
+    develop(input)
+
+def report(input: str, as_json: bool, top: int) -> None:
+    """
+    Used to print the statistics of the scenes and choices recorded in an analytics database.
+    
+    Args:
+        input (str): The analytics database.
+        as_json (bool): Whether the whole report is printed as JSON, for dashboards, instead of as a summary.
+        top (int): The number of most visited scenes printed, with their choices.
+        
+    Returns:
+        None
+    """
+    from vnengine.analytics import report as report_events
+    
+    result = report_events(input)
+    if as_json:
+        print(json.dumps(result, ensure_ascii=False))
+        return
+    
+    choices = {}
+    for choice in result['choices']:
+        choices.setdefault(choice['scene'], []).append(choice)
+    print(f"Sessions: {result['sessions']}, scenes visited: {len(result['scenes'])}")
+    for scene in result['scenes'][:top]:
+        print(f"{scene['scene']}: {scene['visits']} visits in {scene['sessions']} sessions")
+        for choice in sorted(choices.get(scene['scene'], []), key=lambda choice: -choice['taken']):
+            print(f"  choice {choice['choice'] + 1} -> {choice['target']}: {choice['taken']} ({choice['share']:.1%})")
 
 def main() -> None:
     """
@@ -105,38 +326,117 @@ def main() -> None:
 
     Subcommands:
         build: Build the project.
+        analyze: Analyse the graph of a story: cycles, endings, dead ends and paths.
+        pack: Build an asset pack from a folder.
+        simulate: Simulate many playthroughs of a story with random choices.
+        serve: Serve a story to many players over TCP.
+        loadtest: Play many sessions against a running server.
+        dev: Run a story in a window, applying the changes of its files while it runs.
+        report: Print the statistics of the scenes and choices recorded by the players.
 
     Arguments:
-        --resolutions: Resolutions of the Project. Possible values: hd, fullhd, 4k. This argument is required.
+        --resolution: Resolution that the game starts, it can be changed in the options screen. Possible values: hd, fullhd, 4k. Defaults to hd.
         --initial_lang: Default language that the game starts. This argument is required.
         --languages: Languages available to be chosen. Possible values: 'de' (German), 'en' (English), 'es' (Spanish), 'fr' (French), and 'pt' (Portuguese). This argument is required.
-        --input: Name of the input file to be executed. This argument is required.
+        --input: Name of the input file to be executed, a Python script or a '.vn' story file. This argument is required.
         --output: Folder destination of the executable. This argument is required.
 
     If no subcommand is provided, the function will print a message indicating that no action was given and suggest using -h to see the available actions.
 
     If the 'build' subcommand is provided, the function will call the build function with the provided arguments.
 
+    If the 'pack' subcommand is provided, the function will pack the folder --input into the file --output.
+
+    If the 'analyze' subcommand is provided, the function will print the analysis of the story of --input, as JSON with --json.
+
+    If the 'simulate' subcommand is provided, the function will simulate --players playthroughs of the story of --input and
+    print how often each ending and scene is reached and the distribution of the number of choices to an ending.
+
+    If the 'serve' subcommand is provided, the function will serve the story of --input on --host and --port.
+
+    If the 'loadtest' subcommand is provided, the function will play --sessions sessions over --connections connections
+    against the server on --host and --port, making --steps choices each.
+
+    If the 'dev' subcommand is provided, the function will run the story of --input in a window and apply the changes of its
+    source and assets while the game runs, keeping the player at the current scene.
+
+    If the 'report' subcommand is provided, the function will print how often each scene of the analytics database --input
+    was visited and how often each of its choices was taken, as JSON with --json.
+
     If an unknown subcommand is provided, the function will print a message indicating that the action is unknown.
     """
     parser = argparse.ArgumentParser(description="Build the VNEngine project")
     subparsers = parser.add_subparsers(title="subcommands", dest="subcommand")
 
     build_parser = subparsers.add_parser("build", help="Build the project")
-    build_parser.add_argument("--resolutions", help="Resolutions of the Project. Possible values: hd, fullhd, 4k", required=True)
+    build_parser.add_argument("--resolution", help="Resolution that the game starts, it can be changed in the options screen. Possible values: hd, fullhd, 4k", default='hd')
+    build_parser.add_argument("--resolutions", help=argparse.SUPPRESS)
     build_parser.add_argument("--initial_lang", help="Default language that the game starts", required=True) #todo
     build_parser.add_argument("--languages", help="Languages available to be chosen. Possible values: 'de' (German), 'en' (English), 'es' (Spanish), 'fr' (French), and 'pt' (Portuguese).", required=True) #todo
-    build_parser.add_argument("--input", help="Name of the input file to be executed", required=True)
+    build_parser.add_argument("--input", help="Name of the input file to be executed, a Python script or a '.vn' story file", required=True)
     build_parser.add_argument("--output", help="Folder destination of the executable", required=True)
+
+    pack_parser = subparsers.add_parser("pack", help="Build an asset pack from a folder")
+    pack_parser.add_argument("--input", help="Folder with the assets, e.g. 'assets'", required=True)
+    pack_parser.add_argument("--output", help="Path of the pack", default='assets.pack')
+
+    analyze_parser = subparsers.add_parser("analyze", help="Analyse the graph of a story")
+    analyze_parser.add_argument("--input", help="Story to analyse: a Python script, a '.vn' story file or a '.jsonl'/'.csv' story file", required=True)
+    analyze_parser.add_argument("--json", help="Print the analysis as JSON", action="store_true")
+
+    simulate_parser = subparsers.add_parser("simulate", help="Simulate many playthroughs of a story with random choices")
+    simulate_parser.add_argument("--input", help="Story to simulate: a Python script, a '.vn' story file or a '.jsonl'/'.csv' story file", required=True)
+    simulate_parser.add_argument("--players", help="Number of simulated players", type=int, default=1000000)
+    simulate_parser.add_argument("--max_steps", help="Maximum number of choices made by a player", type=int, default=1000)
+    simulate_parser.add_argument("--weights", help="JSON file with the weights of the choices of each scene, e.g. {\"Start\": [3, 1]}")
+    simulate_parser.add_argument("--seed", help="Seed of the random choices", type=int)
+    simulate_parser.add_argument("--top", help="Number of most visited scenes printed", type=int, default=10)
+
+    serve_parser = subparsers.add_parser("serve", help="Serve a story to many players over TCP, one JSON message per line")
+    serve_parser.add_argument("--input", help="Story to serve: a Python script, a '.vn' story file or a '.jsonl'/'.csv' story file", required=True)
+    serve_parser.add_argument("--host", help="Address to listen on", default='127.0.0.1')
+    serve_parser.add_argument("--port", help="Port to listen on", type=int, default=8765)
+
+    load_test_parser = subparsers.add_parser("loadtest", help="Play many sessions against a running server")
+    load_test_parser.add_argument("--host", help="Address of the server", default='127.0.0.1')
+    load_test_parser.add_argument("--port", help="Port of the server", type=int, default=8765)
+    load_test_parser.add_argument("--sessions", help="Number of sessions", type=int, default=1000)
+    load_test_parser.add_argument("--connections", help="Number of connections the sessions are split among", type=int, default=10)
+    load_test_parser.add_argument("--steps", help="Number of choices made by each session", type=int, default=10)
+
+    dev_parser = subparsers.add_parser("dev", help="Run a story in a window, applying the changes of its files while it runs")
+    dev_parser.add_argument("--input", help="Story to run: a Python script, a '.vn' story file or a '.jsonl'/'.csv' story file", required=True)
+
+    report_parser = subparsers.add_parser("report", help="Print the statistics of the scenes and choices recorded by the players")
+    report_parser.add_argument("--input", help="Analytics database written by the game", default='analytics.db')
+    report_parser.add_argument("--json", help="Print the whole report as JSON", action="store_true")
+    report_parser.add_argument("--top", help="Number of most visited scenes printed", type=int, default=20)
     args = parser.parse_args()
 
     if args.subcommand is None:
         print("No action given. Use -h to see the available actions.")
-    
-    if args.subcommand == "build":
-        build(str(args.resolutions).split(','), str(args.languages), str(args.initial_lang), str(args.input), str(args.output))
+    elif args.subcommand == "build":
+        resolution = str(args.resolution)
+        if args.resolutions:
+            warnings.warn("--resolutions is deprecated, a single executable supports every resolution. Use --resolution to choose the initial one.")
+            resolution = str(args.resolutions).split(',')[0]
+        build(resolution, str(args.languages), str(args.initial_lang), str(args.input), str(args.output))
+    elif args.subcommand == "pack":
+        pack(str(args.input), str(args.output))
+    elif args.subcommand == "analyze":
+        analyze(str(args.input), args.json)
+    elif args.subcommand == "simulate":
+        simulate(str(args.input), args.players, args.max_steps, args.weights, args.seed, args.top)
+    elif args.subcommand == "serve":
+        serve(str(args.input), args.host, args.port)
+    elif args.subcommand == "loadtest":
+        load_test(args.host, args.port, args.sessions, args.connections, args.steps)
+    elif args.subcommand == "dev":
+        dev(str(args.input))
+    elif args.subcommand == "report":
+        report(str(args.input), args.json, args.top)
     else:
-        print("Unknown action:", args.action)
+        print("Unknown action:", args.subcommand)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,477 @@
+import os
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+from vnengine.base.scene import _Scene
+from vnengine.pack import asset_exists
+from vnengine.loader import StreamingStory
+from vnengine.story import Story
+
+__all__: List[str] = ['StoryReloader', 'diff_stories', 'develop']
+
+def _script_signature(script: Optional[Callable]) -> Optional[tuple]:
+    """
+    Gets the name and the code of the script of a scene. Reloading a source creates new functions, so the script is
+    compared by its code instead of by identity.
+
+    Args:
+        script (Callable): The script, or None.
+
+    Returns:
+        tuple: The signature of the script, or None if the scene has no script.
+    """
+    if script is None:
+        return None
+    code = getattr(script, '__code__', None)
+    name = getattr(script, '__qualname__', type(script).__qualname__)
+    if code is None:
+        return (name,)
+    return (name, code.co_code, code.co_consts, code.co_names)
+
+def _scene_signature(scene: _Scene) -> tuple:
+    """
+    Gets everything shown or played by a scene, to find the scenes that changed between two versions of a story.
+
+    Args:
+        scene (_Scene): The scene.
+
+    Returns:
+        tuple: The signature of the scene.
+    """
+    return (
+        scene.character_text,
+        scene.background_display_img,
+        tuple((choice.go_to_scene, choice.choice_text, choice.condition, choice.effects) for choice in scene.choices),
+        scene.music,
+        tuple(sorted(scene.voices.items(), key=lambda item: str(item[0]))),
+        tuple(scene.sprites),
+        tuple(scene.overlays),
+        scene.animation.key() if scene.animation else None,
+        _script_signature(scene.script),
+        tuple(effect.key() for effect in scene.effects),
+    )
+
+def _signatures(story: Story) -> Dict[str, tuple]:
+    return {name: _scene_signature(story.scenes[name]) for name in story.scenes_names}
+
+def diff_stories(old: Story, new: Story) -> Dict[str, List[str]]:
+    """
+    Compares the scenes of two versions of a story.
+
+    Args:
+        old (Story): The previous version of the story.
+        new (Story): The new version of the story.
+
+    Returns:
+        Dict[str, List[str]]: The names of the 'added', 'removed' and 'changed' scenes.
+    """
+    return _diff(_signatures(old), _signatures(new))
+
+def _diff(old: Dict[str, tuple], new: Dict[str, tuple]) -> Dict[str, List[str]]:
+    return {
+        'added': [name for name in new if name not in old],
+        'removed': [name for name in old if name not in new],
+        'changed': [name for name in new if name in old and new[name] != old[name]],
+    }
+
+def _asset_files(story: Story) -> Set[str]:
+    """
+    Gets every image, audio and font file used by a story.
+
+    Args:
+        story (Story): The story.
+
+    Returns:
+        Set[str]: The paths of the files.
+    """
+    files = set(story.audio_files())
+    if story.starting_background:
+        files.add(story.starting_background)
+    for expressions in story.characters.values():
+        files.update(expressions.values())
+    files.update(story.fonts.values())
+    for scene in story.scenes.values():
+        files.update(path for path, _, _ in scene.layers())
+        if scene.animation:
+            files.update(scene.animation.frames)
+    return files
+
+def _materialize(story: Story) -> Story:
+    """
+    Gets a story with every scene in memory, so its scenes can be replaced while the game runs. Stories loaded on demand
+    are copied.
+
+    Args:
+        story (Story): The story.
+
+    Returns:
+        Story: The story, or a copy with every scene loaded.
+    """
+    if type(story) is Story:
+        return story
+    plain = Story()
+    for attribute in ('starting_background', 'starting_music', 'characters', 'languages', 'language', 'resolution', 'display_mode', 'asset_pack',
+                      'fonts', 'variables', 'slots', 'analytics', 'memory_budget', 'low_memory'):
+        setattr(plain, attribute, getattr(story, attribute))
+    plain.scenes_names = list(story.scenes_names)
+    plain.scenes = {name: story.scenes[name] for name in plain.scenes_names}
+    plain.number_scenes = len(plain.scenes_names)
+    # every scene was read, so the file of the story is not needed anymore
+    if isinstance(story, StreamingStory):
+        story.close()
+    return plain
+
+def _validate_scenes(story: Story, names: Iterable[str]) -> None:
+    """
+    Validates some scenes of a story: their choices go to defined scenes and their images and audio files exist.
+
+    Args:
+        story (Story): The story.
+        names (Iterable[str]): The names of the scenes to validate.
+
+    Raises:
+        ValueError: If a choice goes to a scene that is not defined or a file is not found.
+    """
+    for name in names:
+        scene = story.scenes[name]
+        for target in (choice.go_to_scene for choice in scene.choices):
+            if target not in story.scenes:
+                raise ValueError(f"Scene {target} is not defined in the story. Define this scene so it can be used in a choice.")
+        for path in [path for path, _, _ in scene.layers()] + (scene.animation.frames if scene.animation else []):
+            if not asset_exists(path):
+                raise ValueError(f"Image {path} on Scene {name} was not found. Check the Path.")
+        for path in [scene.music] + list(scene.voices.values()):
+            if path and not asset_exists(path):
+                raise ValueError(f"Audio file {path} on Scene {name} was not found. Check the Path.")
+
+def _stamp(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+class _Watcher:
+    """
+    Watches files for changes from a background thread, by their modification time and size.
+
+    Attributes:
+        stamps (Dict[str, tuple]): The modification time and size of each watched file, None if it doesn't exist.
+        changed (Set[str]): The files changed since the last call to `take`.
+        interval (float): The seconds between two checks of the files.
+    """
+
+    def __init__(self, paths: Iterable[str], interval: float = 0.25) -> None:
+        """
+        Starts watching files.
+
+        Args:
+            paths (Iterable[str]): The paths of the files.
+            interval (float, optional): The seconds between two checks of the files. Defaults to 0.25.
+        """
+        self.stamps: Dict[str, Optional[Tuple[int, int]]] = {path: _stamp(path) for path in paths}
+        self.changed: Set[str] = set()
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, name='vnengine-watcher', daemon=True)
+        self.thread.start()
+
+    def _run(self) -> None:
+        while not self.stopped.wait(self.interval):
+            self.check()
+
+    def check(self) -> None:
+        """
+        Checks the watched files once. Called by the background thread.
+        """
+        with self.lock:
+            paths = list(self.stamps)
+        stamps = {path: _stamp(path) for path in paths}
+        with self.lock:
+            for path, stamp in stamps.items():
+                if path in self.stamps and self.stamps[path] != stamp:
+                    self.stamps[path] = stamp
+                    self.changed.add(path)
+
+    def watch(self, paths: Iterable[str]) -> None:
+        """
+        Replaces the watched files. Files already watched keep their state.
+
+        Args:
+            paths (Iterable[str]): The paths of the files.
+        """
+        paths = set(paths)
+        with self.lock:
+            added = paths.difference(self.stamps)
+            self.stamps = {path: stamp for path, stamp in self.stamps.items() if path in paths}
+        stamps = {path: _stamp(path) for path in added}
+        with self.lock:
+            self.stamps.update(stamps)
+
+    def take(self) -> Set[str]:
+        """
+        Gets the files changed since the last call.
+
+        Returns:
+            Set[str]: The paths of the changed files.
+        """
+        with self.lock:
+            changed, self.changed = self.changed, set()
+        return changed
+
+    def close(self) -> None:
+        """
+        Stops watching the files.
+        """
+        self.stopped.set()
+
+class StoryReloader:
+    """
+    Applies the changes of the source of a story and of its assets to the story of a running game.
+
+    Only the scenes that changed are replaced and validated again, with the scenes whose choices go to removed scenes, and
+    only the cached images, sounds, translations and rendered choices of what changed are dropped. The player stays at the
+    current scene, or goes back to the last visited scene that still exists.
+
+    Attributes:
+        story (Story): The running story, with every scene in memory.
+        input (str): The source of the story: a Python script, a '.vn' story file or a '.jsonl'/'.csv' story file.
+        game (_Game): The running game, or None to only update the story.
+        signatures (Dict[str, tuple]): The signature of each scene of the running story.
+        predecessors (Dict[str, Set[str]]): The names of the scenes with a choice going to each scene.
+        watcher (_Watcher): The watcher of the source and the assets of the story.
+    """
+
+    def __init__(self, story: Story, input: str, game=None, interval: float = 0.25) -> None:
+        """
+        Starts watching the source and the assets of a story.
+
+        Args:
+            story (Story): The running story. Stories loaded on demand must be loaded with `_materialize` first.
+            input (str): The source of the story.
+            game (_Game, optional): The running game. Defaults to None.
+            interval (float, optional): The seconds between two checks of the files. Defaults to 0.25.
+        """
+        self.story = story
+        self.input = input
+        self.game = game
+        self.signatures = _signatures(story)
+        self.predecessors: Dict[str, Set[str]] = {}
+        for name in story.scenes_names:
+            for choice in story.scenes[name].choices:
+                self.predecessors.setdefault(choice.go_to_scene, set()).add(name)
+        self.watcher = _Watcher([input] + sorted(_asset_files(story)), interval)
+
+    def update(self) -> None:
+        """
+        Called once per frame: applies the changes found by the watcher.
+        """
+        changed = self.watcher.take()
+        if self.input in changed:
+            self.reload_story()
+            changed.discard(self.input)
+        if changed:
+            self.reload_assets(changed)
+
+    def reload_story(self) -> Optional[Dict[str, List[str]]]:
+        """
+        Loads the source of the story again and applies its changes. The running story is kept when the new source has an
+        error.
+
+        Returns:
+            Dict[str, List[str]]: The names of the 'added', 'removed' and 'changed' scenes, or None if the source has an error.
+        """
+        # the import is here because the CLI imports the whole engine
+        from vnengine.cli import load_input
+        try:
+            new = _materialize(load_input(self.input))
+            signatures = _signatures(new)
+            diff = _diff(self.signatures, signatures)
+            if new.slots != self.story.slots:
+                # the conditions of the scenes kept from the running story were compiled for the old slots of the variables
+                diff['changed'] += [name for name in new.scenes_names if name in self.signatures and name not in diff['changed']
+                                    and any(choice.condition or choice.effects for choice in new.scenes[name].choices)]
+            self.validate(new, diff)
+        except Exception as error:
+            # an error in the edited source is reported without closing the game
+            print(f"Not reloaded {self.input}: {error}")
+            return None
+
+        old_names = self.story.scenes_names
+        old_scenes = self.story.scenes
+        self.apply(new, diff)
+        self.signatures = signatures
+        for name in diff['removed'] + diff['changed']:
+            for choice in old_scenes[name].choices:
+                self.predecessors.get(choice.go_to_scene, set()).discard(name)
+        for name in diff['added'] + diff['changed']:
+            for choice in new.scenes[name].choices:
+                self.predecessors.setdefault(choice.go_to_scene, set()).add(name)
+        self.watcher.watch([self.input] + sorted(_asset_files(self.story)))
+        if self.game is not None:
+            self.update_game(old_names, old_scenes, diff)
+        print(f"Reloaded {self.input}: {len(diff['changed'])} changed, {len(diff['added'])} added, {len(diff['removed'])} removed")
+        return diff
+
+    def validate(self, new: Story, diff: Dict[str, List[str]]) -> None:
+        """
+        Validates the scenes of a new version of the story affected by its changes.
+
+        Args:
+            new (Story): The new version of the story.
+            diff (Dict[str, List[str]]): The changes of the story.
+
+        Raises:
+            ValueError: If the new version is not valid.
+        """
+        if len(new.scenes_names) == 0:
+            raise ValueError("There are no scenes defined for the visual novel.")
+        orphans = {source for name in diff['removed'] for source in self.predecessors.get(name, ())}
+        _validate_scenes(new, set(diff['added'] + diff['changed']) | orphans.difference(diff['removed']))
+        if new.starting_background != self.story.starting_background and not asset_exists(new.starting_background):
+            raise ValueError(f"Image {new.starting_background} of the starting menu was not found. Check the Path.")
+        if new.characters != self.story.characters:
+            new.validateCharacters()
+        if new.fonts != self.story.fonts:
+            new.validateFonts()
+
+    def apply(self, new: Story, diff: Dict[str, List[str]]) -> None:
+        """
+        Replaces the changed scenes and the menu settings of the running story. The scenes that didn't change are kept.
+
+        Args:
+            new (Story): The new version of the story.
+            diff (Dict[str, List[str]]): The changes of the story.
+        """
+        replaced = set(diff['added'] + diff['changed'])
+        scenes = {name: new.scenes[name] if name in replaced else self.story.scenes[name] for name in new.scenes_names}
+        for number, name in enumerate(new.scenes_names):
+            scenes[name].scene_number = number
+        self.story.scenes = scenes
+        self.story.scenes_names = list(new.scenes_names)
+        self.story.number_scenes = len(new.scenes_names)
+        self.story.starting_background = new.starting_background
+        self.story.starting_music = new.starting_music
+        self.story.characters = new.characters
+        self.story.fonts = new.fonts
+        self.story.variables = new.variables
+        self.story.slots = new.slots
+
+    def update_game(self, old_names: List[str], old_scenes: Dict[str, _Scene], diff: Dict[str, List[str]]) -> None:
+        """
+        Updates the running game after the story changed: keeps the player at the current scene, drops the translations and
+        rendered choices of the changed scenes and builds the current screen again. Before a game is started, e.g. on the
+        main menu, only the caches and the current screen are updated.
+
+        Args:
+            old_names (List[str]): The names of the scenes before the change, by scene number.
+            old_scenes (Dict[str, _Scene]): The scenes before the change.
+            diff (Dict[str, List[str]]): The changes of the story.
+        """
+        from vnengine.runtime import CompiledStory, SeenScenes
+        from vnengine.utils.font import _FontRegistry
+
+        game = self.game
+        numbers = {name: scene.scene_number for name, scene in self.story.scenes.items()}
+        renumbered = old_names != self.story.scenes_names
+        history = [numbers[old_names[number]] for number in game.runtime.history if old_names[number] in numbers]
+        playing = game.current_scene is not None
+        current_changed = playing and (game.current_scene in diff['changed'] or game.current_scene not in numbers)
+        variables = game.runtime.values()
+        game.runtime.compiled = CompiledStory(self.story)
+        # the variables are kept by name, the values before each choice can't be undone on a changed history
+        game.runtime.load_state({'history': history if history else [0], 'variables': variables})
+        if playing:
+            game.current_scene = game.runtime.current_scene
+        if renumbered:
+            seen = SeenScenes(len(self.story.scenes_names))
+            for number, name in enumerate(old_names):
+                if number in game.seen and name in numbers:
+                    seen.add(numbers[name])
+            game.seen = seen
+
+        stale = set()
+        for name in diff['changed'] + diff['removed']:
+            scene = old_scenes[name]
+            stale.update([name, scene.character_text] + [choice.choice_text for choice in scene.choices])
+        game.translations = {key: text for key, text in game.translations.items() if key[0] not in stale}
+        if game.fonts.faces != self.story.fonts:
+            game.fonts = _FontRegistry(self.story.fonts)
+            game.texts.clear()
+            game.rows.clear()
+        elif renumbered:
+            game.rows.clear()
+        else:
+            affected = {numbers[name] for name in diff['changed']}
+            game.rows.discard(lambda key: key[0][1] in affected)
+
+        game.music_position = None
+        game.audio_position = None if current_changed else (len(game.runtime.history), game.runtime.current)
+        game.rebuild_screen()
+        game.draw_screen()
+
+    def reload_assets(self, paths: Iterable[str]) -> None:
+        """
+        Drops the cached copies of changed images, sounds and fonts, so they are loaded again, and builds the current screen again.
+        Removed files keep their cached copies.
+
+        Args:
+            paths (Iterable[str]): The paths of the changed files.
+        """
+        for path in sorted(paths):
+            if not os.path.exists(path):
+                print(f"Asset {path} was removed, its cached copy is used until it is restored")
+                continue
+            if self.game is not None:
+                self.game.forget_animation(path)
+                self.game.compositor.forget(path)
+                self.game.audio.forget(path)
+                self.game.gallery.forget(path)
+                if path in self.game.fonts.data:
+                    self.game.fonts.forget(path)
+                    self.game.texts.clear()
+                    self.game.rows.clear()
+            print(f"Reloaded {path}")
+        if self.game is not None:
+            self.game.rebuild_screen()
+            self.game.draw_screen()
+
+    def close(self) -> None:
+        """
+        Stops watching the files.
+        """
+        self.watcher.close()
+
+def develop(input: str, interval: float = 0.25) -> None:
+    """
+    Runs a story in a window and applies the changes of its source and assets while it runs.
+
+    Args:
+        input (str): The source of the story: a Python script, a '.vn' story file or a '.jsonl'/'.csv' story file.
+        interval (float, optional): The seconds between two checks of the files. Defaults to 0.25.
+
+    Raises:
+        ValueError: If the story is not valid when the game starts.
+    """
+    from vnengine.cli import load_input
+
+    story = _materialize(load_input(input))
+    if not story.language in story.languages:
+        raise ValueError(f"The language {story.language} is not on the available languages defined. Add this languages to the languages available.")
+    story.set_display_mode('resizable')
+
+    def validate() -> None:
+        # the asset pack is not mounted, so the files being edited are the ones shown
+        story.validateImages()
+        story.validateAudio()
+        story.validatePathing()
+
+    from vnengine.utils.game import _Game
+
+    game = _Game(story)
+    game.startup.submit('validation', validate)
+    game.reloader = StoryReloader(story, input, game, interval)
+    try:
+        game.run()
+    finally:
+        game.reloader.close()
@@ -0,0 +1,220 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+import os
+import pygame
+
+try:
+    import numpy as np
+except ImportError: # pragma: no cover
+    np = None
+
+__all__: List[str] = ['render_screens', 'compare_images', 'write_heatmap', 'check_golden']
+
+# the screens rendered by default, by the name of the frames and the screen of the game
+_SCREENS: Dict[str, str] = {'menu': 'start', 'scene': 'game', 'choice': 'choice', 'language': 'language'}
+
+class _OfflineTranslator:
+    """
+    Translator returning the texts as they are, so the rendered frames don't depend on the network.
+    """
+
+    class _Translation:
+        def __init__(self, text: str) -> None:
+            self.text = text
+
+    def translate(self, text: str, src: str = 'pt', dest: str = 'pt') -> '_OfflineTranslator._Translation':
+        return self._Translation(text)
+
+def render_screens(story, resolutions: Iterable[str] = ('hd', 'fullhd', '4k'),
+                   screens: Iterable[str] = ('menu', 'scene', 'choice', 'language')) -> Dict[str, pygame.Surface]:
+    """
+    Renders screens of a story at each resolution, without a window, e.g. to compare them with golden images. The game
+    is started from its first scene, the texts are not translated and the mouse is over no button, so the same story
+    always gives the same frames.
+
+    Set the 'SDL_VIDEODRIVER' environment variable to 'dummy' before pygame is initialized to render without a display.
+
+    Args:
+        story (Story): The story.
+        resolutions (Iterable[str], optional): The resolutions. Availables: 'hd', 'fullhd', '4k'. Defaults to every one.
+        screens (Iterable[str], optional): The screens. Availables: 'menu', 'scene', 'choice', 'language'. Defaults to
+            every one.
+
+    Returns:
+        Dict[str, pygame.Surface]: The frame of each screen at each resolution, by '<screen>-<resolution>', e.g.
+        'menu-hd'.
+
+    Raises:
+        ValueError: If a screen or a resolution is not available.
+    """
+    from vnengine.utils.game import _Game
+    screens = list(screens)
+    for screen in screens:
+        if screen not in _SCREENS:
+            raise ValueError(f"The screen {screen} is not available. Availables: {', '.join(_SCREENS)}.")
+    story.validatePathing()
+    game = _Game(story)
+    frames: Dict[str, pygame.Surface] = {}
+    try:
+        game.startup.wait('translations', 'menu background')
+        game.translator = _OfflineTranslator()
+        game.translations.clear()
+        game.runtime.start()
+        game.current_scene = game.runtime.current_scene
+        for resolution in resolutions:
+            if resolution not in game.resolution:
+                raise ValueError(f"The resolution {resolution} is not available. Availables: {', '.join(game.resolution)}.")
+            game.set_resolution(resolution, 'windowed')
+            for screen in screens:
+                game.scene = _SCREENS[screen]
+                game.rebuild_screen()
+                game.draw_screen()
+                frames[f'{screen}-{resolution}'] = game.screen.copy()
+    finally:
+        game.startup.close()
+        game.stop_animation()
+        game.slots.close()
+        game.gallery.close()
+        game.audio.close()
+    return frames
+
+def _packed(surface: pygame.Surface) -> pygame.Surface:
+    """
+    Gets a surface with 8 bits per channel packed in 32-bit pixels, the surface itself if it already has them.
+
+    Args:
+        surface (pygame.Surface): The surface.
+
+    Returns:
+        pygame.Surface: The surface with packed pixels.
+    """
+    if surface.get_bitsize() in (24, 32) and surface.get_bytesize() == 4 and surface.get_masks()[:3] == (0xFF0000, 0xFF00, 0xFF):
+        return surface
+    packed = pygame.Surface(surface.get_size(), 0, 32, (0xFF0000, 0xFF00, 0xFF, 0))
+    packed.blit(surface, (0, 0))
+    return packed
+
+def compare_images(actual: pygame.Surface, expected: pygame.Surface, tolerance: int = 16) -> Optional['np.ndarray']:
+    """
+    Compares two images of the same size. A channel may differ by up to `tolerance`, e.g. for the antialiasing of texts
+    rendered by another version of FreeType.
+
+    The pixels are compared as 32-bit integers in a single pass, and the difference of each channel is only computed for
+    the pixels that differ, so comparing two 4k frames that match takes a few milliseconds.
+
+    Args:
+        actual (pygame.Surface): The rendered image.
+        expected (pygame.Surface): The golden image.
+        tolerance (int, optional): The largest difference allowed in a channel, from 0 to 255. Defaults to 16.
+
+    Returns:
+        np.ndarray: None if the images match, or else the (width, height) array of the largest channel difference of each
+        pixel, 0 for the pixels within the tolerance.
+
+    Raises:
+        ImportError: If NumPy is not installed.
+        ValueError: If the images don't have the same size.
+    """
+    if np is None:
+        raise ImportError("NumPy is required to compare images. Install it with 'pip install numpy'.")
+    if actual.get_size() != expected.get_size():
+        raise ValueError(f"The image is {actual.get_size()} and the golden image is {expected.get_size()}.")
+    # the pixels are read in the order they are stored, a row after the other
+    first = pygame.surfarray.pixels2d(_packed(actual)).ravel('F')
+    second = pygame.surfarray.pixels2d(_packed(expected)).ravel('F')
+    try:
+        changed = np.bitwise_xor(first, second)
+        changed &= 0xFFFFFF
+        if not changed.any():
+            return None
+        indices = np.flatnonzero(changed)
+        a, b = first[indices].astype(np.int32), second[indices].astype(np.int32)
+    finally:
+        del first, second
+    x, y = indices % actual.get_width(), indices // actual.get_width()
+    difference = np.zeros(len(x), np.int32)
+    for shift in (16, 8, 0):
+        np.maximum(difference, np.abs(((a >> shift) & 0xFF) - ((b >> shift) & 0xFF)), out=difference)
+    over = difference > tolerance
+    if not over.any():
+        return None
+    heat = np.zeros(actual.get_size(), np.uint8)
+    heat[x[over], y[over]] = difference[over]
+    return heat
+
+def write_heatmap(difference: 'np.ndarray', expected: pygame.Surface, path: str) -> None:
+    """
+    Writes a heatmap of the difference between two images: the golden image darkened, with the pixels that differ in red,
+    brighter the more they differ.
+
+    Args:
+        difference (np.ndarray): The difference, as returned by `compare_images`.
+        expected (pygame.Surface): The golden image.
+        path (str): The path of the PNG file.
+    """
+    heatmap = pygame.surfarray.array3d(_packed(expected)) // 4
+    changed = difference > 0
+    # even the smallest difference over the tolerance is clearly visible
+    heatmap[changed] = 0
+    heatmap[changed, 0] = np.maximum(difference[changed], 96)
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    pygame.image.save(pygame.surfarray.make_surface(heatmap), path)
+
+def check_golden(frames: Dict[str, pygame.Surface], folder: str, failures: Optional[str] = None, tolerance: int = 16,
+                 max_ratio: float = 0.0, update: bool = False) -> List[str]:
+    """
+    Compares frames with the golden images of a folder, '<name>.png' for each frame. For each frame that doesn't match,
+    the frame and a heatmap of the difference are written to the failures folder, as '<name>.png' and '<name>.diff.png'.
+
+    The golden images are decoded by worker threads while the frames already decoded are compared, so hundreds of 4k
+    frames are checked in seconds.
+
+    Args:
+        frames (Dict[str, pygame.Surface]): The frames, by name, e.g. as returned by `render_screens`.
+        folder (str): The folder of the golden images.
+        failures (str, optional): The folder the frames that don't match and their heatmaps are written to. Defaults to
+            the 'failures' folder inside the folder of the golden images.
+        tolerance (int, optional): The largest difference allowed in a channel, see `compare_images`. Defaults to 16.
+        max_ratio (float, optional): The fraction of the pixels allowed to differ by more than the tolerance. Defaults
+            to 0.
+        update (bool, optional): Whether the frames are written as the new golden images instead of being compared,
+            e.g. after an intended change of the rendering. Defaults to False.
+
+    Returns:
+        List[str]: A message for each frame that doesn't match, empty if every frame matches.
+    """
+    failures = failures if failures is not None else os.path.join(folder, 'failures')
+    if update:
+        os.makedirs(folder, exist_ok=True)
+        for name, frame in frames.items():
+            pygame.image.save(frame, os.path.join(folder, f'{name}.png'))
+        return []
+
+    def load(name: str) -> Optional[pygame.Surface]:
+        path = os.path.join(folder, f'{name}.png')
+        return pygame.image.load(path) if os.path.exists(path) else None
+
+    messages: List[str] = []
+    with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1), thread_name_prefix='vnengine-golden') as executor:
+        goldens = executor.map(load, frames)
+        for (name, frame), expected in zip(frames.items(), goldens):
+            if expected is None:
+                messages.append(f"{name}: there is no golden image in {folder}.")
+                continue
+            try:
+                difference = compare_images(frame, expected, tolerance)
+            except ValueError as e:
+                messages.append(f"{name}: {e}")
+                continue
+            if difference is None:
+                continue
+            count = int(np.count_nonzero(difference))
+            if count <= max_ratio * difference.size:
+                continue
+            os.makedirs(failures, exist_ok=True)
+            pygame.image.save(frame, os.path.join(failures, f'{name}.png'))
+            write_heatmap(difference, expected, os.path.join(failures, f'{name}.diff.png'))
+            messages.append(f"{name}: {count} pixels differ by up to {int(difference.max())}, see {os.path.join(failures, name + '.diff.png')}.")
+    return messages
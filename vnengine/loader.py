@@ -0,0 +1,654 @@
+import csv
+import json
+import os
+import threading
+import warnings
+from array import array
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from vnengine.base.animation import _Animation
+from vnengine.base.choice import _Choice
+from vnengine.base.effect import _Effect
+from vnengine.base.condition import _compile_condition, _compile_effects
+from vnengine.base.graph import _StoryGraph
+from vnengine.base.scene import _Scene
+from vnengine.pack import asset_exists
+from vnengine.story import Story
+
+__all__: List[str] = ['StreamingStory', 'load_story']
+
+def _read_lines(path: str) -> Iterator[Tuple[int, int, bytes]]:
+    """
+    Reads a file line by line, without holding more than one line in memory.
+
+    Args:
+        path (str): The path of the file.
+
+    Yields:
+        tuple: The line number, the byte offset of the line and the line.
+    """
+    with open(path, 'rb') as file:
+        offset = 0
+        for number, line in enumerate(file, 1):
+            yield number, offset, line
+            offset += len(line)
+
+def _parse_line(line: bytes, kind: str, header: Optional[List[str]]) -> Optional[dict]:
+    """
+    Parses one line of a story file into a record.
+
+    Args:
+        line (bytes): The line to parse.
+        kind (str): The format of the file, 'jsonl' or 'csv'.
+        header (List[str], optional): The columns of a csv file.
+
+    Returns:
+        dict: The record, or None for blank lines.
+    """
+    text = line.decode('utf-8-sig').strip()
+    if not text:
+        return None
+    if kind == 'jsonl':
+        return json.loads(text)
+    row = next(csv.reader([text]))
+    return {column: value.replace('\\n', '\n') for column, value in zip(header, row) if value != ''}
+
+def _parse_records(path: str, lines: Iterable[Tuple[int, int, bytes]], kind: str) -> Iterator[Tuple[int, int, dict]]:
+    """
+    Turns the lines of a story file into records.
+
+    Args:
+        path (str): The path of the file, used in error messages.
+        lines (Iterable[tuple]): The lines read by `_read_lines`.
+        kind (str): The format of the file, 'jsonl' or 'csv'.
+
+    Yields:
+        tuple: The line number, the byte offset and the record of each line.
+    """
+    header = None
+    for number, offset, line in lines:
+        if kind == 'csv' and header is None:
+            header = next(csv.reader([line.decode('utf-8-sig').strip()]))
+            yield number, offset, {'type': 'header', 'columns': header}
+            continue
+        try:
+            record = _parse_line(line, kind, header)
+        except (ValueError, UnicodeDecodeError) as e:
+            raise ValueError(f"Line {number} of {path} is not valid: {e}")
+        if record is None:
+            continue
+        if not isinstance(record, dict) or record.get('type') not in ('story', 'scene', 'choice'):
+            raise ValueError(f"Line {number} of {path} must have a type: 'story', 'scene' or 'choice'.")
+        yield number, offset, record
+
+def _scene_audio(record: dict) -> Tuple[Optional[str], Dict[Optional[str], str]]:
+    """
+    Gets the music and voice-overs of a scene record.
+
+    Args:
+        record (dict): The scene record, with the optional fields 'music', 'voice' and 'voice_<language>'.
+
+    Returns:
+        tuple: The music of the scene, as in `_Scene.music`, and its voice-overs by language.
+    """
+    music = record.get('music')
+    if music is not None:
+        music = music if music != 'none' else ''
+    voices = {None if key == 'voice' else key[len('voice_'):]: value for key, value in record.items()
+              if (key == 'voice' or key.startswith('voice_')) and value}
+    return music, voices
+
+def _scene_animation(record: dict) -> Optional[_Animation]:
+    """
+    Gets the animated background of a scene record.
+
+    Args:
+        record (dict): The scene record, with the optional field 'animation': {'frames': [images], 'fps': ...} or
+            {'sheet': image, 'columns': ..., 'rows': ..., 'count': ..., 'fps': ...}, both with an optional 'loop'.
+
+    Returns:
+        _Animation: The animation, or None if the scene has no animated background.
+
+    Raises:
+        ValueError: If the animation is not valid.
+    """
+    animation = record.get('animation')
+    if not animation:
+        return None
+    if not isinstance(animation, dict) or ('frames' in animation) == ('sheet' in animation):
+        raise ValueError("an animation must have either 'frames' or a 'sheet'.")
+    frames = animation['frames'] if 'frames' in animation else animation['sheet']
+    return _Animation(frames, animation.get('fps', 12.0), animation.get('columns', 1), animation.get('rows', 1),
+                      animation.get('count'), animation.get('loop', True))
+
+def _scene_effects(record: dict) -> List[_Effect]:
+    """
+    Gets the ambient effects of a scene record.
+
+    Args:
+        record (dict): The scene record, with the optional field 'effects': a list of kinds, or of [kind, count].
+
+    Returns:
+        List[_Effect]: The effects.
+
+    Raises:
+        ValueError: If an effect is not valid.
+    """
+    effects = record.get('effects') or []
+    if not isinstance(effects, list):
+        raise ValueError("the effects of a scene must be a list, e.g. ['rain', ['dust', 500]].")
+    return [_Effect(effect) if isinstance(effect, str) else _Effect(*effect) for effect in effects]
+
+class _SceneStore(Mapping):
+    """
+    Read-only mapping of scene names to scenes, loading the scenes from the story file when they are used.
+
+    The scenes near the player are kept resident; every other scene loaded is kept in a least recently used cache.
+
+    Attributes:
+        story (StreamingStory): The story whose scenes are stored.
+        cache_size (int): The number of scenes kept besides the resident ones.
+        resident (Dict[str, _Scene]): The scenes near the player.
+        cache (OrderedDict): The other scenes loaded, from the least to the most recently used.
+    """
+
+    def __init__(self, story: 'StreamingStory', cache_size: int) -> None:
+        """
+        Initializes the store.
+
+        Args:
+            story (StreamingStory): The story whose scenes are stored.
+            cache_size (int): The number of scenes kept besides the resident ones.
+        """
+        self.story = story
+        self.cache_size = cache_size
+        self.resident: Dict[str, _Scene] = {}
+        self.cache: 'OrderedDict[str, _Scene]' = OrderedDict()
+        self.lock = threading.RLock()
+
+    def __getitem__(self, name: str) -> _Scene:
+        with self.lock:
+            scene = self.resident.get(name)
+            if scene is not None:
+                return scene
+            scene = self.cache.get(name)
+            if scene is not None:
+                self.cache.move_to_end(name)
+                return scene
+            scene = self.story._load_scene(self.story.numbers[name])
+            self._remember(name, scene)
+            return scene
+
+    def __iter__(self) -> Iterator[str]:
+        return (name for number, name in enumerate(self.story.scenes_names) if self.story.offsets[number] >= 0)
+
+    def __len__(self) -> int:
+        return self.story.number_scenes
+
+    def __contains__(self, name: object) -> bool:
+        number = self.story.numbers.get(name)
+        return number is not None and self.story.offsets[number] >= 0
+
+    def _remember(self, name: str, scene: _Scene) -> None:
+        self.cache[name] = scene
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+
+    def focus(self, names: Iterable[str]) -> None:
+        """
+        Makes the given scenes the resident ones. The scenes that stop being resident go to the cache.
+
+        Args:
+            names (Iterable[str]): The names of the scenes near the player.
+        """
+        with self.lock:
+            resident = {name: self[name] for name in names}
+            for name, scene in self.resident.items():
+                if name not in resident:
+                    self._remember(name, scene)
+            for name in resident:
+                self.cache.pop(name, None)
+            self.resident = resident
+
+class StreamingStory(Story):
+    """
+    A story read from a line-oriented story file, for stories too large to be held in memory.
+
+    Only a compact index of the story is built while the file is streamed: the scene names, the byte offset of each scene,
+    the images and the choices as integer arrays. The texts are read from the file when a scene is used and only the scenes
+    near the player are kept resident.
+
+    The story file stays open while scenes are read from it; close the story, or use it as a context manager, when it is
+    no longer used.
+
+    Attributes:
+        path (str): The path of the story file.
+        format (str): The format of the story file, 'jsonl' or 'csv'.
+        numbers (Dict[str, int]): The number of each scene by name.
+        offsets (array): The byte offset of each scene in the file, -1 for scenes used in choices but not defined.
+        images (List[str]): The distinct images of the story.
+        scene_images (array): The index in `images` of the image of each scene.
+        choices_start (array): The index in the choice arrays of the first choice of each scene.
+        choices_target (array): The number of the scene each choice goes to.
+        choices_offset (array): The byte offset of each choice in the file.
+        choices_condition (Dict[int, Callable]): The compiled condition of the choices with a condition, by choice index.
+        choices_effects (Dict[int, Callable]): The compiled effects of the choices with effects, by choice index.
+        radius (int): How many choices away from the player the scenes are kept resident.
+        audio (Dict[str, None]): The distinct audio files of the story, in the order they appear.
+        overlays (Dict[str, None]): The distinct overlay images of the story, in the order they appear.
+        frames (Dict[str, None]): The distinct images of the animated backgrounds of the story, in the order they appear.
+    """
+
+    def __init__(self, path: str, radius: int = 2, cache_size: int = 256) -> None:
+        """
+        Initializes the story by streaming its file.
+
+        Args:
+            path (str): The path of the story file, with extension '.jsonl' or '.csv'.
+            radius (int, optional): How many choices away from the player the scenes are kept resident. Defaults to 2.
+            cache_size (int, optional): How many other scenes are kept loaded. Defaults to 256.
+        """
+        super().__init__()
+        extension = os.path.splitext(path)[1].lower()
+        if extension not in ('.jsonl', '.csv'):
+            raise ValueError(f"The story file {path} must be a '.jsonl' or '.csv' file.")
+        self.path = path
+        self.format = extension[1:]
+        self.radius = radius
+        self.header: Optional[List[str]] = None
+        self.numbers: Dict[str, int] = {}
+        self.offsets = array('q')
+        self.images: List[str] = []
+        self.scene_images = array('i')
+        self.choices_start = array('i')
+        self.choices_target = array('i')
+        self.choices_offset = array('q')
+        self.choices_condition: Dict[int, Callable[[List[int]], bool]] = {}
+        self.choices_effects: Dict[int, Callable[[List[int]], Any]] = {}
+        self.audio: Dict[str, None] = {}
+        self.overlays: Dict[str, None] = {}
+        self.frames: Dict[str, None] = {}
+        self.scenes = _SceneStore(self, cache_size)
+        self.file = None
+        self.file_lock = threading.Lock()
+
+        self._index(_parse_records(path, _read_lines(path), self.format))
+
+    def _number(self, name: str) -> int:
+        """
+        Gets the number of a scene, numbering it the first time it is mentioned.
+
+        Args:
+            name (str): The name of the scene.
+
+        Returns:
+            int: The number of the scene.
+        """
+        number = self.numbers.get(name)
+        if number is None:
+            number = len(self.scenes_names)
+            self.numbers[name] = number
+            self.scenes_names.append(name)
+            self.offsets.append(-1)
+            self.scene_images.append(-1)
+        return number
+
+    def _index(self, records: Iterable[Tuple[int, int, dict]]) -> None:
+        """
+        Builds the index of the story from the records of its file.
+
+        Args:
+            records (Iterable[tuple]): The records yielded by `_parse_records`.
+        """
+        image_numbers: Dict[str, int] = {}
+        choices_from = array('i')
+        choices_target = array('i')
+        choices_offset = array('q')
+        conditions: Dict[int, Callable[[List[int]], bool]] = {}
+        effects: Dict[int, Callable[[List[int]], Any]] = {}
+
+        for number, offset, record in records:
+            kind = record['type']
+            if kind == 'header':
+                self.header = record['columns']
+            elif kind == 'story':
+                try:
+                    self._apply_settings(record)
+                except ValueError as e:
+                    raise ValueError(f"Line {number} of {self.path}: {e}")
+            elif kind == 'scene':
+                if 'name' not in record or 'image' not in record:
+                    raise ValueError(f"Line {number} of {self.path}: a scene must have a name and an image.")
+                scene = self._number(record['name'])
+                if self.offsets[scene] >= 0:
+                    raise ValueError(f"Line {number} of {self.path}: the scene {record['name']} is already defined.")
+                self.offsets[scene] = offset
+                image = record['image']
+                if image not in image_numbers:
+                    image_numbers[image] = len(self.images)
+                    self.images.append(image)
+                self.scene_images[scene] = image_numbers[image]
+                music, voices = _scene_audio(record)
+                if music:
+                    self.audio[music] = None
+                self.audio.update(dict.fromkeys(voices.values()))
+                try:
+                    self._sprites(record)
+                    animation = _scene_animation(record)
+                    _scene_effects(record)
+                except (TypeError, ValueError) as e:
+                    raise ValueError(f"Line {number} of {self.path}: {e}")
+                self.overlays.update(dict.fromkeys(record.get('overlays', [])))
+                if animation:
+                    self.frames.update(dict.fromkeys(animation.frames))
+                self.number_scenes += 1
+            else:
+                if 'name' not in record or 'to' not in record:
+                    raise ValueError(f"Line {number} of {self.path}: a choice must have the name of its scene and the scene it goes to.")
+                scene = self.numbers.get(record['name'])
+                if scene is None or self.offsets[scene] < 0:
+                    raise ValueError(f"Line {number} of {self.path}: the scene {record['name']} must be defined before its choices.")
+                # conditions and effects are compiled once here, so the index holds everything the runtime needs
+                try:
+                    if record.get('if'):
+                        conditions[len(choices_from)] = _compile_condition(record['if'], self.slots)
+                    if record.get('set'):
+                        effects[len(choices_from)] = _compile_effects(record['set'], self.slots)
+                except ValueError as e:
+                    raise ValueError(f"Line {number} of {self.path}: {e}")
+                choices_from.append(scene)
+                choices_target.append(self._number(record['to']))
+                choices_offset.append(offset)
+
+        # counting sort of the choices by scene, keeping the order in which they were defined
+        counts = array('i', [0]) * (len(self.scenes_names) + 1)
+        for scene in choices_from:
+            counts[scene + 1] += 1
+        for scene in range(len(self.scenes_names)):
+            counts[scene + 1] += counts[scene]
+        self.choices_start = array('i', counts)
+        self.choices_target = array('i', [0]) * len(choices_from)
+        self.choices_offset = array('q', [0]) * len(choices_from)
+        position = array('i', counts[:-1])
+        for idx, scene in enumerate(choices_from):
+            self.choices_target[position[scene]] = choices_target[idx]
+            self.choices_offset[position[scene]] = choices_offset[idx]
+            if idx in conditions:
+                self.choices_condition[position[scene]] = conditions[idx]
+            if idx in effects:
+                self.choices_effects[position[scene]] = effects[idx]
+            position[scene] += 1
+
+    def _apply_settings(self, record: dict) -> None:
+        """
+        Applies the settings of a story record.
+
+        Args:
+            record (dict): The record with the settings. The fonts are in the fields 'font' and 'font_<language>'. The
+                variables are a dictionary of initial values, or in csv files a
+                text like 'gold=10, has_key'.
+
+        Raises:
+            ValueError: If a variable is not valid.
+        """
+        if 'background' in record:
+            self.add_starting_background(record['background'])
+        if 'languages' in record:
+            languages = record['languages']
+            self.set_languages(languages.split(',') if isinstance(languages, str) else list(languages))
+        if 'language' in record:
+            self.set_initial_language(record['language'])
+        if 'resolution' in record:
+            self.set_resolution(record['resolution'])
+        if record.get('analytics'):
+            self.set_analytics(record['analytics'])
+        if record.get('memory'):
+            self.set_memory_budget(int(record['memory']), str(record.get('low_memory', '')).lower() in ('1', 'true'))
+        for character, expressions in record.get('characters', {}).items():
+            self.add_character(character, expressions)
+        variables = record.get('variables', {})
+        if isinstance(variables, str):
+            variables = dict(item.partition('=')[::2] for item in variables.split(',') if item.strip())
+        for name, value in variables.items():
+            try:
+                value = int(value) if value != '' else 0
+            except ValueError:
+                raise ValueError(f"the value of the variable {name.strip()} must be an integer.")
+            self.add_variable(name.strip(), value)
+        if 'music' in record:
+            self.add_starting_music(record['music'])
+            self.audio[record['music']] = None
+        for key, value in record.items():
+            if (key == 'font' or key.startswith('font_')) and value:
+                self.set_font(value, None if key == 'font' else key[len('font_'):])
+
+    def _read_record(self, offset: int) -> dict:
+        """
+        Reads the record at a byte offset of the story file.
+
+        Args:
+            offset (int): The byte offset of the record.
+
+        Returns:
+            dict: The record.
+        """
+        with self.file_lock:
+            if self.file is None:
+                self.file = open(self.path, 'rb')
+            self.file.seek(offset)
+            line = self.file.readline()
+        return _parse_line(line, self.format, self.header)
+
+    def _load_scene(self, number: int) -> _Scene:
+        """
+        Reads a scene and its choices from the story file.
+
+        Args:
+            number (int): The number of the scene.
+
+        Returns:
+            _Scene: The scene.
+        """
+        if self.offsets[number] < 0:
+            raise KeyError(self.scenes_names[number])
+        record = self._read_record(self.offsets[number])
+        scene = _Scene(record.get('text', ''), self.images[self.scene_images[number]], number)
+        scene.music, scene.voices = _scene_audio(record)
+        scene.sprites = self._sprites(record)
+        scene.overlays = list(record.get('overlays', []))
+        scene.animation = _scene_animation(record)
+        scene.effects = _scene_effects(record)
+        for idx in range(self.choices_start[number], self.choices_start[number + 1]):
+            record = self._read_record(self.choices_offset[idx])
+            # the conditions and effects were compiled by the index, only their texts are read again
+            choice = _Choice(record.get('text', ''), self.scenes_names[self.choices_target[idx]])
+            choice.condition, choice.predicate = record.get('if') or None, self.choices_condition.get(idx)
+            choice.effects, choice.effect = record.get('set') or None, self.choices_effects.get(idx)
+            scene.choices.append(choice)
+        return scene
+
+    def close(self) -> None:
+        """
+        Closes the story file. It is opened again if another scene is read.
+        """
+        with self.file_lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+
+    def __enter__(self) -> 'StreamingStory':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _sprites(self, record: dict) -> List[Tuple[str, float, float]]:
+        """
+        Gets the sprites of a scene record, with the images of the expressions of its characters.
+
+        Args:
+            record (dict): The scene record, with the optional field 'sprites': a list of [character, expression, x, y], where
+                x and y are optional.
+
+        Returns:
+            List[tuple]: The image and position of each sprite, as in `_Scene.sprites`.
+
+        Raises:
+            ValueError: If a character or an expression is not defined.
+        """
+        sprites = []
+        for sprite in record.get('sprites', []):
+            character, expression, *position = sprite
+            x, y = (position + [0.5, 1.0][len(position):])[:2]
+            expressions = self.characters.get(character, {})
+            if expression not in expressions:
+                raise ValueError(f"the character {character} has no expression {expression}.")
+            sprites.append((expressions[expression], float(x), float(y)))
+        return sprites
+
+    def add_scene(self, scene_name: str, character_text: str, image: str) -> None:
+        raise TypeError("Scenes of a StreamingStory are defined in its story file.")
+
+    def add_choice(self, current_scene_name: str, choice_text: str, go_to_scene: str, condition: Optional[str] = None,
+                   effects: Optional[str] = None) -> None:
+        raise TypeError("Choices of a StreamingStory are defined in its story file.")
+
+    def targets(self, number: int) -> Iterable[int]:
+        """
+        Gets the numbers of the scenes that the choices of a scene go to.
+
+        Args:
+            number (int): The number of the scene.
+
+        Returns:
+            Iterable[int]: The numbers of the scenes.
+        """
+        return self.choices_target[self.choices_start[number]:self.choices_start[number + 1]]
+
+    def focus(self, scene_name: str) -> None:
+        """
+        Keeps resident the scenes up to `radius` choices away from the scene the player is in.
+
+        Args:
+            scene_name (str): The name of the scene the player is in.
+        """
+        start = self.numbers[scene_name]
+        seen = {start}
+        frontier = [start]
+        for _ in range(self.radius):
+            next_frontier = []
+            for number in frontier:
+                for target in self.targets(number):
+                    if target not in seen:
+                        seen.add(target)
+                        next_frontier.append(target)
+            frontier = next_frontier
+        self.scenes.focus(self.scenes_names[number] for number in seen if self.offsets[number] >= 0)
+
+    def graph(self) -> _StoryGraph:
+        """
+        Gets the graph of the story straight from its index, without reading any text.
+
+        Returns:
+            _StoryGraph: The graph of the story.
+        """
+        for number, offset in enumerate(self.offsets):
+            if offset < 0:
+                raise ValueError(f"Scene {self.scenes_names[number]} is not defined in the story. Define this scene so it can be used in a choice.")
+        return _StoryGraph(self.scenes_names, self.choices_start, self.choices_target, self.choices_condition, self.choices_effects)
+
+    def validatePathing(self) -> None:
+        """
+        Validates the pathing of the story using only its index, without reading any text.
+        Raises a ValueError if a scene is not defined in the story.
+        Issues a warning if a scene is not reachable from any choice.
+        """
+        if self.number_scenes == 0:
+            raise ValueError("There are no scenes defined for the visual novel.")
+
+        for number, offset in enumerate(self.offsets):
+            if offset < 0:
+                raise ValueError(f"Scene {self.scenes_names[number]} is not defined in the story. Define this scene so it can be used in a choice.")
+
+        reachable = bytearray(len(self.scenes_names))
+        stack = [0]
+        reachable[0] = 1
+        while stack:
+            for target in self.targets(stack.pop()):
+                if not reachable[target]:
+                    reachable[target] = 1
+                    stack.append(target)
+
+        for number, is_reachable in enumerate(reachable):
+            if not is_reachable:
+                warnings.warn(f"Scene {self.scenes_names[number]} is not reachable from any choice")
+
+    def audio_files(self) -> List[str]:
+        """
+        Gets the audio files used by the story, from its index.
+
+        Returns:
+            List[str]: The paths of the audio files, each one once.
+        """
+        return list(self.audio)
+
+    def backgrounds(self) -> Dict[str, List[int]]:
+        """
+        Gets the background images of the scenes from the index, without reading the scenes.
+
+        Returns:
+            Dict[str, List[int]]: The numbers of the scenes of each background, in the order the backgrounds appear.
+        """
+        images: Dict[str, List[int]] = {image: [] for image in self.images}
+        for number, image in enumerate(self.scene_images):
+            if image >= 0:
+                images[self.images[image]].append(number)
+        return images
+
+    def validateImages(self) -> None:
+        """
+        Validates that the images of the story exist, checking each distinct image only once.
+        Raises a ValueError if an image is not found.
+        """
+        for idx, image in enumerate(self.images):
+            if not asset_exists(image):
+                number = self.scene_images.index(idx)
+                raise ValueError(f"Image on Scene {self.scenes_names[number]} was not found. Check the Path.")
+        for overlay in self.overlays:
+            if not asset_exists(overlay):
+                raise ValueError(f"Overlay {overlay} was not found. Check the Path.")
+        for frame in self.frames:
+            if not asset_exists(frame):
+                raise ValueError(f"Frame {frame} of an animation was not found. Check the Path.")
+        self.validateCharacters()
+
+def load_story(path: str, radius: int = 2, cache_size: int = 256) -> StreamingStory:
+    """
+    Loads a story from a line-oriented story file.
+
+    Each line of a '.jsonl' file is a JSON object; a '.csv' file has a header line with the columns and one record per line,
+    with line breaks in texts written as '\\n'. Every record has a type:
+
+    - 'story': the settings of the story, with the optional fields 'background', 'music', 'language', 'languages',
+      'resolution', 'analytics', 'memory' (the memory budget in megabytes), 'low_memory', 'variables', the initial value of
+      each variable, e.g. {'gold': 10} or in '.csv' files 'gold=10, has_key', and, in '.jsonl' files, 'characters': the
+      image of each expression of each character.
+    - 'scene': a scene, with the fields 'name', 'text' and 'image', and the optional fields 'music' (or 'none' to stop the
+      music), 'voice' and 'voice_<language>', e.g. 'voice_en'. In '.jsonl' files a scene can also have 'sprites', a list of
+      [character, expression, x, y], 'overlays', a list of images, and 'animation', an animated background: {'frames':
+      [images], 'fps': 12} or {'sheet': image, 'columns': 4, 'rows': 2, 'fps': 12}, with an optional 'loop', and 'effects',
+      its ambient effects: a list of kinds or of [kind, count], e.g. ['rain', ['dust', 500]].
+    - 'choice': a choice of the scene 'name', with the fields 'text' and 'to', and the optional fields 'if', the condition
+      that must hold for the choice to be shown, e.g. 'gold >= 10 and not has_key', and 'set', the assignments done when
+      it is selected, e.g. 'gold -= 10; has_key = 1'. The scene must be defined before its choices.
+
+    Args:
+        path (str): The path of the story file.
+        radius (int, optional): How many choices away from the player the scenes are kept resident. Defaults to 2.
+        cache_size (int, optional): How many other scenes are kept loaded. Defaults to 256.
+
+    Returns:
+        StreamingStory: The story. Close it when it is no longer used, see `StreamingStory.close`.
+    """
+    return StreamingStory(path, radius, cache_size)
@@ -0,0 +1,333 @@
+import hashlib
+import io
+import mmap
+import os
+import struct
+import threading
+from typing import BinaryIO, Dict, List, NamedTuple, Optional
+
+__all__: List[str] = ['AssetPack', 'build_pack', 'mount', 'unmount', 'open_asset', 'asset_exists', 'asset_digest']
+
+_MAGIC = b'VNPK'
+_VERSION = 1
+# magic, version, number of entries, size of the index
+_HEADER = struct.Struct('<4sIIQ')
+# length of the name, offset and length of the data, sha256 of the data; followed by the name
+_ENTRY = struct.Struct('<HQQ32s')
+
+def _logical_name(path: str) -> str:
+    """
+    Gets the name of an asset in a pack from its path: relative, with '/' separators and without '.' segments.
+
+    Args:
+        path (str): The path of the asset, e.g. 'assets/01.jpg' or '.\\assets\\01.jpg'.
+
+    Returns:
+        str: The name of the asset.
+    """
+    return os.path.normpath(path).replace(os.sep, '/').lstrip('/')
+
+class _Entry(NamedTuple):
+    offset: int
+    length: int
+    digest: bytes
+
+class _PackFile(io.RawIOBase):
+    """
+    A read-only file object over the bytes of an asset in a pack, without copying them.
+
+    Attributes:
+        name (str): The name of the asset.
+        view (memoryview): The bytes of the asset.
+        position (int): The current position in the asset.
+    """
+
+    def __init__(self, name: str, view: memoryview) -> None:
+        super().__init__()
+        self.name = name
+        self.view = view
+        self.position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        size = min(len(buffer), len(self.view) - self.position)
+        if size <= 0:
+            return 0
+        buffer[:size] = self.view[self.position:self.position + size]
+        self.position += size
+        return size
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self.position
+        elif whence == io.SEEK_END:
+            offset += len(self.view)
+        if offset < 0:
+            raise ValueError("Negative seek position.")
+        self.position = offset
+        return self.position
+
+    def tell(self) -> int:
+        return self.position
+
+    def close(self) -> None:
+        # the view is released so the pack can be closed, the bytes stay in the pack
+        if not self.closed:
+            self.view.release()
+        super().close()
+
+class AssetPack:
+    """
+    A single file holding the assets of a game, read through a memory map.
+
+    The pack starts with an index of the (name, offset, length, sha256) of every asset, so opening an asset is a lookup in
+    the index and a view of the mapped file: no file is opened and no bytes are copied until the asset is decoded.
+
+    Attributes:
+        path (str): The path of the pack.
+        entries (Dict[str, _Entry]): The offset, length and sha256 of each asset, by name.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Opens a pack.
+
+        Args:
+            path (str): The path of the pack.
+
+        Raises:
+            ValueError: If the file is not a valid pack.
+        """
+        self.path = path
+        with open(path, 'rb') as file:
+            self.map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.view = memoryview(self.map)
+        if len(self.view) < _HEADER.size:
+            self.close()
+            raise ValueError(f"{path} is not an asset pack.")
+        magic, version, count, index_size = _HEADER.unpack_from(self.view, 0)
+        if magic != _MAGIC or version != _VERSION:
+            self.close()
+            raise ValueError(f"{path} is not an asset pack of version {_VERSION}.")
+
+        self.entries: Dict[str, _Entry] = {}
+        position = _HEADER.size
+        for _ in range(count):
+            name_size, offset, length, digest = _ENTRY.unpack_from(self.view, position)
+            position += _ENTRY.size
+            name = bytes(self.view[position:position + name_size]).decode('utf-8')
+            position += name_size
+            self.entries[name] = _Entry(offset, length, digest)
+
+    def __contains__(self, name: str) -> bool:
+        return _logical_name(name) in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @property
+    def names(self) -> List[str]:
+        """
+        List[str]: The names of the assets.
+        """
+        return list(self.entries)
+
+    def read(self, name: str) -> memoryview:
+        """
+        Gets the bytes of an asset, as a view of the mapped pack.
+
+        Args:
+            name (str): The name of the asset.
+
+        Returns:
+            memoryview: The bytes of the asset.
+
+        Raises:
+            KeyError: If the asset is not in the pack.
+        """
+        entry = self.entries[_logical_name(name)]
+        return self.view[entry.offset:entry.offset + entry.length]
+
+    def open(self, name: str) -> _PackFile:
+        """
+        Opens an asset as a read-only file object, e.g. for `pygame.image.load`.
+
+        Args:
+            name (str): The name of the asset.
+
+        Returns:
+            _PackFile: The file object.
+
+        Raises:
+            KeyError: If the asset is not in the pack.
+        """
+        return _PackFile(_logical_name(name), self.read(name))
+
+    def digest(self, name: str) -> bytes:
+        """
+        Gets the sha256 of an asset, from the index of the pack.
+
+        Args:
+            name (str): The name of the asset.
+
+        Returns:
+            bytes: The sha256 of the asset.
+
+        Raises:
+            KeyError: If the asset is not in the pack.
+        """
+        return self.entries[_logical_name(name)].digest
+
+    def verify(self) -> List[str]:
+        """
+        Checks the sha256 of every asset.
+
+        Returns:
+            List[str]: The names of the assets whose bytes don't match their sha256.
+        """
+        return [name for name, entry in self.entries.items()
+                if hashlib.sha256(self.view[entry.offset:entry.offset + entry.length]).digest() != entry.digest]
+
+    def close(self) -> None:
+        """
+        Closes the pack. Assets opened before must be closed first.
+        """
+        self.view.release()
+        self.map.close()
+
+def build_pack(folder: str, output: str, prefix: Optional[str] = None) -> int:
+    """
+    Builds a pack with every file of a folder.
+
+    Args:
+        folder (str): The folder with the assets.
+        output (str): The path of the pack to create.
+        prefix (str, optional): The prefix of the names of the assets. Defaults to the name of the folder, so the file
+            'assets/01.jpg' keeps the name 'assets/01.jpg' in the pack.
+
+    Returns:
+        int: The number of assets in the pack.
+    """
+    prefix = os.path.basename(os.path.normpath(folder)) if prefix is None else prefix
+    files = []
+    for root, folders, names in os.walk(folder):
+        folders.sort()
+        for name in sorted(names):
+            path = os.path.join(root, name)
+            files.append((_logical_name(os.path.join(prefix, os.path.relpath(path, folder))), path))
+
+    encoded = [(name.encode('utf-8'), path) for name, path in files]
+    index_size = sum(_ENTRY.size + len(name) for name, _ in encoded)
+    offset = _HEADER.size + index_size
+    entries = []
+    for name, path in encoded:
+        size = os.path.getsize(path)
+        entries.append((name, path, offset, size))
+        offset += size
+
+    with open(output, 'wb') as pack:
+        pack.write(_HEADER.pack(_MAGIC, _VERSION, len(entries), index_size))
+        # the index is written with empty hashes, which are filled once the data is streamed
+        index_position = pack.tell()
+        for name, _, offset, size in entries:
+            pack.write(_ENTRY.pack(len(name), offset, size, bytes(32)))
+            pack.write(name)
+        digests = []
+        for _, path, _, _ in entries:
+            digest = hashlib.sha256()
+            with open(path, 'rb') as file:
+                for chunk in iter(lambda: file.read(1024 * 1024), b''):
+                    digest.update(chunk)
+                    pack.write(chunk)
+            digests.append(digest.digest())
+        pack.seek(index_position)
+        for (name, _, offset, size), digest in zip(entries, digests):
+            pack.write(_ENTRY.pack(len(name), offset, size, digest))
+            pack.seek(len(name), io.SEEK_CUR)
+    return len(entries)
+
+_packs: List[AssetPack] = []
+_packs_lock = threading.Lock()
+
+def mount(path: str) -> AssetPack:
+    """
+    Mounts a pack, so its assets are used instead of the files with the same path.
+
+    Args:
+        path (str): The path of the pack.
+
+    Returns:
+        AssetPack: The mounted pack.
+    """
+    pack = AssetPack(path)
+    with _packs_lock:
+        _packs.insert(0, pack)
+    return pack
+
+def unmount(pack: AssetPack) -> None:
+    """
+    Unmounts a pack.
+
+    Args:
+        pack (AssetPack): The pack returned by `mount`.
+    """
+    with _packs_lock:
+        _packs.remove(pack)
+
+def open_asset(path: str) -> BinaryIO:
+    """
+    Opens an asset from the mounted packs, or from the disk when no pack has it.
+
+    Args:
+        path (str): The path of the asset.
+
+    Returns:
+        BinaryIO: A read-only binary file object.
+    """
+    with _packs_lock:
+        packs = list(_packs)
+    for pack in packs:
+        if path in pack:
+            return pack.open(path)
+    return open(path, 'rb')
+
+def asset_exists(path: str) -> bool:
+    """
+    Checks whether an asset is in a mounted pack or on the disk.
+
+    Args:
+        path (str): The path of the asset.
+
+    Returns:
+        bool: Whether the asset exists.
+    """
+    with _packs_lock:
+        packs = list(_packs)
+    return any(path in pack for pack in packs) or os.path.exists(path)
+
+def asset_digest(path: str) -> bytes:
+    """
+    Gets the sha256 of an asset, e.g. to key files derived from it. The digest of an asset in a mounted pack is read from
+    the index of the pack, the file of an asset on the disk is read in blocks.
+
+    Args:
+        path (str): The path of the asset.
+
+    Returns:
+        bytes: The sha256 of the asset.
+    """
+    with _packs_lock:
+        packs = list(_packs)
+    for pack in packs:
+        if path in pack:
+            return pack.digest(path)
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.digest()
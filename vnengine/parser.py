@@ -0,0 +1,384 @@
+from typing import Dict, List, Optional, Tuple
+from vnengine.story import Story
+
+__all__: List[str] = ['StoryParseError', 'parse_story', 'read_story']
+
+_LANGUAGES: List[str] = ['de', 'en', 'es', 'fr', 'pt']
+_RESOLUTIONS: List[str] = ['hd', 'fullhd', '4k']
+_DISPLAY_MODES: List[str] = ['fullscreen', 'windowed', 'resizable']
+
+class StoryParseError(ValueError):
+    """
+    Raised when a story file is not valid.
+
+    Attributes:
+        path (str): The path of the story file.
+        line (int): The number of the line with the error.
+    """
+
+    def __init__(self, path: str, line: int, message: str) -> None:
+        """
+        Initializes the error.
+
+        Args:
+            path (str): The path of the story file.
+            line (int): The number of the line with the error.
+            message (str): The description of the error.
+        """
+        super().__init__(f"{path}, line {line}: {message}")
+        self.path = path
+        self.line = line
+
+class _PendingScene:
+    """
+    A scene being read, added to the story once its block ends.
+
+    Attributes:
+        name (str): The name of the scene.
+        line (int): The line where the scene starts.
+        image (str): The image of the scene.
+        text (List[str]): The lines of the text of the scene.
+        choices (List[Tuple[str, str, Optional[str], Optional[str], int]]): The text, target, condition, effects and line
+            of each choice of the scene.
+        music (str): The music of the scene, '' to stop the music, or None.
+        voices (Dict[Optional[str], str]): The voice-over of the scene by language, None for every language.
+        sprites (List[Tuple[str, str, float, float]]): The character, expression and position of each sprite of the scene.
+        overlays (List[str]): The overlays of the scene.
+        animation (tuple): The arguments of `Story.set_animation` for the animated background of the scene, and the line
+            of the statement, or None.
+        effects (List[Tuple[str, Optional[int], int]]): The kind, number of particles and line of each ambient effect of the
+            scene.
+    """
+
+    def __init__(self, name: str, line: int) -> None:
+        self.name = name
+        self.line = line
+        self.image: Optional[str] = None
+        self.text: List[str] = []
+        self.choices: List[Tuple[str, str, Optional[str], Optional[str], int]] = []
+        self.music: Optional[str] = None
+        self.voices: Dict[Optional[str], str] = {}
+        self.sprites: List[Tuple[str, str, float, float]] = []
+        self.overlays: List[str] = []
+        self.animation: Optional[tuple] = None
+        self.effects: List[Tuple[str, Optional[int], int]] = []
+
+def _animation(value: str, error) -> tuple:
+    """
+    Reads an animation statement: `animation [once] <fps> <image> [<image> ...]`, or `animation [once] <fps> <sheet>
+    <columns>x<rows> [count]` for a sprite sheet.
+
+    Args:
+        value (str): The statement without its keyword.
+        error (Callable): Function raising a StoryParseError for the current line.
+
+    Returns:
+        tuple: The frames, fps, columns, rows, count and loop of the animation.
+    """
+    parts = value.split()
+    loop = not parts or parts[0] != 'once'
+    parts = parts if loop else parts[1:]
+    if len(parts) < 2:
+        error("An animation must be written as 'animation [once] <fps> <images>' or 'animation [once] <fps> <sheet> <columns>x<rows> [count]'.")
+    try:
+        fps = float(parts[0])
+    except ValueError:
+        error("The frame rate of an animation must be a number, e.g. 'animation 12 assets/rain.png 4x2'.")
+    grid = parts[2].split('x') if len(parts) in (3, 4) else []
+    if len(grid) == 2 and all(side.isdigit() for side in grid):
+        if len(parts) == 4 and not parts[3].isdigit():
+            error("The number of frames of a sprite sheet must be an integer.")
+        return parts[1], fps, int(grid[0]), int(grid[1]), int(parts[3]) if len(parts) == 4 else None, loop
+    return parts[1:], fps, 1, 1, None, loop
+
+def _setting(story: Story, keyword: str, value: str, error) -> None:
+    """
+    Applies a top level setting of a story file.
+
+    Args:
+        story (Story): The story being built.
+        keyword (str): The name of the setting.
+        value (str): The value of the setting.
+        error (Callable): Function raising a StoryParseError for the current line.
+    """
+    if keyword == 'background':
+        story.add_starting_background(value)
+    elif keyword == 'music':
+        story.add_starting_music(value)
+    elif keyword == 'character':
+        parts = value.split(None, 2)
+        if len(parts) < 3:
+            error("A character must be written as 'character <name> <expression> <image>'.")
+        story.add_character(parts[0], {parts[1]: parts[2]})
+    elif keyword == 'languages':
+        languages = [language.strip() for language in value.split(',') if language.strip()]
+        for language in languages:
+            if language not in _LANGUAGES:
+                error(f"The language {language} is not available. Availables: {', '.join(_LANGUAGES)}.")
+        story.set_languages(languages)
+    elif keyword == 'language':
+        if value not in _LANGUAGES:
+            error(f"The language {value} is not available. Availables: {', '.join(_LANGUAGES)}.")
+        story.set_initial_language(value)
+    elif keyword == 'resolution':
+        if value not in _RESOLUTIONS:
+            error(f"The resolution {value} is not available. Availables: {', '.join(_RESOLUTIONS)}.")
+        story.set_resolution(value)
+    elif keyword == 'display':
+        if value not in _DISPLAY_MODES:
+            error(f"The display mode {value} is not available. Availables: {', '.join(_DISPLAY_MODES)}.")
+        story.set_display_mode(value)
+    elif keyword == 'analytics':
+        story.set_analytics(value)
+    elif keyword == 'memory':
+        parts = value.split()
+        if len(parts) > 2 or not parts[0].isdigit() or int(parts[0]) == 0 or parts[1:] not in ([], ['low']):
+            error("The memory budget must be written as 'memory <megabytes> [low]', e.g. 'memory 1536 low'.")
+        story.set_memory_budget(int(parts[0]), len(parts) == 2)
+    elif keyword == 'font':
+        font_language, _, font = value.partition(' ')
+        if font_language in _LANGUAGES and font.strip():
+            story.set_font(font.strip(), font_language)
+        else:
+            story.set_font(value)
+    elif keyword == 'var':
+        parts = value.split()
+        if len(parts) > 2:
+            error("A variable must be written as 'var <name> [value]'.")
+        try:
+            initial = int(parts[1]) if len(parts) > 1 else 0
+        except ValueError:
+            error("The value of a variable must be an integer, e.g. 'var gold 10'.")
+        try:
+            story.add_variable(parts[0], initial)
+        except ValueError as exception:
+            error(str(exception))
+
+def parse_story(source: str, path: str = '<story>', language: Optional[str] = None, languages: Optional[List[str]] = None,
+                resolution: Optional[str] = None, display_mode: Optional[str] = None) -> Story:
+    """
+    Parses a story written in the story file format, in a single pass over its lines.
+
+    A story file has top level settings and scene blocks; the statements of a scene are indented:
+
+    .. code-block:: text
+
+        # comments start with '#'
+        background assets/menu.jpg
+        music assets/menu.ogg
+        character Anna happy assets/anna_happy.png
+        languages pt, en
+        language pt
+        resolution hd
+        display fullscreen
+        font assets/font.ttf
+        font de assets/font_de.ttf
+        var gold 10
+        var has_key
+        analytics analytics.db
+        memory 1536 low
+
+        scene Start
+            image assets/01.jpg
+            text Hello!
+            text Each text statement is a new line of the text.
+            music assets/theme.ogg
+            voice assets/start.ogg
+            voice en assets/start_en.ogg
+            sprite Anna happy 0.3
+            overlay assets/rain.png
+            animation 12 assets/waves.png 4x2
+            effect rain 3000
+            choice Go left -> Left
+            choice Buy the key -> Shop if gold >= 10 and not has_key set gold -= 10; has_key = 1
+
+    The music of a scene keeps playing in the next scenes, `music none` stops it. A voice statement may start with the
+    language of the voice-over; without it, the voice-over is used for every language. A sprite shows an expression of a
+    character defined before, optionally followed by the x and y of the sprite as fractions of the background size. An
+    animation statement draws an animated background instead of the image, with its frame rate and either the images of
+    its frames or a sprite sheet and its grid, e.g. `animation 8 assets/f1.png assets/f2.png` or `animation 12
+    assets/waves.png 4x2`; `animation once ...` stops on the last frame instead of starting again.
+    An effect statement draws particles of rain, snow, sparkles or dust over the background, optionally followed by the
+    number of particles, see `Story.add_effect`.
+
+    Like a voice, a font statement may start with the language written with the font. An analytics statement records the
+    scenes entered and the choices taken by the players in a database, see `Story.set_analytics`, and a memory statement sets the memory budget
+    of the caches in megabytes, followed by `low` for the low memory mode, see `Story.set_memory_budget`. A var statement defines an integer variable, 0 by default. A choice can be followed by `if <condition>`, to show it
+    only when the condition holds, and by `set <effects>`, assignments done when the choice is selected. Several choices
+    may go to the same scene.
+
+    The settings given as arguments override the ones written in the file.
+
+    Args:
+        source (str): The content of the story file.
+        path (str, optional): The path of the story file, used in error messages. Defaults to '<story>'.
+        language (str, optional): Overrides the initial language. Defaults to None.
+        languages (List[str], optional): Overrides the available languages. Defaults to None.
+        resolution (str, optional): Overrides the resolution. Defaults to None.
+        display_mode (str, optional): Overrides the display mode. Defaults to None.
+
+    Returns:
+        Story: The story, with its pathing validated.
+
+    Raises:
+        StoryParseError: If the story file is not valid, with the number of the line with the error.
+    """
+    story = Story()
+    scene: Optional[_PendingScene] = None
+    scenes_lines: Dict[str, int] = {}
+    targets_lines: Dict[str, int] = {}
+    number = 0
+
+    def error(message: str, line: Optional[int] = None) -> None:
+        raise StoryParseError(path, line if line else number, message)
+
+    def add_scene(scene: _PendingScene) -> None:
+        if scene.image is None:
+            error(f"The scene {scene.name} has no image.", scene.line)
+        story.add_scene(scene.name, '\n'.join(scene.text), scene.image)
+        for choice_text, go_to_scene, condition, effects, line in scene.choices:
+            try:
+                story.add_choice(scene.name, choice_text, go_to_scene, condition, effects)
+            except ValueError as exception:
+                error(str(exception), line)
+        if scene.music is not None:
+            story.add_music(scene.name, scene.music)
+        for voice_language, voice in scene.voices.items():
+            story.add_voice(scene.name, voice, voice_language)
+        for character, expression, x, y in scene.sprites:
+            story.add_sprite(scene.name, character, expression, x, y)
+        for overlay in scene.overlays:
+            story.add_overlay(scene.name, overlay)
+        if scene.animation is not None:
+            try:
+                story.set_animation(scene.name, *scene.animation[:-1])
+            except ValueError as exception:
+                error(str(exception), scene.animation[-1])
+        for kind, count, line in scene.effects:
+            try:
+                story.add_effect(scene.name, kind, count)
+            except ValueError as exception:
+                error(str(exception), line)
+
+    for number, line in enumerate(source.splitlines(), 1):
+        stripped = line.strip()
+        if not stripped or stripped.startswith('#'):
+            continue
+        keyword, _, value = stripped.partition(' ')
+        value = value.strip()
+        indented = line[0] in ' \t'
+
+        if indented:
+            if scene is None:
+                error("Indented statements must be inside a scene.")
+            if keyword == 'image':
+                scene.image = value
+            elif keyword == 'text':
+                scene.text.append(value)
+            elif keyword == 'sprite':
+                parts = value.split()
+                if len(parts) < 2 or len(parts) > 4:
+                    error("A sprite must be written as 'sprite <character> <expression> [x] [y]'.")
+                if parts[1] not in story.characters.get(parts[0], {}):
+                    error(f"The character {parts[0]} has no expression {parts[1]}. Define it with 'character' before the scene.")
+                try:
+                    position = [float(part) for part in parts[2:]]
+                except ValueError:
+                    error("The position of a sprite must be written with numbers, e.g. 'sprite Anna happy 0.3 1.0'.")
+                x, y = (position + [0.5, 1.0][len(position):])[:2]
+                scene.sprites.append((parts[0], parts[1], x, y))
+            elif keyword in ('music', 'voice', 'overlay', 'animation') and not value:
+                error(f"The statement {keyword} must have a file.")
+            elif keyword == 'music':
+                scene.music = '' if value == 'none' else value
+            elif keyword == 'voice':
+                voice_language, _, voice = value.partition(' ')
+                if voice_language in _LANGUAGES and voice.strip():
+                    scene.voices[voice_language] = voice.strip()
+                else:
+                    scene.voices[None] = value
+            elif keyword == 'overlay':
+                scene.overlays.append(value)
+            elif keyword == 'animation':
+                scene.animation = _animation(value, error) + (number,)
+            elif keyword == 'effect':
+                parts = value.split()
+                if len(parts) not in (1, 2):
+                    error("An effect must be written as 'effect <kind> [count]', e.g. 'effect snow 2000'.")
+                if len(parts) == 2 and not parts[1].isdigit():
+                    error("The number of particles of an effect must be an integer.")
+                scene.effects.append((parts[0], int(parts[1]) if len(parts) == 2 else None, number))
+            elif keyword == 'choice':
+                choice_text, arrow, go_to_scene = value.rpartition('->')
+                go_to_scene, has_effects, effects = go_to_scene.partition(' set ')
+                go_to_scene, has_condition, condition = go_to_scene.partition(' if ')
+                if not arrow or not choice_text.strip() or not go_to_scene.strip():
+                    error("A choice must be written as 'choice <text> -> <scene> [if <condition>] [set <effects>]'.")
+                if (has_condition and not condition.strip()) or (has_effects and not effects.strip()):
+                    error("The condition and the effects of a choice can't be empty.")
+                scene.choices.append((choice_text.strip(), go_to_scene.strip(), condition.strip() or None, effects.strip() or None, number))
+                targets_lines.setdefault(go_to_scene.strip(), number)
+            else:
+                error(f"Unknown scene statement '{keyword}'. Availables: image, text, music, voice, sprite, overlay, animation, effect, choice.")
+            continue
+
+        if scene is not None:
+            add_scene(scene)
+            scene = None
+
+        if keyword == 'scene':
+            if not value:
+                error("A scene must have a name.")
+            if value in scenes_lines:
+                error(f"The scene {value} is already defined on line {scenes_lines[value]}.")
+            scenes_lines[value] = number
+            scene = _PendingScene(value, number)
+        elif keyword in ('background', 'music', 'character', 'languages', 'language', 'resolution', 'display', 'font', 'var', 'analytics', 'memory'):
+            if not value:
+                error(f"The setting {keyword} must have a value.")
+            _setting(story, keyword, value, error)
+        else:
+            error(f"Unknown statement '{keyword}'. Availables: scene, background, music, character, languages, language, resolution, display, font, var, analytics, memory.")
+
+    if scene is not None:
+        add_scene(scene)
+
+    for target, line in targets_lines.items():
+        if target not in scenes_lines:
+            error(f"Scene {target} is not defined in the story. Define this scene so it can be used in a choice.", line)
+    if not scenes_lines:
+        error("There are no scenes defined for the visual novel.", 1)
+
+    if languages is not None:
+        story.set_languages(languages)
+    if language is not None:
+        story.set_initial_language(language)
+    if resolution is not None:
+        story.set_resolution(resolution)
+    if display_mode is not None:
+        story.set_display_mode(display_mode)
+
+    story.validatePathing()
+    return story
+
+def read_story(path: str, language: Optional[str] = None, languages: Optional[List[str]] = None,
+               resolution: Optional[str] = None, display_mode: Optional[str] = None) -> Story:
+    """
+    Reads a story file. See `parse_story` for the format.
+
+    Args:
+        path (str): The path of the story file.
+        language (str, optional): Overrides the initial language. Defaults to None.
+        languages (List[str], optional): Overrides the available languages. Defaults to None.
+        resolution (str, optional): Overrides the resolution. Defaults to None.
+        display_mode (str, optional): Overrides the display mode. Defaults to None.
+
+    Returns:
+        Story: The story, with its pathing validated.
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            source = file.read()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"File {path} not found.")
+    return parse_story(source, path, language, languages, resolution, display_mode)
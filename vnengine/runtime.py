@@ -0,0 +1,339 @@
+import os
+from array import array
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Tuple, Union
+from vnengine.base.graph import _StoryGraph
+from vnengine.base.scene import _Scene
+
+if TYPE_CHECKING: # pragma: no cover
+    from vnengine.story import Story
+
+__all__: List[str] = ['CompiledStory', 'StoryRuntime', 'SeenScenes']
+
+class CompiledStory:
+    """
+    Immutable form of a story shared by any number of runtimes.
+
+    Attributes:
+        story (Story): The story, used to read the texts and images of the scenes.
+        graph (_StoryGraph): The choices of the story as integer arrays, with their compiled conditions and effects.
+        variables (Tuple[int, ...]): The initial value of each variable, by slot.
+        variable_names (Tuple[str, ...]): The name of each variable, by slot.
+    """
+
+    __slots__ = ('story', 'graph', 'variables', 'variable_names')
+
+    def __init__(self, story) -> None:
+        """
+        Compiles a story.
+
+        Args:
+            story (Story): The story to compile.
+
+        Raises:
+            ValueError: If the story has no scenes or a choice goes to a scene that is not defined.
+        """
+        if len(story.scenes_names) == 0:
+            raise ValueError("There are no scenes defined for the visual novel.")
+        self.story = story
+        self.graph: _StoryGraph = story.graph()
+        self.variables: Tuple[int, ...] = tuple(story.variables.values())
+        self.variable_names: Tuple[str, ...] = tuple(story.variables)
+
+class StoryRuntime:
+    """
+    The state of one playthrough of a story, independent of any display.
+
+    A runtime only holds the scenes visited, as an array of scene numbers, and the values of the variables, and shares the
+    compiled story with every other runtime, so one process can hold and step thousands of them.
+
+    Attributes:
+        compiled (CompiledStory): The compiled story.
+        history (array): The numbers of the scenes visited, the last one is the current scene.
+        variables (List[int]): The value of each variable, by slot.
+        undo (List[Tuple[int, List[int]]]): The length of the history and the values of the variables before each choice
+            with effects, so going back restores them.
+    """
+
+    __slots__ = ('compiled', 'history', 'variables', 'undo')
+
+    def __init__(self, story: Union[CompiledStory, 'Story']) -> None:
+        """
+        Initializes a runtime at the first scene of the story.
+
+        Args:
+            story (CompiledStory or Story): The compiled story, or a story to compile. Compile the story once and share it
+                when creating many runtimes.
+        """
+        self.compiled = story if isinstance(story, CompiledStory) else CompiledStory(story)
+        self.start()
+
+    @property
+    def current(self) -> int:
+        """
+        int: The number of the current scene.
+        """
+        return self.history[-1]
+
+    @property
+    def current_scene(self) -> str:
+        """
+        str: The name of the current scene.
+        """
+        return self.compiled.graph.names[self.history[-1]]
+
+    @property
+    def scene(self) -> _Scene:
+        """
+        _Scene: The current scene, with its text, image and choices.
+        """
+        return self.compiled.story.scenes[self.current_scene]
+
+    @property
+    def choices(self) -> List[str]:
+        """
+        List[str]: The texts of the choices available in the current scene, in the order used by `choose`.
+        """
+        choices = self.scene.choices
+        return [choices[index].choice_text for index in self.available()]
+
+    @property
+    def is_ending(self) -> bool:
+        """
+        bool: Whether the current scene has no available choices.
+        """
+        graph = self.compiled.graph
+        start, end = graph.starts[self.history[-1]], graph.starts[self.history[-1] + 1]
+        if not graph.conditions:
+            return start == end
+        conditions, variables = graph.conditions, self.variables
+        return not any((condition := conditions.get(idx)) is None or condition(variables) for idx in range(start, end))
+
+    def available(self) -> List[int]:
+        """
+        Gets the choices of the current scene whose condition holds, evaluating the compiled conditions on the variables.
+
+        Returns:
+            List[int]: The indexes of the available choices, in the order in which the choices were created.
+        """
+        graph = self.compiled.graph
+        start, end = graph.starts[self.history[-1]], graph.starts[self.history[-1] + 1]
+        if not graph.conditions:
+            return list(range(end - start))
+        conditions, variables = graph.conditions, self.variables
+        return [idx - start for idx in range(start, end) if (condition := conditions.get(idx)) is None or condition(variables)]
+
+    def values(self) -> Dict[str, int]:
+        """
+        Gets the value of each variable by name.
+
+        Returns:
+            Dict[str, int]: The values of the variables.
+        """
+        return dict(zip(self.compiled.variable_names, self.variables))
+
+    def start(self) -> None:
+        """
+        Starts the story again from its first scene, with the initial values of the variables.
+        """
+        self.history = array('i', [0])
+        self.variables = list(self.compiled.variables)
+        self.undo = []
+
+    def choose(self, index: int) -> str:
+        """
+        Selects an available choice of the current scene, applies its effects and goes to the scene it leads to.
+
+        Args:
+            index (int): The index of the choice among the available choices, in the order of `choices`.
+
+        Returns:
+            str: The name of the new current scene.
+
+        Raises:
+            IndexError: If the current scene has no available choice with this index.
+        """
+        graph = self.compiled.graph
+        start = graph.starts[self.history[-1]]
+        available = self.available() if graph.conditions else range(graph.starts[self.history[-1] + 1] - start)
+        if not 0 <= index < len(available):
+            raise IndexError(f"Scene {self.current_scene} has no choice {index}.")
+        choice = start + available[index]
+        effect = graph.effects.get(choice)
+        if effect is not None:
+            self.undo.append((len(self.history), list(self.variables)))
+            effect(self.variables)
+        self.history.append(graph.targets[choice])
+        return self.current_scene
+
+    def back(self) -> bool:
+        """
+        Goes back to the previous scene, undoing the effects of the choice that led to the current scene. The first scene
+        has no previous scene.
+
+        Returns:
+            bool: Whether the runtime went back.
+        """
+        if len(self.history) > 1:
+            self.history.pop()
+            if self.undo and self.undo[-1][0] == len(self.history):
+                self.variables = self.undo.pop()[1]
+            return True
+        return False
+
+    def snapshot(self) -> Tuple[int, ...]:
+        """
+        Gets the state of the runtime, to be saved or restored later.
+
+        Returns:
+            tuple: The numbers of the scenes visited.
+        """
+        return tuple(self.history)
+
+    def restore(self, snapshot: Iterable[int]) -> None:
+        """
+        Restores a state obtained with `snapshot`. The variables get their initial values, use `state` and `load_state` to
+        keep them.
+
+        Args:
+            snapshot (Iterable[int]): The numbers of the scenes visited.
+
+        Raises:
+            ValueError: If the snapshot is empty or has a scene that is not in the story.
+        """
+        history = array('i', snapshot)
+        scenes = len(self.compiled.graph)
+        if len(history) == 0 or any(not 0 <= scene < scenes for scene in history):
+            raise ValueError("The snapshot doesn't match the scenes of the story.")
+        self.history = history
+        self.variables = list(self.compiled.variables)
+        self.undo = []
+
+    def state(self) -> Dict[str, Any]:
+        """
+        Gets the whole state of the runtime, with the variables, as plain lists that can be saved as JSON.
+
+        Returns:
+            dict: The 'history', the 'variables' by name and the 'undo' values of the variables before each choice.
+        """
+        names = self.compiled.variable_names
+        return {
+            'history': list(self.history),
+            'variables': dict(zip(names, self.variables)),
+            'undo': [[length, dict(zip(names, values))] for length, values in self.undo],
+        }
+
+    def load_state(self, state: Dict[str, Any]) -> None:
+        """
+        Restores a state obtained with `state`. The variables are matched by name, so a state saved before variables were
+        added or removed from the story still loads, and the new variables get their initial values.
+
+        Args:
+            state (dict): The state.
+
+        Raises:
+            ValueError: If the state doesn't match the story.
+        """
+        names = self.compiled.variable_names
+
+        def values(saved: Dict[str, int]) -> List[int]:
+            if not isinstance(saved, dict) or not all(isinstance(value, int) for value in saved.values()):
+                raise ValueError("The values of the variables of the state are not valid.")
+            return [int(saved.get(name, initial)) for name, initial in zip(names, self.compiled.variables)]
+
+        # everything is checked before the runtime changes, so a state that doesn't load leaves the current game as it was
+        try:
+            variables = values(state.get('variables', {}))
+            undo = [(int(length), values(saved)) for length, saved in state.get('undo', [])]
+            history = array('i', state.get('history', ()))
+        except (AttributeError, OverflowError, TypeError) as error:
+            raise ValueError("The state doesn't match the story.") from error
+        if any(not 0 < length < len(history) for length, _ in undo):
+            raise ValueError("The state doesn't match the scenes of the story.")
+        self.restore(history)
+        self.variables, self.undo = variables, undo
+
+class SeenScenes:
+    """
+    The scenes already read by the player, kept across games as a bitset with one bit per scene number.
+
+    Marking and checking a scene are a single bit operation, and the whole set of a story with ten thousand scenes is
+    stored in 1.25 KB, so it can be written with every save.
+
+    Attributes:
+        bits (bytearray): The bits of the scenes, the scene number n is the bit n % 8 of the byte n // 8.
+    """
+
+    __slots__ = ('bits',)
+
+    def __init__(self, scenes: int, data: bytes = b'') -> None:
+        """
+        Initializes the set of seen scenes.
+
+        Args:
+            scenes (int): The number of scenes of the story.
+            data (bytes, optional): The bits returned by `to_bytes`. Bits of scenes that are not in the story are ignored.
+                Defaults to no scene seen.
+        """
+        self.bits = bytearray((scenes + 7) // 8)
+        data = data[:len(self.bits)]
+        self.bits[:len(data)] = data
+        if scenes % 8 and len(data) == len(self.bits):
+            self.bits[-1] &= (1 << scenes % 8) - 1
+
+    def __contains__(self, scene: int) -> bool:
+        return 0 <= scene < len(self.bits) * 8 and bool(self.bits[scene >> 3] & (1 << (scene & 7)))
+
+    def __len__(self) -> int:
+        return int.from_bytes(self.bits, 'little').bit_count()
+
+    def add(self, scene: int) -> bool:
+        """
+        Marks a scene as seen.
+
+        Args:
+            scene (int): The number of the scene.
+
+        Returns:
+            bool: Whether the scene was not seen before.
+        """
+        mask = 1 << (scene & 7)
+        if self.bits[scene >> 3] & mask:
+            return False
+        self.bits[scene >> 3] |= mask
+        return True
+
+    def to_bytes(self) -> bytes:
+        """
+        Gets the bits of the set, to be saved.
+
+        Returns:
+            bytes: The bits of the scenes.
+        """
+        return bytes(self.bits)
+
+    def save(self, path: str) -> None:
+        """
+        Writes the set to a file.
+
+        Args:
+            path (str): The path of the file.
+        """
+        with open(path, 'wb') as file:
+            file.write(self.bits)
+
+    @classmethod
+    def load(cls, path: str, scenes: int) -> 'SeenScenes':
+        """
+        Reads a set written by `save`.
+
+        Args:
+            path (str): The path of the file.
+            scenes (int): The number of scenes of the story.
+
+        Returns:
+            SeenScenes: The set read, or an empty set if the file doesn't exist.
+        """
+        if not os.path.exists(path):
+            return cls(scenes)
+        with open(path, 'rb') as file:
+            return cls(scenes, file.read())
@@ -0,0 +1,343 @@
+import heapq
+import itertools
+import math
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+__all__: List[str] = ['wait', 'say', 'move', 'sound', 'shake', 'spawn']
+
+# a script is a generator function: each action it yields runs, and the script resumes once the action ends
+_Script = Callable[[], Iterator['_Action']]
+
+class _Action:
+    """
+    An action yielded by a scene script.
+
+    Attributes:
+        kind (str): The kind of the action. Availables: 'wait', 'say', 'move', 'sound', 'shake', 'spawn'.
+        args (tuple): The arguments of the action.
+        seconds (float): The seconds the script waits for the action before resuming.
+    """
+
+    def __init__(self, kind: str, args: Tuple[Any, ...], seconds: float = 0.0) -> None:
+        """
+        Initializes an action.
+
+        Args:
+            kind (str): The kind of the action.
+            args (tuple): The arguments of the action.
+            seconds (float, optional): The seconds the script waits for the action. Defaults to 0.
+
+        Raises:
+            ValueError: If the seconds are negative.
+        """
+        if seconds < 0:
+            raise ValueError(f"The {kind} action of a script can't last {seconds} seconds.")
+        self.kind = kind
+        self.args = args
+        self.seconds = float(seconds)
+
+    def __repr__(self) -> str:
+        return f"{self.kind}{self.args + (self.seconds,)}"
+
+def wait(seconds: float) -> _Action:
+    """
+    Waits before the next action of the script.
+
+    Args:
+        seconds (float): The seconds to wait.
+
+    Returns:
+        _Action: The action, to be yielded by the script.
+    """
+    return _Action('wait', (), seconds)
+
+def say(text: str, seconds: float = 0.0) -> _Action:
+    """
+    Replaces the text of the scene, e.g. to show a line of dialogue after another.
+
+    Args:
+        text (str): The text, translated like the texts of the scenes.
+        seconds (float, optional): The seconds the text is shown before the next action. Defaults to 0.
+
+    Returns:
+        _Action: The action, to be yielded by the script.
+    """
+    return _Action('say', (text,), seconds)
+
+def move(sprite: int, x: float, y: float, seconds: float = 0.0, wait: bool = True) -> _Action:
+    """
+    Moves a sprite of the scene to another position, in a straight line at constant speed.
+
+    Args:
+        sprite (int): The index of the sprite, in the order in which the sprites were added to the scene.
+        x (float): The horizontal position of the center of the sprite, as a fraction of the background width.
+        y (float): The vertical position of the bottom of the sprite, as a fraction of the background height.
+        seconds (float, optional): The seconds the movement lasts. Defaults to 0, moving the sprite at once.
+        wait (bool, optional): Whether the script waits for the end of the movement. Defaults to True.
+
+    Returns:
+        _Action: The action, to be yielded by the script.
+    """
+    return _Action('move', (sprite, x, y, seconds), seconds if wait else 0.0)
+
+def sound(path: str) -> _Action:
+    """
+    Plays a sound effect, over the music and the voice-over.
+
+    Args:
+        path (str): The path of the sound file.
+
+    Returns:
+        _Action: The action, to be yielded by the script.
+    """
+    return _Action('sound', (path,))
+
+def shake(seconds: float, amplitude: float = 0.015, wait: bool = False) -> _Action:
+    """
+    Shakes the background of the scene, with its sprites and overlays, fading out over the duration.
+
+    Args:
+        seconds (float): The seconds the shake lasts.
+        amplitude (float, optional): The largest distance the background moves, as a fraction of its height. Defaults to
+            0.015.
+        wait (bool, optional): Whether the script waits for the end of the shake. Defaults to False.
+
+    Returns:
+        _Action: The action, to be yielded by the script.
+    """
+    return _Action('shake', (seconds, amplitude), seconds if wait else 0.0)
+
+def spawn(script: Iterator[_Action]) -> _Action:
+    """
+    Runs another script at the same time as the current one, e.g. to move two sprites together.
+
+    Args:
+        script (Iterator[_Action]): The generator of the other script, e.g. `spawn(walk())`.
+
+    Returns:
+        _Action: The action, to be yielded by the script.
+    """
+    return _Action('spawn', (script,))
+
+class _Scheduler:
+    """
+    Runs the script of a scene: the scripts waiting for an action to end are kept in a heap by the time they resume, so
+    each frame only looks at the scripts that are due, and thousands of waiting scripts cost O(log n) per action.
+
+    The time of the scheduler is the seconds since the scene was shown. Scripts resume at the time their action ends, not
+    at the time of the frame that runs them, so a script always runs the same way whatever the frame rate. This makes a
+    script saved at some time restorable by running it again, silently, up to that time.
+
+    Attributes:
+        time (float): The seconds since the script started.
+        text (str): The text set by the last `say` action, or None to show the text of the scene.
+        sprites (List[tuple]): The image and the (x, y) position of each sprite of the scene.
+        moves (Dict[int, tuple]): The movement of each sprite moved by the script: its (x0, y0, x1, y1, start, end).
+        shaking (tuple): The (start, end, amplitude) of the last shake, or None.
+        play_sound (Callable[[str], None]): Function playing a sound effect.
+        heap (List[tuple]): The (time, order, script) of each script waiting for the end of an action.
+    """
+
+    def __init__(self, script: _Script, sprites: Optional[List[Tuple[str, float, float]]] = None,
+                 play_sound: Optional[Callable[[str], None]] = None) -> None:
+        """
+        Initializes the scheduler and runs the script until it first waits.
+
+        Args:
+            script (Callable): The generator function of the script.
+            sprites (List[tuple], optional): The image and the (x, y) position of each sprite of the scene. Defaults to
+                no sprites.
+            play_sound (Callable, optional): Function playing a sound effect. Defaults to no sound.
+        """
+        self.time = 0.0
+        self.sprites = list(sprites) if sprites else []
+        self.text: Optional[str] = None
+        self.moves: Dict[int, Tuple[float, float, float, float, float, float]] = {}
+        self.shaking: Optional[Tuple[float, float, float]] = None
+        self.play_sound = play_sound
+        self.heap: List[Tuple[float, int, Iterator[_Action]]] = []
+        self.order = itertools.count()
+        self.silent = False
+        self._push(0.0, script())
+        self.update(0.0)
+
+    def _push(self, time: float, script: Iterator[_Action]) -> None:
+        heapq.heappush(self.heap, (time, next(self.order), script))
+
+    @property
+    def done(self) -> bool:
+        """
+        Whether every script ended.
+        """
+        return not self.heap
+
+    @property
+    def active(self) -> bool:
+        """
+        Whether the scene changes by itself: a script is waiting, or a sprite is moving, or the background is shaking.
+        """
+        return bool(self.heap) or any(move[5] > self.time for move in self.moves.values()) or (self.shaking is not None and self.shaking[1] > self.time)
+
+    def _run(self, script: Iterator[_Action], now: float, limit: int = 100000) -> None:
+        """
+        Runs a script until it yields an action that lasts, or ends.
+
+        Args:
+            script (Iterator[_Action]): The script.
+            now (float): The time the script resumes at.
+            limit (int, optional): The largest number of actions run without waiting. Defaults to 100000.
+
+        Raises:
+            ValueError: If the script yields something that is not an action, or never waits.
+        """
+        for count, action in enumerate(script):
+            if not isinstance(action, _Action):
+                raise ValueError(f"A script yielded {action!r}, which is not an action.")
+            if count >= limit:
+                raise ValueError(f"A script ran {limit} actions without waiting.")
+            self._apply(action, now)
+            if action.seconds > 0:
+                self._push(now + action.seconds, script)
+                return
+
+    def _apply(self, action: _Action, now: float) -> None:
+        """
+        Does what an action does at the time it starts.
+
+        Args:
+            action (_Action): The action.
+            now (float): The time the action starts.
+        """
+        if action.kind == 'say':
+            self.text = action.args[0]
+        elif action.kind == 'move':
+            sprite, x, y, seconds = action.args
+            if not 0 <= sprite < len(self.sprites):
+                raise ValueError(f"The script moves the sprite {sprite}, but the scene has {len(self.sprites)} sprites.")
+            x0, y0 = self.position(sprite, now) or self.sprites[sprite][1:]
+            self.moves[sprite] = (x0, y0, x, y, now, now + seconds)
+        elif action.kind == 'sound':
+            if self.play_sound is not None and not self.silent:
+                self.play_sound(action.args[0])
+        elif action.kind == 'shake':
+            seconds, amplitude = action.args
+            self.shaking = (now, now + seconds, amplitude)
+        elif action.kind == 'spawn':
+            self._push(now, action.args[0])
+
+    def update(self, time: float, silent: bool = False) -> None:
+        """
+        Runs the scripts due up to a time.
+
+        Args:
+            time (float): The seconds since the script started.
+            silent (bool, optional): Whether the sounds of the actions run are not played, e.g. when the script is
+                restored. Defaults to False.
+        """
+        self.silent = silent
+        while self.heap and self.heap[0][0] <= time:
+            due, _, script = heapq.heappop(self.heap)
+            self._run(script, due)
+        self.time = max(self.time, time)
+        self.silent = False
+
+    def skip(self, limit: int = 10000) -> None:
+        """
+        Runs every script to its end at once, without sounds: the sprites are left where they end and the last text is
+        shown. Scripts that never end are stopped after `limit` actions.
+
+        Args:
+            limit (int, optional): The largest number of actions run. Defaults to 10000.
+        """
+        self.silent = True
+        steps = 0
+        while self.heap and steps < limit:
+            due, _, script = heapq.heappop(self.heap)
+            self.time = max(self.time, due)
+            self._run(script, due)
+            steps += 1
+        for _, _, script in self.heap:
+            script.close()
+        self.heap.clear()
+        self.moves = {sprite: (x1, y1, x1, y1, 0.0, 0.0) for sprite, (_, _, x1, y1, _, _) in self.moves.items()}
+        self.shaking = None
+        self.silent = False
+
+    def position(self, sprite: int, time: Optional[float] = None) -> Optional[Tuple[float, float]]:
+        """
+        Gets the position of a sprite moved by the script.
+
+        Args:
+            sprite (int): The index of the sprite.
+            time (float, optional): The seconds since the script started. Defaults to the time of the scheduler.
+
+        Returns:
+            tuple: The (x, y) of the sprite, or None if the script didn't move it.
+        """
+        move = self.moves.get(sprite)
+        if move is None:
+            return None
+        time = self.time if time is None else time
+        x0, y0, x1, y1, start, end = move
+        progress = 1.0 if end <= start else min(1.0, max(0.0, (time - start) / (end - start)))
+        return (x0 + (x1 - x0) * progress, y0 + (y1 - y0) * progress)
+
+    def layers(self, layers: Tuple[Tuple[str, Optional[float], Optional[float]], ...]) -> Tuple[Tuple[str, Optional[float], Optional[float]], ...]:
+        """
+        Gets the layers of the scene with the sprites at the positions set by the script.
+
+        Args:
+            layers (tuple): The layers of the scene, as returned by `_Scene.layers`.
+
+        Returns:
+            tuple: The layers, the same tuple if the script didn't move any sprite.
+        """
+        if not self.moves:
+            return layers
+        layers = list(layers)
+        for sprite in self.moves:
+            layers[sprite + 1] = (layers[sprite + 1][0],) + self.position(sprite)
+        return tuple(layers)
+
+    def offset(self, height: int) -> Tuple[int, int]:
+        """
+        Gets how far the background is moved by the shake at the time of the scheduler.
+
+        Args:
+            height (int): The height of the background in pixels.
+
+        Returns:
+            tuple: The (x, y) offset in pixels.
+        """
+        if self.shaking is None or not self.shaking[0] <= self.time < self.shaking[1]:
+            return (0, 0)
+        start, end, amplitude = self.shaking
+        # the shake fades out linearly, and two frequencies keep it from looking like a circle
+        size = amplitude * height * (end - self.time) / (end - start)
+        return (round(size * math.sin(self.time * 71.0)), round(size * math.cos(self.time * 53.0)))
+
+    def state(self) -> Dict[str, float]:
+        """
+        Gets what is needed to restore the script, as a dictionary that can be saved as JSON. Generators can't be saved,
+        so the script is restored by running it again up to the same time.
+
+        Returns:
+            dict: The 'time' of the script.
+        """
+        return {'time': self.time}
+
+    def restore(self, state: Dict[str, float]) -> None:
+        """
+        Runs a script just started up to the time of a saved state, without sounds.
+
+        Args:
+            state (dict): The state, obtained with `state`.
+
+        Raises:
+            ValueError: If the state is not valid.
+        """
+        try:
+            time = float(state['time'])
+        except (KeyError, TypeError, ValueError) as error:
+            raise ValueError("The state of the script is not valid.") from error
+        self.update(time, silent=True)
@@ -0,0 +1,324 @@
+import asyncio
+import json
+import random
+import time
+from itertools import count
+from typing import Dict, List, Optional, Set
+from vnengine.runtime import CompiledStory, StoryRuntime
+
+__all__: List[str] = ['StoryServer', 'serve', 'load_test']
+
+class StoryServer:
+    """
+    Serves one story to many players at the same time, over TCP with one JSON message per line.
+
+    The story is compiled once and shared; each session is only a `StoryRuntime`. A connection can open any number of
+    sessions, so front-ends can multiplex their players over a few connections, and the sessions of a connection are closed
+    with it. Every request is a JSON object with an `op` and, optionally, an `id` that is copied to the response:
+
+    .. code-block:: text
+
+        {"op": "new"}                                  opens a session at the first scene
+        {"op": "restore", "history": [0, 2]}           opens a session from a snapshot, with its "variables" and "undo"
+        {"op": "state", "session": 1}                  gets the current scene of a session
+        {"op": "choose", "session": 1, "index": 0}     selects a choice
+        {"op": "back", "session": 1}                   goes back to the previous scene
+        {"op": "start", "session": 1}                  starts the story again
+        {"op": "close", "session": 1}                  closes the session
+
+    Successful responses have `"ok": true`, the `session` and its scene: `scene`, `text`, `image`, `choices`, `ending` and
+    the `history` to restore it later. Stories with variables also send the `variables` by name and the `undo` values of the
+    choices with effects, which are restored with the history. Errors have `"ok": false` and an `error` message.
+
+    Attributes:
+        compiled (CompiledStory): The compiled story shared by every session.
+        sessions (Dict[int, StoryRuntime]): The open sessions, by id.
+        server (asyncio.Server): The listening server, once started.
+    """
+
+    def __init__(self, story) -> None:
+        """
+        Initializes the server.
+
+        Args:
+            story (CompiledStory or Story): The story to serve.
+        """
+        self.compiled = story if isinstance(story, CompiledStory) else CompiledStory(story)
+        self.sessions: Dict[int, StoryRuntime] = {}
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.ids = count(1)
+
+    def state(self, session: int) -> dict:
+        """
+        Gets the current scene of a session.
+
+        Args:
+            session (int): The id of the session.
+
+        Returns:
+            dict: The successful response with the scene of the session.
+        """
+        runtime = self.sessions[session]
+        scene = runtime.scene
+        response = {
+            'ok': True,
+            'session': session,
+            'scene': runtime.current_scene,
+            'text': scene.character_text,
+            'image': scene.background_display_img,
+            'choices': runtime.choices,
+            'ending': runtime.is_ending,
+            'history': list(runtime.history),
+        }
+        if self.compiled.variable_names:
+            state = runtime.state()
+            response['variables'], response['undo'] = state['variables'], state['undo']
+        return response
+
+    def dispatch(self, message: dict, owned: Set[int]) -> dict:
+        """
+        Handles one request.
+
+        Args:
+            message (dict): The request.
+            owned (Set[int]): The sessions of the connection, updated when a session is opened or closed.
+
+        Returns:
+            dict: The response, without the id of the request.
+        """
+        op = message.get('op')
+        if op in ('new', 'restore'):
+            runtime = StoryRuntime(self.compiled)
+            if op == 'restore':
+                try:
+                    runtime.load_state({'history': message.get('history') or [], 'variables': message.get('variables') or {},
+                                        'undo': message.get('undo') or []})
+                except (TypeError, ValueError, OverflowError):
+                    return {'ok': False, 'error': "The history doesn't match the scenes of the story."}
+            session = next(self.ids)
+            self.sessions[session] = runtime
+            owned.add(session)
+            return self.state(session)
+
+        session = message.get('session')
+        if not isinstance(session, int) or isinstance(session, bool) or session not in owned:
+            return {'ok': False, 'error': f"Session {session} is not open on this connection."}
+        runtime = self.sessions[session]
+        if op == 'state':
+            pass
+        elif op == 'choose':
+            index = message.get('index')
+            if not isinstance(index, int):
+                return {'ok': False, 'error': "The index of the choice must be an integer."}
+            try:
+                runtime.choose(index)
+            except IndexError as e:
+                return {'ok': False, 'error': str(e)}
+        elif op == 'back':
+            runtime.back()
+        elif op == 'start':
+            runtime.start()
+        elif op == 'close':
+            owned.discard(session)
+            del self.sessions[session]
+            return {'ok': True, 'session': session}
+        else:
+            return {'ok': False, 'error': f"Unknown op {op}. Availables: new, restore, state, choose, back, start, close."}
+        return self.state(session)
+
+    async def read_request(self, reader: asyncio.StreamReader) -> Optional[bytes]:
+        """
+        Reads the line of a request. A line longer than the limit of the stream is dropped up to its end, so the next
+        request is read whole and the connection and its other sessions are kept.
+
+        Args:
+            reader (asyncio.StreamReader): The stream of requests.
+
+        Returns:
+            bytes: The line, empty when the connection is closed, or None if the line was too long.
+
+        Raises:
+            asyncio.IncompleteReadError: If the connection is closed in the middle of a line that is too long.
+        """
+        try:
+            return await reader.readuntil(b'\n')
+        except asyncio.IncompleteReadError as e:
+            # the last line may not end with a newline
+            return e.partial
+        except asyncio.LimitOverrunError as e:
+            consumed = e.consumed
+        while True:
+            await reader.readexactly(consumed)
+            try:
+                await reader.readuntil(b'\n')
+                return None
+            except asyncio.LimitOverrunError as e:
+                consumed = e.consumed
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Handles a connection until it is closed, then closes its sessions.
+
+        Args:
+            reader (asyncio.StreamReader): The stream of requests.
+            writer (asyncio.StreamWriter): The stream of responses.
+        """
+        owned: Set[int] = set()
+        try:
+            while True:
+                line = await self.read_request(reader)
+                if line == b'':
+                    break
+                try:
+                    message = json.loads(line) if line is not None else None
+                    if not isinstance(message, dict):
+                        raise ValueError
+                except ValueError:
+                    response = {'ok': False, 'error': "Requests must be JSON objects, one per line."}
+                    if line is None:
+                        response['error'] = "The request is too long."
+                else:
+                    response = self.dispatch(message, owned)
+                    if 'id' in message:
+                        response['id'] = message['id']
+                writer.write(json.dumps(response, ensure_ascii=False).encode('utf-8') + b'\n')
+                # requests that are already buffered are answered before waiting for the client to read
+                if writer.transport.get_write_buffer_size() > 65536:
+                    await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            for session in owned:
+                del self.sessions[session]
+            writer.close()
+
+    async def start(self, host: str = '127.0.0.1', port: int = 8765) -> asyncio.AbstractServer:
+        """
+        Starts listening for connections.
+
+        Args:
+            host (str, optional): The address to listen on. Defaults to '127.0.0.1'.
+            port (int, optional): The port to listen on, 0 to choose a free one. Defaults to 8765.
+
+        Returns:
+            asyncio.Server: The listening server.
+        """
+        self.server = await asyncio.start_server(self.handle, host, port)
+        return self.server
+
+    @property
+    def port(self) -> int:
+        """
+        int: The port the server is listening on.
+        """
+        return self.server.sockets[0].getsockname()[1]
+
+def serve(story, host: str = '127.0.0.1', port: int = 8765) -> None:
+    """
+    Serves a story until interrupted. See `StoryServer` for the protocol.
+
+    Args:
+        story (CompiledStory or Story): The story to serve.
+        host (str, optional): The address to listen on. Defaults to '127.0.0.1'.
+        port (int, optional): The port to listen on. Defaults to 8765.
+    """
+    async def main() -> None:
+        server = StoryServer(story)
+        await server.start(host, port)
+        print(f"Serving on {host}:{server.port}")
+        async with server.server:
+            await server.server.serve_forever()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
+
+async def _load_connection(host: str, port: int, sessions: int, steps: int, seed: int, latencies: List[float]) -> int:
+    """
+    Plays the sessions of one connection of the load test, sending the requests of every session in a single batch.
+
+    Args:
+        host (str): The address of the server.
+        port (int): The port of the server.
+        sessions (int): The number of sessions of the connection.
+        steps (int): The number of choices made by each session.
+        seed (int): The seed of the random choices.
+        latencies (List[float]): Receives the time, in seconds, of each batch.
+
+    Returns:
+        int: The number of requests sent.
+    """
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port, limit=2 ** 20)
+    requests = 0
+
+    async def batch(messages: List[dict]) -> List[dict]:
+        nonlocal requests
+        started = time.perf_counter()
+        writer.write(b''.join(json.dumps(message).encode('utf-8') + b'\n' for message in messages))
+        await writer.drain()
+        responses = [json.loads(await reader.readline()) for _ in messages]
+        latencies.append(time.perf_counter() - started)
+        requests += len(messages)
+        for response in responses:
+            if not response['ok']:
+                raise RuntimeError(response['error'])
+        return responses
+
+    try:
+        states = await batch([{'op': 'new'}] * sessions)
+        for _ in range(steps):
+            messages = []
+            for state in states:
+                if state['choices']:
+                    messages.append({'op': 'choose', 'session': state['session'], 'index': rng.randrange(len(state['choices']))})
+                else:
+                    messages.append({'op': 'start', 'session': state['session']})
+            states = await batch(messages)
+        await batch([{'op': 'close', 'session': state['session']} for state in states])
+    finally:
+        writer.close()
+    return requests
+
+def load_test(host: str = '127.0.0.1', port: int = 8765, sessions: int = 1000, connections: int = 10, steps: int = 10,
+              seed: int = 0) -> dict:
+    """
+    Plays many sessions against a running server, making random choices and starting again at the endings.
+
+    Args:
+        host (str, optional): The address of the server. Defaults to '127.0.0.1'.
+        port (int, optional): The port of the server. Defaults to 8765.
+        sessions (int, optional): The number of sessions, split among the connections. Defaults to 1000.
+        connections (int, optional): The number of connections. Defaults to 10.
+        steps (int, optional): The number of choices made by each session. Defaults to 10.
+        seed (int, optional): The seed of the random choices. Defaults to 0.
+
+    Returns:
+        dict: The result, with the number of 'sessions', 'requests', the 'seconds' taken, the 'requests_per_second' and
+            the median and 99th percentile time of a batch of requests, 'batch_p50' and 'batch_p99', in seconds.
+
+    Raises:
+        ValueError: If there are less sessions than connections.
+    """
+    if connections < 1 or sessions < connections:
+        raise ValueError("There must be at least one session per connection.")
+    latencies: List[float] = []
+
+    async def main() -> List[int]:
+        shares = [sessions // connections + (idx < sessions % connections) for idx in range(connections)]
+        return await asyncio.gather(*(_load_connection(host, port, share, steps, seed + idx, latencies)
+                                      for idx, share in enumerate(shares)))
+
+    started = time.perf_counter()
+    requests = sum(asyncio.run(main()))
+    seconds = time.perf_counter() - started
+    latencies.sort()
+    return {
+        'sessions': sessions,
+        'requests': requests,
+        'seconds': seconds,
+        'requests_per_second': requests / seconds if seconds else 0.0,
+        'batch_p50': latencies[len(latencies) // 2],
+        'batch_p99': latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+    }
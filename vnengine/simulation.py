@@ -0,0 +1,250 @@
+from typing import Callable, Dict, List, Optional, Sequence, Union
+from vnengine.base.graph import _StoryGraph
+
+try:
+    import numpy as np
+except ImportError: # pragma: no cover
+    np = None
+
+__all__: List[str] = ['simulate']
+
+def _choice_weights(story, graph: _StoryGraph, weights) -> 'np.ndarray':
+    """
+    Gets the weight of every choice of the graph.
+
+    Args:
+        story (Story): The story.
+        graph (_StoryGraph): The graph of the story.
+        weights: None, a sequence with a weight per choice, a dictionary or a function. See `simulate`.
+
+    Returns:
+        np.ndarray: The weight of each choice, in the order of `graph.targets`.
+
+    Raises:
+        ValueError: If the weights don't match the choices of the story.
+    """
+    starts = np.frombuffer(graph.starts, dtype=np.int32)
+    choices = len(graph.targets)
+    if weights is None:
+        return np.ones(choices)
+    if not isinstance(weights, dict) and not callable(weights):
+        result = np.asarray(weights, dtype=np.float64)
+        if result.shape != (choices,):
+            raise ValueError(f"The story has {choices} choices but {result.size} weights.")
+        return result
+
+    result = np.ones(choices)
+    if isinstance(weights, dict):
+        numbers = {name: number for number, name in enumerate(graph.names)}
+        for name in weights:
+            if name not in numbers:
+                raise ValueError(f"Scene {name} is not defined in the story.")
+        selected = [numbers[name] for name in weights]
+    else:
+        selected = np.flatnonzero(starts[:-1] < starts[1:])
+    for number in selected:
+        start, end = starts[number], starts[number + 1]
+        if start == end:
+            continue
+        name = graph.names[number]
+        scene_weights = weights[name] if isinstance(weights, dict) else weights(name, story.scenes[name])
+        if len(scene_weights) != end - start:
+            raise ValueError(f"Scene {name} has {end - start} choices but {len(scene_weights)} weights.")
+        result[start:end] = scene_weights
+    return result
+
+def _guarded_choices(graph: _StoryGraph, position: 'np.ndarray', values: 'np.ndarray', players: 'np.ndarray',
+                     choice_weights: 'np.ndarray', rng, choice: 'np.ndarray') -> None:
+    """
+    Draws the choices of the players in scenes with conditions, among the choices available to each player.
+
+    The players are grouped by scene, and each condition is evaluated once per scene for the whole group, on the arrays of
+    the values of the variables of its players.
+
+    Args:
+        graph (_StoryGraph): The graph of the story.
+        position (np.ndarray): The scene of each player.
+        values (np.ndarray): The values of the variables, with a row per variable and a column per player.
+        players (np.ndarray): The players in scenes with conditions.
+        choice_weights (np.ndarray): The weight of every choice of the story.
+        rng (np.random.Generator): The random generator.
+        choice (np.ndarray): Receives the index in `graph.targets` of the choice of each of the players, or -1 if no choice
+            is available to the player.
+    """
+    players = players[np.argsort(position[players], kind='stable')]
+    for selected in np.split(players, np.flatnonzero(np.diff(position[players])) + 1):
+        scene = int(position[selected[0]])
+        start, end = graph.starts[scene], graph.starts[scene + 1]
+        group_values = values[:, selected]
+        weight = np.repeat(choice_weights[start:end, None], selected.size, axis=1)
+        for index in range(start, end):
+            condition = graph.conditions.get(index)
+            if condition is not None:
+                weight[index - start] *= np.broadcast_to(condition(group_values), selected.size)
+        cumulative = np.cumsum(weight, axis=0)
+        draw = rng.random(selected.size) * cumulative[-1]
+        picked = np.minimum((cumulative <= draw).sum(axis=0), end - start - 1)
+        choice[selected] = np.where(cumulative[-1] > 0, start + picked, -1)
+
+def _apply_effects(graph: _StoryGraph, choice: 'np.ndarray', values: 'np.ndarray', has_effects: 'np.ndarray') -> None:
+    """
+    Applies the effects of the choices made by the players, once per choice for all the players that made it.
+
+    Args:
+        graph (_StoryGraph): The graph of the story.
+        choice (np.ndarray): The index in `graph.targets` of the choice of each player.
+        values (np.ndarray): The values of the variables, with a row per variable and a column per player, changed in place.
+        has_effects (np.ndarray): Whether each choice of the story has effects.
+    """
+    players = np.flatnonzero(has_effects[choice])
+    players = players[np.argsort(choice[players], kind='stable')]
+    for selected in np.split(players, np.flatnonzero(np.diff(choice[players])) + 1):
+        if selected.size:
+            group_values = values[:, selected]
+            graph.effects[int(choice[selected[0]])](group_values)
+            values[:, selected] = group_values
+
+def simulate(story, players: int = 1000000, max_steps: int = 1000, weights: Union[None, Sequence[float], Dict[str, Sequence[float]],
+             Callable] = None, seed: Optional[int] = None, batch_size: int = 1000000) -> dict:
+    """
+    Simulates many playthroughs of a story at once, with NumPy, to see how often each scene and ending is reached.
+
+    Every player starts at the first scene and makes random choices until reaching a scene without choices, an ending, or
+    until making `max_steps` choices. Each player has its own values of the variables of the story: a choice is only made
+    when its condition holds for the player, its effects change the values of the player, and a player in a scene without
+    available choices ends there. By default each available choice of a scene is equally likely; `weights` changes the
+    chance of each choice, relative to the other choices of the same scene:
+
+    - a sequence with a weight for every choice of the story, in the order of `story.graph().targets`;
+    - a dictionary from scene names to the weights of the choices of the scene, in the order in which they were created.
+      Scenes not in the dictionary keep equally likely choices;
+    - a function receiving the name of a scene with choices and the scene, and returning the weights of its choices.
+
+    Args:
+        story (Story): The story to simulate.
+        players (int, optional): The number of players. Defaults to 1000000.
+        max_steps (int, optional): The maximum number of choices made by a player. Defaults to 1000.
+        weights (optional): The weights of the choices. Defaults to None, equally likely choices.
+        seed (int, optional): The seed of the random choices, for reproducible results. Defaults to None.
+        batch_size (int, optional): The number of players simulated at once, to limit the memory used. Defaults to 1000000.
+
+    Returns:
+        dict: The result of the simulation, with the keys:
+            players (int): The number of players.
+            names (Sequence[str]): The name of each scene, by scene number.
+            visits (np.ndarray): The number of visits to each scene, by scene number, counting every time a player enters it.
+            endings (Dict[str, int]): The number of players that reached each ending.
+            path_lengths (np.ndarray): The number of players that reached an ending with each number of choices.
+            unfinished (int): The number of players that didn't reach an ending in `max_steps` choices.
+
+    Raises:
+        ImportError: If NumPy is not installed.
+        ValueError: If the story has no scenes, or the weights are not valid.
+    """
+    if np is None:
+        raise ImportError("NumPy is required to simulate stories. Install it with 'pip install numpy'.")
+    graph = story.graph()
+    scenes = len(graph)
+    if scenes == 0:
+        raise ValueError("There are no scenes defined for the visual novel.")
+    if players < 1 or max_steps < 0 or batch_size < 1:
+        raise ValueError("The number of players and the batch size must be positive and max_steps not negative.")
+
+    starts = np.frombuffer(graph.starts, dtype=np.int32).astype(np.int64)
+    targets = np.frombuffer(graph.targets, dtype=np.int32)
+    degrees = np.diff(starts)
+    choice_weights = _choice_weights(story, graph, weights)
+
+    owners = np.repeat(np.arange(scenes), degrees)
+    if np.any(choice_weights < 0) or not np.all(np.isfinite(choice_weights)):
+        raise ValueError("The weights of the choices must be finite and not negative.")
+    totals = np.bincount(owners, weights=choice_weights, minlength=scenes)
+    if np.any(totals[degrees > 0] <= 0):
+        raise ValueError("Every scene with choices must have a choice with a positive weight.")
+    # the cumulative probability of each choice within its scene, the last choice of a scene is always 1
+    cumulative = np.cumsum(choice_weights)
+    before = np.concatenate(([0.0], cumulative))[starts[:-1]]
+    thresholds = (cumulative - before[owners]) / totals[owners] if len(targets) else np.zeros(0)
+    thresholds[starts[1:][degrees > 0] - 1] = 1.0
+    uniform = weights is None
+    # number of halvings needed by the binary search on the choices of any scene
+    rounds = int(degrees.max()).bit_length()
+    # the players carry the values of the variables only when the story has conditions or effects
+    stateful = bool(graph.conditions or graph.effects)
+    guarded = np.zeros(scenes, dtype=bool)
+    guarded[owners[np.fromiter(graph.conditions, dtype=np.int64, count=len(graph.conditions))]] = True
+    has_effects = np.zeros(len(targets), dtype=bool)
+    has_effects[np.fromiter(graph.effects, dtype=np.int64, count=len(graph.effects))] = True
+    initial = np.array(list(story.variables.values()), dtype=np.int64)
+
+    rng = np.random.default_rng(seed)
+    visits = np.zeros(scenes, dtype=np.int64)
+    finished: List['np.ndarray'] = []
+    path_lengths = np.zeros(max_steps + 1, dtype=np.int64)
+    unfinished = 0
+    pending: List['np.ndarray'] = []
+    pending_size = 0
+
+    for first in range(0, players, batch_size):
+        position = np.zeros(min(batch_size, players - first), dtype=np.int64)
+        values = np.repeat(initial[:, None], position.size, axis=1) if stateful else None
+        for step in range(max_steps + 1):
+            pending.append(position)
+            pending_size += position.size
+            # visits are counted in chunks, so each step doesn't cost time proportional to the number of scenes
+            if pending_size >= 4 * batch_size:
+                visits += np.bincount(np.concatenate(pending), minlength=scenes)
+                pending, pending_size = [], 0
+
+            ended = degrees[position] == 0
+            if ended.any():
+                finished.append(position[ended])
+                path_lengths[step] += finished[-1].size
+                position = position[~ended]
+                if stateful:
+                    values = values[:, ~ended]
+            if position.size == 0:
+                break
+            if step == max_steps:
+                unfinished += position.size
+                break
+            low = starts[position]
+            if uniform:
+                count = degrees[position]
+                choice = low + np.minimum((rng.random(position.size) * count).astype(np.int64), count - 1)
+            else:
+                # binary search of every player at once, restricted to the choices of the scene of the player
+                draw = rng.random(position.size)
+                high = starts[position + 1] - 1
+                for _ in range(rounds):
+                    middle = (low + high) >> 1
+                    above = thresholds[middle] <= draw
+                    low = np.where(above, middle + 1, low)
+                    high = np.where(above, high, middle)
+                choice = low
+            if stateful:
+                in_guarded = np.flatnonzero(guarded[position])
+                if in_guarded.size:
+                    _guarded_choices(graph, position, values, in_guarded, choice_weights, rng, choice)
+                    # players without any available choice end the story where they are
+                    stuck = choice < 0
+                    if stuck.any():
+                        finished.append(position[stuck])
+                        path_lengths[step] += finished[-1].size
+                        position, choice, values = position[~stuck], choice[~stuck], values[:, ~stuck]
+                if graph.effects:
+                    _apply_effects(graph, choice, values, has_effects)
+            position = targets[choice].astype(np.int64)
+
+    if pending:
+        visits += np.bincount(np.concatenate(pending), minlength=scenes)
+    ending_counts = np.bincount(np.concatenate(finished), minlength=scenes) if finished else np.zeros(scenes, dtype=np.int64)
+
+    return {
+        'players': players,
+        'names': graph.names,
+        'visits': visits,
+        'endings': {graph.names[number]: int(ending_counts[number]) for number in np.flatnonzero(ending_counts)},
+        'path_lengths': np.trim_zeros(path_lengths, 'b'),
+        'unfinished': unfinished,
+    }
@@ -1,7 +1,11 @@
-from typing import List
+from typing import Callable, Dict, Iterator, List, Optional, Union
+import keyword
+from vnengine.base.animation import _Animation
+from vnengine.base.effect import _Effect
 from vnengine.base.scene import _Scene
+from vnengine.base.graph import _StoryGraph
+from vnengine.pack import asset_exists, mount
 import warnings
-from vnengine.utils.game import _Game
 import os
 
 class Story:
@@ -10,7 +14,18 @@ class Story:
 
     Attributes:
         starting_background (str): The path of the starting menu background image.
+        starting_music (str): The path of the starting menu music.
         scenes (dict): A dictionary containing the scenes of the story.
+        characters (Dict[str, Dict[str, str]]): The image of each expression of each character.
+        asset_pack (str): The path of the asset pack mounted when the game runs, if it exists.
+        fonts (Dict[Optional[str], str]): The TrueType font file of each language, None for every language without its own
+            font. Languages without a font use the default font.
+        variables (Dict[str, int]): The initial value of each variable of the story, in the order in which they were added.
+        slots (Dict[str, int]): The index of each variable in the variable array of a playthrough.
+        analytics (str): The path of the database where the scenes entered and the choices taken by the players are
+            recorded, or None to record nothing.
+        memory_budget (int): The bytes the caches of the game can hold together, or None for the default size of each cache.
+        low_memory (bool): Whether the game saves memory at the cost of image quality.
     """
 
     def __init__(self):
@@ -18,12 +33,22 @@ class Story:
         Initializes a new instance of the Story class.
         """
         self.starting_background: str = None # starting menu background image
+        self.starting_music: str = None # starting menu music
         self.scenes: dict = {}
+        self.characters: Dict[str, Dict[str, str]] = {}
         self.scenes_names: List[str] = []
         self.languages: List[str] = ['pt', 'en']
         self.language: str = 'pt'
         self.resolution: str = 'hd'
+        self.display_mode: str = 'fullscreen'
         self.number_scenes: int = 0
+        self.asset_pack: str = 'assets.pack'
+        self.fonts: Dict[Optional[str], str] = {}
+        self.variables: Dict[str, int] = {}
+        self.slots: Dict[str, int] = {}
+        self.analytics: Optional[str] = None
+        self.memory_budget: Optional[int] = None
+        self.low_memory: bool = False
     
     def set_languages(self, languages: List[str]) -> None:
         """
@@ -60,7 +85,85 @@ class Story:
             None
         """
         self.resolution = resolution
+
+    def set_display_mode(self, display_mode: str) -> None:
+        """
+        Set the display mode of the game window.
+
+        Args:
+            display_mode: A String with the choosen display mode.
+                Availables: 'fullscreen', 'windowed', 'resizable'.
+
+        Returns:
+            None
+        """
+        if display_mode not in ('fullscreen', 'windowed', 'resizable'):
+            raise ValueError(f"The display mode {display_mode} is not valid. Availables: 'fullscreen', 'windowed', 'resizable'.")
+        self.display_mode = display_mode
         
+    def set_asset_pack(self, path: str) -> None:
+        """
+        Set the asset pack read by the game. The paths of the images and audio files of the story are looked up in the pack
+        first, and then on the disk.
+
+        Args:
+            path (str): The path of the pack built by the CLI. Defaults to 'assets.pack'.
+
+        Returns:
+            None
+        """
+        self.asset_pack = path
+
+    def set_analytics(self, path: Optional[str] = 'analytics.db') -> None:
+        """
+        Records the scenes entered and the choices taken by the players in a local SQLite database, to be summarized with
+        the 'report' command of the CLI. Nothing is recorded unless this is set.
+
+        Args:
+            path (str, optional): The path of the database, or None to stop recording. Defaults to 'analytics.db'.
+
+        Returns:
+            None
+        """
+        self.analytics = path
+
+    def set_memory_budget(self, megabytes: Optional[int], low_memory: bool = False) -> None:
+        """
+        Set the memory that the caches of the game can hold together: the decoded and scaled images, the composites of the
+        scenes, the rendered texts, the decoded sounds and the thumbnails. With a budget the caches keep as much as fits
+        in it, and evict first what is cheapest to make again.
+
+        Args:
+            megabytes (int): The budget in megabytes, or None for the default size of each cache.
+            low_memory (bool, optional): Whether memory is saved at the cost of image quality: the backgrounds of the next
+                scenes are prefetched with 16 bits per pixel. Defaults to False.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If the budget is not positive.
+        """
+        if megabytes is not None and megabytes <= 0:
+            raise ValueError("The memory budget must be greater than 0 megabytes.")
+        self.memory_budget = megabytes * 1024 * 1024 if megabytes is not None else None
+        self.low_memory = low_memory
+        
+    def set_font(self, font: str, language: Optional[str] = None) -> None:
+        """
+        Set the font of the texts of the game, e.g. a font with the letters of a language. Each font is loaded once for
+        each size and shared by every text of the game.
+
+        Args:
+            font (str): The path of a TrueType font file, e.g. a '.ttf' or '.otf' file.
+            language (str, optional): The language written with the font. Defaults to None, used for every language
+                without its own font. Availables: 'de', 'en', 'es', 'fr', 'pt'.
+
+        Returns:
+            None
+        """
+        self.fonts[language] = font
+
     def add_starting_background(self, image: str) -> None:
         """
         Adds the starting menu background image to the story.
@@ -70,6 +173,15 @@ class Story:
         """
         self.starting_background = image
 
+    def add_starting_music(self, music: str) -> None:
+        """
+        Adds the music played in the starting menu.
+
+        Args:
+            music (str): The path of the music file, e.g. an '.ogg' or '.mp3' file.
+        """
+        self.starting_music = music
+
     def add_scene(self, scene_name: str, character_text: str, image: str) -> None:
         """
         Adds a new scene to the story.
@@ -82,16 +194,254 @@ class Story:
         self.scenes[scene_name] = _Scene(character_text, image, len(self.scenes_names))
         self.scenes_names.append(scene_name)
 
-    def add_choice(self, current_scene_name: str, choice_text: str, go_to_scene: str) -> None:
+    def add_variable(self, name: str, value: int = 0) -> None:
+        """
+        Adds a variable to the story, e.g. a flag, a counter or the amount of an item, used by the conditions and effects
+        of the choices. Variables are integers, and True and False are stored as 1 and 0.
+
+        Args:
+            name (str): The name of the variable, a valid identifier.
+            value (int, optional): The value of the variable when a game starts. Defaults to 0.
+
+        Raises:
+            ValueError: If the name or the value is not valid.
+        """
+        if not name.isidentifier() or keyword.iskeyword(name):
+            raise ValueError(f"The variable name {name} is not valid. Use letters, digits and underscores.")
+        if not isinstance(value, int):
+            raise ValueError(f"The value of the variable {name} must be an integer.")
+        self.slots.setdefault(name, len(self.slots))
+        self.variables[name] = int(value)
+
+    def add_choice(self, current_scene_name: str, choice_text: str, go_to_scene: str, condition: Optional[str] = None,
+                   effects: Optional[str] = None) -> None:
         """
-        Adds a choice to a scene.
+        Adds a choice to a scene. A scene can have several choices that go to the same scene.
+
+        The condition and the effects are compiled once, when the choice is added, so the variables they use must be added
+        before with `add_variable`. They use the variables, integers, the operators +, -, *, //, %, the comparisons, and,
+        or and not. Two choices with the same text and opposite conditions make a conditional branch.
 
         Args:
             current_scene_name (str): The name of the current scene.
             choice_text (str): The text of the choice.
             go_to_scene (str): The name of the scene to go to when the choice is selected.
+            condition (str, optional): The condition that must hold for the choice to be shown, e.g.
+                'gold >= 10 and not has_key'. Defaults to None, always shown.
+            effects (str, optional): The assignments done when the choice is selected, separated by ';', e.g.
+                'gold -= 10; has_key = 1'. Defaults to None.
+
+        Raises:
+            ValueError: If the condition or the effects are not valid or use a variable that is not defined.
+        """
+        self.scenes[current_scene_name].add_choice(choice_text, go_to_scene, condition, effects, self.slots)
+
+    def add_character(self, character: str, expressions: Dict[str, str]) -> None:
+        """
+        Adds a character that can be shown in the scenes, with the image of each of its expressions.
+
+        Args:
+            character (str): The name of the character.
+            expressions (Dict[str, str]): The path of the image of each expression, e.g. {'happy': 'assets/anna_happy.png'}.
+                Images with transparency, like '.png' files, are drawn over the background.
+        """
+        self.characters.setdefault(character, {}).update(expressions)
+
+    def add_sprite(self, scene_name: str, character: str, expression: str, x: float = 0.5, y: float = 1.0) -> None:
+        """
+        Shows a character in a scene. Sprites are drawn over the background in the order in which they are added.
+
+        Args:
+            scene_name (str): The name of the scene.
+            character (str): The name of the character, added with `add_character`.
+            expression (str): The expression of the character.
+            x (float, optional): The horizontal center of the sprite, as a fraction of the background width. Defaults to 0.5.
+            y (float, optional): The bottom of the sprite, as a fraction of the background height. Defaults to 1.0.
+        """
+        expressions = self.characters.get(character)
+        if expressions is None:
+            raise ValueError(f"The character {character} is not defined. Add it with add_character.")
+        if expression not in expressions:
+            raise ValueError(f"The character {character} has no expression {expression}. Availables: {', '.join(expressions)}.")
+        self.scenes[scene_name].sprites.append((expressions[expression], float(x), float(y)))
+
+    def add_overlay(self, scene_name: str, image: str) -> None:
+        """
+        Adds a foreground image drawn over the sprites of a scene, scaled to the size of the background, e.g. rain or a
+        vignette. Overlays are drawn in the order in which they are added.
+
+        Args:
+            scene_name (str): The name of the scene.
+            image (str): The path of the image, with transparency.
+        """
+        self.scenes[scene_name].overlays.append(image)
+
+    def set_animation(self, scene_name: str, frames: Union[str, List[str]], fps: float = 12.0, columns: int = 1, rows: int = 1,
+                      count: Optional[int] = None, loop: bool = True) -> None:
+        """
+        Sets an animated background drawn in a scene instead of its image, under its sprites and overlays. The frames are
+        decoded ahead while the scene is shown; the image of the scene is shown until the first frame is ready.
+
+        Args:
+            scene_name (str): The name of the scene.
+            frames (str or List[str]): The path of a sprite sheet, or the paths of the images of the frames, in order.
+            fps (float, optional): The frames shown per second. Defaults to 12.
+            columns (int, optional): The number of columns of the sprite sheet. Defaults to 1.
+            rows (int, optional): The number of rows of the sprite sheet. Defaults to 1.
+            count (int, optional): The number of frames of the sprite sheet, when its last row is not full. Defaults to
+                every cell.
+            loop (bool, optional): Whether the animation starts again after its last frame, or stops on it. Defaults to True.
+
+        Raises:
+            ValueError: If there are no frames, or the frame rate or the grid of the sprite sheet are not valid.
+        """
+        self.scenes[scene_name].animation = _Animation(frames, fps, columns, rows, count, loop)
+
+    def add_effect(self, scene_name: str, kind: str, count: Optional[int] = None) -> None:
+        """
+        Adds an ambient effect to a scene: particles drawn over its background, sprites and overlays, e.g. falling rain or
+        snow. The effects keep moving into the next scene when it has the same ones.
+
+        Args:
+            scene_name (str): The name of the scene.
+            kind (str): The kind of the effect. Availables: 'rain', 'snow', 'sparkles', 'dust'.
+            count (int, optional): The number of particles. Defaults to a number that depends on the kind, e.g. 4000 for
+                rain. Tens of thousands of particles can be drawn at every resolution.
+
+        Raises:
+            ValueError: If the kind is not valid or the number of particles is not positive.
+        """
+        self.scenes[scene_name].effects.append(_Effect(kind, count))
+
+    def set_script(self, scene_name: str, script: Callable[[], Iterator]) -> None:
+        """
+        Sets the script of a scene: a generator function whose actions, from `vnengine.script`, run while the scene is
+        shown, e.g. waits, lines of text, sprite moves, sound effects and shakes. A click runs the rest of the script at
+        once, and the script is saved in the save slots with the time it was at.
+
+        Args:
+            scene_name (str): The name of the scene.
+            script (Callable): The generator function. It must do the same actions each time it runs, so a saved script can
+                be restored by running it again.
+
+        Raises:
+            ValueError: If the script is not callable.
+        """
+        if not callable(script):
+            raise ValueError(f"The script of the scene {scene_name} must be a generator function.")
+        self.scenes[scene_name].script = script
+
+    def add_music(self, scene_name: str, music: str) -> None:
+        """
+        Sets the background music that starts playing when the player enters a scene. The music keeps playing in the next
+        scenes until a scene with other music, and is streamed from the disk instead of being loaded in memory.
+
+        Args:
+            scene_name (str): The name of the scene.
+            music (str): The path of the music file, or None to stop the music in this scene.
+        """
+        self.scenes[scene_name].music = music if music else ''
+
+    def add_voice(self, scene_name: str, voice: str, language: str = None) -> None:
+        """
+        Adds the voice-over played when the player enters a scene.
+
+        Args:
+            scene_name (str): The name of the scene.
+            voice (str): The path of the voice-over file.
+            language (str, optional): The language of the voice-over. Defaults to None, used for every language without its
+                own voice-over. Availables: 'de', 'en', 'es', 'fr', 'pt'.
+        """
+        self.scenes[scene_name].voices[language] = voice
+
+    def focus(self, scene_name: str) -> None:
+        """
+        Called by the game when the player enters a scene. Every scene of a Story is always in memory, so nothing is done;
+        stories that load their scenes on demand use it to keep the scenes near the player loaded.
+
+        Args:
+            scene_name (str): The name of the scene the player entered.
         """
-        self.scenes[current_scene_name].add_choice(choice_text, go_to_scene)
+        
+    def graph(self) -> _StoryGraph:
+        """
+        Builds the compact graph of the choices of the story, used to analyse and simulate the story.
+
+        Returns:
+            _StoryGraph: The graph of the story.
+        """
+        return _StoryGraph.from_story(self)
+
+    def validateFonts(self) -> None:
+        """
+        Validates that the font file of every language exists.
+        Raises a ValueError if a font file is not found.
+        """
+        for language, font in self.fonts.items():
+            if not asset_exists(font):
+                raise ValueError(f"Font {font} of the language {language if language else 'every language'} was not found. Check the Path.")
+
+    def validateImages(self) -> None:
+        """
+        Validates that the background image, the frames of the animated background and the overlays of every scene, and
+        the images of the characters, exist.
+        Raises a ValueError if an image is not found.
+        """
+        for scene in self.scenes.values():
+            if not asset_exists(scene.background_display_img):
+                raise ValueError(f"Image on Scene {self.scenes_names[scene.scene_number]} was not found. Check the Path.")
+            for overlay in scene.overlays:
+                if not asset_exists(overlay):
+                    raise ValueError(f"Overlay {overlay} on Scene {self.scenes_names[scene.scene_number]} was not found. Check the Path.")
+            for frame in (scene.animation.frames if scene.animation else []):
+                if not asset_exists(frame):
+                    raise ValueError(f"Frame {frame} of the animation on Scene {self.scenes_names[scene.scene_number]} was not found. Check the Path.")
+        self.validateCharacters()
+
+    def validateCharacters(self) -> None:
+        """
+        Validates that the image of every expression of every character exists.
+        Raises a ValueError if an image is not found.
+        """
+        for character, expressions in self.characters.items():
+            for expression, image in expressions.items():
+                if not asset_exists(image):
+                    raise ValueError(f"Image of the expression {expression} of {character} was not found. Check the Path.")
+        
+    def audio_files(self) -> List[str]:
+        """
+        Gets the audio files used by the story: the starting menu music, and the music and voice-overs of the scenes.
+
+        Returns:
+            List[str]: The paths of the audio files, each one once.
+        """
+        files = dict.fromkeys([self.starting_music] if self.starting_music else [])
+        for scene in self.scenes.values():
+            if scene.music:
+                files[scene.music] = None
+            files.update(dict.fromkeys(scene.voices.values()))
+        return list(files)
+
+    def backgrounds(self) -> Dict[str, List[int]]:
+        """
+        Gets the background images of the scenes, e.g. for the gallery.
+
+        Returns:
+            Dict[str, List[int]]: The numbers of the scenes of each background, in the order the backgrounds appear.
+        """
+        images: Dict[str, List[int]] = {}
+        for scene in self.scenes.values():
+            images.setdefault(scene.background_display_img, []).append(scene.scene_number)
+        return images
+
+    def validateAudio(self) -> None:
+        """
+        Validates that every audio file of the story exists.
+        Raises a ValueError if an audio file is not found.
+        """
+        for path in self.audio_files():
+            if not asset_exists(path):
+                raise ValueError(f"Audio file {path} was not found. Check the Path.")
         
     def validatePathing(self) -> None:
         """
@@ -105,40 +455,62 @@ class Story:
         reachable: List[bool] = [False] * len(self.scenes_names)
                 
         stack: List[_Scene] = [self.scenes[self.scenes_names[0]]] 
+        reachable[0] = True
         
         current: _Scene = None
         
+        # scenes are marked when pushed, so each scene is visited once and the check is linear on the size of the story
         while stack:
             current = stack.pop()
-            reachable[current.scene_number] = True
             
-            for s in current.choices.keys():
-                if not s in self.scenes_names:
+            for s in (choice.go_to_scene for choice in current.choices):
+                if not s in self.scenes:
                     raise ValueError(f"Scene {s} is not defined in the story. Define this scene so it can be used in a choice.")
                 
-                if not self.scenes[s] in stack and not reachable[self.scenes_names.index(s)]:
+                if not reachable[self.scenes[s].scene_number]:
+                    reachable[self.scenes[s].scene_number] = True
                     stack.append(self.scenes[s])
 
         for idx, s  in enumerate(reachable):
             if s == False:
                 warnings.warn(f"Scene {self.scenes_names[idx]} is not reachable from any choice")
+
+    def validate(self) -> None:
+        """
+        Validates the images, audio, fonts and pathing of the story.
+
+        Raises:
+            ValueError: If an asset is not found or a choice goes to a scene that is not defined.
+        """
+        self.validateImages()
+        
+        self.validateAudio()
+
+        self.validateFonts()
+            
+        self.validatePathing()
                             
     def run(self) -> None:
         """
         Runs the game with the scenes and choices defined.
+
+        The window opens at once and the story is validated while the menu loads; a game is started only once the story
+        is valid, and an invalid story stops the game as soon as it is found invalid.
         """
         
         if not self.language in self.languages:
             raise ValueError(f"The language {self.language} is not on the available languages defined. Add this languages to the languages available.")
         
-        for scene in self.scenes.values():
-            if not os.path.exists(scene.background_display_img):
-                raise ValueError(f"Image on Scene {self.scenes_names[scene.scene_number]} was not found. Check the Path.")
-            
-        self.validatePathing()
+        if self.asset_pack and os.path.exists(self.asset_pack):
+            mount(self.asset_pack)
+        
+        # the renderer is imported only when a game starts, so defining and validating stories doesn't load pygame
+        from vnengine.utils.game import _Game
         
         game = _Game(self)
         
+        game.startup.submit('validation', self.validate)
+        
         game.run()
 
 
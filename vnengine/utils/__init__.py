@@ -0,0 +1,4 @@
+import os
+
+# hide the banner printed by pygame when it is imported
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
@@ -0,0 +1,163 @@
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pygame
+from pygame.surface import Surface
+from vnengine.base.animation import _Animation
+from vnengine.utils.cache import _load_image
+
+__all__: List[str] = []
+
+class _FramePlayer:
+    """
+    Plays an animated background: a worker decodes and scales the next frames ahead into a ring of surfaces, so the game
+    loop only blits the current frame.
+
+    The ring has a fixed number of frames, so the memory held does not depend on the length of the animation. When a frame
+    is not decoded in time, the last frame shown stays on the screen and the frames that were never shown are counted as
+    dropped.
+
+    Attributes:
+        animation (_Animation): The animation played.
+        size (tuple): The (width, height) the frames are scaled to.
+        capacity (int): The number of frames decoded ahead.
+        loader (Callable[[str], Surface]): Function decoding an image from its path.
+        ring (List[Optional[tuple]]): The (sequence, surface) of the frames decoded ahead, the frame of each sequence at the
+            index sequence % capacity.
+        position (int): The sequence number of the frame the game is at.
+        shown (int): The sequence number of the last frame shown, -1 before the first one.
+        frame_surface (pygame.Surface): The last frame shown, or None before the first one.
+        dropped (int): The number of frames that were not decoded in time and never shown.
+        decoded (int): The number of frames decoded.
+        sheets (Dict[str, Surface]): The sprite sheets already decoded, cut into frames without copying them.
+    """
+
+    def __init__(self, animation: _Animation, size: Tuple[int, int], capacity: int = 6,
+                 loader: Callable[[str], Surface] = _load_image) -> None:
+        """
+        Initializes the player and starts decoding the first frames.
+
+        Args:
+            animation (_Animation): The animation to play.
+            size (tuple): The (width, height) the frames are scaled to.
+            capacity (int, optional): The number of frames decoded ahead. Defaults to 6.
+            loader (Callable, optional): Function decoding an image from its path. Defaults to reading it from the asset
+                packs or the disk.
+        """
+        self.animation = animation
+        self.size = tuple(size)
+        self.capacity = max(1, capacity)
+        self.loader = loader
+        self.ring: List[Optional[Tuple[int, Surface]]] = [None] * self.capacity
+        self.position = 0
+        self.next = 0
+        self.generation = 0
+        self.shown = -1
+        self.frame_surface: Optional[Surface] = None
+        self.dropped = 0
+        self.decoded = 0
+        self.sheets: Dict[str, Surface] = {}
+        self.error: Optional[Exception] = None
+        self.closed = False
+        self.condition = threading.Condition()
+        self.thread = threading.Thread(target=self._decode_ahead, name='vnengine-animation', daemon=True)
+        self.thread.start()
+
+    def _ready(self) -> bool:
+        """
+        Whether the worker has a frame to decode. Called with the condition held.
+        """
+        if self.next >= self.position + self.capacity:
+            return False
+        return self.animation.loop or self.next < self.animation.count
+
+    def _decode(self, sequence: int) -> Surface:
+        """
+        Decodes and scales a frame. Called by the worker.
+
+        Args:
+            sequence (int): The sequence number of the frame.
+
+        Returns:
+            pygame.Surface: The frame.
+        """
+        path, cell = self.animation.source(sequence)
+        if cell is None:
+            image = self.loader(path)
+        else:
+            sheet = self.sheets.get(path)
+            if sheet is None:
+                sheet = self.sheets[path] = self.loader(path)
+            column, row, columns, rows = cell
+            width, height = sheet.get_width() // columns, sheet.get_height() // rows
+            image = sheet.subsurface(pygame.Rect(column * width, row * height, width, height))
+        return pygame.transform.scale(image, self.size)
+
+    def _decode_ahead(self) -> None:
+        while True:
+            with self.condition:
+                while not self.closed and not self._ready():
+                    self.condition.wait()
+                if self.closed:
+                    return
+                # a worker left behind skips the frames the game already passed
+                sequence = self.next = max(self.next, self.position)
+                self.next += 1
+                generation = self.generation
+            try:
+                surface = self._decode(sequence)
+            except Exception as exception:
+                with self.condition:
+                    self.error = exception
+                return
+            with self.condition:
+                if generation == self.generation and sequence >= self.position:
+                    self.ring[sequence % self.capacity] = (sequence, surface)
+                    self.decoded += 1
+
+    def frame(self, elapsed: int) -> Optional[Surface]:
+        """
+        Gets the frame to show, and lets the worker decode the frames after it.
+
+        Args:
+            elapsed (int): The time since the animation started, in milliseconds.
+
+        Returns:
+            pygame.Surface: The current frame, or the last frame shown if it is not decoded yet, or None before the first
+                frame is decoded.
+
+        Raises:
+            Exception: The error of the worker, if a frame could not be decoded.
+        """
+        target = self.animation.sequence(elapsed)
+        with self.condition:
+            if self.error is not None:
+                raise self.error
+            if target < self.position:
+                # the animation started again: the frames decoded ahead are of the old position
+                self.generation += 1
+                self.ring = [None] * self.capacity
+                self.next = target
+                self.shown = target - 1
+            if target != self.position:
+                self.position = target
+                self.condition.notify()
+            entry = self.ring[target % self.capacity]
+            if entry is None or entry[0] != target or target == self.shown:
+                return self.frame_surface
+            self.dropped += max(0, target - self.shown - 1)
+            self.shown = target
+            surface = entry[1]
+        self.frame_surface = surface.convert() if pygame.display.get_surface() is not None else surface
+        return self.frame_surface
+
+    def close(self) -> None:
+        """
+        Stops the worker and drops the frames.
+        """
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
+        self.thread.join()
+        self.ring = [None] * self.capacity
+        self.sheets.clear()
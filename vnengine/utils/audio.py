@@ -0,0 +1,236 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional
+
+import pygame
+from vnengine.pack import open_asset
+from vnengine.utils.cache import _LRUCache
+
+__all__: List[str] = []
+
+class _AudioManager:
+    """
+    Plays the music and voice-overs of the game without blocking the game loop.
+
+    Music is streamed from the disk with `pygame.mixer.music`, so only a small buffer of it is in memory; changing tracks
+    fades the current track out and the new one in. Voice-overs and sound effects are decoded into `pygame.mixer.Sound`
+    objects by a worker and kept in a cache bounded by their bytes. A voice-over that is not decoded yet starts when it is
+    ready, so entering a scene never waits for audio.
+
+    The game works without audio when the mixer can't be initialized, e.g. on machines without an audio device.
+
+    Attributes:
+        enabled (bool): Whether the mixer was initialized.
+        fade_ms (int): The duration of the fade out and fade in between music tracks, in milliseconds.
+        sounds (_LRUCache): The decoded voice-overs and sound effects, by path.
+        pending (Dict[str, Future]): The sounds being decoded in the background, by path.
+        music (str): The music playing or fading in, or None.
+        next_music (str): The music that starts when the current one has faded out, '' for silence, or None.
+        voice (str): The voice-over that plays as soon as it is decoded, or None.
+        effects (List[str]): The sound effects that play as soon as they are decoded.
+        executor (ThreadPoolExecutor): The worker decoding the sounds.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, fade_ms: int = 800, clock: Callable[[], int] = pygame.time.get_ticks) -> None:
+        """
+        Initializes the mixer and the audio manager.
+
+        Args:
+            max_bytes (int, optional): The maximum bytes of the decoded sounds. Defaults to 64 MB.
+            fade_ms (int, optional): The duration of the fades between music tracks, in milliseconds. Defaults to 800.
+            clock (Callable, optional): Function returning the current time in milliseconds. Defaults to pygame.time.get_ticks.
+        """
+        try:
+            if pygame.mixer.get_init() is None:
+                pygame.mixer.init()
+            frequency, size, channels = pygame.mixer.get_init()
+            pygame.mixer.set_reserved(1)
+            self.enabled = True
+        except pygame.error:
+            frequency, size, channels = 44100, -16, 2
+            self.enabled = False
+        bytes_per_second = frequency * channels * abs(size) // 8
+
+        self.fade_ms = fade_ms
+        self.clock = clock
+        self.sounds = _LRUCache(max_bytes, lambda sound: int(sound.get_length() * bytes_per_second))
+        self.pending: Dict[str, Future] = {}
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='vnengine-audio')
+        self.music: Optional[str] = None
+        self.next_music: Optional[str] = None
+        self.switch_at = 0
+        self.voice: Optional[str] = None
+        self.effects: List[str] = []
+        self.channel = pygame.mixer.Channel(0) if self.enabled else None
+        self.music_file = None
+
+    def load(self, path: str) -> pygame.mixer.Sound:
+        """
+        Decodes a sound, or gets it from the cache. Safe to call from the worker.
+
+        Args:
+            path (str): The path of the sound.
+
+        Returns:
+            pygame.mixer.Sound: The decoded sound.
+        """
+        sound = self.sounds.get(path)
+        if sound is None:
+            with open_asset(path) as file:
+                sound = pygame.mixer.Sound(file=file)
+            self.sounds.put(path, sound)
+        return sound
+
+    def prefetch(self, paths: Iterable[str]) -> None:
+        """
+        Decodes sounds in the background, e.g. the voice-overs of the scenes the player can go to.
+
+        Args:
+            paths (Iterable[str]): The paths of the sounds.
+        """
+        if not self.enabled:
+            return
+        for path in paths:
+            with self.lock:
+                if path in self.pending or path in self.sounds:
+                    continue
+                future = self.executor.submit(self.load, path)
+                self.pending[path] = future
+            future.add_done_callback(lambda future, path=path: self._done(path, future))
+
+    def _done(self, path: str, future: Future) -> None:
+        with self.lock:
+            if self.pending.get(path) is future:
+                del self.pending[path]
+
+    def play_music(self, music: Optional[str]) -> None:
+        """
+        Changes the music, fading the current track out and the new one in. Playing the current track again does nothing.
+
+        Args:
+            music (str): The path of the music, or '' or None to stop the music.
+        """
+        music = music if music else None
+        if self.next_music is not None:
+            # a fade out is already running, only the track that follows it changes
+            self.next_music = music if music else ''
+            return
+        if music == self.music:
+            return
+        if not self.enabled or self.music is None:
+            self.start_music(music)
+            return
+
+        # the stream fades out by itself, the new track is loaded by `update` once it is silent
+        pygame.mixer.music.fadeout(self.fade_ms)
+        self.next_music = music if music else ''
+        self.switch_at = self.clock() + self.fade_ms
+
+    def start_music(self, music: Optional[str]) -> None:
+        """
+        Starts streaming a music in a loop, fading it in.
+
+        Args:
+            music (str): The path of the music, or None for silence.
+        """
+        self.music = music
+        if not self.enabled:
+            return
+        if music is None:
+            pygame.mixer.music.stop()
+            return
+        # the file stays open while the music is streamed from it
+        music_file = open_asset(music)
+        pygame.mixer.music.load(music_file, music)
+        if self.music_file is not None:
+            self.music_file.close()
+        self.music_file = music_file
+        pygame.mixer.music.play(-1, fade_ms=self.fade_ms)
+
+    def play_voice(self, voice: Optional[str]) -> None:
+        """
+        Stops the current voice-over and plays another, as soon as it is decoded.
+
+        Args:
+            voice (str): The path of the voice-over, or None to only stop the current one.
+        """
+        if not self.enabled:
+            return
+        self.channel.stop()
+        self.voice = voice
+        if voice is not None:
+            self.prefetch([voice])
+            self.update()
+
+    def play_sound(self, path: str) -> None:
+        """
+        Plays a sound effect on a free channel, over the music and the voice-over, as soon as it is decoded.
+
+        Args:
+            path (str): The path of the sound effect.
+        """
+        if not self.enabled:
+            return
+        self.effects.append(path)
+        self.prefetch([path])
+        self.update()
+
+    @property
+    def voice_playing(self) -> bool:
+        """
+        bool: Whether a voice-over is playing or waiting to be decoded.
+        """
+        return self.enabled and (self.voice is not None or self.channel.get_busy())
+
+    def update(self) -> None:
+        """
+        Called once per frame: starts the music that waits for the previous one to fade out, and the voice-over and sound
+        effects that were waiting to be decoded.
+        """
+        if not self.enabled:
+            return
+        if self.next_music is not None and self.clock() >= self.switch_at:
+            music, self.next_music = self.next_music, None
+            self.start_music(music if music else None)
+        if self.voice is not None:
+            with self.lock:
+                decoding = self.voice in self.pending
+            sound = self.sounds.get(self.voice)
+            if sound is not None:
+                self.voice = None
+                self.channel.play(sound)
+            elif not decoding:
+                # decoding failed, the voice-over is skipped instead of stopping the game
+                self.voice = None
+        if self.effects:
+            waiting = []
+            for path in self.effects:
+                with self.lock:
+                    decoding = path in self.pending
+                sound = self.sounds.get(path)
+                if sound is not None:
+                    sound.play()
+                elif decoding:
+                    waiting.append(path)
+            self.effects = waiting
+
+    def forget(self, path: str) -> None:
+        """
+        Drops a decoded sound, e.g. after its file changed, and restarts the music if it is the one playing.
+
+        Args:
+            path (str): The path of the sound or music.
+        """
+        self.sounds.pop(path)
+        if path == self.music and self.next_music is None:
+            self.start_music(path)
+
+    def close(self) -> None:
+        """
+        Stops the audio and the worker.
+        """
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        if self.enabled:
+            pygame.mixer.music.stop()
+            self.channel.stop()
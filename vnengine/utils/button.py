@@ -2,6 +2,8 @@ import pygame
 from typing import Optional, Tuple
 from pygame.font import Font
 from pygame.surface import Surface
+from vnengine.utils.cache import _TextCache
+from vnengine.utils.font import _default_font
 from typing import List
 
 __all__: List[str] = []
@@ -19,11 +21,12 @@ class _Button:
         font (pygame.font.Font): The font used for the button text.
         scenario (str): The scenario in which the button is used ('menu', 'scene', or 'choice').
         rect (tuple): The rectangular area occupied by the button.
+        text_cache (_TextCache): The cache of rendered texts, if any.
     """
 
     def __init__(self, x: int, y: int, text: Optional[str] = None, color: Tuple[int, int, int] = (110, 110, 110),
                  hover_color: Tuple[int, int, int] = (220, 220, 220), font: Optional[Font] = None,
-                 scenario: str = 'menu') -> None:
+                 scenario: str = 'menu', text_cache: Optional[_TextCache] = None) -> None:
         """
         Initializes a Button object.
 
@@ -33,17 +36,20 @@ class _Button:
             text (str, optional): The text displayed on the button. Defaults to None.
             color (tuple, optional): The default color of the button in RGB format. Defaults to (110, 110, 110).
             hover_color (tuple, optional): The color of the button when hovered over in RGB format. Defaults to (220, 220, 220).
-            font (pygame.font.Font, optional): The font used for the button text. Defaults to None.
+            font (pygame.font.Font, optional): The font used for the button text. Defaults to None, which uses the shared
+                default font with a size of x / 25.
             scenario (str, optional): The scenario in which the button is used. Defaults to 'menu'.
+            text_cache (_TextCache, optional): The cache used to render the text only once per color. Defaults to None.
         """
         self.x = x
         self.y = y
         self.text = text
         self.default_color = color
         self.hover_color = hover_color
-        self.font = font if font else pygame.font.Font(None, x // 25)
+        self.font = font if font else _default_font(x // 25)
         self.scenario = scenario
         self.rect = (x, y)
+        self.text_cache = text_cache
 
     def draw(self, screen: Surface) -> None:
         """
@@ -58,21 +64,54 @@ class _Button:
         else:
             text_color = self.default_color
         if self.scenario == 'menu':
-            text = self.font.render(self.text, True, text_color)
+            text = self.render(text_color)
             screen.blit(text, (self.x, self.y))
         elif self.scenario == 'scene':
-            text = self.font.render(self.text, True, text_color)
+            text = self.render(text_color)
             screen.blit(text, (self.x, self.y))
         elif self.scenario == 'choice':
             button_width: int = self.font.size(self.text)[0] + 20
             button_height: int = self.font.size(self.text)[1] + 10
             button_rect = pygame.Rect(self.x - button_width / 2, self.y - button_height / 2, button_width, button_height)
             pygame.draw.rect(screen, (0, 0, 0), button_rect)
-            text = self.font.render(self.text, True, text_color)
+            text = self.render(text_color)
             text_rect = text.get_rect(center=(self.x, self.y))
             screen.blit(text, text_rect)
             self.rect = button_rect[:2]
 
+    def render(self, color: Tuple[int, int, int]) -> Surface:
+        """
+        Render the text of the button.
+
+        Args:
+            color (tuple): The color of the text in RGB format.
+
+        Returns:
+            pygame.Surface: The rendered text.
+        """
+        if self.text_cache is not None:
+            return self.text_cache.render(self.font, self.text, color)
+        return self.font.render(self.text, True, color)
+
+    def surface(self, hovered: bool = False) -> Surface:
+        """
+        Renders the button on its own surface, e.g. to be cached as a row of a scrolling list. Choice buttons are rendered
+        with their box.
+
+        Args:
+            hovered (bool, optional): Whether to use the hover color. Defaults to False.
+
+        Returns:
+            pygame.Surface: The rendered button.
+        """
+        text = self.render(self.hover_color if hovered else self.default_color)
+        if self.scenario != 'choice':
+            return text
+        surface = Surface((text.get_width() + 20, text.get_height() + 10))
+        surface.fill((0, 0, 0))
+        surface.blit(text, text.get_rect(center=surface.get_rect().center))
+        return surface
+
     def is_over(self, pos: Tuple[int, int]) -> bool:
         """
         Check if the given position is over the button. Used to check if the mouse is on the button.
@@ -0,0 +1,452 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+import pygame
+from pygame.font import Font
+from pygame.surface import Surface
+from vnengine.pack import open_asset
+
+__all__: List[str] = []
+
+def _surface_bytes(surface: Surface) -> int:
+    """
+    Gets the number of bytes held by the pixels of a surface.
+
+    Args:
+        surface (pygame.Surface): The surface to measure.
+
+    Returns:
+        int: The bytes of the surface.
+    """
+    return surface.get_pitch() * surface.get_height()
+
+def _load_image(path: str) -> Surface:
+    """
+    Decodes an image from the mounted asset packs, or from the disk.
+
+    Args:
+        path (str): The path of the image.
+
+    Returns:
+        pygame.Surface: The decoded image.
+    """
+    with open_asset(path) as file:
+        return pygame.image.load(file, path)
+
+class _LRUCache:
+    """
+    A thread safe least recently used cache bounded by the bytes of its values.
+
+    Attributes:
+        max_bytes (int): The maximum bytes held by the cache.
+        size_of (Callable): Function returning the bytes of a value.
+        entries (OrderedDict): The cached values, from the least to the most recently used.
+        bytes (int): The bytes currently held by the cache.
+        evictions (int): The number of values evicted to keep the cache, or the memory budget, under its size.
+        budget (_MemoryBudget): The memory budget shared with other caches, or None.
+    """
+
+    def __init__(self, max_bytes: int, size_of: Callable[[Any], int] = _surface_bytes) -> None:
+        """
+        Initializes the cache.
+
+        Args:
+            max_bytes (int): The maximum bytes held by the cache.
+            size_of (Callable, optional): Function returning the bytes of a value. Defaults to the bytes of a surface.
+        """
+        self.max_bytes = max_bytes
+        self.size_of = size_of
+        self.entries: 'OrderedDict[Hashable, Tuple[Any, int]]' = OrderedDict()
+        self.bytes = 0
+        self.evictions = 0
+        self.budget: Optional['_MemoryBudget'] = None
+        self.lock = threading.RLock()
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self.lock:
+            return key in self.entries
+
+    def __len__(self) -> int:
+        with self.lock:
+            return len(self.entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Gets a value, marking it as the most recently used.
+
+        Args:
+            key (Hashable): The key of the value.
+            default (Any, optional): Returned when the key is not cached. Defaults to None.
+
+        Returns:
+            Any: The cached value or the default.
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return default
+            self.entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Stores a value, evicting the least recently used values while the cache is over its size.
+
+        Args:
+            key (Hashable): The key of the value.
+            value (Any): The value to store.
+        """
+        size = self.size_of(value)
+        with self.lock:
+            self.pop(key)
+            self.entries[key] = (value, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes and len(self.entries) > 1:
+                _, (_, evicted) = self.entries.popitem(last=False)
+                self.bytes -= evicted
+                self.evictions += 1
+        # outside the lock: the budget locks the other caches to evict from them
+        if self.budget is not None:
+            self.budget.enforce()
+
+    def evict(self) -> Optional[int]:
+        """
+        Removes the least recently used value. The most recently used value is never removed.
+
+        Returns:
+            int: The bytes of the removed value, or None if there was nothing to remove.
+        """
+        with self.lock:
+            if len(self.entries) <= 1:
+                return None
+            _, (_, evicted) = self.entries.popitem(last=False)
+            self.bytes -= evicted
+            self.evictions += 1
+            return evicted
+
+    def pop(self, key: Hashable) -> Any:
+        """
+        Removes a value from the cache.
+
+        Args:
+            key (Hashable): The key of the value.
+
+        Returns:
+            Any: The removed value, or None if the key was not cached.
+        """
+        with self.lock:
+            entry = self.entries.pop(key, None)
+            if entry is None:
+                return None
+            self.bytes -= entry[1]
+            return entry[0]
+
+    def discard(self, predicate: Callable[[Hashable], bool]) -> None:
+        """
+        Removes every value whose key matches the predicate.
+
+        Args:
+            predicate (Callable): Function receiving a key and returning True when it must be removed.
+        """
+        with self.lock:
+            for key in [key for key in self.entries if predicate(key)]:
+                self.pop(key)
+
+    def clear(self) -> None:
+        """
+        Removes every value from the cache.
+        """
+        with self.lock:
+            self.entries.clear()
+            self.bytes = 0
+
+class _MemoryBudget:
+    """
+    Keeps the bytes held by several caches under a single budget.
+
+    Each cache is registered with a priority: when the caches hold more than the budget, values are evicted from the caches
+    of the lowest priority first, from the least recently used, so the values that are cheap to make again, like rendered
+    texts, are dropped before the decoded images. With a budget, a cache is no longer bounded by its own size but only by
+    the budget. Without a budget, the caches keep their own sizes and the budget only reports their bytes.
+
+    Attributes:
+        max_bytes (int): The budget in bytes, or None for no budget.
+        low_memory (bool): Whether memory is saved at the cost of quality, e.g. prefetched backgrounds are kept with fewer
+            bits per pixel until they are shown.
+        caches (Dict[str, Tuple[int, _LRUCache]]): The priority and the cache of each name.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None, low_memory: bool = False) -> None:
+        """
+        Initializes the budget.
+
+        Args:
+            max_bytes (int, optional): The budget in bytes. Defaults to no budget.
+            low_memory (bool, optional): Whether memory is saved at the cost of quality. Defaults to False.
+        """
+        self.max_bytes = max_bytes
+        self.low_memory = low_memory
+        self.caches: Dict[str, Tuple[int, _LRUCache]] = {}
+        self.lock = threading.Lock()
+
+    def register(self, name: str, cache: _LRUCache, priority: int) -> None:
+        """
+        Adds a cache to the budget.
+
+        Args:
+            name (str): The name of the cache in the stats.
+            cache (_LRUCache): The cache.
+            priority (int): The priority of the values of the cache, the values of the lowest priorities are evicted first.
+        """
+        with self.lock:
+            self.caches[name] = (priority, cache)
+        cache.budget = self
+        if self.max_bytes is not None:
+            cache.max_bytes = max(cache.max_bytes, self.max_bytes)
+            self.enforce()
+
+    @property
+    def bytes(self) -> int:
+        """
+        The bytes held by every cache of the budget.
+        """
+        return sum(cache.bytes for _, cache in self.caches.values())
+
+    def enforce(self) -> None:
+        """
+        Evicts values from the caches, from the lowest priority, until they hold no more than the budget. Called by the
+        caches after they store a value.
+        """
+        if self.max_bytes is None:
+            return
+        with self.lock:
+            total = self.bytes
+            if total <= self.max_bytes:
+                return
+            for _, cache in sorted(self.caches.values(), key=lambda entry: entry[0]):
+                while total > self.max_bytes:
+                    evicted = cache.evict()
+                    if evicted is None:
+                        break
+                    total -= evicted
+                if total <= self.max_bytes:
+                    return
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Gets the memory held by the caches, e.g. to show it while the game runs.
+
+        Returns:
+            dict: The 'budget' and the 'bytes' held by every cache, and the 'caches': the 'bytes', 'entries', 'evictions'
+                and 'priority' of each cache by name.
+        """
+        with self.lock:
+            caches = dict(self.caches)
+        return {
+            'budget': self.max_bytes,
+            'bytes': sum(cache.bytes for _, cache in caches.values()),
+            'caches': {name: {'bytes': cache.bytes, 'entries': len(cache), 'evictions': cache.evictions, 'priority': priority}
+                       for name, (priority, cache) in caches.items()},
+        }
+
+class _ImageCache:
+    """
+    Loads images and keeps them scaled to the sizes used by the screens.
+
+    Decoded images are kept at their original size, so changing the resolution only scales them again.
+    Scaling for a new size can be done in the background with `prefetch`.
+
+    Attributes:
+        sources (_LRUCache): The decoded images at their original size, by path.
+        scaled (_LRUCache): The scaled images, by (path, size).
+        reduced (set): The (path, size) of the scaled images kept at 16 bits per pixel until they are shown.
+        pending (Dict[tuple, Future]): The images being loaded in the background, by (path, size).
+        executor (ThreadPoolExecutor): The worker loading images in the background.
+    """
+
+    def __init__(self, max_bytes: int = 512 * 1024 * 1024, loader: Callable[[str], Surface] = _load_image) -> None:
+        """
+        Initializes the image cache.
+
+        Args:
+            max_bytes (int, optional): The maximum bytes of the scaled images. Defaults to 512 MB.
+            loader (Callable, optional): Function decoding an image from its path. Defaults to reading it from the asset packs
+                or the disk.
+        """
+        self.loader = loader
+        self.sources = _LRUCache(max_bytes // 2)
+        self.scaled = _LRUCache(max_bytes)
+        self.converted: set = set()
+        self.reduced: set = set()
+        self.pending: Dict[Tuple[str, Tuple[int, int]], Future] = {}
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='vnengine-images')
+
+    def source(self, path: str) -> Surface:
+        """
+        Gets an image decoded at its original size. Safe to call from a worker.
+
+        Args:
+            path (str): The path of the image.
+
+        Returns:
+            pygame.Surface: The decoded image.
+        """
+        source = self.sources.get(path)
+        if source is None:
+            source = self.loader(path)
+            self.sources.put(path, source)
+        return source
+
+    def load(self, path: str, size: Tuple[int, int], reduced: bool = False) -> Surface:
+        """
+        Decodes and scales an image without converting it to the display format. Safe to call from a worker.
+
+        Args:
+            path (str): The path of the image.
+            size (tuple): The (width, height) to scale the image to.
+            reduced (bool, optional): Whether the scaled image is kept at 16 bits per pixel, half the memory of the display
+                format, until it is shown. Defaults to False.
+
+        Returns:
+            pygame.Surface: The scaled image.
+        """
+        key = (path, tuple(size))
+        surface = self.scaled.get(key)
+        if surface is None:
+            surface = pygame.transform.scale(self.source(path), key[1])
+            reduced = reduced and surface.get_bitsize() > 16
+            if reduced:
+                smaller = pygame.Surface(key[1], 0, 16)
+                smaller.blit(surface, (0, 0))
+                surface = smaller
+            # the sets are also read by the main thread
+            with self.lock:
+                self.converted.discard(key)
+                if reduced:
+                    self.reduced.add(key)
+                else:
+                    self.reduced.discard(key)
+            self.scaled.put(key, surface)
+        return surface
+
+    def get(self, path: str, size: Tuple[int, int]) -> Surface:
+        """
+        Gets an image scaled to a size, waiting for it if it is being loaded in the background.
+
+        Must be called from the main thread, where the image is converted to the display format.
+
+        Args:
+            path (str): The path of the image.
+            size (tuple): The (width, height) to scale the image to.
+
+        Returns:
+            pygame.Surface: The scaled image.
+        """
+        key = (path, tuple(size))
+        with self.lock:
+            future = self.pending.get(key)
+        surface = future.result() if future and not future.cancelled() else self.load(path, key[1])
+
+        if key not in self.converted and pygame.display.get_surface() is not None:
+            surface = surface.convert()
+            self.scaled.put(key, surface)
+            with self.lock:
+                self.converted.add(key)
+                self.reduced.discard(key)
+        return surface
+
+    def prefetch(self, paths: Iterable[str], size: Optional[Tuple[int, int]], reduced: bool = False) -> None:
+        """
+        Loads and scales images in the background.
+
+        Args:
+            paths (Iterable[str]): The paths of the images.
+            size (tuple): The (width, height) to scale the images to, or None to only decode them.
+            reduced (bool, optional): Whether the scaled images are kept at 16 bits per pixel until they are shown, e.g.
+                for images that may not be shown soon. Defaults to False.
+        """
+        for path in paths:
+            key = (path, tuple(size) if size else None)
+            with self.lock:
+                if key in self.pending or key in self.scaled or (size is None and path in self.sources):
+                    continue
+                future = self.executor.submit(self.load, path, key[1], reduced) if size else self.executor.submit(self.source, path)
+                self.pending[key] = future
+            future.add_done_callback(lambda future, key=key: self._done(key, future))
+
+    def _done(self, key: Tuple[str, Tuple[int, int]], future: Future) -> None:
+        with self.lock:
+            if self.pending.get(key) is future:
+                del self.pending[key]
+
+    def forget(self, path: str) -> None:
+        """
+        Drops the decoded and scaled copies of an image, e.g. after its file changed, so it is loaded again when needed.
+
+        Args:
+            path (str): The path of the image.
+        """
+        with self.lock:
+            stale = [self.pending.pop(key) for key in list(self.pending) if key[0] == path]
+        for future in stale:
+            future.cancel()
+        self.sources.pop(path)
+        self.scaled.discard(lambda key: key[0] == path)
+        with self.lock:
+            self.converted = {key for key in self.converted if key[0] != path}
+            self.reduced = {key for key in self.reduced if key[0] != path}
+
+    def resize(self, sizes: Iterable[Tuple[int, int]]) -> None:
+        """
+        Drops the scaled images of every size that is no longer used. The decoded images are kept.
+
+        Args:
+            sizes (Iterable[tuple]): The sizes still used by the screens.
+        """
+        keep = {tuple(size) for size in sizes}
+        with self.lock:
+            stale = [self.pending.pop(key) for key in list(self.pending) if key[1] is not None and key[1] not in keep]
+        for future in stale:
+            future.cancel()
+        self.scaled.discard(lambda key: key[1] not in keep)
+        with self.lock:
+            self.converted = {key for key in self.converted if key[1] in keep}
+            self.reduced = {key for key in self.reduced if key[1] in keep}
+
+class _TextCache(_LRUCache):
+    """
+    Keeps rendered texts, so static labels are rendered once instead of every frame.
+
+    The cache is keyed by font object, so the texts of a resolution are dropped with `clear` when the fonts change size.
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024) -> None:
+        """
+        Initializes the text cache.
+
+        Args:
+            max_bytes (int, optional): The maximum bytes of the rendered texts. Defaults to 32 MB.
+        """
+        super().__init__(max_bytes)
+
+    def render(self, font: Font, text: str, color: Tuple[int, int, int]) -> Surface:
+        """
+        Renders an antialiased text, reusing the surface rendered before when possible.
+
+        Args:
+            font (pygame.font.Font): The font of the text.
+            text (str): The text to render.
+            color (tuple): The color of the text in RGB format.
+
+        Returns:
+            pygame.Surface: The rendered text.
+        """
+        key = (font, text, tuple(color))
+        surface = self.get(key)
+        if surface is None:
+            surface = font.render(text, True, color)
+            self.put(key, surface)
+        return surface
@@ -0,0 +1,165 @@
+from typing import Iterable, List, Optional, Tuple
+
+import pygame
+from pygame.surface import Surface
+from vnengine.utils.cache import _ImageCache, _LRUCache
+
+__all__: List[str] = []
+
+_Layer = Tuple[str, Optional[float], Optional[float]]
+
+class _Compositor:
+    """
+    Draws the layers of a scene into a single surface, so the game loop blits one surface whatever the number of layers.
+
+    Composites are cached by their window size and layers. Every partial stack of layers, from the background up, is cached
+    as well: when scenes share a background and only a sprite changes, the composite is rebuilt from the longest cached
+    stack below the change instead of from the background.
+
+    Sprites are scaled by the same factor as the background, so they keep their size relative to the background art.
+
+    Attributes:
+        images (_ImageCache): The cache of the decoded and scaled backgrounds.
+        composites (_LRUCache): The composites, by (size, layers).
+        layers (_LRUCache): The sprites and overlays scaled and converted for the display, by (path, size).
+    """
+
+    def __init__(self, images: _ImageCache, max_bytes: int = 256 * 1024 * 1024) -> None:
+        """
+        Initializes the compositor.
+
+        Args:
+            images (_ImageCache): The cache of the decoded and scaled backgrounds.
+            max_bytes (int, optional): The maximum bytes of the composites. Defaults to 256 MB.
+        """
+        self.images = images
+        self.composites = _LRUCache(max_bytes)
+        self.layers = _LRUCache(max_bytes // 4)
+
+    def layer(self, path: str, size: Tuple[int, int]) -> Surface:
+        """
+        Gets a sprite or an overlay scaled to a size, keeping its transparency.
+
+        Args:
+            path (str): The path of the image.
+            size (tuple): The (width, height) to scale the image to.
+
+        Returns:
+            pygame.Surface: The scaled image.
+        """
+        key = (path, size)
+        surface = self.layers.get(key)
+        if surface is None:
+            source = self.images.source(path)
+            try:
+                surface = pygame.transform.smoothscale(source, size)
+            except ValueError:
+                # smoothscale only works on 24 and 32 bit images
+                surface = pygame.transform.scale(source, size)
+            if pygame.display.get_surface() is not None:
+                surface = surface.convert_alpha()
+            self.layers.put(key, surface)
+        return surface
+
+    def get(self, layers: Tuple[_Layer, ...], size: Tuple[int, int]) -> Surface:
+        """
+        Gets the composite of the layers of a scene.
+
+        Args:
+            layers (tuple): The (image, x, y) of each layer, from the background up, as returned by `_Scene.layers`.
+            size (tuple): The (width, height) of the background.
+
+        Returns:
+            pygame.Surface: The composite. It is shared, so it must not be drawn on.
+        """
+        size = tuple(size)
+        if len(layers) == 1:
+            return self.images.get(layers[0][0], size)
+        composite = self.composites.get((size, layers))
+        if composite is not None:
+            return composite
+
+        start = 1
+        for end in range(len(layers) - 1, 1, -1):
+            below = self.composites.get((size, layers[:end]))
+            if below is not None:
+                start = end
+                composite = below.copy()
+                break
+        if composite is None:
+            composite = self.images.get(layers[0][0], size).copy()
+
+        scale = size[1] / self.images.source(layers[0][0]).get_height()
+        for idx in range(start, len(layers)):
+            self._blit(composite, layers[idx], size, scale, (0, 0))
+            if idx < len(layers) - 1:
+                self.composites.put((size, layers[:idx + 1]), composite.copy())
+        self.composites.put((size, layers), composite)
+        return composite
+
+    def _blit(self, target: Surface, layer: _Layer, size: Tuple[int, int], scale: float, origin: Tuple[int, int]) -> None:
+        """
+        Draws a sprite or an overlay over a background.
+
+        Args:
+            target (pygame.Surface): The surface the background is drawn on.
+            layer (tuple): The (image, x, y) of the layer.
+            size (tuple): The (width, height) of the background.
+            scale (float): The factor the background art is scaled by, used to scale the sprites.
+            origin (tuple): The position of the top left corner of the background on the target.
+        """
+        path, x, y = layer
+        if x is None:
+            target.blit(self.layer(path, size), origin)
+        else:
+            width, height = self.images.source(path).get_size()
+            sprite = self.layer(path, (max(1, round(width * scale)), max(1, round(height * scale))))
+            target.blit(sprite, sprite.get_rect(midbottom=(origin[0] + round(x * size[0]), origin[1] + round(y * size[1]))))
+
+    def draw_layers(self, target: Surface, layers: Tuple[_Layer, ...], rect: pygame.Rect) -> None:
+        """
+        Draws the sprites and overlays of a scene over a background already drawn, e.g. a frame of an animated background.
+        The sprites are scaled like the image of the background of the scene.
+
+        Args:
+            target (pygame.Surface): The surface the background is drawn on, e.g. the screen.
+            layers (tuple): The (image, x, y) of each layer, from the background up, as returned by `_Scene.layers`.
+            rect (pygame.Rect): Where the background is drawn on the target.
+        """
+        if len(layers) == 1:
+            return
+        size = tuple(rect.size)
+        scale = size[1] / self.images.source(layers[0][0]).get_height()
+        for layer in layers[1:]:
+            self._blit(target, layer, size, scale, rect.topleft)
+
+    def prefetch(self, layers: Iterable[Tuple[_Layer, ...]]) -> None:
+        """
+        Decodes in the background the sprites and overlays of scenes the player can go to.
+
+        Args:
+            layers (Iterable[tuple]): The layers of each scene.
+        """
+        self.images.prefetch({path for scene in layers for path, _, _ in scene[1:]}, None)
+
+    def forget(self, path: str) -> None:
+        """
+        Drops an image and every composite it is part of, e.g. after its file changed. Other composites are kept.
+
+        Args:
+            path (str): The path of the image.
+        """
+        self.images.forget(path)
+        self.layers.discard(lambda key: key[0] == path)
+        self.composites.discard(lambda key: any(layer[0] == path for layer in key[1]))
+
+    def resize(self, sizes: Iterable[Tuple[int, int]]) -> None:
+        """
+        Drops the composites of every size that is no longer used, and every scaled sprite.
+
+        Args:
+            sizes (Iterable[tuple]): The sizes still used by the screens.
+        """
+        keep = {tuple(size) for size in sizes}
+        self.composites.discard(lambda key: key[0] not in keep)
+        self.layers.clear()
@@ -1,13 +1,13 @@
-import pygame
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 from pygame.font import Font
 from pygame.surface import Surface
-from typing import List
+from vnengine.utils.cache import _TextCache
+from vnengine.utils.font import _default_font
 
 __all__: List[str] = []
 
 class _Dialogue:
-    def __init__(self, x: int, y: int, width: int, height: int, text: Optional[str] = None, color: Tuple[int, int, int] = (255, 255, 255), font: Optional[Font] = None):
+    def __init__(self, x: int, y: int, width: int, height: int, text: Optional[str] = None, color: Tuple[int, int, int] = (255, 255, 255), font: Optional[Font] = None, text_cache: Optional[_TextCache] = None):
         """
         Initialize a dialogue box.
 
@@ -18,7 +18,8 @@ class _Dialogue:
             height (int): The height of the dialogue box.
             text (str, optional): The text to be displayed in the dialogue box. Defaults to None.
             color (tuple, optional): The color of the text in RGB format. Defaults to (255, 255, 255).
-            font (pygame.font.Font, optional): The font used for the text. Defaults to None, which uses the default font with size 24.
+            font (pygame.font.Font, optional): The font used for the text. Defaults to None, which uses the shared default font with size 24.
+            text_cache (_TextCache, optional): The cache used to render each line only once. Defaults to None.
         """
         self.x = x
         self.y = y
@@ -26,7 +27,8 @@ class _Dialogue:
         self.height = height
         self.text = text
         self.color = color
-        self.font = font if font else pygame.font.Font(None, 24)
+        self.font = font if font else _default_font(24)
+        self.text_cache = text_cache
 
     def draw(self, screen: Surface) -> None:
         """
@@ -41,6 +43,9 @@ class _Dialogue:
             x_offset: int = self.x + 10
             y_offset: int = self.y + 10
             for line in lines:
-                text: str = self.font.render(line, True, self.color)
+                if self.text_cache is not None:
+                    text = self.text_cache.render(self.font, line, self.color)
+                else:
+                    text = self.font.render(line, True, self.color)
                 screen.blit(text, (x_offset, y_offset))
                 y_offset += text.get_height() + 5
\ No newline at end of file
@@ -0,0 +1,119 @@
+import io
+from typing import Dict, List, Optional, Tuple
+
+import pygame
+from pygame.font import Font
+from vnengine.pack import open_asset
+
+__all__: List[str] = []
+
+class _FontRegistry:
+    """
+    The fonts of the game, each face and size loaded only once and shared by every widget.
+
+    The face of each language is a TrueType file, read once from the asset packs or the disk and kept in memory, so a new
+    size of a face is parsed from memory instead of reading the file again. Fonts can't be used once pygame quits, so they
+    are dropped when it quits.
+
+    Attributes:
+        faces (Dict[Optional[str], Optional[str]]): The font file of each language, None for every language without its
+            own font. A face of None is the default font of pygame.
+        fonts (Dict[Tuple[Optional[str], int], Font]): The fonts already loaded, by (face, size).
+        data (Dict[str, bytes]): The content of the font files already read, by path.
+        registered (bool): Whether the fonts are dropped when pygame quits. pygame forgets the callback once it is called,
+            so it is registered again with the first font loaded after pygame starts again.
+    """
+
+    def __init__(self, faces: Optional[Dict[Optional[str], Optional[str]]] = None) -> None:
+        """
+        Initializes the registry.
+
+        Args:
+            faces (Dict[Optional[str], Optional[str]], optional): The font file of each language, None for every language
+                without its own font. Defaults to the default font of pygame for every language.
+        """
+        self.faces: Dict[Optional[str], Optional[str]] = dict(faces) if faces else {}
+        self.fonts: Dict[Tuple[Optional[str], int], Font] = {}
+        self.data: Dict[str, bytes] = {}
+        self.registered = False
+
+    def __len__(self) -> int:
+        return len(self.fonts)
+
+    def face(self, language: Optional[str] = None) -> Optional[str]:
+        """
+        Gets the font file of a language.
+
+        Args:
+            language (str, optional): The language. Defaults to None.
+
+        Returns:
+            str: The font file of the language, or the one for every language, or None for the default font.
+        """
+        return self.faces.get(language, self.faces.get(None))
+
+    def get(self, size: int, language: Optional[str] = None) -> Font:
+        """
+        Gets the font of a language with the given size, loading it only once.
+
+        Args:
+            size (int): The size of the font in pixels.
+            language (str, optional): The language of the texts written with the font. Defaults to None.
+
+        Returns:
+            pygame.font.Font: The font.
+        """
+        face = self.face(language)
+        key = (face, max(1, size))
+        font = self.fonts.get(key)
+        if font is None:
+            if face is None:
+                font = Font(None, key[1])
+            else:
+                if face not in self.data:
+                    with open_asset(face) as file:
+                        self.data[face] = file.read()
+                font = Font(io.BytesIO(self.data[face]), key[1])
+            if not self.registered:
+                pygame.register_quit(self.quit)
+                self.registered = True
+            self.fonts[key] = font
+        return font
+
+    def forget(self, path: str) -> None:
+        """
+        Drops a font file and every font loaded from it, e.g. after the file changed.
+
+        Args:
+            path (str): The path of the font file.
+        """
+        self.data.pop(path, None)
+        self.fonts = {key: font for key, font in self.fonts.items() if key[0] != path}
+
+    def quit(self) -> None:
+        """
+        Called when pygame quits: drops the loaded fonts, which can't be used anymore.
+        """
+        self.registered = False
+        self.clear()
+
+    def clear(self) -> None:
+        """
+        Drops the loaded fonts, e.g. when the window changes size and the texts are drawn with other sizes. The content of
+        the font files is kept.
+        """
+        self.fonts.clear()
+
+_DEFAULT_FONTS = _FontRegistry()
+
+def _default_font(size: int) -> Font:
+    """
+    Gets the default font of pygame with the given size, from a registry shared by the widgets created without a font.
+
+    Args:
+        size (int): The size of the font in pixels.
+
+    Returns:
+        pygame.font.Font: The font.
+    """
+    return _DEFAULT_FONTS.get(size)
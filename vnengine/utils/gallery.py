@@ -0,0 +1,152 @@
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Container, Dict, List, Optional, Tuple
+
+import pygame
+from pygame.surface import Surface
+from vnengine.pack import asset_digest
+from vnengine.utils.cache import _LRUCache, _load_image
+from vnengine.utils.saves import _thumbnail, _write_png
+
+__all__: List[str] = []
+
+class _Gallery:
+    """
+    The thumbnails of the backgrounds shown in the gallery.
+
+    A thumbnail is made once per image: it is written to a folder under the sha256 of the image and the size of the
+    thumbnail, so opening the gallery decodes small thumbnails instead of the backgrounds at full resolution, and an image
+    changed by a new version of the game gets a new thumbnail. Thumbnails are read or made by a worker only when they are
+    requested, i.e. when they are scrolled into view.
+
+    Attributes:
+        folder (str): The folder of the thumbnails.
+        size (tuple): The (width, height) the thumbnails fit in.
+        loader (Callable[[str], Surface]): Function decoding an image from its path, used when its thumbnail is not made yet.
+        thumbnails (_LRUCache): The thumbnails already read, by path of the image.
+        pending (Dict[str, Future]): The thumbnails being read or made in the background, by path of the image.
+        executor (ThreadPoolExecutor): The worker reading and making the thumbnails.
+    """
+
+    def __init__(self, folder: str = 'thumbnails', size: Tuple[int, int] = (256, 144),
+                 loader: Callable[[str], Surface] = _load_image, max_bytes: int = 16 * 1024 * 1024) -> None:
+        """
+        Initializes the gallery.
+
+        Args:
+            folder (str, optional): The folder of the thumbnails. Defaults to 'thumbnails'.
+            size (tuple, optional): The (width, height) the thumbnails fit in. Defaults to (256, 144).
+            loader (Callable, optional): Function decoding an image from its path. Defaults to reading it from the asset
+                packs or the disk.
+            max_bytes (int, optional): The maximum bytes of the thumbnails kept in memory. Defaults to 16 MB.
+        """
+        self.folder = folder
+        self.size = tuple(size)
+        self.loader = loader
+        self.thumbnails = _LRUCache(max_bytes)
+        self.pending: Dict[str, Future] = {}
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='vnengine-gallery')
+
+    def path(self, image: str) -> str:
+        """
+        Gets the path of the thumbnail of an image, from the sha256 of the image. Reads the whole image when it is not in an
+        asset pack.
+
+        Args:
+            image (str): The path of the image.
+
+        Returns:
+            str: The path of the thumbnail.
+        """
+        return os.path.join(self.folder, f'{asset_digest(image).hex()}_{self.size[0]}x{self.size[1]}.png')
+
+    def make(self, image: str) -> Surface:
+        """
+        Reads the thumbnail of an image from the folder, or makes and writes it the first time. Safe to call from a worker.
+
+        Args:
+            image (str): The path of the image.
+
+        Returns:
+            pygame.Surface: The thumbnail.
+        """
+        path = self.path(image)
+        if os.path.exists(path):
+            try:
+                thumbnail = pygame.image.load(path)
+                self.thumbnails.put(image, thumbnail)
+                return thumbnail
+            except pygame.error:
+                # a damaged thumbnail is made again
+                pass
+        thumbnail = _thumbnail(self.loader(image), self.size)
+        _write_png(path, thumbnail)
+        self.thumbnails.put(image, thumbnail)
+        return thumbnail
+
+    def get(self, image: str) -> Optional[Surface]:
+        """
+        Gets the thumbnail of an image, reading or making it in the background the first time it is requested.
+
+        Args:
+            image (str): The path of the image.
+
+        Returns:
+            pygame.Surface: The thumbnail, or None while it is read or made.
+        """
+        thumbnail = self.thumbnails.get(image)
+        if thumbnail is not None:
+            return thumbnail
+        with self.lock:
+            if image in self.pending:
+                return None
+            future = self.executor.submit(self.make, image)
+            self.pending[image] = future
+        # outside the lock: the callback runs at once if the future is already done
+        future.add_done_callback(lambda future: self._done(image, future))
+        return None
+
+    def _done(self, image: str, future: Future) -> None:
+        with self.lock:
+            if self.pending.get(image) is future:
+                del self.pending[image]
+
+    def wait(self) -> None:
+        """
+        Waits for the thumbnails being read or made in the background.
+        """
+        with self.lock:
+            futures = list(self.pending.values())
+        for future in futures:
+            future.result()
+
+    def forget(self, image: str) -> None:
+        """
+        Drops the thumbnail of an image from memory, e.g. after the image changed. The thumbnail of the new image is made
+        under its own sha256.
+
+        Args:
+            image (str): The path of the image.
+        """
+        self.thumbnails.pop(image)
+
+    def close(self) -> None:
+        """
+        Stops the worker, without making the thumbnails still waiting.
+        """
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+def _unlocked_backgrounds(backgrounds: Dict[str, List[int]], seen: Container[int]) -> List[Tuple[str, bool]]:
+    """
+    Gets which backgrounds of the story the player unlocked: the ones of at least one scene already seen.
+
+    Args:
+        backgrounds (Dict[str, List[int]]): The numbers of the scenes of each background, returned by `Story.backgrounds`.
+        seen (SeenScenes): The scenes already seen by the player.
+
+    Returns:
+        List[Tuple[str, bool]]: Each background and whether it is unlocked, in the order they appear in the story.
+    """
+    return [(image, any(number in seen for number in numbers)) for image, numbers in backgrounds.items()]
@@ -1,10 +1,29 @@
 import pygame
 from vnengine.utils.button import _Button
 from vnengine.utils.dialogue import _Dialogue
-from googletrans import Translator
+from vnengine.utils.layout import _LayoutCache, _ResolvedLayout
+from vnengine.utils.cache import _ImageCache, _LRUCache, _MemoryBudget, _TextCache
+from vnengine.utils.animation import _FramePlayer
+from vnengine.utils.particles import _EffectLayer
+from vnengine.utils.audio import _AudioManager
+from vnengine.utils.compositor import _Compositor
+from vnengine.utils.font import _FontRegistry
+from vnengine.utils.gallery import _Gallery, _unlocked_backgrounds
+from vnengine.utils.saves import _SaveSlots, _thumbnail
+from vnengine.utils.scroll import _ScrollList
+from vnengine.utils.startup import _Startup
+from vnengine.runtime import SeenScenes, StoryRuntime
+from vnengine.script import _Scheduler
+from concurrent.futures import ThreadPoolExecutor
+import json
 import os
+import time
 
 __all__ = []
+
+# the labels of the buttons of the menu, translated by a startup worker before the menu is shown
+_MENU_BUTTONS = ['Iniciar Jogo', 'Continuar Jogo', 'Carregar Jogo', 'Galeria', 'Idioma', 'Opções', 'Fechar Jogo']
+
 class _Game:
     """
     Represents the game instance for the visual novel engine. Is the class responsible for the interaction with the pygame and running the game loop.
@@ -15,17 +34,62 @@ class _Game:
         language (str): The current chosen language of the game.
         resolution (Dict[str, Tuple[int, int]]): The available screen resolutions.
         languages_names (Dict[str, str]): The keyword for the translation tool and the original name of the language.
-        translator (Translator): The translator object for language translation.
+        translator (Translator): The translator object for language translation, or None until a startup worker makes it.
         FPS (int): The frames per second for the game.
-        side_bar_x (int): The initial width of the side bar on the screen.
-        side_bar_y (int): The initial height of the side bar on the screen.
-        font (Font): The font object for text rendering.
+        SKIP_FPS (int): The frames per second while skipping seen scenes.
+        SKIP_BUDGET (float): The time spent going through seen scenes in each frame while skipping, in seconds.
+        AUTO_DELAY (int): The time a scene is shown in auto mode, in milliseconds, plus AUTO_CHAR_DELAY per character.
+        AUTO_CHAR_DELAY (int): The time added to AUTO_DELAY for each character of the text of the scene, in milliseconds.
+        GALLERY_COLUMNS (int): The number of thumbnails in each row of the gallery.
+        display_modes (Dict[str, int]): The pygame display flags of each display mode.
+        display_mode (str): The current display mode of the window.
+        startup (_Startup): The work done on workers while the splash screen is shown: the translator and the texts of the
+            menu, the menu background and the validation of the story. Its `first_frame` and `interactive` are the seconds
+            from the start of the game to its first frame and to the menu accepting input.
+        layouts (_LayoutCache): The layouts of the screens, resolved once per window size and language.
+        fonts (_FontRegistry): The fonts of the languages of the story, each face and size loaded once.
+        images (_ImageCache): The background images scaled to the sizes of the screens.
+        compositor (_Compositor): The backgrounds of the scenes drawn with their sprites and overlays.
+        animation (_FramePlayer): The player of the animated background of the current scene, or None. Its `dropped` counts
+            the frames that were not decoded in time.
+        animation_started (int): The time at which the animated background started, in milliseconds.
+        particles (_EffectLayer): The particles of the ambient effects of the current scene, or None.
+        script (_Scheduler): The script of the current scene, or None.
+        script_started (int): The time at which the script started, in milliseconds.
+        script_position (tuple): The position in the story whose script was started, so it is not started again when the
+            screen is rebuilt.
+        texts (_TextCache): The texts already rendered with the current fonts.
+        rows (_LRUCache): The rows of the scrolling lists already rendered with the current fonts.
+        translations (Dict[Tuple[str, str], str]): The texts already translated, by (text, language).
+        audio (_AudioManager): The music and voice-overs player.
+        memory (_MemoryBudget): The memory held by every cache of the game, kept under the memory budget of the story. Its
+            `stats` are the live bytes and evictions of each cache.
+        audio_position (tuple): The position in the story whose voice-over was played, so it is not played again.
+        music_position (tuple): The position in the story whose music was looked up, with its music.
+        seen (SeenScenes): The scenes the player already read, in this and previous games.
+        mode (str): The mode advancing the scenes by itself: 'skip', 'auto' or None.
+        scene_started (int): The time at which the current scene was shown, in milliseconds.
+        scene (str): The current screen, e.g. 'splash', 'start', 'game' or 'choice'.
+        current_scene (str): The name of the scene of the story the player is at, or None before a game is started.
         screen (Surface): The game screen surface.
         buttons (List[_Button]): The list of buttons in the game.
         scene_buttons (List[_Button]): The list of buttons available in the scenes.
-        scenes_stack (List[int]): The stack of visited scenes in the game.
-        rescale_image_menu (Tuple[int, int]): The scaled size of the menu background image.
-        rescale_image_game (Tuple[int, int]): The scaled size of the game background image.
+        choice_list (_ScrollList): The choices of the current scene, in the choice screen.
+        backlog (_ScrollList): The texts of the visited scenes, in the backlog screen.
+        backlog_return (str): The screen the backlog screen goes back to: 'game' or 'choice'.
+        slots (_SaveSlots): The save slots, with the thumbnails of the screen when they were saved.
+        slot_list (_ScrollList): The save slots, in the slots screen.
+        slots_mode (str): Whether the slots screen saves or loads the game: 'save' or 'load'.
+        slots_return (str): The screen the slots screen goes back to: 'start', 'game' or 'choice'.
+        capture (Surface): The copy of the screen when the slots screen was opened to save, used for the thumbnails.
+        gallery (_Gallery): The thumbnails of the backgrounds, made once and kept on the disk.
+        gallery_images (List[Tuple[str, bool]]): The backgrounds of the story and whether the player unlocked them.
+        gallery_list (_ScrollList): The rows of thumbnails of the gallery screen.
+        gallery_view (str): The background shown in the whole window in the gallery screen, or None.
+        runtime (StoryRuntime): The state of the playthrough: the current scene and the stack of visited scenes.
+        analytics (AnalyticsLog): Records the scenes entered and the choices taken, when the story sets an analytics
+            database, or None.
+        reloader (StoryReloader): Applies the changes of the story files while the game runs in development mode, or None.
     """
 
     def __init__(self, story):
@@ -40,78 +104,854 @@ class _Game:
         self.language = story.language
         self.resolution = {'hd': (1280, 720), 'fullhd': (1920, 1080), '4k': (3840, 2160)}
         self.languages_names = {'pt': 'Português', 'en': 'Inglês', 'fr': 'Francês', 'es': 'Espanhol', 'de': 'Alemão'}
-        self.translator = Translator()
+        
+        self.translator = None
+        self.startup = _Startup()
         
         pygame.init()
         
         # Constants
         self.res_chosen = story.resolution
         self.FPS = 60
+        self.SKIP_FPS = 240
+        self.SKIP_BUDGET = 0.008
+        self.AUTO_DELAY = 1500
+        self.AUTO_CHAR_DELAY = 40
+        self.GALLERY_COLUMNS = 4
+        self.display_modes = {'fullscreen': pygame.FULLSCREEN, 'windowed': 0, 'resizable': pygame.RESIZABLE}
+        self.display_mode = story.display_mode
+        self.scene = 'splash'
         
-        self.side_bar_x = self.resolution[self.res_chosen][0] // 5
-        self.side_bar_y = self.resolution[self.res_chosen][1] // 4
-        
-        font_size = 32
-        
-        self.font = pygame.font.Font(None, font_size)
-    
         # Screen
-        self.screen = pygame.display.set_mode(self.resolution[self.res_chosen], pygame.FULLSCREEN)
+        # the window shows the splash screen from its first frame, before anything else is loaded
+        self.layouts = _LayoutCache()
+        self.screen = pygame.display.set_mode(self.resolution[self.res_chosen], self.display_modes[self.display_mode])
+        self.draw_splash()
+        pygame.display.update()
+        self.startup.mark('first_frame')
+        
+        self.fonts = _FontRegistry(story.fonts)
+        self.images = _ImageCache()
+        self.compositor = _Compositor(self.images)
+        self.animation = None
+        self.animation_started = 0
+        self.particles = None
+        self.script = None
+        self.script_started = 0
+        self.script_position = None
+        self.texts = _TextCache()
+        self.rows = _LRUCache(32 * 1024 * 1024)
+        self.translations = {}
+        self.audio = _AudioManager()
+        self.memory = _MemoryBudget(story.memory_budget, story.low_memory)
+        self.audio_position = None
+        self.music_position = None
+        self.seen = SeenScenes.load('seen.dat', len(story.scenes_names))
+        self.mode = None
+        self.scene_started = 0
+        self.current_scene = None
         
         # Utils
         self.buttons = []
         
         self.scene_buttons = []
+        self.choice_list = None
+        self.backlog = None
+        self.backlog_return = 'game'
+        self.slots = _SaveSlots()
+        self.slot_list = None
+        self.slots_mode = 'load'
+        self.slots_return = 'start'
+        self.capture = None
+        self.gallery = _Gallery()
+        self.gallery_images = []
+        self.gallery_list = None
+        self.gallery_view = None
+        # the cheapest values to make again are evicted first: texts are rendered again, composites drawn again from their
+        # layers and images scaled again, while sounds and sources are decoded again from the files
+        for name, cache, priority in (('texts', self.texts, 0), ('rows', self.rows, 0), ('thumbnails', self.gallery.thumbnails, 1),
+                                      ('composites', self.compositor.composites, 1), ('layers', self.compositor.layers, 2),
+                                      ('backgrounds', self.images.scaled, 2), ('sounds', self.audio.sounds, 3), ('sources', self.images.sources, 3)):
+            self.memory.register(name, cache, priority)
+        
+        self.runtime = StoryRuntime(story)
+        self.reloader = None
+        self.analytics = None
+        if story.analytics:
+            from vnengine.analytics import AnalyticsLog
+            self.analytics = AnalyticsLog(story.analytics)
         
-        self.scenes_stack = []
+        self.startup.submit('translations', self.load_translations)
+        self.startup.submit('menu background', self.images.load, story.starting_background, self.layout('menu')['background'].rect.size)
         
-        self.scenarios = {'game': self.game_display, 'choice': self.choice_display, 'start': self.menu_display, 'language': self.language_display}
+        self.scenarios = {'splash': self.splash_display, 'game': self.game_display, 'choice': self.choice_display, 'start': self.menu_display, 'language': self.language_display, 'options': self.options_display, 'backlog': self.backlog_display, 'slots': self.slots_display, 'gallery': self.gallery_display}
     
-        infoObject = pygame.display.Info()
-        screen_width = infoObject.current_w
-        screen_height = infoObject.current_h
+    def layout(self, screen: str) -> _ResolvedLayout:
+        """
+        Gets the layout of a screen for the current window size and language.
         
-        self.rescale_image_menu = (screen_width - self.side_bar_x, screen_height)
-        self.rescale_image_game = (screen_width, screen_height - self.side_bar_y)
+        The window size is always read from the display surface, so a fullscreen mode that differs from the
+        chosen resolution, or a resized window, is laid out consistently.
+
+        Args:
+            screen (str): The name of the screen. Availables: 'splash', 'menu', 'language', 'options', 'scene', 'choice',
+                'backlog', 'slots', 'gallery'.
+
+        Returns:
+            _ResolvedLayout: The layout in pixels.
+        """
+        return self.layouts.get(screen, self.screen.get_size(), self.language)
+
+    def get_font(self, size: int) -> pygame.font.Font:
+        """
+        Gets the font of the current language with the given size, loading it only once.
+
+        Args:
+            size (int): The size of the font in pixels.
+
+        Returns:
+            pygame.font.Font: The font.
+        """
+        return self.fonts.get(size, self.language)
+
+    def translate(self, text: str, language: str = None) -> str:
+        """
+        Translates a text written in portuguese, asking the translator only once for each text and language. Texts are
+        returned as they are in portuguese.
+
+        Args:
+            text (str): The text to translate.
+            language (str, optional): The language to translate to. Defaults to the current language.
+
+        Returns:
+            str: The translated text.
+        """
+        language = language if language else self.language
+        if language == 'pt':
+            return text
+        key = (text, language)
+        if key not in self.translations:
+            if self.translator is None:
+                self.startup.wait('translations')
+            self.translations[key] = self.translator.translate(text, src='pt', dest=language).text
+        return self.translations[key]
+
+    def load_translations(self) -> None:
+        """
+        Makes the translator and translates the texts of the menu to the current language, all at the same time since
+        each one waits for the network. Run by a startup worker.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        # the translation client pulls an HTTP stack, so it is only imported when a game starts
+        from googletrans import Translator
+        self.translator = Translator()
+        with ThreadPoolExecutor(max_workers=len(_MENU_BUTTONS), thread_name_prefix='vnengine-translate') as executor:
+            list(executor.map(self.translate, _MENU_BUTTONS))
+
+    def background_sizes(self) -> list:
+        """
+        Gets the sizes that backgrounds are scaled to for the current window size.
+
+        Args:
+            None
+
+        Returns:
+            list: The (width, height) of the menu and scene backgrounds.
+        """
+        return [self.layout('menu')['background'].rect.size, self.layout('scene')['background'].rect.size]
+
+    def prefetch_backgrounds(self) -> None:
+        """
+        Loads in the background the images that the player can reach from the current screen: the menu background and
+        the backgrounds, sprites and overlays of the scenes reachable from the current scene. In low memory mode, the
+        backgrounds of the next scenes are kept with 16 bits per pixel until they are shown.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        menu_size, scene_size = self.background_sizes()
+        self.images.prefetch([self.story.starting_background], menu_size)
+        if self.scene in ('game', 'choice'):
+            current = self.runtime.scene
+            self.images.prefetch([current.background_display_img], scene_size)
+            next_scenes = [self.story.scenes[name] for name in dict.fromkeys(choice.go_to_scene for choice in current.choices) if name in self.story.scenes]
+            self.images.prefetch([scene.background_display_img for scene in next_scenes], scene_size, self.memory.low_memory)
+            self.compositor.prefetch(scene.layers() for scene in next_scenes)
+
+    def play_scene_audio(self) -> None:
+        """
+        Plays the music and the voice-over of the current scene and decodes in the background the voice-overs of the scenes
+        reachable from it.
+
+        The music is the one of the last visited scene with music, so going back or continuing a game plays the same music
+        as playing the story forward. The voice-over is played only when the player arrives at the scene, not when the
+        screen is rebuilt, and not while skipping.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        history = self.runtime.history
+        music = self.runtime.scene.music
+        previous = (len(history) - 1, history[-2]) if len(history) > 1 else None
+        if music is None and self.music_position is not None and self.music_position[:2] == previous:
+            # moving forward keeps the music of the previous scene, without walking the whole history again
+            music = self.music_position[2]
+        elif music is None:
+            for number in reversed(history):
+                music = self.story.scenes[self.story.scenes_names[number]].music
+                if music is not None:
+                    break
+        self.music_position = (len(history), self.runtime.current, music)
+        self.audio.play_music(music)
+
+        position = (len(history), self.runtime.current)
+        if position != self.audio_position:
+            self.audio_position = position
+            if self.mode == 'skip':
+                self.audio.play_voice(None)
+                return
+            current = self.runtime.scene
+            self.audio.play_voice(current.voice(self.language))
+            names = dict.fromkeys(choice.go_to_scene for choice in current.choices)
+            self.audio.prefetch(voice for voice in (self.story.scenes[name].voice(self.language) for name in names if name in self.story.scenes) if voice)
+
+    def set_resolution(self, resolution, display_mode: str = None) -> None:
+        """
+        Changes the resolution of the game while it runs.
+
+        Args:
+            resolution (str or tuple): The name of the resolution ('hd', 'fullhd' or '4k') or a (width, height) window size.
+            display_mode (str, optional): The new display mode. Defaults to the current display mode.
+
+        Returns:
+            None
+        """
+        if isinstance(resolution, str):
+            self.res_chosen = resolution
+            size = self.resolution[resolution]
+        else:
+            size = tuple(resolution)
+        if display_mode:
+            self.display_mode = display_mode
+
+        pygame.display.set_mode(size, self.display_modes[self.display_mode])
+        self.resize()
+
+    def resize(self) -> None:
+        """
+        Recomputes the layouts and rebuilds the current screen after the window size changed.
+
+        Only the scaled images and rendered texts of the old size are dropped; the decoded images and the translations
+        are kept, and the images reachable from the current screen are scaled again in the background.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        self.screen = pygame.display.get_surface()
+        self.layouts.invalidate()
+        self.fonts.clear()
+        self.texts.clear()
+        self.rows.clear()
+        self.images.resize(self.background_sizes())
+        self.compositor.resize(self.background_sizes())
+        self.rebuild_screen()
+
+    def rebuild_screen(self) -> None:
+        """
+        Builds the current screen again, e.g. after the window was resized or the story changed.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        if self.scene == 'start':
+            self.starting_menu()
+        elif self.scene == 'language':
+            self.starting_menu()
+            self.starting_language()
+        elif self.scene == 'options':
+            self.starting_menu()
+            self.starting_options()
+        elif self.scene == 'game':
+            self.starting_scene()
+        elif self.scene == 'choice':
+            self.starting_scene()
+            self.starting_choice()
+        elif self.scene == 'backlog':
+            self.starting_scene()
+            if self.backlog_return == 'choice':
+                self.starting_choice()
+            self.starting_backlog()
+        elif self.scene == 'slots':
+            if self.slots_return == 'start':
+                self.starting_menu()
+            else:
+                self.starting_scene()
+            self.starting_slots()
+        elif self.scene == 'gallery':
+            self.starting_menu()
+            self.starting_gallery()
+
+    def draw_screen(self) -> None:
+        """
+        Draws the current screen, whatever it is.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        draws = {'splash': self.draw_splash, 'start': self.draw_menu, 'language': self.draw_languages, 'options': self.draw_options, 'game': self.draw_scene, 'choice': self.draw_choice, 'backlog': self.draw_backlog, 'slots': self.draw_slots, 'gallery': self.draw_gallery}
+        draws[self.scene]()
         
     def load_scenes_stack(self) -> None:
         """
-        Load the scenes stack from the 'save.txt' file.
+        Load the scenes stack and the variables from the 'save.txt' file and restore the runtime with them.
+
+        The save is the JSON state of the runtime: the list of the numbers of the scenes visited, and the values of the
+        variables. Saves with only the list of scenes are still loaded, with the initial values of the variables.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        with open("save.txt", "r") as file:
+            state = json.loads(file.read())
+        if isinstance(state, list):
+            self.runtime.restore(state)
+        else:
+            self.runtime.load_state(state)
+
+    def save_scenes_stack(self) -> None:
+        """
+        Save the scenes stack and the variables of the runtime to the 'save.txt' file, and the seen scenes to the 'seen.dat'
+        file.
+
+        While skipping, the game is saved only when the skipping stops.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        if self.mode == 'skip':
+            return
+        with open("save.txt", "w") as file:
+            json.dump(self.runtime.state(), file)
+        self.seen.save('seen.dat')
+
+    def advance(self, index: int) -> None:
+        """
+        Marks the current scene as seen and goes to the scene of one of its choices.
+
+        Args:
+            index (int): The index of the choice.
+
+        Returns:
+            None
+        """
+        self.seen.add(self.runtime.current)
+        self.scene = 'game'
+        self.current_scene = self.choose(index)
+        self.save_scenes_stack()
+        self.starting_scene()
+        self.draw_scene()
+
+    def choose(self, index: int) -> str:
+        """
+        Takes an available choice of the current scene in the runtime, recording the choice and the scene it goes to when
+        analytics are enabled.
+
+        Args:
+            index (int): The index of the choice among the available choices.
+
+        Returns:
+            str: The name of the new current scene.
+        """
+        if self.analytics is None:
+            return self.runtime.choose(index)
+        scene, choice = self.runtime.current_scene, self.runtime.available()[index]
+        target = self.runtime.choose(index)
+        self.analytics.choice(scene, choice, target)
+        self.analytics.scene(target)
+        return target
+
+    def record_scene(self) -> None:
+        """
+        Records that the player entered the current scene when analytics are enabled, e.g. when a game is started or loaded.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        if self.analytics is not None:
+            self.analytics.scene(self.runtime.current_scene)
+
+    def set_mode(self, mode: str = None) -> None:
+        """
+        Starts or stops skipping seen scenes or advancing the scenes automatically.
+
+        Args:
+            mode (str, optional): The new mode. Availables: 'skip', 'auto' or None to stop. Selecting the current mode stops
+                it. Defaults to None.
+
+        Returns:
+            None
+        """
+        previous, self.mode = self.mode, (None if mode == self.mode else mode)
+        if previous == 'skip':
+            # the save and the voice-over of the scene where the skipping stopped were held back
+            self.save_scenes_stack()
+            if self.scene in ('game', 'choice'):
+                self.audio_position = None
+                self.play_scene_audio()
+        self.scene_started = pygame.time.get_ticks()
+        if self.scene_buttons:
+            self.create_scene_buttons()
+
+    def update_modes(self) -> None:
+        """
+        Called once per frame: skips a seen scene or advances the scene in auto mode.
+
+        Skipping goes through the scenes while the current scene was seen and has a single choice, and stops at the first
+        unseen scene, at scenes with more choices and at endings. Only the runtime moves through the skipped scenes, for up
+        to SKIP_BUDGET each frame, and only the scene reached at the end of the frame is built and drawn, so the texts of the
+        skipped scenes are not translated and their images are not decoded. In auto mode, a scene is shown for a time that
+        grows with its text and until its voice-over ends; then its single choice is taken, or the choices are shown.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        if self.mode is None or self.scene != 'game':
+            return
+        if self.mode == 'skip':
+            deadline = time.perf_counter() + self.SKIP_BUDGET
+            skipped = False
+            while len(self.runtime.available()) == 1 and self.runtime.current in self.seen:
+                self.choose(0)
+                skipped = True
+                if time.perf_counter() >= deadline:
+                    break
+            if skipped:
+                self.current_scene = self.runtime.current_scene
+                self.starting_scene()
+            if len(self.runtime.available()) != 1 or self.runtime.current not in self.seen:
+                self.set_mode(None)
+            self.draw_scene()
+        elif self.mode == 'auto':
+            if self.runtime.is_ending:
+                self.set_mode(None)
+                self.draw_scene()
+                return
+            delay = self.AUTO_DELAY + self.AUTO_CHAR_DELAY * len(self.runtime.scene.character_text)
+            if pygame.time.get_ticks() - self.scene_started < delay or self.audio.voice_playing or (self.script is not None and self.script.active):
+                return
+            if len(self.runtime.available()) == 1:
+                self.advance(0)
+            else:
+                self.scene = 'choice'
+                self.starting_choice()
+                self.draw_choice()
+    
+    def checkButtonsColor(self, pos) -> None:
+        """
+        Checks the color of the buttons based on the given position. Used to highlight the button that the mouse is over.
+
+        Args:
+            pos (tuple): The position of the mouse cursor.
+
+        Returns:
+            None
+        """
+        for button in self.buttons:
+            if button.is_over(pos):
+                button.color = button.hover_color
+            else:
+                button.color = button.default_color
+            
+            button.draw(self.screen)
+            
+    def create_scene_buttons(self) -> None:  
+        """
+        Creates the buttons available in the scenes.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        layout = self.layout('scene')
+        font = self.get_font(layout.fonts['button'])
+        self.scene_buttons = []
+        
+        menu_x, menu_y = layout['menu_button'].row(0)
+        self.scene_buttons.append(_Button(menu_x, menu_y, self.translate('Menu'), font = font, color=(150, 150, 150), hover_color=(220, 220, 220), text_cache = self.texts))
+        back_x, back_y = layout['back_button'].row(0)
+        self.scene_buttons.append(_Button(back_x, back_y, self.translate('Voltar Cena'), font = font, color=(150, 150, 150), hover_color=(220, 220, 220), text_cache = self.texts))
+        # the button of the running mode is highlighted
+        for element, text, mode in (('skip_button', 'Pular', 'skip'), ('auto_button', 'Auto', 'auto')):
+            x, y = layout[element].row(0)
+            color = (255, 210, 80) if self.mode == mode else (150, 150, 150)
+            self.scene_buttons.append(_Button(x, y, self.translate(text), font = font, color=color, hover_color=(220, 220, 220), text_cache = self.texts))
+        backlog_x, backlog_y = layout['backlog_button'].row(0)
+        self.scene_buttons.append(_Button(backlog_x, backlog_y, self.translate('Histórico'), font = font, color=(150, 150, 150), hover_color=(220, 220, 220), text_cache = self.texts))
+        save_x, save_y = layout['save_button'].row(0)
+        self.scene_buttons.append(_Button(save_x, save_y, self.translate('Salvar'), font = font, color=(150, 150, 150), hover_color=(220, 220, 220), text_cache = self.texts))
+             
+    def starting_menu(self) -> None:     
+        """
+        Displays the starting menu of the game with buttons for starting a new game, continuing a game, loading a saved
+        game, opening the gallery, changing the language, changing the options, and closing the game.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        layout = self.layout('menu')
+        font = self.get_font(layout.fonts['button'])
+        self.buttons = []   
+        for idx, text in enumerate(_MENU_BUTTONS):
+            x, y = layout['buttons'].row(idx)
+            self.buttons.append(_Button(x, y, self.translate(text), font = font, text_cache = self.texts))
+        
+        self.background = self.images.get(self.story.starting_background, layout['background'].rect.size)
+        self.audio.play_music(self.story.starting_music)
+        self.audio.play_voice(None)
+        self.audio_position = None
+        self.script = None
+        self.script_position = None
+        self.stop_animation()
+        self.particles = None
+        self.set_mode(None)
+    
+    def starting_scene(self) -> None:
+        """
+        Initializes the current scene of the game.
+
+        This method sets the text, background image, and scene buttons.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        self.story.focus(self.current_scene)
+        if self.runtime.is_ending:
+            # endings are never left with a choice, they are seen as soon as they are shown
+            self.seen.add(self.runtime.current)
+        self.scene_started = pygame.time.get_ticks()
+        layout = self.layout('scene')
+        dialogue = layout['dialogue'].rect
+        self.text = _Dialogue(dialogue.x, dialogue.y, dialogue.width, dialogue.height,  self.translate(self.story.scenes[self.current_scene].character_text), font = self.get_font(layout.fonts['dialogue']), text_cache = self.texts)
+        
+        self.background = self.compositor.get(self.story.scenes[self.current_scene].layers(), layout['background'].rect.size)
+        self.start_animation()
+        self.start_effects()
+        self.start_script()
+        
+        self.create_scene_buttons()
+        self.prefetch_backgrounds()
+        self.play_scene_audio()
+
+    def start_script(self) -> None:
+        """
+        Starts the script of the current scene when the player arrives at the scene, not when the screen is rebuilt. The
+        script of a seen scene reached while skipping is run to its end at once.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        position = (len(self.runtime.history), self.runtime.current)
+        if position != self.script_position:
+            self.script_position = position
+            scene = self.story.scenes[self.current_scene]
+            self.script = _Scheduler(scene.script, scene.sprites, self.audio.play_sound) if scene.script is not None else None
+            self.script_started = pygame.time.get_ticks()
+            if self.script is not None and self.mode == 'skip' and self.runtime.current in self.seen:
+                self.script.skip()
+        self.update_script()
+
+    def update_script(self) -> None:
+        """
+        Called once per frame: runs the actions of the script of the current scene that are due, and shows its text.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        if self.script is None:
+            return
+        self.script.update((pygame.time.get_ticks() - self.script_started) / 1000)
+        if self.script.text is not None:
+            self.text.text = self.translate(self.script.text)
+
+    def restore_script(self, state: dict) -> None:
+        """
+        Runs the script of the current scene, just started, up to the time it was at in a saved game.
+
+        Args:
+            state (dict): The saved game, with the state of the script under 'script' if the scene has a script.
+
+        Returns:
+            None
+        """
+        if self.script is None or 'script' not in state:
+            return
+        self.script.restore(state['script'])
+        self.script_started = pygame.time.get_ticks() - round(self.script.time * 1000)
+        self.update_script()
+
+    def start_animation(self) -> None:
+        """
+        Starts playing the animated background of the current scene. An animation already playing at the same size, e.g.
+        shared by consecutive scenes or after the screen is rebuilt, keeps playing.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        animation = self.story.scenes[self.current_scene].animation
+        size = tuple(self.layout('scene')['background'].rect.size)
+        if animation is not None and self.animation is not None and self.animation.animation.key() == animation.key() and self.animation.size == size:
+            return
+        self.stop_animation()
+        if animation is not None:
+            self.animation = _FramePlayer(animation, size)
+            self.animation_started = pygame.time.get_ticks()
+
+    def start_effects(self) -> None:
+        """
+        Creates the particles of the ambient effects of the current scene. Particles of the same effects at the same size,
+        e.g. rain falling over consecutive scenes or after the screen is rebuilt, keep moving.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        effects = self.story.scenes[self.current_scene].effects
+        size = tuple(self.layout('scene')['background'].rect.size)
+        key = tuple(effect.key() for effect in effects) + (size,)
+        if not effects:
+            self.particles = None
+        elif self.particles is None or self.particles.key() != key:
+            self.particles = _EffectLayer(effects, size)
+
+    def stop_animation(self) -> None:
+        """
+        Stops the animated background, if one is playing.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        if self.animation is not None:
+            self.animation.close()
+            self.animation = None
+
+    def forget_animation(self, path: str) -> None:
+        """
+        Stops the animated background if one of its images changed, so it is decoded again when the screen is rebuilt.
+
+        Args:
+            path (str): The path of the image.
+
+        Returns:
+            None
+        """
+        if self.animation is not None and path in self.animation.animation.frames:
+            self.stop_animation()
+
+    def starting_choice(self) -> None:
+        """
+        Creates the scrolling list of the available choices on the current scene in the game.
+
+        The choices are translated and rendered only when they are scrolled into view.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        layout = self.layout('choice')
+        font = self.get_font(layout.fonts['button'])
+        self.buttons = []
+        choices = self.story.scenes[self.current_scene].choices
+        available = self.runtime.available()
+        current, language = self.runtime.current, self.language
+
+        def render_choice(idx: int, hovered: bool) -> pygame.Surface:
+            return _Button(0, 0, self.translate(choices[available[idx]].choice_text), font = font, scenario = 'choice', text_cache = self.texts).surface(hovered)
+
+        box = layout['choices']
+        self.choice_list = _ScrollList(box.rect, box.step, len(available), render_choice, key = lambda idx: ('choice', current, available[idx], language), rows = self.rows)
+
+    def render_backlog_row(self, idx: int, hovered: bool = False) -> pygame.Surface:
+        """
+        Renders a row of the backlog: the title of a visited scene and the lines of its text that fit in the row.
+
+        Args:
+            idx (int): The index of the scene in the stack of visited scenes.
+            hovered (bool, optional): Whether the mouse is over the row. Unused, rows are not highlighted. Defaults to False.
+
+        Returns:
+            pygame.Surface: The rendered row.
+        """
+        layout = self.layout('backlog')
+        rows = layout['rows']
+        scene_name = self.story.scenes_names[self.runtime.history[idx]]
+        title = self.texts.render(self.get_font(layout.fonts['title']), self.translate(scene_name), (255, 210, 80))
+        surface = pygame.Surface((rows.rect.width, rows.step), pygame.SRCALPHA)
+        surface.blit(title, (10, 0))
+
+        font = self.get_font(layout.fonts['dialogue'])
+        lines = self.translate(self.story.scenes[scene_name].character_text).split('\n')
+        fit = max(1, (rows.step - title.get_height()) // font.get_linesize())
+        if len(lines) > fit:
+            lines = lines[:fit - 1] + [lines[fit - 1] + ' ...']
+        y = title.get_height()
+        for line in lines:
+            surface.blit(self.texts.render(font, line, (255, 255, 255)), (10, y))
+            y += font.get_linesize()
+        return surface
+
+    def starting_backlog(self) -> None:
+        """
+        Creates the backlog screen: a scrolling list of the texts of the visited scenes, scrolled to the current scene.
+
+        Only the rows in view are rendered, so the backlog of a long game opens and scrolls as fast as a short one.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        layout = self.layout('backlog')
+        font = self.get_font(layout.fonts['button'])
+        history, language = self.runtime.history, self.language
+        rows = layout['rows']
+        self.backlog = _ScrollList(rows.rect, rows.step, len(history), self.render_backlog_row, key = lambda idx: ('backlog', history[idx], language), align = 'left', rows = self.rows)
+        self.backlog.scroll_to_end()
+        back_x, back_y = layout['back_button'].row(0)
+        self.buttons = [_Button(back_x, back_y, self.translate('Voltar'), font = font, text_cache = self.texts)]
+
+    def open_backlog(self) -> None:
+        """
+        Opens the backlog screen from the game or the choice screen, stopping the skip and auto modes.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        self.set_mode(None)
+        self.backlog_return = self.scene
+        self.scene = 'backlog'
+        self.starting_backlog()
+        self.draw_backlog()
 
-        The scenes stack is a list of integers representing the scenes that have been visited in the game.
-        Each integer corresponds to a specific scene.
+    def open_slots(self, mode: str) -> None:
+        """
+        Opens the slots screen, stopping the skip and auto modes. To save, the screen is copied first, so the thumbnails show
+        the screen the player saved from.
 
         Args:
-            None
+            mode (str): Whether the player saves or loads the game. Availables: 'save', 'load'.
 
         Returns:
             None
         """
-        with open("save.txt", "r") as file:
-            scenes_list_str = file.read().strip('[]').split(', ')
-            self.scenes_stack = [int(scene) for scene in scenes_list_str]
-    
-    def checkButtonsColor(self, pos) -> None:
+        self.set_mode(None)
+        self.capture = self.screen.copy() if mode == 'save' else None
+        self.slots_mode = mode
+        self.slots_return = self.scene
+        self.scene = 'slots'
+        self.starting_slots()
+        self.draw_slots()
+
+    def render_slot_row(self, idx: int, hovered: bool = False) -> pygame.Surface:
         """
-        Checks the color of the buttons based on the given position. Used to highlight the button that the mouse is over.
+        Renders a row of the slots screen: the thumbnail of the slot, its number, and the scene and time of its save.
 
         Args:
-            pos (tuple): The position of the mouse cursor.
+            idx (int): The index of the slot.
+            hovered (bool, optional): Whether the mouse is over the row. Defaults to False.
 
         Returns:
-            None
+            pygame.Surface: The rendered row.
         """
-        for button in self.buttons:
-            if button.is_over(pos):
-                button.color = button.hover_color
-            else:
-                button.color = button.default_color
-            
-            button.draw(self.screen)
-            
-    def create_scene_buttons(self) -> None:  
+        layout = self.layout('slots')
+        rows = layout['rows']
+        surface = pygame.Surface((rows.rect.width, rows.step), pygame.SRCALPHA)
+        box = pygame.Rect(10, 4, max(1, (rows.step - 8) * 16 // 9), max(1, rows.step - 8))
+        pygame.draw.rect(surface, (40, 40, 40), box)
+        thumbnail = self.slots.thumbnail(idx)
+        if thumbnail is not None:
+            thumbnail = _thumbnail(thumbnail, box.size)
+            surface.blit(thumbnail, thumbnail.get_rect(center=box.center))
+
+        title_color = (255, 210, 80) if hovered else (255, 255, 255)
+        title = self.texts.render(self.get_font(layout.fonts['title']), f"{self.translate('Espaço')} {idx + 1}", title_color)
+        surface.blit(title, (box.right + 20, box.y))
+        info = self.slots.info(idx)
+        if info is None:
+            text = self.translate('Vazio')
+        elif info['status'] == 'damaged':
+            text = self.translate('Danificado')
+        elif info['status'] == 'incompatible':
+            text = f"{self.translate(info['scene'])} - {self.translate('Incompatível')}"
+        else:
+            text = f"{self.translate(info['scene'])} - {time.strftime('%d/%m/%Y %H:%M', time.localtime(info['time']))}"
+        surface.blit(self.texts.render(self.get_font(layout.fonts['dialogue']), text, (200, 200, 200)), (box.right + 20, box.y + title.get_height()))
+        return surface
+
+    def starting_slots(self) -> None:
         """
-        Creates the buttons available in the scenes.
+        Creates the slots screen: a scrolling list of the save slots.
+
+        The thumbnails are read in the background, and a slot is rendered again when its thumbnail is ready or it is saved.
 
         Args:
             None
@@ -119,18 +959,17 @@ class _Game:
         Returns:
             None
         """
-        self.scene_buttons = []
-        starter_value = 50         
-        y_position = self.resolution[self.res_chosen][1] - (self.font.size('')[1] + 10)
-        
-        self.scene_buttons.append(_Button((self.resolution[self.res_chosen][0] // 2) - 50, y_position, self.translator.translate('Menu', src='pt', dest=self.language).text, font = self.font, color=(150, 150, 150), hover_color=(220, 220, 220)))
-        starter_value += 50
-        self.scene_buttons.append(_Button((self.resolution[self.res_chosen][0] // 2) + 50, y_position, self.translator.translate('Voltar Cena', src='pt', dest=self.language).text, font = self.font, color=(150, 150, 150), hover_color=(220, 220, 220)))
-             
-    def starting_menu(self) -> None:     
+        layout = self.layout('slots')
+        font = self.get_font(layout.fonts['button'])
+        language = self.language
+        rows = layout['rows']
+        self.slot_list = _ScrollList(rows.rect, rows.step, self.slots.count, self.render_slot_row, key = lambda idx: ('slot', idx, self.slots.version(idx), language), align = 'left', rows = self.rows)
+        back_x, back_y = layout['back_button'].row(0)
+        self.buttons = [_Button(back_x, back_y, self.translate('Voltar'), font = font, text_cache = self.texts)]
+
+    def close_slots(self) -> None:
         """
-        Displays the starting menu of the game with buttons for starting a new game, continuing a game,
-        changing the language, and closing the game.
+        Goes back from the slots screen to the screen it was opened from.
 
         Args:
             None
@@ -138,24 +977,23 @@ class _Game:
         Returns:
             None
         """
-        self.buttons = []   
-        starter_value = 150
-        self.buttons.append(_Button(25, starter_value, self.translator.translate('Iniciar Jogo', src='pt', dest=self.language).text, font = self.font))
-        starter_value += 50
-        self.buttons.append(_Button(25, starter_value, self.translator.translate('Continuar Jogo', src='pt', dest=self.language).text, font = self.font))
-        starter_value += 50
-        self.buttons.append(_Button(25, starter_value, self.translator.translate('Idioma', src='pt', dest=self.language).text, font = self.font))
-        starter_value += 50
-        self.buttons.append(_Button(25, starter_value, self.translator.translate('Fechar Jogo', src='pt', dest=self.language).text, font = self.font))
-        
-        background = pygame.image.load(self.story.starting_background).convert()
-        self.background = pygame.transform.scale(background, self.rescale_image_menu)
-    
-    def starting_scene(self) -> None:
+        self.capture = None
+        self.scene = self.slots_return
+        if self.scene == 'start':
+            self.starting_menu()
+            self.draw_menu()
+        elif self.scene == 'choice':
+            self.starting_choice()
+            self.draw_choice()
+        else:
+            self.draw_scene()
+
+    def starting_gallery(self) -> None:
         """
-        Initializes the current scene of the game.
+        Creates the gallery screen: rows of thumbnails of the backgrounds of the story, with the backgrounds of the scenes
+        the player didn't see yet locked.
 
-        This method sets the text, background image, and scene buttons.
+        The thumbnails are requested only for the rows in view, and read or made in the background.
 
         Args:
             None
@@ -163,29 +1001,56 @@ class _Game:
         Returns:
             None
         """
-        self.text = _Dialogue(50, (self.resolution[self.res_chosen][1] - self.side_bar_y) + 25, 200, 200,  self.translator.translate(self.story.scenes[self.current_scene].character_text, src='pt', dest=self.language).text)
-        
-        background = pygame.image.load(self.story.scenes[self.current_scene].background_display_img).convert()
-        self.background = pygame.transform.scale(background, self.rescale_image_game)
-        
-        self.create_scene_buttons()
+        layout = self.layout('gallery')
+        font = self.get_font(layout.fonts['button'])
+        self.gallery_images = _unlocked_backgrounds(self.story.backgrounds(), self.seen)
+        self.gallery_view = None
+        rows = layout['rows']
+        count = -(-len(self.gallery_images) // self.GALLERY_COLUMNS)
+        self.gallery_list = _ScrollList(rows.rect, rows.step, count, self.render_gallery_row, key = self.gallery_row_key, rows = self.rows)
+        back_x, back_y = layout['back_button'].row(0)
+        self.buttons = [_Button(back_x, back_y, self.translate('Voltar'), font = font, text_cache = self.texts)]
 
-    def starting_choice(self) -> None:
+    def gallery_row_key(self, idx: int) -> tuple:
         """
-        Creates buttons for the available choices on the current scene in the game.
+        Gets the key of a row of the gallery in the cache of the rendered rows, requesting the thumbnails of the row.
 
         Args:
-            None
+            idx (int): The index of the row.
 
         Returns:
-            None
+            tuple: The key, with the thumbnail of each unlocked background of the row, None while it is loaded.
         """
-        starter_value: int = 100
-        self.buttons = []
-        for choice in self.story.scenes[self.current_scene].choices.values():
-            self.buttons.append(_Button((self.resolution[self.res_chosen][0]//2), starter_value, self.translator.translate(choice.choice_text, src='pt', dest=self.language).text, font = self.font, scenario = 'choice'))
-            starter_value += 50
-            
+        images = self.gallery_images[idx * self.GALLERY_COLUMNS:(idx + 1) * self.GALLERY_COLUMNS]
+        return ('gallery', idx, tuple(self.gallery.get(image) if unlocked else False for image, unlocked in images))
+
+    def render_gallery_row(self, idx: int, hovered: bool = False) -> pygame.Surface:
+        """
+        Renders a row of the gallery: the thumbnails of its backgrounds, a gray box for thumbnails still loaded, and a
+        question mark for locked backgrounds.
+
+        Args:
+            idx (int): The index of the row.
+            hovered (bool, optional): Whether the mouse is over the row. Unused, rows are not highlighted. Defaults to False.
+
+        Returns:
+            pygame.Surface: The rendered row.
+        """
+        layout = self.layout('gallery')
+        rows = layout['rows']
+        surface = pygame.Surface((rows.rect.width, rows.step), pygame.SRCALPHA)
+        width = rows.rect.width // self.GALLERY_COLUMNS
+        for column, thumbnail in enumerate(self.gallery_row_key(idx)[2]):
+            box = pygame.Rect(column * width + 4, 4, max(1, width - 8), max(1, rows.step - 8))
+            pygame.draw.rect(surface, (30, 30, 30) if thumbnail is False else (60, 60, 60), box)
+            if thumbnail is False:
+                mark = self.texts.render(self.get_font(layout.fonts['title']), '?', (120, 120, 120))
+                surface.blit(mark, mark.get_rect(center=box.center))
+            elif thumbnail is not None:
+                fitted = _thumbnail(thumbnail, box.size)
+                surface.blit(fitted, fitted.get_rect(center=box.center))
+        return surface
+
     def starting_language(self) -> None:
         """
         Initializes the language screen buttons.
@@ -198,14 +1063,74 @@ class _Game:
         Returns:
             None
         """
-        starter_value = 100
+        layout = self.layout('language')
         self.buttons = []
         
-        for language in self.languages:
-            self.buttons.append(_Button(25, starter_value, self.translator.translate(self.languages_names[language], src='pt', dest=language).text, font = self.font))
-            starter_value += 50
+        for idx, language in enumerate(self.languages):
+            x, y = layout['buttons'].row(idx)
+            # each name is written in its own language, with the font of that language
+            font = self.fonts.get(layout.fonts['button'], language)
+            self.buttons.append(_Button(x, y, self.translate(self.languages_names[language], language), font = font, text_cache = self.texts))
+
+    def starting_options(self) -> None:
+        """
+        Initializes the options screen buttons.
+
+        This method creates buttons for each resolution, each display mode and for going back to the menu.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        layout = self.layout('options')
+        font = self.get_font(layout.fonts['button'])
+        self.buttons = []
+
+        labels = [f'{name.upper()} ({width}x{height})' for name, (width, height) in self.resolution.items()]
+        labels += [self.translate(text) for text in ['Tela Cheia', 'Janela', 'Janela Redimensionável', 'Voltar']]
+        for idx, label in enumerate(labels):
+            x, y = layout['buttons'].row(idx)
+            self.buttons.append(_Button(x, y, label, font = font, text_cache = self.texts))
 
 
+    def draw_splash(self) -> None:
+        """
+        Draws the splash screen: the progress of the startup work, without any text to translate or image to load.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        self.screen.fill((20, 20, 20))
+        rect = self.layout('splash')['progress'].rect
+        pygame.draw.rect(self.screen, (60, 60, 60), rect)
+        pygame.draw.rect(self.screen, (220, 220, 220), pygame.Rect(rect.x, rect.y, round(rect.width * self.startup.progress), rect.height))
+
+    def update_startup(self) -> None:
+        """
+        Shows the progress of the startup on the splash screen, and the menu as soon as its texts and background are
+        ready, without waiting for the validation of the story.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        if not self.startup.ready('translations', 'menu background'):
+            self.draw_splash()
+            return
+        self.scene = 'start'
+        self.starting_menu()
+        self.draw_menu()
+        self.startup.mark('interactive')
+        if self.reloader is not None:
+            print(self.startup.report())
+
     def draw_menu(self) -> None:
         """
         Draws the menu on the screen.
@@ -217,11 +1142,62 @@ class _Game:
             None
         """
         self.screen.fill((20, 20, 20)) 
-        self.screen.blit(self.background, (self.side_bar_x, 0))
+        self.screen.blit(self.background, self.layout('menu')['background'].rect)
         
         for button in self.buttons:
             button.draw(self.screen)
+
+    def draw_title(self, layout: _ResolvedLayout) -> None:
+        """
+        Draws the title of the current scene, in black over light backgrounds and in white otherwise.
+
+        Args:
+            layout (_ResolvedLayout): The layout of the current screen.
+
+        Returns:
+            None
+        """
+        scene_title = self.translate(self.current_scene)
+        title_font = self.get_font(layout.fonts['title'])
+        title_x, title_y = layout['title'].row(0)
+        sample = (min(title_x, self.background.get_width() - 1), min(title_y, self.background.get_height() - 1))
+        if self.background.get_at((0, 0)) == (255, 255, 255) or sum(self.background.get_at(sample)) > 600:
+            title_text = self.texts.render(title_font, scene_title, (0, 0, 0))
+        else:
+            title_text = self.texts.render(title_font, scene_title, (255, 255, 255))
+        title_rect = title_text.get_rect(center=(title_x, title_y))
+        self.screen.blit(title_text, title_rect)
             
+    def draw_background(self, layout: _ResolvedLayout) -> None:
+        """
+        Draws the background of the current scene: the current frame of its animated background under its sprites and
+        overlays, or its composite while there is no frame, and the particles of its ambient effects over them. The sprites
+        are drawn where the script of the scene moved them, and everything is moved by its shakes.
+
+        Args:
+            layout (_ResolvedLayout): The layout of the current screen.
+
+        Returns:
+            None
+        """
+        rect = layout['background'].rect
+        layers = self.story.scenes[self.current_scene].layers()
+        moved = self.script is not None and bool(self.script.moves)
+        if self.script is not None:
+            layers = self.script.layers(layers)
+            rect = rect.move(self.script.offset(rect.height))
+        frame = self.animation.frame(pygame.time.get_ticks() - self.animation_started) if self.animation is not None else None
+        if frame is None and not moved:
+            self.screen.blit(self.background, rect)
+        else:
+            if frame is None:
+                # the sprites moved by the script are drawn over the background alone
+                frame = self.compositor.get(layers[:1], rect.size)
+            self.screen.blit(frame, rect)
+            self.compositor.draw_layers(self.screen, layers, rect)
+        if self.particles is not None:
+            self.particles.draw(self.screen, rect, pygame.time.get_ticks())
+
     def draw_scene(self) -> None:
         """
         Draws the current scene on the screen.
@@ -234,19 +1210,13 @@ class _Game:
         Returns:
             None
         """
+        layout = self.layout('scene')
         self.screen.fill((20, 20, 20)) 
-        self.screen.blit(self.background, (0, 0))
+        self.draw_background(layout)
                 
         self.text.draw(self.screen)
 
-        scene_title = self.translator.translate(self.current_scene, src='pt', dest=self.language).text
-        title_font = pygame.font.Font(None, 48)
-        if self.background.get_at((0, 0)) == (255, 255, 255) or sum(self.background.get_at((self.resolution[self.res_chosen][0] // 2, 25))) > 600:
-            title_text = title_font.render(scene_title, True, (0, 0, 0))
-        else:
-            title_text = title_font.render(scene_title, True, (255, 255, 255))
-        title_rect = title_text.get_rect(center=(self.resolution[self.res_chosen][0] // 2, 25))
-        self.screen.blit(title_text, title_rect)
+        self.draw_title(layout)
         
         for button in self.scene_buttons:
             button.draw(self.screen)
@@ -261,26 +1231,71 @@ class _Game:
         Returns:
             None
         """
+        layout = self.layout('choice')
         self.screen.fill((20, 20, 20)) 
-        self.screen.blit(self.background, (0, 0))
+        self.draw_background(layout)
         
-        for button in self.buttons:
-            button.draw(self.screen)
+        self.choice_list.draw(self.screen, pygame.mouse.get_pos())
                 
         for button in self.scene_buttons:
             button.draw(self.screen)
             
         self.text.draw(self.screen)
 
-        scene_title = self.translator.translate(self.current_scene, src='pt', dest=self.language).text
-        title_font = pygame.font.Font(None, 48)
-        if self.background.get_at((0, 0)) == (255, 255, 255) or sum(self.background.get_at((self.resolution[self.res_chosen][0] // 2, 25))) > 600:
-            title_text = title_font.render(scene_title, True, (0, 0, 0))
-        else:
-            title_text = title_font.render(scene_title, True, (255, 255, 255))
-        title_rect = title_text.get_rect(center=(self.resolution[self.res_chosen][0] // 2, 25))
-        self.screen.blit(title_text, title_rect)
+        self.draw_title(layout)
         
+    def draw_backlog(self) -> None:
+        """
+        Draws the backlog screen.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        self.screen.fill((20, 20, 20))
+        self.backlog.draw(self.screen)
+
+        for button in self.buttons:
+            button.draw(self.screen)
+
+    def draw_slots(self) -> None:
+        """
+        Draws the slots screen.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        self.screen.fill((20, 20, 20))
+        self.slot_list.draw(self.screen, pygame.mouse.get_pos())
+
+        for button in self.buttons:
+            button.draw(self.screen)
+
+    def draw_gallery(self) -> None:
+        """
+        Draws the gallery screen, or the background chosen in it over the whole window.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        self.screen.fill((20, 20, 20))
+        if self.gallery_view is not None:
+            view = self.layout('gallery')['view'].rect
+            self.screen.blit(self.images.get(self.gallery_view, view.size), view)
+            return
+        self.gallery_list.draw(self.screen)
+
+        for button in self.buttons:
+            button.draw(self.screen)
+
     def draw_languages(self) -> None:
         """
         Draws the languages buttons on the screen.
@@ -292,11 +1307,39 @@ class _Game:
             None
         """
         self.screen.fill((20, 20, 20)) 
-        self.screen.blit(self.background, (self.side_bar_x, 0))
+        self.screen.blit(self.background, self.layout('language')['background'].rect)
         
         for button in self.buttons:
             button.draw(self.screen)
+
+    def draw_options(self) -> None:
+        """
+        Draws the options buttons on the screen.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        self.screen.fill((20, 20, 20))
+        self.screen.blit(self.background, self.layout('options')['background'].rect)
+
+        for button in self.buttons:
+            button.draw(self.screen)
         
+    def splash_display(self, event) -> None:
+        """
+        Runs the loop display of the splash screen, which ignores the input of the user until the menu is shown.
+
+        Args:
+            event (pygame.event.Event): The event object representing the user input event.
+
+        Returns:
+            None
+        """
+        self.draw_splash()
+
     def menu_display(self, event) -> None:
         """
         Runs the loop display of the menu and handle user input events.
@@ -319,27 +1362,45 @@ class _Game:
                 if button.is_over(pos):
                     # start game
                     if idx == 0:
+                        # a game starts only with a valid story
+                        self.startup.wait('validation')
                         self.scene = 'game'
-                        self.scenes_stack = [0]
-                        with open("save.txt", "w") as file:
-                            file.write(str(self.scenes_stack))
+                        self.runtime.start()
+                        self.save_scenes_stack()
+                        self.record_scene()
                             
-                        self.current_scene = self.story.scenes_names[self.scenes_stack[-1]]
+                        self.current_scene = self.runtime.current_scene
                         self.starting_scene()
                         self.draw_scene()
                     # continue game
                     elif idx == 1:
+                        self.startup.wait('validation')
                         self.scene = 'game'
                         self.load_scenes_stack()
-                        self.current_scene = self.story.scenes_names[self.scenes_stack[-1]]
+                        self.record_scene()
+                        self.current_scene = self.runtime.current_scene
                         self.starting_scene()
                         self.draw_scene()
-                    # choose language
+                    # load a saved game
                     elif idx == 2:
+                        self.startup.wait('validation')
+                        self.open_slots('load')
+                    # show the unlocked backgrounds
+                    elif idx == 3:
+                        self.scene = 'gallery'
+                        self.starting_gallery()
+                        self.draw_gallery()
+                    # choose language
+                    elif idx == 4:
                         self.scene = 'language'
                         self.starting_language()
                         self.draw_languages()
-                    elif idx == 3:
+                    # change resolution and display mode
+                    elif idx == 5:
+                        self.scene = 'options'
+                        self.starting_options()
+                        self.draw_options()
+                    elif idx == 6:
                         self.running = False
                         
     def game_display(self, event) -> None:
@@ -356,7 +1417,15 @@ class _Game:
 
         pos = pygame.mouse.get_pos()
 
-        if event.type == pygame.MOUSEBUTTONDOWN:
+        if event.type == pygame.KEYDOWN and event.key in (pygame.K_TAB, pygame.K_a):
+            self.set_mode('skip' if event.key == pygame.K_TAB else 'auto')
+            self.draw_scene()
+
+        # scrolling up shows the texts already read
+        if event.type == pygame.MOUSEWHEEL and event.y > 0:
+            self.open_backlog()
+
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button not in (4, 5):
             b = False
             for idx, button in enumerate(self.scene_buttons):
                 if button.is_over(pos):
@@ -365,17 +1434,32 @@ class _Game:
                         self.starting_menu()
                         self.draw_menu()
                     elif idx == 1:
-                        if len(self.scenes_stack) > 1:
-                            self.scenes_stack.pop()
-                            self.current_scene = self.story.scenes_names[self.scenes_stack[-1]]
+                        self.set_mode(None)
+                        if self.runtime.back():
+                            self.current_scene = self.runtime.current_scene
 
-                            with open("save.txt", "w") as file:
-                                file.write(str(self.scenes_stack))
+                            self.save_scenes_stack()
 
                         self.starting_scene()
                         self.draw_scene()
+                    elif idx in (2, 3):
+                        self.set_mode('skip' if idx == 2 else 'auto')
+                        self.draw_scene()
+                    elif idx == 4:
+                        self.open_backlog()
+                    elif idx == 5:
+                        self.open_slots('save')
                     b = True
-            if not b:
+            if not b and self.mode == 'skip':
+                # a click stops the skipping
+                self.set_mode(None)
+                self.draw_scene()
+            elif not b and self.script is not None and self.script.active:
+                # a click runs the rest of the script at once, the next one shows the choices
+                self.script.skip()
+                self.update_script()
+                self.draw_scene()
+            elif not b:
                 self.scene = 'choice'
                 self.starting_choice()
                 self.draw_choice()
@@ -396,18 +1480,14 @@ class _Game:
         if event.type == pygame.MOUSEMOTION:
             self.checkButtonsColor(pos)
             
-        if event.type == pygame.MOUSEBUTTONDOWN:
-            for idx, button in enumerate(self.buttons):
-                if button.is_over(pos):
-                    self.scene = 'game'
-                    self.current_scene = list(self.story.scenes[self.current_scene].choices.keys())[idx]
-                    self.scenes_stack.append(self.story.scenes_names.index(self.current_scene))
-                        
-                    with open("save.txt", "w") as file:
-                        file.write(str(self.scenes_stack))
-                            
-                    self.starting_scene()
-                    self.draw_scene()
+        if event.type == pygame.MOUSEWHEEL:
+            self.choice_list.scroll(-event.y * self.choice_list.row_height)
+            self.draw_choice()
+
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button not in (4, 5):
+            idx = self.choice_list.row_at(pos)
+            if idx is not None:
+                self.advance(idx)
                 
             for idx, button in enumerate(self.scene_buttons):
                 if button.is_over(pos):
@@ -415,18 +1495,160 @@ class _Game:
                         self.scene = 'start'
                         self.starting_menu()
                         self.draw_menu()
+                    elif idx in (2, 3):
+                        # the mode starts once a choice is made
+                        self.set_mode('skip' if idx == 2 else 'auto')
+                        self.draw_choice()
+                    elif idx == 4:
+                        self.open_backlog()
+                    elif idx == 5:
+                        self.open_slots('save')
                     elif idx == 1:
                         self.scene = 'game'
-                        if len(self.scenes_stack) > 1: 
-                            self.scenes_stack.pop()
-                            self.current_scene = self.story.scenes_names[self.scenes_stack[-1]]    
+                        self.set_mode(None)
+                        if self.runtime.back(): 
+                            self.current_scene = self.runtime.current_scene    
                                 
-                            with open("save.txt", "w") as file:
-                                file.write(str(self.scenes_stack))  
+                            self.save_scenes_stack()  
                         
                         self.starting_scene()
                         self.draw_scene()
                         
+    def backlog_display(self, event: pygame.event.Event) -> None:
+        """
+        Runs the loop display of the backlog screen and handles user input.
+
+        Args:
+            event (pygame.event.Event): The event object representing the user's input.
+
+        Returns:
+            None
+        """
+        self.draw_backlog()
+        pos = pygame.mouse.get_pos()
+
+        if event.type == pygame.MOUSEWHEEL:
+            self.backlog.scroll(-event.y * self.backlog.row_height)
+            self.draw_backlog()
+
+        if event.type == pygame.MOUSEMOTION:
+            self.checkButtonsColor(pos)
+
+        back = event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button not in (4, 5):
+            back = any(button.is_over(pos) for button in self.buttons)
+        if back:
+            self.scene = self.backlog_return
+            if self.scene == 'choice':
+                self.starting_choice()
+                self.draw_choice()
+            else:
+                self.draw_scene()
+
+    def slots_display(self, event: pygame.event.Event) -> None:
+        """
+        Runs the loop display of the slots screen and handles user input: saving the game in a slot, or loading the game of a slot.
+
+        Args:
+            event (pygame.event.Event): The event object representing the user's input.
+
+        Returns:
+            None
+        """
+        self.draw_slots()
+        pos = pygame.mouse.get_pos()
+
+        if event.type == pygame.MOUSEWHEEL:
+            self.slot_list.scroll(-event.y * self.slot_list.row_height)
+            self.draw_slots()
+
+        if event.type == pygame.MOUSEMOTION:
+            self.checkButtonsColor(pos)
+
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+            self.close_slots()
+            return
+        if event.type != pygame.MOUSEBUTTONDOWN or event.button in (4, 5):
+            return
+        if any(button.is_over(pos) for button in self.buttons):
+            self.close_slots()
+            return
+        idx = self.slot_list.row_at(pos)
+        if idx is None:
+            return
+        if self.slots_mode == 'save':
+            # the thumbnail is scaled and written in the background, the slot shows it once it is ready
+            state = self.runtime.state()
+            if self.script is not None:
+                state['script'] = self.script.state()
+            self.slots.save(idx, state, self.capture, self.current_scene)
+            self.draw_slots()
+        elif self.slots.info(idx) is not None and self.slots.info(idx)['status'] == 'ok':
+            try:
+                state = self.slots.load(idx)
+            except (OSError, ValueError):
+                self.slots.mark(idx, 'damaged')
+                self.draw_slots()
+                return
+            try:
+                self.runtime.load_state(state)
+            except ValueError:
+                # e.g. saved by a version of the story with other scenes, the current game goes on
+                self.slots.mark(idx, 'incompatible')
+                self.draw_slots()
+                return
+            self.record_scene()
+            self.scene = 'game'
+            self.current_scene = self.runtime.current_scene
+            self.save_scenes_stack()
+            # the script starts again even if the slot is at the position of the current game
+            self.script_position = None
+            self.starting_scene()
+            self.restore_script(state)
+            self.draw_scene()
+
+    def gallery_display(self, event: pygame.event.Event) -> None:
+        """
+        Runs the loop display of the gallery screen and handles user input.
+
+        Args:
+            event (pygame.event.Event): The event object representing the user's input.
+
+        Returns:
+            None
+        """
+        self.draw_gallery()
+        pos = pygame.mouse.get_pos()
+        back = event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE
+
+        if self.gallery_view is not None:
+            # any click or key closes the background shown in the whole window
+            if back or event.type == pygame.MOUSEBUTTONDOWN:
+                self.gallery_view = None
+                self.draw_gallery()
+            return
+
+        if event.type == pygame.MOUSEWHEEL:
+            self.gallery_list.scroll(-event.y * self.gallery_list.row_height)
+            self.draw_gallery()
+
+        if event.type == pygame.MOUSEMOTION:
+            self.checkButtonsColor(pos)
+
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button not in (4, 5):
+            back = any(button.is_over(pos) for button in self.buttons)
+            row = self.gallery_list.row_at(pos)
+            if row is not None:
+                column = (pos[0] - self.gallery_list.rect.x) * self.GALLERY_COLUMNS // max(1, self.gallery_list.rect.width)
+                idx = row * self.GALLERY_COLUMNS + column
+                if column < self.GALLERY_COLUMNS and idx < len(self.gallery_images) and self.gallery_images[idx][1]:
+                    self.gallery_view = self.gallery_images[idx][0]
+                    self.draw_gallery()
+        if back:
+            self.scene = 'start'
+            self.starting_menu()
+            self.draw_menu()
+
     def language_display(self, event: pygame.event.Event) -> None:
         """
         Runs the loop display of the language selection screen and handles user input.
@@ -450,7 +1672,41 @@ class _Game:
                     
                     self.scene = 'start'
                     self.starting_menu()
-                    self.draw_menu
+                    self.draw_menu()
+
+    def options_display(self, event: pygame.event.Event) -> None:
+        """
+        Runs the loop display of the options screen and handles user input.
+
+        Args:
+            event (pygame.event.Event): The event object representing the user's input.
+
+        Returns:
+            None
+        """
+        self.draw_options()
+        pos = pygame.mouse.get_pos()
+
+        if event.type == pygame.MOUSEMOTION:
+            self.checkButtonsColor(pos)
+
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            resolutions = list(self.resolution)
+            display_modes = list(self.display_modes)
+            for idx, button in enumerate(self.buttons):
+                if button.is_over(pos):
+                    if idx < len(resolutions):
+                        self.set_resolution(resolutions[idx])
+                    elif idx < len(resolutions) + len(display_modes):
+                        self.set_resolution(self.res_chosen, display_modes[idx - len(resolutions)])
+                    else:
+                        self.scene = 'start'
+                        self.starting_menu()
+                    if self.scene == 'start':
+                        self.draw_menu()
+                    else:
+                        self.draw_options()
+                    break
                                 
     def run(self) -> None:
         """
@@ -462,11 +1718,7 @@ class _Game:
         Returns:
             None
         """
-        self.starting_menu()
-        self.draw_menu()
-        
         clock = pygame.time.Clock()
-        self.scene = 'start'
         
         self.running = True
         while self.running:
@@ -474,8 +1726,36 @@ class _Game:
                 if event.type == pygame.QUIT:
                     self.running = False
                 
+                if event.type == pygame.VIDEORESIZE:
+                    self.resize()
+
                 self.scenarios[self.scene](event)
                     
+            # a startup task that failed, e.g. the validation of the story, stops the game as soon as it fails
+            self.startup.check()
+            if self.scene == 'splash':
+                self.update_startup()
+            if self.reloader is not None:
+                self.reloader.update()
+            self.update_modes()
+            # the script is drawn until the frame after it ends, which shows where it left the scene
+            scripted = self.script is not None and self.script.active and self.scene in ('game', 'choice')
+            if scripted:
+                self.update_script()
+            moving = self.animation is not None or self.particles is not None or scripted
+            if self.scene in ('slots', 'gallery') or (moving and self.scene in ('game', 'choice')):
+                # thumbnails loaded in the background appear as soon as they are ready, and animations, effects and scripts play
+                self.draw_screen()
+            self.audio.update()
             # pygame.display.flip()
             pygame.display.update()
-            clock.tick(self.FPS)
+            clock.tick(self.SKIP_FPS if self.mode == 'skip' else self.FPS)
+            
+        self.seen.save('seen.dat')
+        self.startup.close()
+        self.stop_animation()
+        if self.analytics is not None:
+            self.analytics.close()
+        self.slots.close()
+        self.gallery.close()
+        self.audio.close()
@@ -0,0 +1,288 @@
+import pygame
+from typing import Dict, List, Optional, Tuple
+
+__all__: List[str] = []
+
+# Relative position of each anchor, as a fraction of the width and height of a box
+_ANCHORS: Dict[str, Tuple[float, float]] = {
+    'topleft': (0.0, 0.0), 'top': (0.5, 0.0), 'topright': (1.0, 0.0),
+    'left': (0.0, 0.5), 'center': (0.5, 0.5), 'right': (1.0, 0.5),
+    'bottomleft': (0.0, 1.0), 'bottom': (0.5, 1.0), 'bottomright': (1.0, 1.0),
+}
+
+class _Box:
+    """
+    An element of a layout resolved to pixels for one window size.
+
+    Attributes:
+        rect (pygame.Rect): The area occupied by the element.
+        step (int): The vertical distance in pixels between two rows of the element.
+    """
+
+    def __init__(self, rect: pygame.Rect, step: int = 0) -> None:
+        """
+        Initializes a resolved box.
+
+        Args:
+            rect (pygame.Rect): The area occupied by the element.
+            step (int, optional): The vertical distance between two rows. Defaults to 0.
+        """
+        self.rect = rect
+        self.step = step
+
+    def row(self, index: int) -> Tuple[int, int]:
+        """
+        Gets the position of a row of the element, used for lists of buttons.
+
+        Args:
+            index (int): The index of the row.
+
+        Returns:
+            tuple: The (x, y) position of the row.
+        """
+        return (self.rect.x, self.rect.y + index * self.step)
+
+class _Element:
+    """
+    Declarative description of an element of a screen, independent of the resolution.
+
+    All the measures are relative units: the horizontal ones are fractions of the window width and the
+    vertical ones are fractions of the window height.
+
+    Attributes:
+        anchor (str): The point of the window, and of the element, used to place the element.
+        x (float): The horizontal offset from the anchor.
+        y (float): The vertical offset from the anchor.
+        width (float): The width of the element.
+        height (float): The height of the element.
+        spacing (float): The vertical distance between two rows of the element.
+    """
+
+    def __init__(self, anchor: str = 'topleft', x: float = 0.0, y: float = 0.0, width: float = 0.0,
+                 height: float = 0.0, spacing: float = 0.0) -> None:
+        """
+        Initializes an element.
+
+        Args:
+            anchor (str, optional): The anchor of the element. Defaults to 'topleft'.
+                Availables: 'topleft', 'top', 'topright', 'left', 'center', 'right', 'bottomleft', 'bottom', 'bottomright'.
+            x (float, optional): The horizontal offset from the anchor. Defaults to 0.0.
+            y (float, optional): The vertical offset from the anchor. Defaults to 0.0.
+            width (float, optional): The width of the element. Defaults to 0.0.
+            height (float, optional): The height of the element. Defaults to 0.0.
+            spacing (float, optional): The vertical distance between two rows of the element. Defaults to 0.0.
+        """
+        if anchor not in _ANCHORS:
+            raise ValueError(f"The anchor {anchor} is not valid. Availables: {', '.join(_ANCHORS)}.")
+        self.anchor = anchor
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.spacing = spacing
+
+    def resolve(self, size: Tuple[int, int]) -> _Box:
+        """
+        Resolves the element to pixels for a window size.
+
+        The anchor point of the element is placed on the anchor point of the window, moved by the offset.
+
+        Args:
+            size (tuple): The (width, height) of the window.
+
+        Returns:
+            _Box: The element in pixels.
+        """
+        window_width, window_height = size
+        anchor_x, anchor_y = _ANCHORS[self.anchor]
+        width = round(self.width * window_width)
+        height = round(self.height * window_height)
+        left = round((anchor_x + self.x) * window_width - anchor_x * width)
+        top = round((anchor_y + self.y) * window_height - anchor_y * height)
+        return _Box(pygame.Rect(left, top, width, height), round(self.spacing * window_height))
+
+class _Layout:
+    """
+    Declarative layout of a screen.
+
+    Attributes:
+        elements (Dict[str, _Element]): The elements of the screen by name.
+        fonts (Dict[str, float]): The font sizes of the screen by name, as fractions of the window height.
+        languages (Dict[str, Dict[str, _Element]]): Elements replaced for specific languages, e.g. wider
+            sidebars for languages with longer labels.
+    """
+
+    def __init__(self, elements: Dict[str, _Element], fonts: Optional[Dict[str, float]] = None,
+                 languages: Optional[Dict[str, Dict[str, _Element]]] = None) -> None:
+        """
+        Initializes a layout.
+
+        Args:
+            elements (Dict[str, _Element]): The elements of the screen by name.
+            fonts (Dict[str, float], optional): The font sizes of the screen by name. Defaults to None.
+            languages (Dict[str, Dict[str, _Element]], optional): Elements replaced for specific languages. Defaults to None.
+        """
+        self.elements = elements
+        self.fonts = fonts if fonts else {}
+        self.languages = languages if languages else {}
+
+    def resolve(self, size: Tuple[int, int], language: str) -> '_ResolvedLayout':
+        """
+        Resolves every element and font of the layout to pixels.
+
+        Args:
+            size (tuple): The (width, height) of the window.
+            language (str): The current language of the game.
+
+        Returns:
+            _ResolvedLayout: The layout in pixels.
+        """
+        elements = dict(self.elements)
+        elements.update(self.languages.get(language, {}))
+        boxes = {name: element.resolve(size) for name, element in elements.items()}
+        fonts = {name: max(1, round(scale * size[1])) for name, scale in self.fonts.items()}
+        return _ResolvedLayout(size, boxes, fonts)
+
+class _ResolvedLayout:
+    """
+    A layout resolved to pixels for one window size and language.
+
+    Attributes:
+        size (tuple): The (width, height) of the window.
+        boxes (Dict[str, _Box]): The resolved elements by name.
+        fonts (Dict[str, int]): The font sizes in pixels by name.
+    """
+
+    def __init__(self, size: Tuple[int, int], boxes: Dict[str, _Box], fonts: Dict[str, int]) -> None:
+        """
+        Initializes a resolved layout.
+
+        Args:
+            size (tuple): The (width, height) of the window.
+            boxes (Dict[str, _Box]): The resolved elements by name.
+            fonts (Dict[str, int]): The font sizes in pixels by name.
+        """
+        self.size = size
+        self.boxes = boxes
+        self.fonts = fonts
+
+    def __getitem__(self, name: str) -> _Box:
+        return self.boxes[name]
+
+_SPLASH_LAYOUT = _Layout({'progress': _Element('bottom', y=-0.12, width=0.4, height=0.012)}, fonts={})
+
+_MENU_LAYOUT = _Layout(
+    {
+        'background': _Element('topright', width=0.8, height=1.0),
+        'buttons': _Element('topleft', x=0.02, y=0.21, spacing=0.07),
+    },
+    fonts={'button': 0.045},
+)
+
+_LANGUAGE_LAYOUT = _Layout(
+    {
+        'background': _Element('topright', width=0.8, height=1.0),
+        'buttons': _Element('topleft', x=0.02, y=0.14, spacing=0.07),
+    },
+    fonts={'button': 0.045},
+)
+
+_SCENE_ELEMENTS: Dict[str, _Element] = {
+    'background': _Element('topleft', width=1.0, height=0.75),
+    'title': _Element('top', y=0.035),
+    'dialogue': _Element('topleft', x=0.04, y=0.785, width=0.92, height=0.17),
+    'menu_button': _Element('bottom', x=-0.04, y=-0.045),
+    'back_button': _Element('bottom', x=0.04, y=-0.045),
+    'skip_button': _Element('bottom', x=0.19, y=-0.045),
+    'auto_button': _Element('bottom', x=0.27, y=-0.045),
+    'backlog_button': _Element('bottom', x=-0.2, y=-0.045),
+    'save_button': _Element('bottom', x=-0.32, y=-0.045),
+}
+
+_SCENE_FONTS: Dict[str, float] = {'button': 0.045, 'title': 0.067, 'dialogue': 0.033}
+
+_SCENE_LAYOUT = _Layout(_SCENE_ELEMENTS, fonts=_SCENE_FONTS)
+
+_CHOICE_LAYOUT = _Layout(
+    dict(_SCENE_ELEMENTS, choices=_Element('top', y=0.105, width=0.9, height=0.63, spacing=0.07)),
+    fonts=_SCENE_FONTS,
+)
+
+_BACKLOG_LAYOUT = _Layout(
+    {
+        'rows': _Element('top', y=0.04, width=0.92, height=0.84, spacing=0.14),
+        'back_button': _Element('bottom', y=-0.045),
+    },
+    fonts={'button': 0.045, 'title': 0.04, 'dialogue': 0.033},
+)
+
+_SLOTS_LAYOUT = _Layout(
+    {
+        'rows': _Element('top', y=0.04, width=0.92, height=0.84, spacing=0.21),
+        'back_button': _Element('bottom', y=-0.045),
+    },
+    fonts={'button': 0.045, 'title': 0.04, 'dialogue': 0.033},
+)
+
+_GALLERY_LAYOUT = _Layout(
+    {
+        'rows': _Element('top', y=0.04, width=0.92, height=0.84, spacing=0.21),
+        'back_button': _Element('bottom', y=-0.045),
+        'view': _Element('topleft', width=1.0, height=1.0),
+    },
+    fonts={'button': 0.045, 'title': 0.04},
+)
+
+class _LayoutCache:
+    """
+    Computes the layouts of the screens once per (screen, window size, language) and keeps them.
+
+    Attributes:
+        layouts (Dict[str, _Layout]): The declarative layouts by screen.
+        resolved (Dict[tuple, _ResolvedLayout]): The layouts already resolved.
+    """
+
+    def __init__(self, layouts: Optional[Dict[str, _Layout]] = None) -> None:
+        """
+        Initializes the cache.
+
+        Args:
+            layouts (Dict[str, _Layout], optional): The layouts by screen. Defaults to the layouts of the splash, menu, language, options, scene, choice, backlog, slots and gallery screens.
+        """
+        self.layouts = layouts if layouts else {
+            'splash': _SPLASH_LAYOUT,
+            'menu': _MENU_LAYOUT,
+            'language': _LANGUAGE_LAYOUT,
+            'options': _LANGUAGE_LAYOUT,
+            'scene': _SCENE_LAYOUT,
+            'choice': _CHOICE_LAYOUT,
+            'backlog': _BACKLOG_LAYOUT,
+            'slots': _SLOTS_LAYOUT,
+            'gallery': _GALLERY_LAYOUT,
+        }
+        self.resolved: Dict[Tuple[str, Tuple[int, int], str], _ResolvedLayout] = {}
+
+    def get(self, screen: str, size: Tuple[int, int], language: str) -> _ResolvedLayout:
+        """
+        Gets the layout of a screen, resolving it only the first time it is requested.
+
+        Args:
+            screen (str): The name of the screen.
+            size (tuple): The (width, height) of the window.
+            language (str): The current language of the game.
+
+        Returns:
+            _ResolvedLayout: The layout in pixels.
+        """
+        key = (screen, tuple(size), language)
+        layout = self.resolved.get(key)
+        if layout is None:
+            layout = self.layouts[screen].resolve(key[1], language)
+            self.resolved[key] = layout
+        return layout
+
+    def invalidate(self) -> None:
+        """
+        Drops every resolved layout. Used when the window is resized.
+        """
+        self.resolved.clear()
@@ -0,0 +1,245 @@
+from typing import Dict, List, Tuple
+
+import pygame
+from pygame.surface import Surface
+from vnengine.base.effect import _Effect
+
+try:
+    import numpy as np
+except ImportError: # pragma: no cover
+    np = None
+
+__all__: List[str] = []
+
+# how the particles of each effect look and move. The speeds and sizes are fractions of the background height, the speeds
+# per second; 'sway' moves the particles from side to side and 'twinkle' shows each particle only part of the time
+_STYLES: Dict[str, Dict[str, object]] = {
+    'rain': {'color': (175, 195, 235), 'fall': (1.1, 1.6), 'drift': (0.22, 0.28), 'sway': 0.0, 'twinkle': 0.0, 'size': 0.008},
+    'snow': {'color': (250, 250, 255), 'fall': (0.05, 0.13), 'drift': (-0.02, 0.02), 'sway': 0.012, 'twinkle': 0.0, 'size': 0.002},
+    'sparkles': {'color': (255, 240, 170), 'fall': (-0.02, -0.005), 'drift': (-0.01, 0.01), 'sway': 0.0, 'twinkle': 0.75, 'size': 0.005},
+    'dust': {'color': (205, 190, 160), 'fall': (-0.006, 0.006), 'drift': (0.004, 0.018), 'sway': 0.006, 'twinkle': 0.0, 'size': 0.002},
+}
+
+def _sprite(kind: str, size: int, velocity: Tuple[float, float]) -> Surface:
+    """
+    Draws the sprite of a particle.
+
+    Args:
+        kind (str): The kind of the effect.
+        size (int): The size of the sprite in pixels.
+        velocity (tuple): The mean (x, y) velocity of the particles, the direction of the rain streaks.
+
+    Returns:
+        pygame.Surface: The sprite, white on a transparent background.
+    """
+    side = size * 2 + 1
+    sprite = pygame.Surface((side, side), pygame.SRCALPHA)
+    center = (size, size)
+    if kind == 'rain':
+        length = (velocity[0] ** 2 + velocity[1] ** 2) ** 0.5
+        end = (size + round(velocity[0] / length * size), size + round(velocity[1] / length * size))
+        pygame.draw.line(sprite, (255, 255, 255, 255), (size - (end[0] - size), size - (end[1] - size)), end)
+    elif kind == 'sparkles':
+        pygame.draw.line(sprite, (255, 255, 255, 255), (0, size), (side - 1, size))
+        pygame.draw.line(sprite, (255, 255, 255, 255), (size, 0), (size, side - 1))
+        sprite.set_at(center, (255, 255, 255, 255))
+    else:
+        pygame.draw.circle(sprite, (255, 255, 255, 255), center, size)
+        # the border of the flakes and motes is blended with the background
+        if size > 1:
+            pygame.draw.circle(sprite, (255, 255, 255, 128), center, size, 1)
+        else:
+            for x, y in ((0, 1), (2, 1), (1, 0), (1, 2)):
+                sprite.set_at((x, y), (255, 255, 255, 128))
+    return sprite
+
+class _ParticleSystem:
+    """
+    The particles of one effect, for one background size.
+
+    The state of the particles is kept in NumPy arrays and updated in a single operation per frame. The sprite of a particle
+    is drawn once and turned into the offsets of its pixels, so drawing writes every pixel of every particle into the
+    screen with a few array operations: the opaque pixels are replaced with the color of the effect and the border pixels
+    are blended half with the background. Screens that are not 32 bits per pixel draw the sprites with `Surface.blits`.
+
+    Attributes:
+        effect (_Effect): The effect.
+        size (tuple): The (width, height) of the background the particles move over.
+        x (np.ndarray): The horizontal position of each particle, in pixels.
+        y (np.ndarray): The vertical position of each particle, in pixels.
+        vx (np.ndarray): The horizontal velocity of each particle, in pixels per second.
+        vy (np.ndarray): The vertical velocity of each particle, in pixels per second.
+        phase (np.ndarray): The phase of the sway and the twinkle of each particle.
+        time (float): The seconds the particles moved.
+        sprite (pygame.Surface): The sprite of a particle, white on a transparent background.
+        solid (Tuple[np.ndarray, np.ndarray]): The (x, y) offsets of the opaque pixels of the sprite from its center.
+        border (Tuple[np.ndarray, np.ndarray]): The (x, y) offsets of the pixels of the sprite blended with the background.
+    """
+
+    def __init__(self, effect: _Effect, size: Tuple[int, int], seed: int = 0) -> None:
+        """
+        Initializes the particles, spread over the whole background.
+
+        Args:
+            effect (_Effect): The effect.
+            size (tuple): The (width, height) of the background.
+            seed (int, optional): The seed of the positions and speeds of the particles, so an effect always starts the
+                same way. Defaults to 0.
+        """
+        self.effect = effect
+        self.size = (max(1, size[0]), max(1, size[1]))
+        self.style = _STYLES[effect.kind]
+        width, height = self.size
+        count = effect.count
+        self.rng = np.random.default_rng(seed)
+        self.x = self.rng.uniform(0, width, count).astype(np.float32)
+        self.y = self.rng.uniform(0, height, count).astype(np.float32)
+        fall, drift = self.style['fall'], self.style['drift']
+        self.vy = (self.rng.uniform(fall[0], fall[1], count) * height).astype(np.float32)
+        self.vx = (self.rng.uniform(drift[0], drift[1], count) * (self.vy if effect.kind == 'rain' else height)).astype(np.float32)
+        self.phase = self.rng.uniform(0, 2 * np.pi, count).astype(np.float32)
+        self.time = 0.0
+
+        radius = max(1, round(self.style['size'] * height))
+        self.sprite = _sprite(effect.kind, radius, (float(self.vx.mean()), float(self.vy.mean()) or 1.0))
+        alpha = pygame.surfarray.array_alpha(self.sprite)
+        solid, border = alpha >= 192, (alpha > 0) & (alpha < 192)
+        self.solid = tuple(axis.astype(np.intp) - radius for axis in np.nonzero(solid))
+        self.border = tuple(axis.astype(np.intp) - radius for axis in np.nonzero(border))
+        self.radius = radius
+        # the particles leave the background by a margin, so they don't disappear while still visible
+        self.margin = radius * 2 + 1
+
+    def update(self, seconds: float) -> None:
+        """
+        Moves every particle. The particles that leave the background come back on the opposite side, the ones that fall
+        through the bottom at a new random horizontal position.
+
+        Args:
+            seconds (float): The time since the last update.
+        """
+        width, height = self.size
+        self.time += seconds
+        self.x += self.vx * seconds
+        self.y += self.vy * seconds
+        below = self.y > height + self.margin
+        if below.any():
+            self.y[below] -= height + 2 * self.margin
+            self.x[below] = self.rng.uniform(0, width, int(below.sum()))
+        above = self.y < -self.margin
+        if above.any():
+            self.y[above] += height + 2 * self.margin
+        np.mod(self.x, width, out=self.x)
+
+    def positions(self, rect: pygame.Rect, clip: pygame.Rect) -> Tuple['np.ndarray', 'np.ndarray']:
+        """
+        Gets the pixels of the centers of the particles drawn in a frame.
+
+        Args:
+            rect (pygame.Rect): Where the background is drawn.
+            clip (pygame.Rect): The area the particles can be drawn in, inside the target.
+
+        Returns:
+            tuple: The x and y of the center of each visible particle, on the target.
+        """
+        x = self.x
+        if self.style['sway']:
+            x = x + np.sin(self.phase + self.time * 1.7) * (self.style['sway'] * self.size[1])
+        xs = x.astype(np.int32) + rect.x
+        ys = self.y.astype(np.int32) + rect.y
+        r = self.radius
+        visible = (xs >= clip.left + r) & (xs < clip.right - r) & (ys >= clip.top + r) & (ys < clip.bottom - r)
+        if self.style['twinkle']:
+            visible &= np.sin(self.phase * 7.0 + self.time * 3.0) > self.style['twinkle']
+        return xs[visible], ys[visible]
+
+    def draw(self, target: Surface, rect: pygame.Rect) -> None:
+        """
+        Draws the particles over a background already drawn.
+
+        Args:
+            target (pygame.Surface): The surface the background is drawn on, e.g. the screen.
+            rect (pygame.Rect): Where the background is drawn on the target.
+        """
+        clip = rect.clip(target.get_rect())
+        xs, ys = self.positions(rect, clip)
+        if not len(xs):
+            return
+        if target.get_bytesize() != 4:
+            previous = target.get_clip()
+            target.set_clip(clip)
+            sprite = self.sprite.copy()
+            sprite.fill(self.style['color'] + (255,), special_flags=pygame.BLEND_RGBA_MULT)
+            target.blits([(sprite, (x - self.radius, y - self.radius)) for x, y in zip(xs.tolist(), ys.tolist())], doreturn=False)
+            target.set_clip(previous)
+            return
+        color = target.map_rgb(self.style['color'])
+        half = (color >> 1) & 0x7F7F7F7F
+        # the pixels are written through a flat view of the surface, indexed by a single offset per pixel, with the native
+        # integer type NumPy indexes with so the indices are not converted
+        stride = target.get_pitch() // 4
+        centers = ys.astype(np.intp) * stride + xs
+        buffer = target.get_buffer()
+        try:
+            pixels = np.frombuffer(buffer, np.uint32)
+            if len(self.border[0]):
+                border = (centers[:, None] + (self.border[1] * stride + self.border[0])).ravel()
+                pixels[border] = ((pixels[border] >> 1) & 0x7F7F7F7F) + half
+            pixels[(centers[:, None] + (self.solid[1] * stride + self.solid[0])).ravel()] = color
+        finally:
+            del pixels, buffer
+
+class _EffectLayer:
+    """
+    Draws the ambient effects of a scene over its background, each effect with its own particles.
+
+    Attributes:
+        effects (List[_Effect]): The effects.
+        size (tuple): The (width, height) of the background.
+        systems (List[_ParticleSystem]): The particles of each effect.
+        last (int): The time of the last frame drawn, in milliseconds, or None before the first one.
+    """
+
+    def __init__(self, effects: List[_Effect], size: Tuple[int, int]) -> None:
+        """
+        Initializes the particles of the effects.
+
+        Args:
+            effects (List[_Effect]): The effects.
+            size (tuple): The (width, height) of the background.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+        """
+        if np is None:
+            raise ImportError("NumPy is required to draw ambient effects. Install it with 'pip install numpy'.")
+        self.effects = list(effects)
+        self.size = tuple(size)
+        self.systems = [_ParticleSystem(effect, self.size, seed) for seed, effect in enumerate(self.effects)]
+        self.last = None
+
+    def key(self) -> tuple:
+        """
+        Gets the effects and the size of the layer, e.g. to keep the particles moving between scenes with the same effects.
+
+        Returns:
+            tuple: The key of the layer.
+        """
+        return tuple(effect.key() for effect in self.effects) + (self.size,)
+
+    def draw(self, target: Surface, rect: pygame.Rect, now: int) -> None:
+        """
+        Moves the particles by the time since the last frame and draws them.
+
+        Args:
+            target (pygame.Surface): The surface the background is drawn on, e.g. the screen.
+            rect (pygame.Rect): Where the background is drawn on the target.
+            now (int): The current time, in milliseconds.
+        """
+        # a long pause, e.g. while the window was dragged, doesn't make the particles jump
+        seconds = 0.0 if self.last is None else min(max(now - self.last, 0), 100) / 1000
+        self.last = now
+        for system in self.systems:
+            if seconds:
+                system.update(seconds)
+            system.draw(target, rect)
@@ -0,0 +1,283 @@
+import io
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+import pygame
+from pygame.surface import Surface
+
+__all__: List[str] = []
+
+def _thumbnail(surface: Surface, size: Tuple[int, int]) -> Surface:
+    """
+    Scales a surface down to fit in a size, keeping its proportions. Safe to call from a worker.
+
+    Args:
+        surface (pygame.Surface): The surface to scale, e.g. a copy of the screen or a decoded image.
+        size (tuple): The (width, height) the thumbnail must fit in.
+
+    Returns:
+        pygame.Surface: The thumbnail.
+    """
+    width, height = surface.get_size()
+    scale = min(size[0] / max(1, width), size[1] / max(1, height))
+    fitted = (max(1, round(width * scale)), max(1, round(height * scale)))
+    # smoothing needs 24 or 32 bits per pixel, images with a palette are only scaled
+    if surface.get_bitsize() in (24, 32):
+        return pygame.transform.smoothscale(surface, fitted)
+    return pygame.transform.scale(surface, fitted)
+
+def _write_file(path: str, data: bytes) -> None:
+    """
+    Writes a file through a temporary file, so a file being written is never read half written, even if the game quits.
+
+    Args:
+        path (str): The path of the file.
+        data (bytes): The content of the file.
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    temporary = f'{path}.tmp'
+    with open(temporary, 'wb') as file:
+        file.write(data)
+    os.replace(temporary, path)
+
+def _write_png(path: str, surface: Surface) -> None:
+    """
+    Encodes a surface as PNG and writes it. Safe to call from a worker.
+
+    Args:
+        path (str): The path of the file.
+        surface (pygame.Surface): The surface to write.
+    """
+    buffer = io.BytesIO()
+    pygame.image.save(surface, buffer, 'png')
+    _write_file(path, buffer.getvalue())
+
+class _SaveSlots:
+    """
+    The save slots of the game, each with the state of the runtime and a thumbnail of the screen when it was saved.
+
+    Saving only copies the screen; the copy is scaled down, encoded as PNG and written with the state by a worker, so a save
+    never holds a frame. The thumbnails of the slots saved in previous games are read by the worker when they are first
+    requested.
+
+    Attributes:
+        folder (str): The folder of the save files.
+        count (int): The number of slots.
+        size (tuple): The (width, height) the thumbnails fit in.
+        infos (Dict[int, Optional[dict]]): The 'scene', 'time' and 'status' of each slot already read, None for empty
+            slots.
+        thumbnails (Dict[int, Optional[pygame.Surface]]): The thumbnails already made or read, None for slots without one.
+        pending (Dict[int, Future]): The saves and thumbnail reads being done in the background, by slot.
+        executor (ThreadPoolExecutor): The worker writing the saves and reading the thumbnails, in order.
+    """
+
+    def __init__(self, folder: str = 'saves', count: int = 6, size: Tuple[int, int] = (320, 180)) -> None:
+        """
+        Initializes the save slots.
+
+        Args:
+            folder (str, optional): The folder of the save files. Defaults to 'saves'.
+            count (int, optional): The number of slots. Defaults to 6.
+            size (tuple, optional): The (width, height) the thumbnails fit in. Defaults to (320, 180).
+        """
+        self.folder = folder
+        self.count = count
+        self.size = tuple(size)
+        self.infos: Dict[int, Optional[Dict[str, Any]]] = {}
+        self.thumbnails: Dict[int, Optional[Surface]] = {}
+        self.pending: Dict[int, Future] = {}
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='vnengine-saves')
+
+    def path(self, slot: int, extension: str = 'json') -> str:
+        """
+        Gets the path of a file of a slot.
+
+        Args:
+            slot (int): The index of the slot.
+            extension (str, optional): The extension of the file. Availables: 'json', 'png'. Defaults to 'json'.
+
+        Returns:
+            str: The path of the file.
+        """
+        return os.path.join(self.folder, f'slot{slot + 1}.{extension}')
+
+    def _read(self, slot: int) -> Optional[Dict[str, Any]]:
+        """
+        Reads the file of a slot.
+
+        Args:
+            slot (int): The index of the slot.
+
+        Returns:
+            dict: The save, or None if the slot is empty.
+
+        Raises:
+            ValueError: If the file can't be read or is not a save.
+        """
+        path = self.path(slot)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r') as file:
+                save = json.load(file)
+        except (OSError, UnicodeDecodeError, ValueError) as error:
+            raise ValueError(f"The slot {slot + 1} is damaged.") from error
+        if not isinstance(save, dict) or not all(key in save for key in ('scene', 'time', 'state')):
+            raise ValueError(f"The slot {slot + 1} is damaged.")
+        return save
+
+    def info(self, slot: int) -> Optional[Dict[str, Any]]:
+        """
+        Gets the name of the scene and the time of the save of a slot, reading its file only once.
+
+        Args:
+            slot (int): The index of the slot.
+
+        Returns:
+            dict: The 'scene' and the 'time' of the save, in seconds since the epoch, and its 'status': 'ok', 'damaged' if
+            its file can't be read, with no scene and time, or 'incompatible' if it failed to load. None if the slot is
+            empty.
+        """
+        if slot not in self.infos:
+            try:
+                save = self._read(slot)
+                self.infos[slot] = {'scene': save['scene'], 'time': save['time'], 'status': 'ok'} if save else None
+            except ValueError:
+                # like a damaged thumbnail, a damaged save is shown instead of stopping the game
+                self.infos[slot] = {'scene': None, 'time': None, 'status': 'damaged'}
+        return self.infos[slot]
+
+    def mark(self, slot: int, status: str) -> None:
+        """
+        Marks a slot that failed to load, e.g. saved by another version of the story, so it is shown as such.
+
+        Args:
+            slot (int): The index of the slot.
+            status (str): The status of the slot. Availables: 'damaged', 'incompatible'.
+        """
+        info = self.info(slot) or {'scene': None, 'time': None}
+        self.infos[slot] = dict(info, status=status)
+
+    def save(self, slot: int, state: Dict[str, Any], screen: Surface, scene: str) -> Future:
+        """
+        Saves the state of the runtime in a slot, with a thumbnail of the screen.
+
+        Only the copy of the screen is done here; the thumbnail and the files are made in the background.
+
+        Args:
+            slot (int): The index of the slot.
+            state (dict): The state of the runtime, returned by `StoryRuntime.state`.
+            screen (pygame.Surface): The screen to make the thumbnail of.
+            scene (str): The name of the current scene, shown in the slot.
+
+        Returns:
+            Future: Done when the files are written.
+        """
+        save = {'scene': scene, 'time': time.time(), 'state': state}
+        data = json.dumps(save).encode('utf-8')
+        copy = screen.copy()
+        with self.lock:
+            self.infos[slot] = {'scene': scene, 'time': save['time'], 'status': 'ok'}
+            self.thumbnails.pop(slot, None)
+            future = self.executor.submit(self._write, slot, data, copy)
+            self.pending[slot] = future
+        future.add_done_callback(lambda future: self._done(slot, future))
+        return future
+
+    def _write(self, slot: int, data: bytes, copy: Surface) -> None:
+        thumbnail = _thumbnail(copy, self.size)
+        _write_png(self.path(slot, 'png'), thumbnail)
+        _write_file(self.path(slot), data)
+        with self.lock:
+            self.thumbnails[slot] = thumbnail
+
+    def _load_thumbnail(self, slot: int) -> None:
+        path = self.path(slot, 'png')
+        try:
+            thumbnail = pygame.image.load(path) if os.path.exists(path) else None
+        except pygame.error:
+            thumbnail = None
+        with self.lock:
+            self.thumbnails.setdefault(slot, thumbnail)
+
+    def _done(self, slot: int, future: Future) -> None:
+        with self.lock:
+            if self.pending.get(slot) is future:
+                del self.pending[slot]
+
+    def thumbnail(self, slot: int) -> Optional[Surface]:
+        """
+        Gets the thumbnail of a slot, reading it in the background the first time it is requested.
+
+        Args:
+            slot (int): The index of the slot.
+
+        Returns:
+            pygame.Surface: The thumbnail, or None while it is made or read, and for slots without a thumbnail.
+        """
+        with self.lock:
+            if slot in self.thumbnails:
+                return self.thumbnails[slot]
+            if slot in self.pending:
+                return None
+            future = self.executor.submit(self._load_thumbnail, slot)
+            self.pending[slot] = future
+        # outside the lock: the callback runs at once if the future is already done
+        future.add_done_callback(lambda future: self._done(slot, future))
+        return None
+
+    def version(self, slot: int) -> Hashable:
+        """
+        Gets a key that changes whenever the slot is saved or its thumbnail changes, e.g. to cache the rendered slot.
+
+        Args:
+            slot (int): The index of the slot.
+
+        Returns:
+            Hashable: The key.
+        """
+        info = self.info(slot)
+        return (info['time'] if info else None, info['status'] if info else None, self.thumbnail(slot))
+
+    def load(self, slot: int) -> Dict[str, Any]:
+        """
+        Gets the state saved in a slot, waiting for the save of the slot if it is being written.
+
+        Args:
+            slot (int): The index of the slot.
+
+        Returns:
+            dict: The state of the runtime.
+
+        Raises:
+            ValueError: If the slot is empty or its file is damaged.
+            OSError: If the save of the slot being written failed.
+        """
+        self.wait(slot)
+        save = self._read(slot)
+        if save is None:
+            raise ValueError(f"The slot {slot + 1} is empty.")
+        return save['state']
+
+    def wait(self, slot: Optional[int] = None) -> None:
+        """
+        Waits for the saves and thumbnail reads being done in the background.
+
+        Args:
+            slot (int, optional): The slot to wait for. Defaults to every slot.
+        """
+        with self.lock:
+            futures = list(self.pending.values()) if slot is None else [self.pending[slot]] if slot in self.pending else []
+        for future in futures:
+            future.result()
+
+    def close(self) -> None:
+        """
+        Finishes writing the saves and stops the worker.
+        """
+        self.executor.shutdown(wait=True)
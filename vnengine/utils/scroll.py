@@ -0,0 +1,183 @@
+from typing import Callable, Hashable, List, Optional, Tuple
+
+import pygame
+from pygame.surface import Surface
+from vnengine.utils.cache import _LRUCache
+
+__all__: List[str] = []
+
+class _ScrollList:
+    """
+    A vertical list of rows of the same height that scrolls inside an area of the screen.
+
+    Only the rows inside the area are laid out and rendered, and their surfaces are cached, so drawing and scrolling a list
+    of ten thousand rows costs the same as a list of ten rows. A row is rendered the first time it becomes visible.
+
+    Attributes:
+        rect (pygame.Rect): The area of the screen where the rows are drawn.
+        row_height (int): The height of each row in pixels.
+        count (int): The number of rows.
+        render_row (Callable[[int, bool], Surface]): Renders a row from its index and whether the mouse is over it.
+        key (Callable[[int], Hashable]): Gets the key of a row in the cache from its index.
+        align (str): The horizontal alignment of the rows in the area. Availables: 'left', 'center'.
+        offset (int): How many pixels the list is scrolled down.
+        rows (_LRUCache): The rendered rows, by (key, hovered).
+        drawn (List[Tuple[int, pygame.Rect]]): The index and rectangle of each row drawn in the last frame.
+    """
+
+    def __init__(self, rect: pygame.Rect, row_height: int, count: int, render_row: Callable[[int, bool], Surface],
+                 key: Optional[Callable[[int], Hashable]] = None, align: str = 'center',
+                 rows: Optional[_LRUCache] = None) -> None:
+        """
+        Initializes a scrolling list.
+
+        Args:
+            rect (pygame.Rect): The area of the screen where the rows are drawn.
+            row_height (int): The height of each row in pixels.
+            count (int): The number of rows.
+            render_row (Callable[[int, bool], Surface]): Renders a row from its index and whether the mouse is over it.
+            key (Callable[[int], Hashable], optional): Gets the key of a row in the cache from its index, so rows with the
+                same content are rendered once. Defaults to the index.
+            align (str, optional): The horizontal alignment of the rows. Availables: 'left', 'center'. Defaults to 'center'.
+            rows (_LRUCache, optional): The cache of the rendered rows, which can be shared by several lists with distinct
+                keys. Defaults to a cache of 16 MB.
+
+        Raises:
+            ValueError: If the alignment is not valid.
+        """
+        if align not in ('left', 'center'):
+            raise ValueError(f"The alignment {align} is not valid. Availables: left, center.")
+        self.rect = pygame.Rect(rect)
+        self.row_height = max(1, row_height)
+        self.count = count
+        self.render_row = render_row
+        self.key = key if key else (lambda index: index)
+        self.align = align
+        self.offset = 0
+        self.rows = rows if rows is not None else _LRUCache(16 * 1024 * 1024)
+        self.drawn: List[Tuple[int, pygame.Rect]] = []
+
+    @property
+    def max_offset(self) -> int:
+        """
+        int: The offset of the list scrolled to its end.
+        """
+        return max(0, self.count * self.row_height - self.rect.height)
+
+    def scroll(self, pixels: int) -> None:
+        """
+        Scrolls the list, without going past its start or its end.
+
+        Args:
+            pixels (int): The pixels to scroll, positive to go down the list.
+        """
+        self.offset = min(max(0, self.offset + pixels), self.max_offset)
+
+    def scroll_to(self, index: int) -> None:
+        """
+        Scrolls the list the least needed to show a row entirely.
+
+        Args:
+            index (int): The index of the row.
+        """
+        top = index * self.row_height
+        if top < self.offset:
+            self.offset = top
+        elif top + self.row_height > self.offset + self.rect.height:
+            self.offset = top + self.row_height - self.rect.height
+        self.scroll(0)
+
+    def scroll_to_end(self) -> None:
+        """
+        Scrolls the list to its last row.
+        """
+        self.offset = self.max_offset
+
+    def visible(self) -> range:
+        """
+        Gets the rows inside the area, even partially.
+
+        Returns:
+            range: The indexes of the visible rows.
+        """
+        first = self.offset // self.row_height
+        last = min(self.count, -(-(self.offset + self.rect.height) // self.row_height))
+        return range(first, max(first, last))
+
+    def row(self, index: int, hovered: bool = False) -> Surface:
+        """
+        Gets a rendered row, rendering it only the first time.
+
+        Args:
+            index (int): The index of the row.
+            hovered (bool, optional): Whether the mouse is over the row. Defaults to False.
+
+        Returns:
+            pygame.Surface: The rendered row.
+        """
+        cache_key = (self.key(index), hovered)
+        surface = self.rows.get(cache_key)
+        if surface is None:
+            surface = self.render_row(index, hovered)
+            self.rows.put(cache_key, surface)
+        return surface
+
+    def row_rect(self, index: int, surface: Surface) -> pygame.Rect:
+        """
+        Gets where a rendered row is drawn on the screen, centered vertically in its row.
+
+        Args:
+            index (int): The index of the row.
+            surface (pygame.Surface): The rendered row.
+
+        Returns:
+            pygame.Rect: The rectangle of the row on the screen.
+        """
+        center_y = self.rect.y + index * self.row_height - self.offset + self.row_height // 2
+        if self.align == 'center':
+            return surface.get_rect(center=(self.rect.centerx, center_y))
+        return surface.get_rect(midleft=(self.rect.x, center_y))
+
+    def row_at(self, pos: Tuple[int, int]) -> Optional[int]:
+        """
+        Gets the row under a position of the screen, among the rows drawn in the last frame.
+
+        Args:
+            pos (tuple): The position in (x, y) format, e.g. of the mouse.
+
+        Returns:
+            int: The index of the row, or None if there is no row at the position.
+        """
+        if not self.rect.collidepoint(pos):
+            return None
+        for index, rect in self.drawn:
+            if rect.collidepoint(pos):
+                return index
+        return None
+
+    def draw(self, screen: Surface, pos: Optional[Tuple[int, int]] = None) -> None:
+        """
+        Draws the visible rows, and a scroll bar when the rows don't fit in the area.
+
+        Args:
+            screen (pygame.Surface): The surface to draw the list on.
+            pos (tuple, optional): The position of the mouse, to highlight the row under it. Defaults to None.
+        """
+        clip = screen.get_clip()
+        screen.set_clip(self.rect)
+        self.drawn = []
+        for index in self.visible():
+            surface = self.row(index)
+            rect = self.row_rect(index, surface)
+            if pos is not None and self.rect.collidepoint(pos) and rect.collidepoint(pos):
+                surface = self.row(index, True)
+                rect = self.row_rect(index, surface)
+            screen.blit(surface, rect)
+            self.drawn.append((index, rect))
+
+        if self.max_offset > 0:
+            track = self.rect.height
+            thumb = max(self.row_height // 2, track * self.rect.height // (self.count * self.row_height))
+            top = self.rect.y + (track - thumb) * self.offset // self.max_offset
+            pygame.draw.rect(screen, (150, 150, 150), pygame.Rect(self.rect.right - 4, top, 4, thumb))
+        screen.set_clip(clip)
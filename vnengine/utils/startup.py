@@ -0,0 +1,142 @@
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+__all__: List[str] = []
+
+class _Startup:
+    """
+    The work done while the game starts. Each task runs on a worker, so the main thread shows the splash screen from the
+    first frame and keeps the window responsive, and each screen is shown as soon as the tasks it needs are done.
+
+    Attributes:
+        tasks (Dict[str, Future]): The tasks by name.
+        clock (Callable[[], float]): Function giving the current time in seconds.
+        started (float): The time at which the game started.
+        first_frame (float): The seconds from the start of the game to its first frame, or None before it.
+        interactive (float): The seconds from the start of the game to the menu accepting input, or None before it.
+    """
+
+    def __init__(self, workers: int = 4, clock: Callable[[], float] = time.perf_counter) -> None:
+        """
+        Initializes the startup, counting the time from now.
+
+        Args:
+            workers (int, optional): The number of tasks run at the same time. Defaults to 4.
+            clock (Callable, optional): Function giving the current time in seconds. Defaults to `time.perf_counter`.
+        """
+        self.tasks: Dict[str, Future] = {}
+        self.clock = clock
+        self.started = clock()
+        self.first_frame: Optional[float] = None
+        self.interactive: Optional[float] = None
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='vnengine-startup')
+
+    def submit(self, name: str, function: Callable, *args) -> Future:
+        """
+        Runs a task on a worker.
+
+        Args:
+            name (str): The name of the task, used to wait for it.
+            function (Callable): The function of the task.
+            *args: The arguments of the function.
+
+        Returns:
+            Future: The result of the task.
+
+        Raises:
+            ValueError: If a task with the same name was already submitted.
+        """
+        if name in self.tasks:
+            raise ValueError(f"The startup task {name} was already submitted.")
+        self.tasks[name] = self.executor.submit(function, *args)
+        return self.tasks[name]
+
+    @property
+    def progress(self) -> float:
+        """
+        The fraction of the tasks that are done, from 0 to 1.
+        """
+        if not self.tasks:
+            return 1.0
+        return sum(task.done() for task in self.tasks.values()) / len(self.tasks)
+
+    def ready(self, *names: str) -> bool:
+        """
+        Checks, without waiting, whether tasks are done. The tasks never submitted are considered done.
+
+        Args:
+            *names (str): The names of the tasks.
+
+        Returns:
+            bool: Whether every task is done.
+
+        Raises:
+            Exception: The error of the first task that failed.
+        """
+        self.check(*names)
+        return all(self.tasks[name].done() for name in names if name in self.tasks)
+
+    def wait(self, *names: str) -> None:
+        """
+        Waits for tasks to be done. The tasks never submitted are considered done.
+
+        Args:
+            *names (str): The names of the tasks.
+
+        Raises:
+            Exception: The error of the first task that failed.
+        """
+        for name in names:
+            if name in self.tasks:
+                self.tasks[name].result()
+
+    def check(self, *names: str) -> None:
+        """
+        Raises the error of a task that failed, so it reaches the main thread as soon as it happens.
+
+        Args:
+            *names (str): The names of the tasks to check. Defaults to every task.
+
+        Raises:
+            Exception: The error of the first task that failed.
+        """
+        for name in names if names else list(self.tasks):
+            task = self.tasks.get(name)
+            if task is not None and task.done() and not task.cancelled() and task.exception() is not None:
+                raise task.exception()
+
+    def mark(self, event: str) -> float:
+        """
+        Records the time from the start of the game to an event, only the first time it happens.
+
+        Args:
+            event (str): The event. Availables: 'first_frame', 'interactive'.
+
+        Returns:
+            float: The seconds from the start of the game to the event.
+
+        Raises:
+            ValueError: If the event is not valid.
+        """
+        if event not in ('first_frame', 'interactive'):
+            raise ValueError(f"The startup event {event} is not valid. Availables: first_frame, interactive.")
+        if getattr(self, event) is None:
+            setattr(self, event, self.clock() - self.started)
+        return getattr(self, event)
+
+    def report(self) -> str:
+        """
+        Describes the times to the first frame and to the interactive menu.
+
+        Returns:
+            str: The description.
+        """
+        times = [f"{label} {value * 1000:.0f} ms" for label, value in (('first frame', self.first_frame), ('interactive', self.interactive)) if value is not None]
+        return f"Startup: {', '.join(times)}"
+
+    def close(self) -> None:
+        """
+        Cancels the tasks that didn't start and stops the workers without waiting for the running tasks.
+        """
+        self.executor.shutdown(wait=False, cancel_futures=True)